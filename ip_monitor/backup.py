@@ -0,0 +1,193 @@
+"""
+Online backups of the SQLite database.
+"""
+
+import asyncio
+from dataclasses import dataclass
+from datetime import datetime
+import logging
+import os
+import sqlite3
+import time
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class BackupResult:
+    """Outcome of one backup."""
+
+    path: str
+    pages: int
+    bytes: int
+    seconds: float
+    verified: bool
+
+    @property
+    def bytes_per_second(self) -> float:
+        """Copy throughput of the backup."""
+        return self.bytes / self.seconds if self.seconds > 0 else float(self.bytes)
+
+
+class DatabaseBackup:
+    """
+    Copies the live database with SQLite's online backup API.
+
+    The copy runs on a worker thread, a bounded number of pages per step
+    with a pause between steps, so neither the event loop nor writers wait
+    for it. The source holds one read transaction for the whole copy; with
+    the write-ahead log this gives a consistent snapshot without blocking
+    writes or restarting when they land. Each copy is written under a
+    temporary name, checked with PRAGMA integrity_check and only then given
+    its final name, after which the oldest backups beyond the number to keep
+    are deleted.
+    """
+
+    # Pages copied per backup step
+    PAGES_PER_STEP = 256
+
+    # Seconds to pause between steps
+    STEP_PAUSE = 0.005
+
+    def __init__(self, db_file: str, backup_dir: str, keep: int = 7) -> None:
+        """
+        Initialize the backup.
+
+        Args:
+            db_file: Path to the SQLite database file to back up
+            backup_dir: Directory the backups are written to
+            keep: Number of backups to keep, 0 to keep them all
+        """
+        self.db_file = db_file
+        self.backup_dir = backup_dir
+        self.keep = keep
+        self._lock = asyncio.Lock()
+        self.last_result: BackupResult | None = None
+
+    @property
+    def prefix(self) -> str:
+        """File name prefix shared by this database's backups."""
+        stem = os.path.splitext(os.path.basename(self.db_file))[0]
+        return f"{stem}-"
+
+    async def run(self) -> BackupResult:
+        """
+        Back up the database, verify the copy and rotate old backups.
+
+        Only one backup runs at a time; a second call waits for the first.
+
+        Returns:
+            The outcome; a copy that fails verification is deleted
+
+        Raises:
+            sqlite3.Error: If the database cannot be copied
+            OSError: If the backup file cannot be written
+        """
+        async with self._lock:
+            result = await asyncio.to_thread(self._run)
+        self.last_result = result
+        return result
+
+    def _run(self) -> BackupResult:
+        """Copy, verify and rotate on the calling thread."""
+        os.makedirs(self.backup_dir, exist_ok=True)
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S-%f")
+        path = os.path.join(self.backup_dir, f"{self.prefix}{stamp}.db")
+        partial = f"{path}.partial"
+
+        start = time.perf_counter()
+        try:
+            pages, page_size = self._copy(partial)
+            verified = self._verify(partial)
+        except BaseException:
+            self._remove(partial)
+            raise
+        seconds = time.perf_counter() - start
+
+        if verified:
+            os.replace(partial, path)
+            self._rotate()
+            logger.info(
+                f"Backed up {self.db_file} to {path}: {pages} pages in {seconds:.2f}s"
+            )
+        else:
+            self._remove(partial)
+            logger.error(f"Backup of {self.db_file} failed its integrity check")
+        return BackupResult(path, pages, pages * page_size, seconds, verified)
+
+    def _copy(self, target_file: str) -> tuple[int, int]:
+        """Copy the database to a file, returning its page count and size."""
+        source = sqlite3.connect(self.db_file)
+        target = sqlite3.connect(target_file)
+        try:
+            # Pin one snapshot of the source for every step
+            source.execute("BEGIN")
+            source.execute("SELECT COUNT(*) FROM sqlite_master").fetchone()
+            source.backup(
+                target,
+                pages=self.PAGES_PER_STEP,
+                progress=self._progress,
+                sleep=self.STEP_PAUSE,
+            )
+            source.rollback()
+            # Make the copy a single self-contained file
+            target.execute("PRAGMA journal_mode=DELETE")
+            (pages,) = target.execute("PRAGMA page_count").fetchone()
+            (page_size,) = target.execute("PRAGMA page_size").fetchone()
+            return pages, page_size
+        finally:
+            target.close()
+            source.close()
+
+    @staticmethod
+    def _progress(status: int, remaining: int, total: int) -> None:
+        """Log the progress of a backup after each step."""
+        logger.debug(f"Backup step: {total - remaining}/{total} pages copied")
+
+    @staticmethod
+    def _verify(path: str) -> bool:
+        """Check a copy with PRAGMA integrity_check."""
+        conn = sqlite3.connect(path)
+        try:
+            rows = conn.execute("PRAGMA integrity_check").fetchall()
+        except sqlite3.DatabaseError as e:
+            logger.error(f"Error checking backup {path}: {e}")
+            return False
+        finally:
+            conn.close()
+        return rows == [("ok",)]
+
+    def list_backups(self) -> list[str]:
+        """
+        List the backups of the database, oldest first.
+
+        Returns:
+            Paths of the completed backup files
+        """
+        try:
+            names = os.listdir(self.backup_dir)
+        except FileNotFoundError:
+            return []
+        return [
+            os.path.join(self.backup_dir, name)
+            for name in sorted(names)
+            if name.startswith(self.prefix) and name.endswith(".db")
+        ]
+
+    def _rotate(self) -> None:
+        """Delete the oldest backups beyond the number to keep."""
+        if self.keep <= 0:
+            return
+        for path in self.list_backups()[: -self.keep]:
+            self._remove(path)
+            logger.info(f"Removed old backup {path}")
+
+    @staticmethod
+    def _remove(path: str) -> None:
+        """Delete a file, logging rather than raising on failure."""
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning(f"Error removing {path}: {e}")
@@ -2,6 +2,7 @@
 Core bot implementation for the IP Monitor Bot.
 """
 
+import asyncio
 import logging
 
 import discord
@@ -12,8 +13,10 @@ from ip_monitor.commands.ip_commands import IPCommands
 from ip_monitor.config import AppConfig
 from ip_monitor.ip_api_config import ip_api_manager
 from ip_monitor.ip_service import IPService
-from ip_monitor.storage import SQLiteIPStorage
+from ip_monitor.observation_log import ObservationLog
+from ip_monitor.storage import AsyncStorage, create_storage
 from ip_monitor.utils.async_rate_limiter import AsyncRateLimiter
+from ip_monitor.utils.cache import get_cache, initialize_cache
 from ip_monitor.utils.discord_rate_limiter import DiscordRateLimiter
 from ip_monitor.utils.message_queue import message_queue
 from ip_monitor.utils.service_health import service_health
@@ -43,6 +46,24 @@ class IPMonitorBot:
         self.client = commands.Bot(command_prefix="!", intents=intents)
 
         # Configure services
+        if config.cache_enabled:
+            # Build the shared cache before any service asks for it
+            initialize_cache(
+                cache_file=config.cache_file,
+                max_memory_size=config.cache_max_memory_size,
+                max_memory_bytes=config.cache_max_memory_bytes or None,
+                memory_budgets=config.cache_type_memory_budgets,
+            )
+
+        self.observation_log = (
+            ObservationLog(
+                config.db_file,
+                raw_retention_hours=config.observation_raw_retention_hours,
+            )
+            if config.observation_log_enabled
+            else None
+        )
+
         self.ip_service = IPService(
             max_retries=config.max_retries,
             retry_delay=config.retry_delay,
@@ -55,16 +76,15 @@ class IPMonitorBot:
             connection_pool_max_keepalive=config.connection_pool_max_keepalive,
             connection_timeout=config.connection_timeout,
             read_timeout=config.read_timeout,
+            observation_log=self.observation_log,
         )
 
-        self.storage = SQLiteIPStorage(
-            db_file=config.db_file,
-            history_size=config.ip_history_size,
-        )
+        self.storage = create_storage(config)
 
-        # Migrate existing JSON data if it exists
-        if not hasattr(self, "_migration_done"):
-            self.storage.migrate_from_json(config.ip_file, config.ip_history_file)
+        # Migrate existing JSON data if it exists and the backend can take it
+        migrate_from_json = getattr(self.storage, "migrate_from_json", None)
+        if migrate_from_json is not None and not hasattr(self, "_migration_done"):
+            migrate_from_json(config.ip_file, config.ip_history_file)
             self._migration_done = True
 
         self.rate_limiter = AsyncRateLimiter(
@@ -108,6 +128,14 @@ class IPMonitorBot:
         # Cache cleanup task reference
         self.cache_cleanup_task = None
 
+        # Scheduled database backup task reference
+        self.backup_task = None
+
+    @property
+    def async_storage(self) -> AsyncStorage:
+        """Storage calls that run off the event loop."""
+        return AsyncStorage(self.storage)
+
     def _setup_slash_commands(self) -> None:
         """
         Set up slash command cogs.
@@ -188,11 +216,40 @@ class IPMonitorBot:
             except Exception as e:
                 logger.warning(f"Error cancelling IP check task: {e}")
 
+        # Stop cache maintenance; IPService.close() writes the final snapshot
+        if self.cache_cleanup_task and self.cache_cleanup_task.is_running():
+            logger.info("Stopping cache maintenance task")
+            try:
+                self.cache_cleanup_task.cancel()
+                logger.info("Cache maintenance task cancelled")
+            except Exception as e:
+                logger.warning(f"Error stopping cache maintenance task: {e}")
+
+        if self.backup_task and self.backup_task.is_running():
+            logger.info("Stopping database backup task")
+            try:
+                self.backup_task.cancel()
+                logger.info("Database backup task cancelled")
+            except Exception as e:
+                logger.warning(f"Error stopping database backup task: {e}")
+
         # Close any pending HTTP connections in the IP service
         logger.info("Closing HTTP connections")
         if hasattr(self.ip_service, "close"):
             await self.ip_service.close()
 
+        # Let queued writes finish before the database is closed
+        logger.info("Closing storage")
+        try:
+            await self.async_storage.close()
+        except Exception as e:
+            logger.warning(f"Error closing storage: {e}")
+        if self.observation_log is not None:
+            try:
+                await self.observation_log.close()
+            except Exception as e:
+                logger.warning(f"Error closing observation log: {e}")
+
         # Close the client connection
         logger.info("Closing client connection")
 
@@ -220,30 +277,14 @@ class IPMonitorBot:
                 return
 
             # Initialize circuit breaker with last known IP if available
-            last_ip = self.storage.load_last_ip()
+            last_ip = await self.async_storage.load_last_ip()
             if last_ip:
                 self.ip_service.set_last_known_ip(last_ip)
                 logger.info(
                     f"Initialized circuit breaker with last known IP: {last_ip}"
                 )
 
-            # Initialize and start message queue
-            if self.config.message_queue_enabled:
-                # Configure message queue with settings from config
-                message_queue.max_queue_size = self.config.message_queue_max_size
-                message_queue.max_message_age_hours = (
-                    self.config.message_queue_max_age_hours
-                )
-                message_queue.batch_size = self.config.message_queue_batch_size
-                message_queue.process_interval = (
-                    self.config.message_queue_process_interval
-                )
-
-                message_queue.set_discord_client(self.client)
-                message_queue.start_processing()
-                logger.info("Message queue initialized and started")
-            else:
-                logger.info("Message queue disabled by configuration")
+            self._start_message_queue()
 
             if self.config.startup_message_enabled:
                 try:
@@ -276,6 +317,9 @@ class IPMonitorBot:
             # Start the scheduled task - this will handle the initial check
             self.check_ip_task = self._create_check_ip_task()
             self.check_ip_task.start()
+
+            self._start_cache_maintenance()
+            self._start_backup_schedule()
         except discord.DiscordException as e:
             logger.error(f"Discord error in on_ready handler: {e}")
             # Try to gracefully shut down if we can't initialize properly
@@ -285,6 +329,96 @@ class IPMonitorBot:
             # Try to gracefully shut down if we can't initialize properly
             await self.client.close()
 
+    def _start_message_queue(self) -> None:
+        """
+        Configure the message queue from config and start processing it.
+        """
+        if not self.config.message_queue_enabled:
+            logger.info("Message queue disabled by configuration")
+            return
+
+        # Configure message queue with settings from config
+        message_queue.max_queue_size = self.config.message_queue_max_size
+        message_queue.max_message_age_hours = self.config.message_queue_max_age_hours
+        message_queue.batch_size = self.config.message_queue_batch_size
+        message_queue.process_interval = self.config.message_queue_process_interval
+
+        message_queue.set_discord_client(self.client)
+        message_queue.start_processing()
+        logger.info("Message queue initialized and started")
+
+    def _start_cache_maintenance(self) -> None:
+        """
+        Start periodic cache maintenance unless it is already running.
+
+        on_ready fires again after a reconnect, so a running loop is kept.
+        """
+        if not self.config.cache_enabled:
+            return
+        if self.cache_cleanup_task is not None and self.cache_cleanup_task.is_running():
+            return
+
+        self.cache_cleanup_task = self._create_cache_cleanup_task()
+        self.cache_cleanup_task.start()
+        config_handler = self.admin_commands.get_handler_for_command("config")
+        if config_handler:
+            config_handler.cache_cleanup_task = self.cache_cleanup_task
+
+    def _start_backup_schedule(self) -> None:
+        """
+        Start scheduled database backups unless they are already running.
+
+        on_ready fires again after a reconnect, so a running loop is kept.
+        Only the SQLite backend has a database to back up.
+        """
+        if self.config.backup_interval_hours <= 0:
+            return
+        if self.config.storage_backend != "sqlite":
+            return
+        if self.backup_task is not None and self.backup_task.is_running():
+            return
+
+        self.backup_task = self._create_backup_task()
+        self.backup_task.start()
+
+    def _create_backup_task(self) -> tasks.Loop:
+        """
+        Create the scheduled database backup task.
+
+        Backups share the !backup command's DatabaseBackup, so a scheduled
+        and a requested backup never run at once.
+
+        Returns:
+            The discord.ext.tasks.Loop instance
+        """
+        interval = self.config.backup_interval_hours
+        logger.info(f"Creating database backup task with {interval}h interval")
+
+        @tasks.loop(hours=interval)
+        async def database_backup() -> None:
+            """
+            Periodic task to back up the database online.
+            """
+            try:
+                backup = self.admin_commands.get_handler_for_command("backup").backup
+                result = await backup.run()
+                if not result.verified:
+                    logger.error("Scheduled backup failed its integrity check")
+            except Exception as e:
+                logger.error(f"Error in database backup task: {e}", exc_info=True)
+
+        @database_backup.before_loop
+        async def before_database_backup() -> None:
+            """
+            Wait until the bot is ready before starting the loop.
+            """
+            try:
+                await self.client.wait_until_ready()
+            except Exception as e:
+                logger.error(f"Error in before_database_backup: {e}", exc_info=True)
+
+        return database_backup
+
     def _create_check_ip_task(self) -> tasks.Loop:
         """
         Create the scheduled IP check task.
@@ -317,7 +451,7 @@ class IPMonitorBot:
                     if current_ip:
                         # Save IP silently if storage is working
                         if not service_health.is_fallback_active("read_only_mode"):
-                            self.storage.save_current_ip(current_ip)
+                            await self.async_storage.save_current_ip(current_ip)
                     return
 
                 await self.ip_commands.check_ip_once(self.client, user_requested=False)
@@ -381,6 +515,53 @@ class IPMonitorBot:
 
         return check_ip_changes
 
+    def _create_cache_cleanup_task(self) -> tasks.Loop:
+        """
+        Create the scheduled cache maintenance task.
+
+        Each run sweeps expired entries within the cache's time budget,
+        snapshots the cache and rolls up its statistics. The interval can be
+        changed while the task runs through change_interval().
+
+        Returns:
+            The discord.ext.tasks.Loop instance
+        """
+        interval = self.config.cache_cleanup_interval
+        logger.info(f"Creating cache maintenance task with {interval}s interval")
+
+        @tasks.loop(seconds=interval)
+        async def cache_maintenance() -> None:
+            """
+            Periodic task to run incremental cache maintenance.
+            """
+            try:
+                # Run off the event loop; sweeps and saves take the cache lock
+                result = await asyncio.to_thread(get_cache().run_maintenance)
+                logger.debug(
+                    f"Cache maintenance: {result['entries_cleaned']} expired "
+                    f"entries removed in {result['duration'] * 1000:.1f}ms, "
+                    f"interval hit rate {result['interval_hit_rate']:.1%}"
+                )
+                if not result["sweep_complete"]:
+                    logger.info(
+                        "Cache maintenance hit its time budget; remaining expired "
+                        "entries will be swept on the next run"
+                    )
+            except Exception as e:
+                logger.error(f"Error in cache maintenance task: {e}", exc_info=True)
+
+        @cache_maintenance.before_loop
+        async def before_cache_maintenance() -> None:
+            """
+            Wait until the bot is ready before starting the loop.
+            """
+            try:
+                await self.client.wait_until_ready()
+            except Exception as e:
+                logger.error(f"Error in before_cache_maintenance: {e}", exc_info=True)
+
+        return cache_maintenance
+
     def _adjust_check_interval_for_degradation(self) -> None:
         """Adjust the IP check interval based on current service health."""
         if self.check_ip_task and self.check_ip_task.is_running():
@@ -435,6 +616,12 @@ class IPMonitorBot:
                 await self.admin_commands.handle_api_command(message)
             elif message.content.startswith("!cache"):
                 await self.admin_commands.handle_cache_command(message)
+            elif message.content.startswith("!export"):
+                await self.admin_commands.handle_export_command(message)
+            elif message.content.startswith("!import"):
+                await self.admin_commands.handle_import_command(message)
+            elif message.content.startswith("!backup"):
+                await self.admin_commands.handle_backup_command(message)
             elif message.content.startswith("!stop"):
                 await self.admin_commands.handle_stop_command(message)
 
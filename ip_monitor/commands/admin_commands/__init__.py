@@ -8,6 +8,7 @@ from .base_handler import BaseHandler
 from .bot_lifecycle_handler import BotLifecycleHandler
 from .cache_handler import CacheHandler
 from .config_handler import ConfigHandler
+from .data_handler import DataHandler
 from .queue_handler import QueueHandler
 
 __all__ = [
@@ -17,5 +18,6 @@ __all__ = [
     "BotLifecycleHandler",
     "CacheHandler",
     "ConfigHandler",
+    "DataHandler",
     "QueueHandler",
 ]
@@ -18,6 +18,7 @@ from .base_handler import BaseHandler
 from .bot_lifecycle_handler import BotLifecycleHandler
 from .cache_handler import CacheHandler
 from .config_handler import ConfigHandler
+from .data_handler import DataHandler
 from .queue_handler import QueueHandler
 
 logger = logging.getLogger(__name__)
@@ -63,6 +64,7 @@ class AdminCommandRouter:
             QueueHandler(client, ip_service, storage, stop_callback, config),
             ApiHandler(client, ip_service, storage, stop_callback, config),
             CacheHandler(client, ip_service, storage, stop_callback, config),
+            DataHandler(client, ip_service, storage, stop_callback, config),
         ]
 
         # Create command mapping for quick lookup
@@ -72,6 +74,9 @@ class AdminCommandRouter:
             "queue": self.handlers[2],  # QueueHandler
             "api": self.handlers[3],  # ApiHandler
             "cache": self.handlers[4],  # CacheHandler
+            "export": self.handlers[5],  # DataHandler
+            "import": self.handlers[5],  # DataHandler
+            "backup": self.handlers[5],  # DataHandler
         }
 
     def check_admin_permissions(self, message: discord.Message) -> bool:
@@ -208,6 +213,43 @@ class AdminCommandRouter:
         args = parts[1:] if len(parts) > 1 else ["cache"]
         return await self.command_map["cache"].handle_command(message, args)
 
+    async def handle_export_command(self, message: discord.Message) -> bool:
+        """
+        Handle the !export command specifically.
+
+        Args:
+            message: The Discord message containing the command
+
+        Returns:
+            bool: True if handled successfully
+        """
+        args = ["export", *message.content.split()[1:]]
+        return await self.command_map["export"].handle_command(message, args)
+
+    async def handle_import_command(self, message: discord.Message) -> bool:
+        """
+        Handle the !import command specifically.
+
+        Args:
+            message: The Discord message containing the command
+
+        Returns:
+            bool: True if handled successfully
+        """
+        return await self.command_map["import"].handle_command(message, ["import"])
+
+    async def handle_backup_command(self, message: discord.Message) -> bool:
+        """
+        Handle the !backup command specifically.
+
+        Args:
+            message: The Discord message containing the command
+
+        Returns:
+            bool: True if handled successfully
+        """
+        return await self.command_map["backup"].handle_command(message, ["backup"])
+
     async def _send_permission_denied(self, message: discord.Message) -> None:
         """
         Send a permission denied message to the user.
@@ -11,7 +11,7 @@ import discord
 
 from ip_monitor.config import AppConfig
 from ip_monitor.ip_service import IPService
-from ip_monitor.storage import IPStorage, SQLiteIPStorage
+from ip_monitor.storage import AsyncStorage, IPStorage, SQLiteIPStorage
 from ip_monitor.utils.discord_rate_limiter import DiscordRateLimiter
 
 logger = logging.getLogger(__name__)
@@ -50,6 +50,11 @@ class BaseHandler(ABC):
         self.config = config
         self.discord_rate_limiter = DiscordRateLimiter()
 
+    @property
+    def async_storage(self) -> AsyncStorage:
+        """Storage calls that run off the event loop."""
+        return AsyncStorage(self.storage)
+
     def check_admin_permissions(self, message: discord.Message) -> bool:
         """
         Check if the user has administrator permissions.
@@ -85,7 +85,7 @@ class BotLifecycleHandler(BaseHandler):
             # First save the current IP one last time
             current_ip = await self.ip_service.get_public_ip()
             if current_ip:
-                self.storage.save_current_ip(current_ip)
+                await self.async_storage.save_current_ip(current_ip)
                 logger.info(f"Final IP saved before shutdown: {current_ip}")
 
             # Send the goodbye message
@@ -290,21 +290,18 @@ class CacheHandler(BaseHandler):
 
                 cache = get_cache()
 
-                # Count entries by type
-                entry_types = {}
-                for entry in cache.memory_cache.values():
-                    cache_type = entry.cache_type.value
-                    entry_types[cache_type] = entry_types.get(cache_type, 0) + 1
-
+                # Entry counts by type come from the locked stats snapshot
+                memory_by_type = stats.get("memory_by_type") or {}
                 type_breakdown = (
                     "\n".join(
                         [
-                            f"  {cache_type}: {count}"
-                            for cache_type, count in entry_types.items()
+                            f"  {cache_type}: {info['entries']}"
+                            + self._format_type_memory(info)
+                            for cache_type, info in memory_by_type.items()
+                            if info["entries"]
                         ]
                     )
-                    if entry_types
-                    else "  No entries"
+                    or "  No entries"
                 )
 
                 max_memory_size = cache.max_memory_size
@@ -312,6 +309,30 @@ class CacheHandler(BaseHandler):
                 type_breakdown = "  Unable to retrieve entry types"
                 max_memory_size = "Unknown"
 
+            namespace_stats = stats.get("namespaces") or {}
+            namespace_breakdown = (
+                "\n".join(
+                    [
+                        f"  {namespace}: {info['entries']} entries, "
+                        f"{info['hit_rate'] * 100:.1f}% hit rate"
+                        for namespace, info in sorted(namespace_stats.items())
+                    ]
+                )
+                if namespace_stats
+                else "  No namespaces"
+            )
+
+            if "memory_bytes" in stats:
+                memory_usage = self._format_bytes(stats["memory_bytes"])
+            else:
+                memory_usage = f"{stats.get('memory_usage_mb', 0):.1f} MB"
+            max_memory_bytes = stats.get("max_memory_bytes")
+            memory_budget = (
+                self._format_bytes(max_memory_bytes)
+                if max_memory_bytes is not None
+                else "Unlimited"
+            )
+
             total_requests = stats["hits"] + stats["misses"]
             hit_rate = stats["hit_rate"] * 100 if "hit_rate" in stats else 0
             miss_rate = 100 - hit_rate if total_requests > 0 else 0
@@ -333,20 +354,27 @@ class CacheHandler(BaseHandler):
                 f"  TTL:              {cache_info['cache_ttl']} seconds\n"
                 f"  Stale Threshold:  {cache_info['stale_threshold']:.1f}\n"
                 f"  Max Memory Size:  {max_memory_size} entries\n"
+                f"  Memory Budget:    {memory_budget}\n"
                 f"\n"
                 f"Current State:\n"
                 f"  Memory Entries:   {stats['memory_entries']}\n"
-                f"  Memory Usage:     {stats.get('memory_usage_mb', 0):.1f} MB\n"
+                f"  Memory Usage:     {memory_usage}\n"
                 f"  Stale Entries:    {cache_info['stale_entries_count']}\n"
                 f"\n"
                 f"Entry Types:\n"
                 f"{type_breakdown}\n"
                 f"\n"
+                f"Namespaces:\n"
+                f"{namespace_breakdown}\n"
+                f"\n"
                 f"Performance Metrics:\n"
                 f"  Total Requests:   {total_requests}\n"
                 f"  Cache Hits:       {stats['hits']} ({hit_rate:.1f}%)\n"
                 f"  Cache Misses:     {stats['misses']} ({miss_rate:.1f}%)\n"
                 f"  Efficiency:       {efficiency}\n"
+                f"  Computations:     {stats.get('computations', 0)}\n"
+                f"  Coalesced Waits:  {stats.get('coalesced', 0)}\n"
+                f"  Failures Reused:  {stats.get('negative_hits', 0)}\n"
                 f"\n"
                 f"Maintenance Operations:\n"
                 f"  Evictions:        {stats['evictions']}\n"
@@ -470,6 +498,40 @@ class CacheHandler(BaseHandler):
             logger.error(f"Error handling cache refresh command: {e}")
             return False
 
+    @staticmethod
+    def _format_bytes(num_bytes: int) -> str:
+        """
+        Format a byte count for display.
+
+        Args:
+            num_bytes: Number of bytes
+
+        Returns:
+            str: Human-readable size
+        """
+        if num_bytes < 1024:
+            return f"{num_bytes} B"
+        if num_bytes < 1024 * 1024:
+            return f"{num_bytes / 1024:.1f} KB"
+        return f"{num_bytes / (1024 * 1024):.1f} MB"
+
+    def _format_type_memory(self, type_memory: dict | None) -> str:
+        """
+        Format the memory used by one cache type, with its budget if set.
+
+        Args:
+            type_memory: Entry from the cache's memory_by_type statistics
+
+        Returns:
+            str: Suffix for the entry type line, empty if unknown
+        """
+        if not type_memory:
+            return ""
+        usage = self._format_bytes(type_memory["bytes"])
+        if type_memory.get("budget") is not None:
+            usage += f" of {self._format_bytes(type_memory['budget'])}"
+        return f" ({usage})"
+
     def _get_cache_help_text(self) -> str:
         """
         Get help text for cache commands.
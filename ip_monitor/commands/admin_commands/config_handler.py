@@ -4,7 +4,7 @@ Configuration handler for admin commands.
 
 import logging
 from collections.abc import Callable, Coroutine
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 import discord
 
@@ -15,6 +15,9 @@ from ip_monitor.utils.message_queue import message_queue
 
 from .base_handler import BaseHandler
 
+if TYPE_CHECKING:
+    from discord.ext import tasks
+
 logger = logging.getLogger(__name__)
 
 
@@ -43,6 +46,9 @@ class ConfigHandler(BaseHandler):
         """
         super().__init__(client, ip_service, storage, stop_callback, config)
 
+        # Cache maintenance loop, set by the bot once it is running
+        self.cache_cleanup_task: tasks.Loop | None = None
+
     async def handle_command(self, message: discord.Message, args: list[str]) -> bool:
         """
         Handle configuration commands.
@@ -337,6 +343,12 @@ class ConfigHandler(BaseHandler):
         elif field == "message_queue_process_interval":
             message_queue.process_interval = value
 
+        # Apply cache settings
+        elif (
+            field == "cache_cleanup_interval" and self.cache_cleanup_task is not None
+        ):
+            self.cache_cleanup_task.change_interval(seconds=value)
+
         logger.info(f"Applied configuration change: {field} = {value}")
 
     def _format_all_configuration(self) -> str:
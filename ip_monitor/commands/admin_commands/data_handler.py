@@ -0,0 +1,307 @@
+"""
+Data export and import handler for admin commands.
+"""
+
+import asyncio
+from collections.abc import Callable, Coroutine, Iterator
+from datetime import datetime
+import logging
+import os
+import tempfile
+from typing import Any
+
+import discord
+
+from ip_monitor.backup import DatabaseBackup
+from ip_monitor.config import AppConfig
+from ip_monitor.data_export import (
+    EXPORT_FORMATS,
+    export_filename,
+    export_format_for,
+    read_import,
+    write_export,
+)
+from ip_monitor.ip_service import IPService
+from ip_monitor.storage import IPStorage, SQLiteIPStorage
+
+from .base_handler import BaseHandler
+
+logger = logging.getLogger(__name__)
+
+# Columns written for each exported dataset
+EXPORT_COLUMNS = {
+    "history": ("ip", "timestamp"),
+    "observations": ("ts_us", "check_us", "endpoint", "latency_us", "ok"),
+}
+
+
+class DataHandler(BaseHandler):
+    """
+    Handles exporting stored data to files, importing IP history and
+    backing up the database.
+
+    Exports are streamed to a compressed file on a worker thread and
+    uploaded as an attachment; imports are read from an attachment the same
+    way, so neither holds a whole dataset in memory.
+    """
+
+    def __init__(
+        self,
+        client: discord.Client,
+        ip_service: IPService,
+        storage: IPStorage | SQLiteIPStorage,
+        stop_callback: Callable[[], Coroutine[Any, Any, None]],
+        config: AppConfig,
+    ) -> None:
+        """
+        Initialize the data handler.
+
+        Args:
+            client: Discord client instance
+            ip_service: Service for IP address operations
+            storage: Storage for IP data
+            stop_callback: Callback to stop the bot
+            config: Application configuration
+        """
+        super().__init__(client, ip_service, storage, stop_callback, config)
+        self.backup = DatabaseBackup(
+            config.db_file, config.backup_dir, config.backup_keep
+        )
+
+    async def handle_command(self, message: discord.Message, args: list[str]) -> bool:
+        """
+        Handle data commands.
+
+        Args:
+            message: The Discord message containing the command
+            args: List of command arguments
+
+        Returns:
+            bool: True if command was handled successfully, False otherwise
+        """
+        if not args:
+            return False
+
+        command = args[0].lower()
+
+        if command == "export":
+            return await self._handle_export_command(message, args[1:])
+        if command == "import":
+            return await self._handle_import_command(message)
+        if command == "backup":
+            return await self._handle_backup_command(message)
+
+        return False
+
+    async def _handle_export_command(
+        self, message: discord.Message, args: list[str]
+    ) -> bool:
+        """
+        Handle the !export command.
+
+        Args:
+            message: The Discord message containing the command
+            args: Optional dataset and format (excluding 'export')
+
+        Returns:
+            bool: True if handled successfully
+        """
+        if not self.check_admin_permissions(message):
+            await self.send_permission_denied(message)
+            return False
+
+        self.log_command_usage(message, "export")
+
+        dataset = args[0].lower() if args else "history"
+        fmt = args[1].lower() if len(args) > 1 else "ndjson"
+        if dataset not in EXPORT_COLUMNS:
+            await self.send_error_message(
+                message,
+                f"Unknown dataset: {dataset}. Use one of: {', '.join(EXPORT_COLUMNS)}",
+            )
+            return False
+        if fmt not in EXPORT_FORMATS:
+            await self.send_error_message(
+                message,
+                f"Unknown format: {fmt}. Use one of: {', '.join(EXPORT_FORMATS)}",
+            )
+            return False
+
+        try:
+            rows = await self._export_rows(dataset)
+            if rows is None:
+                await self.send_error_message(
+                    message, "Observation logging is not enabled."
+                )
+                return False
+
+            filename = export_filename(
+                dataset, fmt, datetime.now().strftime("%Y%m%d_%H%M%S")
+            )
+            with tempfile.TemporaryDirectory() as directory:
+                path = os.path.join(directory, filename)
+                count = await asyncio.to_thread(
+                    write_export, rows, EXPORT_COLUMNS[dataset], fmt, path
+                )
+
+                limit = (
+                    message.guild.filesize_limit
+                    if message.guild is not None
+                    else discord.utils.DEFAULT_FILE_SIZE_LIMIT_BYTES
+                )
+                size = os.path.getsize(path)
+                if size > limit:
+                    await self.send_error_message(
+                        message,
+                        f"The export is {size:,} bytes, over this server's "
+                        f"upload limit of {limit:,} bytes.",
+                    )
+                    return False
+
+                # A file can only be read once, so each attempt opens it again
+                async def send_func() -> discord.Message:
+                    return await message.channel.send(
+                        f"📦 Exported {count:,} {dataset} rows",
+                        file=discord.File(path, filename=filename),
+                    )
+
+                await self.discord_rate_limiter.execute_with_backoff(
+                    send_func,
+                    endpoint=f"channels/{message.channel.id}/messages",
+                    method="POST",
+                )
+            return True
+        except Exception as e:
+            await self.handle_command_error(message, e, "export")
+            return False
+
+    async def _export_rows(self, dataset: str) -> Iterator[dict[str, Any]] | None:
+        """
+        Get the rows of a dataset, streamed where the storage supports it.
+
+        Returns:
+            Rows to export, or None if the dataset is not being recorded
+        """
+        if dataset == "observations":
+            observation_log = self.ip_service.observation_log
+            if observation_log is None:
+                return None
+            # Include the rows still buffered for the writer
+            await asyncio.wrap_future(observation_log.flush())
+            return observation_log.iter_observations()
+
+        iter_archive = getattr(self.storage, "iter_archive", None)
+        if iter_archive is not None:
+            return iter_archive()
+        # JSON storage only keeps the bounded history
+        return iter(await self.async_storage.load_ip_history())
+
+    async def _handle_import_command(self, message: discord.Message) -> bool:
+        """
+        Handle the !import command, adding an attached export to the archive.
+
+        Args:
+            message: The Discord message containing the command
+
+        Returns:
+            bool: True if handled successfully
+        """
+        if not self.check_admin_permissions(message):
+            await self.send_permission_denied(message)
+            return False
+
+        self.log_command_usage(message, "import")
+
+        if not hasattr(self.storage, "import_archive"):
+            await self.send_error_message(
+                message, "Importing history requires SQLite storage."
+            )
+            return False
+        if not message.attachments:
+            await self.send_error_message(
+                message, "Attach an NDJSON or CSV history export to import."
+            )
+            return False
+
+        attachment = message.attachments[0]
+        fmt = export_format_for(attachment.filename)
+        if fmt is None:
+            await self.send_error_message(
+                message,
+                f"Unsupported file: {attachment.filename}. Use .ndjson, .jsonl "
+                "or .csv, optionally gzipped.",
+            )
+            return False
+
+        try:
+            with tempfile.TemporaryDirectory() as directory:
+                path = os.path.join(directory, "import")
+                await attachment.save(path)
+                added = await self.async_storage.import_archive(read_import(path, fmt))
+            if added < 0:
+                await self.send_error_message(
+                    message, "Failed to import history. Check the logs for details."
+                )
+                return False
+            await self.send_success_message(
+                message, f"Imported {added:,} new IP changes into the archive."
+            )
+            return True
+        except Exception as e:
+            await self.handle_command_error(message, e, "import")
+            return False
+
+    async def _handle_backup_command(self, message: discord.Message) -> bool:
+        """
+        Handle the !backup command, backing up the database now.
+
+        Args:
+            message: The Discord message containing the command
+
+        Returns:
+            bool: True if handled successfully
+        """
+        if not self.check_admin_permissions(message):
+            await self.send_permission_denied(message)
+            return False
+
+        self.log_command_usage(message, "backup")
+
+        if self.config.storage_backend != "sqlite":
+            await self.send_error_message(
+                message, "Backing up requires SQLite storage."
+            )
+            return False
+
+        try:
+            result = await self.backup.run()
+        except Exception as e:
+            await self.handle_command_error(message, e, "backup")
+            return False
+
+        if not result.verified:
+            await self.send_error_message(
+                message, "The backup failed its integrity check and was discarded."
+            )
+            return False
+        await self.send_success_message(
+            message,
+            f"Backed up {result.pages:,} pages ({result.bytes / 1_048_576:.1f} MiB) "
+            f"in {result.seconds:.2f}s at "
+            f"{result.bytes_per_second / 1_048_576:.1f} MiB/s to "
+            f"{self.format_inline_code(os.path.basename(result.path))}. "
+            f"Backups kept: {len(self.backup.list_backups())}.",
+        )
+        return True
+
+    def get_help_text(self) -> str:
+        """
+        Get help text for data commands.
+
+        Returns:
+            str: Help text describing available commands
+        """
+        return """**Data Commands:**
+• `!export [history|observations] [ndjson|csv]` - Export data as a gzipped file
+• `!import` - Import an attached history export into the archive
+• `!backup` - Back up the database now and report throughput"""
@@ -5,11 +5,12 @@ IP-related commands for the IP Monitor Bot.
 import asyncio
 import logging
 from datetime import datetime
+from typing import Any
 
 import discord
 
 from ip_monitor.ip_service import IPService
-from ip_monitor.storage import IPStorage, SQLiteIPStorage
+from ip_monitor.storage import AsyncStorage, IPStorage, SQLiteIPStorage
 from ip_monitor.utils.async_rate_limiter import AsyncRateLimiter
 from ip_monitor.utils.discord_rate_limiter import DiscordRateLimiter
 from ip_monitor.utils.message_queue import MessagePriority, message_queue
@@ -23,6 +24,9 @@ class IPCommands:
     Handles IP-related bot commands.
     """
 
+    # History entries per message, few enough to fit Discord's length limit
+    HISTORY_PAGE_SIZE = 10
+
     def __init__(
         self,
         channel_id: int,
@@ -46,6 +50,11 @@ class IPCommands:
         self.ip_check_lock = asyncio.Lock()
         self.discord_rate_limiter = DiscordRateLimiter()
 
+    @property
+    def async_storage(self) -> AsyncStorage:
+        """Storage calls that run off the event loop."""
+        return AsyncStorage(self.storage)
+
     async def send_message_with_retry(
         self,
         channel: discord.TextChannel,
@@ -178,11 +187,11 @@ class IPCommands:
                 return False
 
             # Get the last known IP
-            last_ip = self.storage.load_last_ip()
+            last_ip = await self.async_storage.load_last_ip()
 
             # Save the current IP (skip if in read-only mode)
             if not service_health.is_fallback_active("read_only_mode"):
-                if not self.storage.save_current_ip(current_ip):
+                if not await self.async_storage.save_current_ip(current_ip):
                     logger.error("Failed to save current IP address")
                     await self.send_message_with_retry(
                         channel,
@@ -292,7 +301,7 @@ class IPCommands:
             status_text += "⚪ Cache: Disabled\n"
 
         # Add current IP info
-        current_ip = self.storage.load_last_ip()
+        current_ip = await self.async_storage.load_last_ip()
         if current_ip:
             status_text += f"🌐 Current IP: `{current_ip}`\n"
 
@@ -379,16 +388,39 @@ class IPCommands:
         Handle the !history command to show IP history.
         """
         logger.info(f"IP history requested by {message.author}")
-        history = self.storage.load_ip_history()
+        entries, next_cursor = await self.async_storage.load_history_page(
+            self.HISTORY_PAGE_SIZE
+        )
 
-        if not history:
+        if not entries:
             await self.send_message_with_retry(
                 message.channel, "No IP history available."
             )
             return True
 
+        history_text = self.format_history_page(entries)
+        if next_cursor is not None:
+            history_text += "Use `/history` to page through older entries."
+
+        await self.send_message_with_retry(message.channel, history_text)
+        return True
+
+    @staticmethod
+    def format_history_page(
+        entries: list[dict[str, Any]], first_number: int = 1
+    ) -> str:
+        """
+        Format a page of IP history for a Discord message.
+
+        Args:
+            entries: History entries, newest first
+            first_number: Number shown next to the first entry
+
+        Returns:
+            str: The formatted page
+        """
         history_text = "📜 **IP Address History**\n"
-        for idx, entry in enumerate(reversed(history), 1):
+        for idx, entry in enumerate(entries, first_number):
             ip = entry.get("ip", "Unknown")
             timestamp_str = entry.get("timestamp", "Unknown time")
             try:
@@ -399,14 +431,7 @@ class IPCommands:
                 pass
 
             history_text += f"{idx}. IP: `{ip}` - {timestamp_str}\n"
-
-            # Discord message limit is 2000 chars, be safe and break if needed
-            if len(history_text) > 1800 and idx < len(history):
-                history_text += f"... and {len(history) - idx} more entries"
-                break
-
-        await self.send_message_with_retry(message.channel, history_text)
-        return True
+        return history_text
 
     async def handle_ip_command(
         self, message: discord.Message, client: discord.Client
@@ -6,7 +6,7 @@ import contextlib
 import json
 import logging
 import os
-from dataclasses import asdict, dataclass
+from dataclasses import asdict, dataclass, field
 from typing import Any, ClassVar
 
 from dotenv import load_dotenv
@@ -72,6 +72,24 @@ class AppConfig:
     cache_stale_threshold: float  # 0.0-1.0, when to consider entries stale
     cache_file: str  # cache persistence file
     cache_cleanup_interval: int  # seconds between cleanup runs
+    cache_max_memory_bytes: int = 0  # total byte budget for entries, 0 for none
+    # byte budgets per cache type, e.g. {"api_response": 262144}
+    cache_type_memory_budgets: dict[str, int] = field(default_factory=dict)
+
+    # Storage backend settings
+    storage_backend: str = "sqlite"  # registered backend: sqlite, jsonl or memory
+    jsonl_history_file: str = "ip_history.jsonl"  # history file of the jsonl backend
+    jsonl_compact_bytes: int = 262144  # jsonl file size that triggers compaction
+
+    # Storage archive settings
+    archive_retention_months: int = 0  # months of archived history, 0 for all
+    observation_log_enabled: bool = True  # log every check and API attempt
+    observation_raw_retention_hours: int = 168  # raw rows kept before rollup
+
+    # Database backup settings
+    backup_dir: str = "backups"  # directory online backups are written to
+    backup_interval_hours: float = 24.0  # hours between backups, 0 to disable
+    backup_keep: int = 7  # backups kept after rotation, 0 to keep all
 
     # Class constants
     DEFAULT_MAX_RETRIES: ClassVar[int] = 3
@@ -252,6 +270,22 @@ class AppConfig:
                     str(cls.DEFAULT_CACHE_CLEANUP_INTERVAL),
                 )
             ),
+            cache_max_memory_bytes=int(os.getenv("CACHE_MAX_MEMORY_BYTES", "0")),
+            cache_type_memory_budgets=cls.parse_memory_budgets(
+                os.getenv("CACHE_TYPE_MEMORY_BUDGETS", "")
+            ),
+            storage_backend=os.getenv("STORAGE_BACKEND", "sqlite").lower(),
+            jsonl_history_file=os.getenv("JSONL_HISTORY_FILE", "ip_history.jsonl"),
+            jsonl_compact_bytes=int(os.getenv("JSONL_COMPACT_BYTES", "262144")),
+            archive_retention_months=int(os.getenv("ARCHIVE_RETENTION_MONTHS", "0")),
+            observation_log_enabled=os.getenv("OBSERVATION_LOG_ENABLED", "true").lower()
+            == "true",
+            observation_raw_retention_hours=int(
+                os.getenv("OBSERVATION_RAW_RETENTION_HOURS", "168")
+            ),
+            backup_dir=os.getenv("BACKUP_DIR", "backups"),
+            backup_interval_hours=float(os.getenv("BACKUP_INTERVAL_HOURS", "24")),
+            backup_keep=int(os.getenv("BACKUP_KEEP", "7")),
         )
 
         # Validate file paths
@@ -262,6 +296,31 @@ class AppConfig:
 
         return config
 
+    @staticmethod
+    def parse_memory_budgets(value: str) -> dict[str, int]:
+        """
+        Parse per cache type byte budgets.
+
+        Args:
+            value: Comma-separated "cache_type=bytes" pairs, e.g.
+                "api_response=262144,performance_data=65536"
+
+        Returns:
+            Dict mapping cache type values to byte budgets
+
+        Raises:
+            ValueError: If a pair is malformed
+        """
+        budgets = {}
+        for pair in value.split(","):
+            if not pair.strip():
+                continue
+            cache_type, separator, budget = pair.partition("=")
+            if not separator:
+                raise ValueError(f"Invalid cache memory budget: '{pair.strip()}'")
+            budgets[cache_type.strip().lower()] = int(budget)
+        return budgets
+
     def get_runtime_configurable_fields(self) -> dict[str, dict[str, Any]]:
         """
         Get fields that can be modified at runtime.
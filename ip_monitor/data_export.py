@@ -0,0 +1,125 @@
+"""
+Streaming export and import of stored data as NDJSON or CSV.
+"""
+
+from collections.abc import Iterable, Iterator, Sequence
+import csv
+import gzip
+import json
+from typing import IO, Any
+
+# Supported formats, by the file extension they are written with
+EXPORT_FORMATS = {"ndjson": ".ndjson", "csv": ".csv"}
+
+GZIP_MAGIC = b"\x1f\x8b"
+
+
+def export_format_for(filename: str) -> str | None:
+    """
+    Get the format of a file from its name.
+
+    Args:
+        filename: Name of the file, optionally ending in ".gz"
+
+    Returns:
+        "ndjson" or "csv", or None if the extension is not supported
+    """
+    name = filename.lower().removesuffix(".gz")
+    if name.endswith((".ndjson", ".jsonl")):
+        return "ndjson"
+    if name.endswith(".csv"):
+        return "csv"
+    return None
+
+
+def write_export(
+    rows: Iterable[dict[str, Any]], columns: Sequence[str], fmt: str, path: str
+) -> int:
+    """
+    Write rows to a gzip compressed NDJSON or CSV file.
+
+    Rows are encoded and compressed one at a time as they are consumed, so
+    memory use does not grow with the number of rows.
+
+    Args:
+        rows: Rows to write, as dictionaries keyed by column
+        columns: Columns to write, in order
+        fmt: "ndjson" or "csv"
+        path: File to write
+
+    Returns:
+        Number of rows written
+
+    Raises:
+        ValueError: If the format is not supported
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported export format: {fmt}")
+
+    count = 0
+    with gzip.open(path, "wt", encoding="utf-8", newline="") as f:
+        if fmt == "csv":
+            writer = csv.DictWriter(f, fieldnames=columns, extrasaction="ignore")
+            writer.writeheader()
+            for row in rows:
+                writer.writerow(row)
+                count += 1
+        else:
+            for row in rows:
+                f.write(json.dumps({column: row[column] for column in columns}))
+                f.write("\n")
+                count += 1
+    return count
+
+
+def read_import(path: str, fmt: str) -> Iterator[dict[str, Any]]:
+    """
+    Read rows from an NDJSON or CSV file, gzip compressed or not.
+
+    Rows are parsed one at a time as they are consumed. Blank lines are
+    skipped.
+
+    Args:
+        path: File to read
+        fmt: "ndjson" or "csv"
+
+    Yields:
+        Rows as dictionaries keyed by column
+
+    Raises:
+        ValueError: If the format is not supported or a line is not valid JSON
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported import format: {fmt}")
+
+    with _open_text(path) as f:
+        if fmt == "csv":
+            yield from csv.DictReader(f)
+        else:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+
+def _open_text(path: str) -> IO[str]:
+    """Open a text file for reading, decompressing it if it is gzipped."""
+    with open(path, "rb") as f:
+        compressed = f.read(len(GZIP_MAGIC)) == GZIP_MAGIC
+    if compressed:
+        return gzip.open(path, "rt", encoding="utf-8", newline="")
+    return open(path, encoding="utf-8", newline="")
+
+
+def export_filename(dataset: str, fmt: str, stamp: str) -> str:
+    """
+    Name an export file.
+
+    Args:
+        dataset: Name of the exported data
+        fmt: "ndjson" or "csv"
+        stamp: Text identifying the export, such as its date
+
+    Returns:
+        File name with the format's extension and ".gz"
+    """
+    return f"ip_{dataset}_{stamp}{EXPORT_FORMATS[fmt]}.gz"
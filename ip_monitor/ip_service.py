@@ -3,6 +3,7 @@ IP address operations for the IP Monitor Bot.
 """
 
 import asyncio
+from collections.abc import Awaitable
 import ipaddress
 import json
 import logging
@@ -11,6 +12,7 @@ import time
 import httpx
 
 from ip_monitor.ip_api_config import ResponseFormat, ip_api_manager
+from ip_monitor.observation_log import ObservationLog
 from ip_monitor.utils.cache import CacheType, get_cache
 from ip_monitor.utils.circuit_breaker import IPServiceCircuitBreaker
 from ip_monitor.utils.service_health import service_health
@@ -32,6 +34,9 @@ class IPService:
         "https://checkip.amazonaws.com/",
     ]
 
+    # Seconds shutdown waits for the final cache snapshot to reach disk
+    CACHE_FLUSH_TIMEOUT = 5.0
+
     def __init__(
         self,
         max_retries: int = 3,
@@ -49,6 +54,7 @@ class IPService:
         cache_enabled: bool = True,
         cache_ttl: int = 300,
         cache_stale_threshold: float = 0.8,
+        observation_log: ObservationLog | None = None,
     ) -> None:
         """
         Initialize the IP service.
@@ -69,6 +75,7 @@ class IPService:
             cache_enabled: Whether to enable intelligent caching
             cache_ttl: Default cache TTL in seconds
             cache_stale_threshold: Threshold for considering cache entries stale (0.0-1.0)
+            observation_log: Log to record every check and API attempt in (optional)
         """
         self.max_retries = max_retries
         self.retry_delay = retry_delay
@@ -99,6 +106,8 @@ class IPService:
         # Track last successful IP for fallback
         self._last_known_ip: str | None = None
 
+        self.observation_log = observation_log
+
         # For backward compatibility with tests
         self._apis: list[str] | None = None
 
@@ -110,6 +119,7 @@ class IPService:
 
         # Configure cache TTL for different types
         if self.cache:
+            self.cache.set_stale_threshold(cache_stale_threshold)
             self.cache.set_ttl(CacheType.IP_RESULT, cache_ttl)
             self.cache.set_ttl(
                 CacheType.API_RESPONSE, cache_ttl // 2
@@ -333,7 +343,34 @@ class IPService:
 
     async def _get_ip_without_circuit_breaker(self) -> str | None:
         """
-        Get IP address without circuit breaker (original implementation).
+        Get IP address without circuit breaker.
+
+        With caching enabled, concurrent lookups share one round of API
+        requests and the result is cached as the current IP. Failed lookups
+        are not cached, so the next check queries the APIs again; backing
+        off from failing APIs is left to the circuit breaker.
+
+        Returns:
+            IP address string or None if unsuccessful
+        """
+        if not self.cache_enabled or self.cache is None:
+            return await self._lookup_public_ip()
+
+        return await self.cache.get_or_compute(
+            "global",
+            "current_ip",
+            self._lookup_public_ip,
+            CacheType.IP_RESULT,
+            ttl=self.cache_ttl,
+            metadata={
+                "source": "concurrent" if self.use_concurrent_checks else "sequential"
+            },
+            refresh=True,
+        )
+
+    async def _lookup_public_ip(self) -> str | None:
+        """
+        Query the IP APIs for the current IP address.
 
         Returns:
             IP address string or None if unsuccessful
@@ -357,13 +394,16 @@ class IPService:
                     if api_configs:
                         # Use custom API configurations
                         tasks = [
-                            self.fetch_ip_from_custom_api(api_config)
+                            self._observe_attempt(
+                                self.fetch_ip_from_custom_api(api_config),
+                                api_config.name,
+                            )
                             for api_config in api_configs
                         ]
                     else:
                         # Use legacy API URLs
                         tasks = [
-                            self.fetch_ip_from_api(api)
+                            self._observe_attempt(self.fetch_ip_from_api(api), api)
                             for api in self.get_apis_to_use()
                         ]
 
@@ -377,20 +417,6 @@ class IPService:
                             if api_configs:
                                 ip_api_manager.save_apis()
 
-                            # Cache the global IP result
-                            if self.cache_enabled and self.cache:
-                                self.cache.set(
-                                    "global",
-                                    "current_ip",
-                                    result,
-                                    CacheType.IP_RESULT,
-                                    ttl=self.cache_ttl,
-                                    metadata={
-                                        "source": "concurrent",
-                                        "timestamp": time.time(),
-                                    },
-                                )
-
                             return result
 
                     # If we get here, all concurrent checks failed
@@ -405,7 +431,9 @@ class IPService:
                 if api_configs:
                     # Use custom API configurations
                     for api_config in api_configs:
-                        ip = await self.fetch_ip_from_custom_api(api_config)
+                        ip = await self._observe_attempt(
+                            self.fetch_ip_from_custom_api(api_config), api_config.name
+                        )
                         if ip:
                             # Save API configuration changes
                             ip_api_manager.save_apis()
@@ -413,7 +441,9 @@ class IPService:
                 else:
                     # Use legacy API URLs
                     for api in self.get_apis_to_use():
-                        ip = await self.fetch_ip_from_api(api)
+                        ip = await self._observe_attempt(
+                            self.fetch_ip_from_api(api), api
+                        )
                         if ip:
                             return ip
 
@@ -430,7 +460,48 @@ class IPService:
             logger.error(f"Unexpected error in IP fetch: {e}")
             return None
 
+    async def _observe_attempt(
+        self, fetch: Awaitable[str | None], endpoint: str
+    ) -> str | None:
+        """
+        Await one API attempt, recording it in the observation log.
+
+        Args:
+            fetch: The attempt to await
+            endpoint: Name or URL of the API it queries
+
+        Returns:
+            IP address string or None if unsuccessful
+        """
+        if self.observation_log is None:
+            return await fetch
+
+        start = time.perf_counter_ns()
+        ip = None
+        try:
+            ip = await fetch
+        finally:
+            self.observation_log.record_attempt(
+                endpoint, (time.perf_counter_ns() - start) // 1000, ip is not None
+            )
+        return ip
+
     async def get_public_ip(self) -> str | None:
+        """
+        Get the current public IP address, recording the check if observed.
+
+        Returns:
+            IP address string or None if unsuccessful
+        """
+        if self.observation_log is None:
+            return await self._get_public_ip()
+
+        with self.observation_log.check() as check:
+            result = await self._get_public_ip()
+            check.ok = result is not None
+        return result
+
+    async def _get_public_ip(self) -> str | None:
         """
         Get the current public IP address with circuit breaker protection.
 
@@ -617,10 +688,11 @@ class IPService:
                 self.client = None
                 self._client_initialized = False
 
-        # Save cache to disk
+        # Save cache to disk; the write itself runs off the event loop
         if self.cache_enabled and self.cache:
             try:
-                self.cache.save()
+                await asyncio.to_thread(self.cache.save)
+                await asyncio.to_thread(self.cache.flush, self.CACHE_FLUSH_TIMEOUT)
                 logger.debug("Cache saved during IP service shutdown")
             except Exception as e:
                 logger.warning(f"Failed to save cache during shutdown: {e}")
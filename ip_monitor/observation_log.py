@@ -0,0 +1,365 @@
+"""
+Time series log of IP checks and the API attempts within them.
+"""
+
+from collections.abc import Iterator
+from concurrent.futures import Future
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+import logging
+import os
+import sqlite3
+from threading import Lock
+import time
+from typing import Any
+
+from ip_monitor.storage import StorageWorker, storage_writer
+
+logger = logging.getLogger(__name__)
+
+HOUR_US = 3_600_000_000
+
+# Endpoint id recorded for a whole check rather than one API attempt
+CHECK_ENDPOINT_ID = 0
+
+# Start of the check that API attempts in this context belong to, in µs
+_current_check: ContextVar[int | None] = ContextVar("current_check", default=None)
+
+
+@dataclass
+class CheckObservation:
+    """Outcome of a check, filled in while it runs."""
+
+    ok: bool = False
+
+
+class ObservationLog:
+    """
+    Append-only log of every IP check and every API attempt within it.
+
+    Rows hold integer wall-clock timestamps, endpoint ids and latencies in
+    microseconds. Recording only appends a row to an in-memory buffer, so it
+    adds no I/O to the check path. The buffer is handed to the storage writer
+    thread when a check ends or the buffer is full, and its rows are written
+    in one transaction: a check and its attempts share one commit. Raw rows
+    older than the retention period are rolled up into per-hour aggregates
+    per endpoint, which are kept indefinitely.
+    """
+
+    # Rows buffered before they are written even though no check has ended
+    BATCH_SIZE = 64
+
+    def __init__(
+        self,
+        db_file: str,
+        raw_retention_hours: int = 168,
+        writer: StorageWorker = storage_writer,
+    ) -> None:
+        """
+        Initialize the observation log.
+
+        The database is opened on the first write, on the writer thread.
+
+        Args:
+            db_file: Path to the SQLite database file
+            raw_retention_hours: Hours raw rows are kept before they are
+                rolled up into hourly aggregates
+            writer: Worker that writes the buffered rows
+        """
+        self.db_file = db_file
+        self.raw_retention_hours = raw_retention_hours
+        self.writer = writer
+        self._buffer: list[tuple[int, int, str | None, int, bool]] = []
+        self._buffer_lock = Lock()
+        self._conn: sqlite3.Connection | None = None
+        self._conn_lock = Lock()
+        self._endpoint_ids: dict[str, int] = {}
+        self._downsampled_hour = 0
+
+    @staticmethod
+    def now_us() -> int:
+        """Get the wall-clock time in microseconds since the epoch."""
+        return time.time_ns() // 1000
+
+    @contextmanager
+    def check(self) -> Iterator[CheckObservation]:
+        """
+        Record a check, timing the block it wraps.
+
+        API attempts recorded inside the block, including in tasks it starts,
+        are linked to the check. Set ok on the yielded observation when the
+        check succeeds.
+        """
+        check_us = self.now_us()
+        start = time.perf_counter_ns()
+        token = _current_check.set(check_us)
+        observation = CheckObservation()
+        try:
+            yield observation
+        finally:
+            _current_check.reset(token)
+            latency_us = (time.perf_counter_ns() - start) // 1000
+            with self._buffer_lock:
+                self._buffer.append(
+                    (check_us, check_us, None, latency_us, observation.ok)
+                )
+            self.flush()
+
+    def record_attempt(self, endpoint: str, latency_us: int, ok: bool) -> None:
+        """
+        Record one API attempt that has just finished.
+
+        Args:
+            endpoint: Name or URL of the API
+            latency_us: How long the attempt took, in microseconds
+            ok: Whether the API returned a valid IP
+        """
+        ts_us = self.now_us()
+        check_us = _current_check.get() or ts_us
+        with self._buffer_lock:
+            self._buffer.append((ts_us, check_us, endpoint, latency_us, ok))
+            full = len(self._buffer) >= self.BATCH_SIZE
+        if full:
+            self.flush()
+
+    def flush(self) -> Future:
+        """
+        Hand the buffered rows to the writer thread.
+
+        Returns:
+            Future that completes once the rows are committed
+        """
+        with self._buffer_lock:
+            rows, self._buffer = self._buffer, []
+        return self.writer.submit(self._write, rows)
+
+    async def close(self) -> None:
+        """Write the buffered rows and close the database."""
+        with self._buffer_lock:
+            rows, self._buffer = self._buffer, []
+        await self.writer.run(self._write_and_close, rows)
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        """
+        Get the database connection, creating the tables on first use.
+
+        Raises:
+            sqlite3.Error: If the database cannot be opened
+        """
+        if self._conn is None:
+            conn = sqlite3.connect(self.db_file, check_same_thread=False)
+            try:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute("PRAGMA synchronous=NORMAL")
+                with conn:
+                    self._create_tables(conn)
+            except sqlite3.Error:
+                conn.close()
+                raise
+            self._conn = conn
+        return self._conn
+
+    @staticmethod
+    def _create_tables(conn: sqlite3.Connection) -> None:
+        """Create the observation tables."""
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS observation_endpoints (
+                id INTEGER PRIMARY KEY,
+                name TEXT NOT NULL UNIQUE
+            )
+        """)
+        # Endpoint id 0 is the check as a whole
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS observations (
+                ts_us INTEGER NOT NULL,
+                check_us INTEGER NOT NULL,
+                endpoint_id INTEGER NOT NULL,
+                latency_us INTEGER NOT NULL,
+                ok INTEGER NOT NULL
+            )
+        """)
+        conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_observations_ts
+            ON observations(ts_us)
+        """)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS observation_hourly (
+                hour INTEGER NOT NULL,
+                endpoint_id INTEGER NOT NULL,
+                attempts INTEGER NOT NULL,
+                failures INTEGER NOT NULL,
+                latency_us_total INTEGER NOT NULL,
+                latency_us_max INTEGER NOT NULL,
+                PRIMARY KEY (hour, endpoint_id)
+            ) WITHOUT ROWID
+        """)
+
+    def _write(self, rows: list[tuple[int, int, str | None, int, bool]]) -> None:
+        """Insert rows in one transaction and roll up expired raw rows."""
+        try:
+            with self._conn_lock, self.conn as conn:
+                conn.executemany(
+                    """
+                    INSERT INTO observations
+                    (ts_us, check_us, endpoint_id, latency_us, ok)
+                    VALUES (?, ?, ?, ?, ?)
+                """,
+                    [
+                        (
+                            ts_us,
+                            check_us,
+                            self._endpoint_id(conn, endpoint),
+                            latency,
+                            ok,
+                        )
+                        for ts_us, check_us, endpoint, latency, ok in rows
+                    ],
+                )
+                hour = self.now_us() // HOUR_US
+                if hour > self._downsampled_hour:
+                    self._downsample(conn, hour - self.raw_retention_hours)
+                    self._downsampled_hour = hour
+        except sqlite3.Error as e:
+            # Endpoint ids added by the rolled back transaction are gone
+            self._endpoint_ids.clear()
+            logger.error(f"Error writing {len(rows)} observations: {e}")
+
+    def _write_and_close(
+        self, rows: list[tuple[int, int, str | None, int, bool]]
+    ) -> None:
+        """Write the last rows and close the connection."""
+        if rows:
+            self._write(rows)
+        with self._conn_lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def _endpoint_id(self, conn: sqlite3.Connection, endpoint: str | None) -> int:
+        """Get the id of an endpoint name, adding it on first use."""
+        if endpoint is None:
+            return CHECK_ENDPOINT_ID
+        endpoint_id = self._endpoint_ids.get(endpoint)
+        if endpoint_id is None:
+            conn.execute(
+                "INSERT OR IGNORE INTO observation_endpoints (name) VALUES (?)",
+                (endpoint,),
+            )
+            (endpoint_id,) = conn.execute(
+                "SELECT id FROM observation_endpoints WHERE name = ?", (endpoint,)
+            ).fetchone()
+            self._endpoint_ids[endpoint] = endpoint_id
+        return endpoint_id
+
+    @staticmethod
+    def _downsample(conn: sqlite3.Connection, before_hour: int) -> None:
+        """Roll raw rows from before an hour into hourly aggregates."""
+        cutoff_us = before_hour * HOUR_US
+        conn.execute(
+            """
+            INSERT INTO observation_hourly
+            (hour, endpoint_id, attempts, failures, latency_us_total, latency_us_max)
+            SELECT ts_us / ?, endpoint_id, COUNT(*), SUM(ok = 0),
+                SUM(latency_us), MAX(latency_us)
+            FROM observations WHERE ts_us < ?
+            GROUP BY ts_us / ?, endpoint_id
+            ON CONFLICT (hour, endpoint_id) DO UPDATE SET
+                attempts = attempts + excluded.attempts,
+                failures = failures + excluded.failures,
+                latency_us_total = latency_us_total + excluded.latency_us_total,
+                latency_us_max = MAX(latency_us_max, excluded.latency_us_max)
+        """,
+            (HOUR_US, cutoff_us, HOUR_US),
+        )
+        conn.execute("DELETE FROM observations WHERE ts_us < ?", (cutoff_us,))
+
+    def iter_observations(self) -> Iterator[dict[str, Any]]:
+        """
+        Stream the raw rows that have not been rolled up, oldest first.
+
+        Rows are read one at a time from a connection of their own, so memory
+        use does not grow with the number of rows and writes are not held up.
+
+        Yields:
+            One dictionary per check or API attempt, with its endpoint,
+            "check" for whole checks
+
+        Raises:
+            sqlite3.Error: If the log cannot be read
+        """
+        if not os.path.exists(self.db_file):
+            return
+        conn = sqlite3.connect(self.db_file)
+        try:
+            conn.execute("PRAGMA query_only=ON")
+            cursor = conn.execute("""
+                SELECT ts_us, check_us, coalesce(e.name, 'check'), latency_us, ok
+                FROM observations
+                LEFT JOIN observation_endpoints e ON e.id = endpoint_id
+                ORDER BY ts_us
+            """)
+            for ts_us, check_us, endpoint, latency_us, ok in cursor:
+                yield {
+                    "ts_us": ts_us,
+                    "check_us": check_us,
+                    "endpoint": endpoint,
+                    "latency_us": latency_us,
+                    "ok": bool(ok),
+                }
+        finally:
+            conn.close()
+
+    def load_summary(self, start_us: int, end_us: int) -> list[dict[str, Any]]:
+        """
+        Summarize checks and API attempts per endpoint over a time range.
+
+        Periods that have been rolled up are counted by whole hours.
+
+        Args:
+            start_us: Start of the range in microseconds since the epoch
+            end_us: End of the range, exclusive
+
+        Returns:
+            One dictionary per endpoint, "check" for whole checks, with its
+            attempts, failures, and mean and max latency in microseconds
+        """
+        try:
+            with self._conn_lock:
+                rows = self.conn.execute(
+                    """
+                    SELECT coalesce(e.name, 'check'), SUM(attempts),
+                        SUM(failures), SUM(latency_us_total), MAX(latency_us_max)
+                    FROM (
+                        SELECT endpoint_id, attempts, failures,
+                            latency_us_total, latency_us_max
+                        FROM observation_hourly WHERE hour >= ? AND hour < ?
+                        UNION ALL
+                        SELECT endpoint_id, 1, ok = 0, latency_us, latency_us
+                        FROM observations WHERE ts_us >= ? AND ts_us < ?
+                    )
+                    LEFT JOIN observation_endpoints e ON e.id = endpoint_id
+                    GROUP BY endpoint_id
+                    ORDER BY endpoint_id
+                """,
+                    (
+                        start_us // HOUR_US,
+                        -(-end_us // HOUR_US),
+                        start_us,
+                        end_us,
+                    ),
+                ).fetchall()
+        except sqlite3.Error as e:
+            logger.error(f"Error loading observation summary: {e}")
+            return []
+        return [
+            {
+                "endpoint": endpoint,
+                "attempts": attempts,
+                "failures": failures,
+                "mean_latency_us": total // attempts,
+                "max_latency_us": max_latency,
+            }
+            for endpoint, attempts, failures, total, max_latency in rows
+        ]
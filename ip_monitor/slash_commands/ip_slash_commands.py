@@ -9,14 +9,95 @@ import discord
 from discord import app_commands
 from discord.ext import commands
 
+from ip_monitor.commands.ip_commands import IPCommands
 from ip_monitor.ip_service import IPService
-from ip_monitor.storage import SQLiteIPStorage
+from ip_monitor.storage import AsyncStorage, HistoryCursor, SQLiteIPStorage
 from ip_monitor.utils.async_rate_limiter import AsyncRateLimiter
 from ip_monitor.utils.service_health import service_health
 
 logger = logging.getLogger(__name__)
 
 
+class HistoryView(discord.ui.View):
+    """
+    Buttons that page through IP history, newest first.
+
+    Each click loads a single page from storage. The view keeps only the
+    cursors of the pages shown so far, to step back to newer pages.
+    """
+
+    def __init__(
+        self,
+        async_storage: AsyncStorage,
+        next_cursor: HistoryCursor | None,
+        since: str | None = None,
+        before: str | None = None,
+        timeout: float = 300,
+    ) -> None:
+        """
+        Initialize the view for a first page that has already been sent.
+
+        Args:
+            async_storage: Storage to load the other pages from
+            next_cursor: Cursor of the page after the first
+            since: Earliest timestamp to include
+            before: Timestamp to stop before
+            timeout: Seconds without a click before the buttons are removed
+        """
+        super().__init__(timeout=timeout)
+        self.async_storage = async_storage
+        self.since = since
+        self.before = before
+        self.next_cursor = next_cursor
+        # Cursor each page shown so far was loaded from, the first needs none
+        self.page_cursors: list[HistoryCursor | None] = [None]
+        self.message: discord.Message | None = None
+        self._update_buttons()
+
+    def _update_buttons(self) -> None:
+        """Enable the buttons that lead to another page."""
+        self.newer_button.disabled = len(self.page_cursors) == 1
+        self.older_button.disabled = self.next_cursor is None
+
+    @discord.ui.button(label="Newer", emoji="◀️", style=discord.ButtonStyle.secondary)
+    async def newer_button(
+        self, interaction: discord.Interaction, button: discord.ui.Button
+    ) -> None:
+        """Show the previous, newer page."""
+        self.page_cursors.pop()
+        await self._show_page(interaction)
+
+    @discord.ui.button(label="Older", emoji="▶️", style=discord.ButtonStyle.secondary)
+    async def older_button(
+        self, interaction: discord.Interaction, button: discord.ui.Button
+    ) -> None:
+        """Show the next, older page."""
+        self.page_cursors.append(self.next_cursor)
+        await self._show_page(interaction)
+
+    async def _show_page(self, interaction: discord.Interaction) -> None:
+        """Load the page of the last cursor and show it in the message."""
+        page_size = IPCommands.HISTORY_PAGE_SIZE
+        entries, self.next_cursor = await self.async_storage.load_history_page(
+            page_size, self.page_cursors[-1], self.since, self.before
+        )
+        self._update_buttons()
+        if entries:
+            first_number = (len(self.page_cursors) - 1) * page_size + 1
+            content = IPCommands.format_history_page(entries, first_number)
+        else:
+            content = "No IP history available."
+        await interaction.response.edit_message(content=content, view=self)
+
+    async def on_timeout(self) -> None:
+        """Remove the buttons once they have expired."""
+        if self.message is not None:
+            try:
+                await self.message.edit(view=None)
+            except discord.HTTPException as e:
+                logger.debug(f"Could not remove history buttons: {e}")
+
+
 class IPSlashCommands(commands.Cog):
     """
     Slash command implementations for IP monitoring functionality.
@@ -49,6 +130,11 @@ class IPSlashCommands(commands.Cog):
         self.rate_limiter = rate_limiter
         self.ip_commands_handler = ip_commands_handler
 
+    @property
+    def async_storage(self) -> AsyncStorage:
+        """Storage calls that run off the event loop."""
+        return AsyncStorage(self.storage)
+
     @app_commands.command(name="ip", description="Check the current public IP address")
     async def ip_slash(self, interaction: discord.Interaction) -> None:
         """
@@ -80,11 +166,11 @@ class IPSlashCommands(commands.Cog):
                 return
 
             # Get the last known IP
-            last_ip = self.storage.load_last_ip()
+            last_ip = await self.async_storage.load_last_ip()
 
             # Save the current IP (skip if in read-only mode)
             if not service_health.is_fallback_active("read_only_mode"):
-                if not self.storage.save_current_ip(current_ip):
+                if not await self.async_storage.save_current_ip(current_ip):
                     logger.error("Failed to save current IP address")
                     await interaction.followup.send(
                         "❌ Failed to save the current IP address. Please try again later.",
@@ -118,41 +204,54 @@ class IPSlashCommands(commands.Cog):
                 pass
 
     @app_commands.command(name="history", description="View IP address change history")
-    async def history_slash(self, interaction: discord.Interaction) -> None:
+    @app_commands.describe(
+        since="Only show changes from this date on, e.g. 2024-01-31 (optional)",
+        before="Only show changes before this date (optional)",
+    )
+    async def history_slash(
+        self,
+        interaction: discord.Interaction,
+        since: str | None = None,
+        before: str | None = None,
+    ) -> None:
         """
-        Slash command to show IP address history.
+        Slash command to show IP address history, a page at a time.
         """
         try:
             await interaction.response.defer()
 
+            for value in (since, before):
+                if value is None:
+                    continue
+                try:
+                    datetime.fromisoformat(value)
+                except ValueError:
+                    await interaction.followup.send(
+                        f"❌ Invalid date: `{value}`. Use YYYY-MM-DD.",
+                        ephemeral=True,
+                    )
+                    return
+
             logger.info(f"IP history requested by {interaction.user} via slash command")
-            history = self.storage.load_ip_history()
+            entries, next_cursor = await self.async_storage.load_history_page(
+                IPCommands.HISTORY_PAGE_SIZE, None, since, before
+            )
 
-            if not history:
+            if not entries:
                 await interaction.followup.send(
                     "No IP history available.", ephemeral=True
                 )
                 return
 
-            history_text = "📜 **IP Address History**\n"
-            for idx, entry in enumerate(reversed(history), 1):
-                ip = entry.get("ip", "Unknown")
-                timestamp_str = entry.get("timestamp", "Unknown time")
-                try:
-                    # Convert ISO timestamp to more readable format
-                    dt = datetime.fromisoformat(timestamp_str)
-                    timestamp_str = dt.strftime("%Y-%m-%d %H:%M:%S")
-                except (ValueError, TypeError):
-                    pass
-
-                history_text += f"{idx}. IP: `{ip}` - {timestamp_str}\n"
-
-                # Discord message limit is 2000 chars, be safe and break if needed
-                if len(history_text) > 1800 and idx < len(history):
-                    history_text += f"... and {len(history) - idx} more entries"
-                    break
+            history_text = IPCommands.format_history_page(entries)
+            if next_cursor is None:
+                await interaction.followup.send(history_text)
+                return
 
-            await interaction.followup.send(history_text)
+            view = HistoryView(self.async_storage, next_cursor, since, before)
+            view.message = await interaction.followup.send(
+                history_text, view=view, wait=True
+            )
 
         except Exception as e:
             logger.error(f"Error in history slash command: {e}")
@@ -232,7 +331,7 @@ class IPSlashCommands(commands.Cog):
                 status_text += "⚪ Cache: Disabled\n"
 
             # Add current IP info
-            current_ip = self.storage.load_last_ip()
+            current_ip = await self.async_storage.load_last_ip()
             if current_ip:
                 status_text += f"🌐 Current IP: `{current_ip}`\n"
 
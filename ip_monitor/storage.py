@@ -2,35 +2,222 @@
 Storage operations for the IP Monitor Bot using SQLite for data integrity.
 """
 
-from datetime import datetime
+import asyncio
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import Future
+from contextlib import contextmanager, suppress
+from datetime import date, datetime
+import ipaddress
+from itertools import islice
 import json
 import logging
 import os
+import queue
 import shutil
+import socket
 import sqlite3
 import tempfile
-from typing import Any
+from threading import Lock, RLock, Thread
+from typing import Any, Protocol, runtime_checkable
 
+from ip_monitor.config import AppConfig
 from ip_monitor.utils.service_health import service_health
 
 logger = logging.getLogger(__name__)
 
+# Position in the history to continue a page from: a timestamp and row id
+HistoryCursor = tuple[str, int]
+
+
+def pack_ip(ip: str) -> tuple[bytes, int]:
+    """
+    Pack an IP address for storage.
+
+    Args:
+        ip: IPv4 or IPv6 address
+
+    Returns:
+        The 4 or 16 byte packed address and its IP version
+
+    Raises:
+        ValueError: If the address is not valid
+    """
+    address = ipaddress.ip_address(ip)
+    return address.packed, address.version
+
+
+def unpack_ip(packed: bytes) -> str:
+    """
+    Format a packed IP address.
+
+    Args:
+        packed: 4 or 16 byte packed address
+
+    Returns:
+        The address in its compressed text form
+
+    Raises:
+        ValueError: If the packed address is not 4 or 16 bytes long
+    """
+    family = socket.AF_INET if len(packed) == 4 else socket.AF_INET6
+    try:
+        return socket.inet_ntop(family, packed)
+    except (OSError, TypeError) as e:
+        raise ValueError(f"Invalid packed IP address: {packed!r}") from e
+
+
+def page_history(
+    history: list[dict[str, Any]],
+    limit: int,
+    before: HistoryCursor | None = None,
+    start: str | None = None,
+    end: str | None = None,
+) -> tuple[list[dict[str, Any]], HistoryCursor | None]:
+    """
+    Take one page, newest first, of a history held as a list.
+
+    Cursors use the record's position in the list as the row id. See
+    SQLiteIPStorage.load_history_page.
+    """
+    keyed = [
+        ((record.get("timestamp", ""), index), record)
+        for index, record in enumerate(history)
+    ]
+    matching = [
+        (key, record)
+        for key, record in reversed(keyed)
+        if (start is None or key[0] >= start)
+        and (end is None or key[0] < end)
+        and (before is None or key < before)
+    ]
+    page = matching[:limit]
+    next_cursor = page[-1][0] if len(matching) > limit else None
+    return [record for _, record in page], next_cursor
+
+
+@runtime_checkable
+class IPStorageBackend(Protocol):
+    """
+    The operations every IP storage backend provides.
+
+    The bot only relies on these, so the backends registered in
+    STORAGE_BACKENDS are interchangeable. Saving an IP that is not valid
+    fails, saving an unchanged IP adds no history, and the history keeps
+    only the last history_size changes. Extras such as SQLiteIPStorage's
+    archive are looked up by the callers that need them.
+    """
+
+    history_size: int
+
+    def load_last_ip(self) -> str | None:
+        """Load the last known IP, or None if there is none."""
+        ...
+
+    def save_current_ip(self, ip: str) -> bool:
+        """Save the current IP, adding it to the history if it changed."""
+        ...
+
+    def load_ip_history(self) -> list[dict[str, Any]]:
+        """Load the last history_size changes, oldest first."""
+        ...
+
+    def save_ip_history(self, history: list[dict[str, Any]]) -> bool:
+        """Replace the history with the given changes."""
+        ...
+
+    def load_history_page(
+        self,
+        limit: int,
+        before: HistoryCursor | None = None,
+        start: str | None = None,
+        end: str | None = None,
+    ) -> tuple[list[dict[str, Any]], HistoryCursor | None]:
+        """Load one page of the history, newest first."""
+        ...
+
+    def is_valid_ip(self, ip: str) -> bool:
+        """Check whether a string is an IPv4 or IPv6 address."""
+        ...
+
+    def close(self) -> None:
+        """Release the backend's resources."""
+        ...
+
 
 class SQLiteIPStorage:
     """
     Handles storage and retrieval of IP address data using SQLite database.
+
+    A single connection is opened lazily and kept for the lifetime of the
+    storage, so its prepared statement cache survives between calls. The
+    database runs in WAL mode with synchronous=NORMAL: commits append to the
+    write-ahead log without an fsync, which is only paid at checkpoints, and
+    a crash can lose at most the last transactions but never corrupt the
+    database. Writes are serialized by a lock so the storage can be shared
+    between threads; reads use a second connection, so they see the last
+    committed state without waiting for a write in progress.
+
+    The current IP and the history tail are read once and then kept in
+    memory, replaced by each write once it has committed, so lookups do not
+    touch the database. This copy is authoritative: the storage must be the
+    only writer to its database while it is open.
+
+    Every change is also written to a long-term archive, partitioned into one
+    table per month so the hot history table stays small. Partitions older
+    than the retention period are dropped whole. Daily and monthly rollups of
+    change counts and distinct IPs are updated with each archived change and
+    outlive the partitions they summarize.
+
+    Addresses are stored packed, 4 bytes for IPv4 and 16 for IPv6, next to
+    their IP version. Every archived address also has a row in seen_ips,
+    keyed by the packed address, with when it was first and last seen and
+    how many times the IP changed to it, so whether an IP has been seen
+    before is a primary key lookup.
     """
 
-    def __init__(self, db_file: str, history_size: int) -> None:
+    # Schema version recorded in the database's user_version, the number
+    # of migrations applied
+    SCHEMA_VERSION = 2
+
+    # Rows copied per transaction when a migration backfills a table
+    BACKFILL_CHUNK_SIZE = 5000
+
+    # Rows passed to each executemany call of a bulk import
+    IMPORT_BATCH_SIZE = 5000
+
+    # Prepared statements kept per connection, keyed by SQL text
+    STATEMENT_CACHE_SIZE = 64
+
+    # Rollup tables by granularity
+    ROLLUP_TABLES = {"day": "ip_rollup_daily", "month": "ip_rollup_monthly"}
+
+    def __init__(
+        self, db_file: str, history_size: int, archive_retention_months: int = 0
+    ) -> None:
         """
         Initialize the SQLite storage handler.
 
         Args:
             db_file: Path to SQLite database file
             history_size: Maximum number of IP records to store in history
+            archive_retention_months: Months of archived changes to keep,
+                0 to keep them all
         """
         self.db_file = db_file
         self.history_size = history_size
+        self.archive_retention_months = archive_retention_months
+        self._conn: sqlite3.Connection | None = None
+        self._lock = RLock()
+        self._read_conn: sqlite3.Connection | None = None
+        self._read_lock = RLock()
+        # In-memory copy of the current IP and history tail. The history is
+        # bounded to the history size and guarded by its own lock, so readers
+        # do not wait for a database write
+        self._current_ip: str | None = None
+        self._history: deque[dict[str, str]] = deque()
+        self._history_lock = Lock()
+        self._state_loaded = False
         self._init_database()
 
     def __enter__(self):
@@ -38,31 +225,99 @@ class SQLiteIPStorage:
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        """Exit the context manager."""
-        # SQLiteIPStorage uses context managers for all operations,
-        # so there are no persistent connections to close.
+        """Exit the context manager, closing the database connection."""
+        self.close()
         return False
 
-    def close(self):
-        """Close any resources and clean up connections."""
-        # SQLiteIPStorage uses context managers for all operations,
-        # so there are no persistent connections to close.
-        # This method is provided for API compatibility.
-        
-        # Force garbage collection to ensure any lingering connections are cleaned up
-        import gc
-        gc.collect()
-        
-        # Also ensure any lingering database connections are explicitly closed
-        # by attempting to connect and immediately close
+    @property
+    def conn(self) -> sqlite3.Connection:
+        """
+        Get the database connection, opening it on first use.
+
+        Raises:
+            sqlite3.Error: If the database cannot be opened
+        """
+        if self._conn is None:
+            self._conn = self._connect(
+                "PRAGMA journal_mode=WAL", "PRAGMA synchronous=NORMAL"
+            )
+        return self._conn
+
+    @property
+    def read_conn(self) -> sqlite3.Connection:
+        """
+        Get the read-only connection, opening it on first use.
+
+        Raises:
+            sqlite3.Error: If the database cannot be opened
+        """
+        if self._read_conn is None:
+            self._read_conn = self._connect("PRAGMA query_only=ON")
+        return self._read_conn
+
+    def _connect(self, *pragmas: str) -> sqlite3.Connection:
+        """Open a connection to the database and apply the given pragmas."""
+        conn = sqlite3.connect(
+            self.db_file,
+            check_same_thread=False,
+            cached_statements=self.STATEMENT_CACHE_SIZE,
+        )
+        try:
+            for pragma in pragmas:
+                conn.execute(pragma)
+        except sqlite3.Error:
+            conn.close()
+            raise
+        return conn
+
+    @contextmanager
+    def _reading(self) -> Iterator[sqlite3.Connection]:
+        """
+        Hold a connection for a read.
+
+        An in-memory database only exists on its own connection, so there
+        reads share the write connection and its lock.
+        """
+        if self.db_file == ":memory:":
+            with self._lock:
+                yield self.conn
+        else:
+            with self._read_lock:
+                yield self.read_conn
+
+    def close(self) -> None:
+        """
+        Close the database connections.
+
+        Closing the last connection checkpoints the write-ahead log into the
+        database file. The storage stays usable; the next call reconnects and
+        reloads the in-memory state.
+        """
+        with self._read_lock:
+            if self._read_conn is not None:
+                self._close_connection(self._read_conn)
+                self._read_conn = None
+        with self._lock:
+            self._state_loaded = False
+            if self._conn is not None:
+                self._close_connection(self._conn)
+                self._conn = None
+
+    @staticmethod
+    def _close_connection(conn: sqlite3.Connection) -> None:
+        """Close a connection, logging rather than raising on failure."""
         try:
-            conn = sqlite3.connect(self.db_file)
             conn.close()
-        except Exception:
-            pass  # Ignore any errors during cleanup
+        except sqlite3.Error as e:
+            logger.warning(f"Error closing database connection: {e}")
 
     def _init_database(self) -> None:
-        """Initialize the SQLite database with required tables."""
+        """
+        Bring the database schema up to date.
+
+        Pending migrations are run in order; a database already at the
+        current schema version costs a single version check.
+        """
         # Create directory if it doesn't exist
         directory = os.path.dirname(self.db_file)
         if directory and not os.path.exists(directory):
@@ -73,36 +328,14 @@ class SQLiteIPStorage:
                 return
 
         try:
-            with sqlite3.connect(self.db_file) as conn:
-                cursor = conn.cursor()
-
-                # Create current_ip table
-                cursor.execute("""
-                    CREATE TABLE IF NOT EXISTS current_ip (
-                        id INTEGER PRIMARY KEY,
-                        ip TEXT NOT NULL,
-                        timestamp TEXT NOT NULL,
-                        created_at DATETIME DEFAULT CURRENT_TIMESTAMP
-                    )
-                """)
-
-                # Create ip_history table
-                cursor.execute("""
-                    CREATE TABLE IF NOT EXISTS ip_history (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        ip TEXT NOT NULL,
-                        timestamp TEXT NOT NULL,
-                        created_at DATETIME DEFAULT CURRENT_TIMESTAMP
-                    )
-                """)
-
-                # Create indexes for better performance
-                cursor.execute("""
-                    CREATE INDEX IF NOT EXISTS idx_ip_history_timestamp 
-                    ON ip_history(timestamp)
-                """)
-
-                conn.commit()
+            with self._lock:
+                conn = self.conn
+                (version,) = conn.execute("PRAGMA user_version").fetchone()
+                if version < self.SCHEMA_VERSION:
+                    self._migrate(conn, version)
+                if self._retention_cutoff() is not None:
+                    with self._transaction(conn) as cursor:
+                        self._apply_retention(cursor)
                 service_health.record_success("storage", "init_database")
                 logger.info("SQLite database initialized successfully")
 
@@ -112,37 +345,423 @@ class SQLiteIPStorage:
                 "storage", f"Database init error: {e}", "init_database"
             )
 
-    def load_ip_history(self) -> list[dict[str, Any]]:
+    @staticmethod
+    @contextmanager
+    def _transaction(conn: sqlite3.Connection) -> Iterator[sqlite3.Cursor]:
+        """Run a block in one write transaction, rolling back if it raises."""
+        cursor = conn.cursor()
+        cursor.execute("BEGIN IMMEDIATE")
+        try:
+            yield cursor
+        except BaseException:
+            conn.rollback()
+            raise
+        conn.commit()
+
+    def _migrations(self) -> list[Callable[[sqlite3.Connection], None]]:
+        """
+        Get the schema migrations in order.
+
+        Migration N brings a database at version N - 1 to version N. Each one
+        must be safe to run again, as one interrupted before its version was
+        recorded is run again from the start.
+        """
+        return [self._migrate_packed_addresses, self._migrate_storage_meta]
+
+    def _migrate(self, conn: sqlite3.Connection, version: int) -> None:
+        """Run the migrations after the given version, recording each one."""
+        migrations = self._migrations()
+        for target, migration in enumerate(migrations[version:], version + 1):
+            logger.info(f"Migrating database to schema version {target}")
+            migration(conn)
+            with self._transaction(conn) as cursor:
+                cursor.execute(f"PRAGMA user_version = {target}")
+
+    def _migrate_packed_addresses(self, conn: sqlite3.Connection) -> None:
         """
-        Load the IP address history from database.
+        Version 1: store addresses packed and index every address seen.
+
+        Creates the tables of an empty database. Tables of an older database
+        holding addresses as text are renamed with a "_text" suffix and
+        copied into packed tables in chunks, so a large archive is never held
+        in memory or in one transaction; rows whose address is not valid are
+        dropped. seen_ips is then rebuilt from the archive, and history not
+        yet archived is archived.
+        """
+        with self._transaction(conn) as cursor:
+            self._set_text_table_aside(cursor, "current_ip")
+            if self._set_text_table_aside(cursor, "ip_history"):
+                # The index moved with the table; recreate it on the new one
+                cursor.execute("DROP INDEX IF EXISTS idx_ip_history_timestamp")
+
+            # Create current_ip table
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS current_ip (
+                    id INTEGER PRIMARY KEY,
+                    ip BLOB NOT NULL,
+                    family INTEGER NOT NULL,
+                    timestamp TEXT NOT NULL,
+                    created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+                )
+            """)
+
+            # Create ip_history table
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS ip_history (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    ip BLOB NOT NULL,
+                    family INTEGER NOT NULL,
+                    timestamp TEXT NOT NULL,
+                    created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+                )
+            """)
+
+            # Create indexes for better performance. History is ordered and
+            # trimmed by id, the table's rowid key, so it needs none
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_ip_history_timestamp 
+                ON ip_history(timestamp)
+            """)
+
+            # Every archived address, keyed by its packed form
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS seen_ips (
+                    ip BLOB PRIMARY KEY,
+                    family INTEGER NOT NULL,
+                    first_seen TEXT NOT NULL,
+                    last_seen TEXT NOT NULL,
+                    occurrences INTEGER NOT NULL
+                ) WITHOUT ROWID
+            """)
+
+            # Months that have an archive partition
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS ip_archive_partitions (
+                    month TEXT PRIMARY KEY
+                )
+            """)
+            for table in self.ROLLUP_TABLES.values():
+                cursor.execute(f"""
+                    CREATE TABLE IF NOT EXISTS {table} (
+                        period TEXT PRIMARY KEY,
+                        changes INTEGER NOT NULL,
+                        distinct_ips INTEGER NOT NULL
+                    )
+                """)
+
+            cursor.execute("SELECT month FROM ip_archive_partitions")
+            for (month,) in cursor.fetchall():
+                partition = self._archive_partition(month)
+                if self._set_text_table_aside(cursor, partition):
+                    cursor.execute(
+                        f"DROP INDEX IF EXISTS idx_{partition}_timestamp"
+                    )
+                self._create_partition(cursor, partition)
+
+            cursor.execute(r"""
+                SELECT name FROM sqlite_master 
+                WHERE type = 'table' AND name LIKE '%\_text' ESCAPE '\'
+            """)
+            text_tables = [name for (name,) in cursor.fetchall()]
+
+        for source in text_tables:
+            self._backfill_packed(conn, source, source.removesuffix("_text"))
+
+        with self._transaction(conn) as cursor:
+            for source in text_tables:
+                cursor.execute(f"DROP TABLE {source}")
+            if text_tables:
+                self._rebuild_seen_ips(cursor)
+                logger.info("Converted stored IP addresses to packed form")
+            # History from before the archive existed; archived changes are
+            # skipped, so this adds nothing to an archived database
+            cursor.execute("SELECT ip, family, timestamp FROM ip_history ORDER BY id")
+            for packed, family, timestamp in cursor.fetchall():
+                self._archive_record(cursor, packed, family, timestamp)
+
+    def _migrate_storage_meta(self, conn: sqlite3.Connection) -> None:
+        """Version 2: add a table of storage flags, such as the JSON import."""
+        with self._transaction(conn) as cursor:
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS storage_meta (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL
+                )
+            """)
+
+    @staticmethod
+    def _set_text_table_aside(cursor: sqlite3.Cursor, table: str) -> bool:
+        """
+        Rename a table holding addresses as text with a "_text" suffix.
 
         Returns:
-            List of dictionaries containing IP addresses and timestamps
+            bool: True if the table was renamed, False if it does not exist or
+            already holds packed addresses
+        """
+        cursor.execute(f"PRAGMA table_info({table})")
+        columns = {row[1] for row in cursor.fetchall()}
+        if not columns or "family" in columns:
+            return False
+        cursor.execute(f"ALTER TABLE {table} RENAME TO {table}_text")
+        return True
+
+    def _backfill_packed(
+        self, conn: sqlite3.Connection, source: str, target: str
+    ) -> None:
+        """
+        Copy rows with a text address into a table of packed addresses.
+
+        Rows are copied in id order, BACKFILL_CHUNK_SIZE per transaction. Ids
+        are kept, so an interrupted copy resumes after the last row copied.
+        """
+        cursor = conn.cursor()
+        cursor.execute(f"PRAGMA table_info({target})")
+        columns = [
+            row[1] for row in cursor.fetchall() if row[1] not in ("id", "ip", "family")
+        ]
+        names = ", ".join(columns)
+        placeholders = ", ".join("?" * (len(columns) + 3))
+        (last_id,) = cursor.execute(
+            f"SELECT coalesce(MAX(id), 0) FROM {target}"
+        ).fetchone()
+
+        while True:
+            with self._transaction(conn) as cursor:
+                cursor.execute(
+                    f"""
+                    SELECT id, ip, {names} FROM {source} 
+                    WHERE id > ? ORDER BY id LIMIT ?
+                """,
+                    (last_id, self.BACKFILL_CHUNK_SIZE),
+                )
+                rows = []
+                chunk = cursor.fetchall()
+                for row_id, ip, *values in chunk:
+                    try:
+                        packed, family = pack_ip(ip)
+                    except ValueError:
+                        logger.warning(f"Dropping invalid IP {ip!r} from {source}")
+                        continue
+                    rows.append((row_id, packed, family, *values))
+                cursor.executemany(
+                    f"""
+                    INSERT INTO {target} (id, ip, family, {names}) 
+                    VALUES ({placeholders})
+                """,
+                    rows,
+                )
+            if len(chunk) < self.BACKFILL_CHUNK_SIZE:
+                return
+            last_id = chunk[-1][0]
+
+    def _rebuild_seen_ips(self, cursor: sqlite3.Cursor) -> None:
+        """Fill seen_ips from every archive partition."""
+        cursor.execute("DELETE FROM seen_ips")
+        cursor.execute("SELECT month FROM ip_archive_partitions")
+        for (month,) in cursor.fetchall():
+            cursor.execute(f"""
+                INSERT INTO seen_ips 
+                (ip, family, first_seen, last_seen, occurrences) 
+                SELECT ip, family, MIN(timestamp), MAX(timestamp), COUNT(*) 
+                FROM {self._archive_partition(month)} WHERE true GROUP BY ip 
+                ON CONFLICT (ip) DO UPDATE SET 
+                    first_seen = min(first_seen, excluded.first_seen), 
+                    last_seen = max(last_seen, excluded.last_seen), 
+                    occurrences = occurrences + excluded.occurrences
+            """)
+
+    @staticmethod
+    def _archive_partition(month: str) -> str:
+        """Name the archive table holding a month, given as "YYYY-MM"."""
+        return f"ip_archive_{month.replace('-', '_')}"
+
+    def _retention_cutoff(self) -> str | None:
+        """Get the oldest month the archive keeps, or None to keep them all."""
+        if self.archive_retention_months <= 0:
+            return None
+        today = datetime.now()
+        months = today.year * 12 + today.month - self.archive_retention_months
+        return f"{months // 12:04d}-{months % 12 + 1:02d}"
+
+    def _apply_retention(self, cursor: sqlite3.Cursor) -> None:
+        """Drop the archive partitions of months before the retention period."""
+        cutoff = self._retention_cutoff()
+        if cutoff is None:
+            return
+        cursor.execute(
+            "SELECT month FROM ip_archive_partitions WHERE month < ?", (cutoff,)
+        )
+        for (month,) in cursor.fetchall():
+            cursor.execute(f"DROP TABLE IF EXISTS {self._archive_partition(month)}")
+            cursor.execute(
+                "DELETE FROM ip_archive_partitions WHERE month = ?", (month,)
+            )
+            logger.info(f"Dropped archived IP history for {month}")
+
+    @staticmethod
+    def _create_partition(cursor: sqlite3.Cursor, partition: str) -> None:
+        """Create an archive partition table."""
+        cursor.execute(f"""
+            CREATE TABLE IF NOT EXISTS {partition} (
+                id INTEGER PRIMARY KEY,
+                ip BLOB NOT NULL,
+                family INTEGER NOT NULL,
+                timestamp TEXT NOT NULL,
+                UNIQUE (ip, timestamp)
+            )
+        """)
+        cursor.execute(f"""
+            CREATE INDEX IF NOT EXISTS idx_{partition}_timestamp 
+            ON {partition}(timestamp)
+        """)
+
+    def _archive_record(
+        self, cursor: sqlite3.Cursor, packed: bytes, family: int, timestamp: str
+    ) -> None:
+        """
+        Add an IP change to its month's archive partition, the rollups and
+        the seen addresses.
+
+        Changes already archived are skipped, so history can be replayed.
         """
         try:
-            with sqlite3.connect(self.db_file) as conn:
+            day = date.fromisoformat(timestamp[:10]).isoformat()
+        except (TypeError, ValueError):
+            logger.warning(f"Not archiving IP change with timestamp {timestamp!r}")
+            return
+        month = day[:7]
+        cutoff = self._retention_cutoff()
+        if cutoff is not None and month < cutoff:
+            return
+
+        partition = self._archive_partition(month)
+        cursor.execute(
+            "INSERT OR IGNORE INTO ip_archive_partitions (month) VALUES (?)",
+            (month,),
+        )
+        if cursor.rowcount:
+            # First change of the month: start its partition
+            self._create_partition(cursor, partition)
+            self._apply_retention(cursor)
+
+        # NULL if the IP is new this month, else whether it was seen that day
+        cursor.execute(
+            f"""
+            SELECT MAX(substr(timestamp, 1, 10) = ?) FROM {partition} 
+            WHERE ip = ?
+        """,
+            (day, packed),
+        )
+        (seen_that_day,) = cursor.fetchone()
+        cursor.execute(
+            f"""
+            INSERT OR IGNORE INTO {partition} (ip, family, timestamp) 
+            VALUES (?, ?, ?)
+        """,
+            (packed, family, timestamp),
+        )
+        if not cursor.rowcount:
+            return
+
+        cursor.execute(
+            """
+            INSERT INTO seen_ips (ip, family, first_seen, last_seen, occurrences) 
+            VALUES (?, ?, ?, ?, 1) 
+            ON CONFLICT (ip) DO UPDATE SET 
+                first_seen = min(first_seen, excluded.first_seen), 
+                last_seen = max(last_seen, excluded.last_seen), 
+                occurrences = occurrences + 1
+        """,
+            (packed, family, timestamp, timestamp),
+        )
+
+        for table, period, new_ip in (
+            (self.ROLLUP_TABLES["day"], day, not seen_that_day),
+            (self.ROLLUP_TABLES["month"], month, seen_that_day is None),
+        ):
+            cursor.execute(
+                f"""
+                INSERT INTO {table} (period, changes, distinct_ips) 
+                VALUES (?, 1, ?) 
+                ON CONFLICT (period) DO UPDATE SET 
+                    changes = changes + 1, 
+                    distinct_ips = distinct_ips + excluded.distinct_ips
+            """,
+                (period, int(new_ip)),
+            )
+
+    def _load_state(self) -> None:
+        """
+        Read the current IP and history tail into memory on first use.
+
+        Raises:
+            sqlite3.Error: If the database cannot be read
+        """
+        if self._state_loaded:
+            return
+        with self._lock:
+            if self._state_loaded:
+                return
+            with self._reading() as conn:
                 cursor = conn.cursor()
+                cursor.execute("""
+                    SELECT ip FROM current_ip 
+                    ORDER BY created_at DESC 
+                    LIMIT 1
+                """)
+                row = cursor.fetchone()
                 cursor.execute(
                     """
                     SELECT ip, timestamp FROM ip_history 
-                    ORDER BY created_at DESC 
+                    ORDER BY id DESC 
                     LIMIT ?
                 """,
                     (self.history_size,),
                 )
-
                 rows = cursor.fetchall()
-                history = [{"ip": row[0], "timestamp": row[1]} for row in rows]
 
-                service_health.record_success("storage", "read_file")
-                return list(reversed(history))  # Return chronological order
+            current_ip = None
+            if row:
+                try:
+                    current_ip = unpack_ip(row[0])
+                except ValueError:
+                    logger.warning("Invalid IP in database")
+                    service_health.record_failure(
+                        "storage", "Invalid IP in database", "read_file"
+                    )
+
+            self._current_ip = current_ip
+            # Return chronological order
+            history = deque(
+                (
+                    {"ip": unpack_ip(packed), "timestamp": timestamp}
+                    for packed, timestamp in reversed(rows)
+                ),
+                maxlen=self.history_size,
+            )
+            with self._history_lock:
+                self._history = history
+            self._state_loaded = True
+            service_health.record_success("storage", "read_file")
+
+    def load_ip_history(self) -> list[dict[str, Any]]:
+        """
+        Load the IP address history, from memory once it has been read.
 
+        Returns:
+            List of dictionaries containing IP addresses and timestamps
+        """
+        try:
+            self._load_state()
         except sqlite3.Error as e:
             logger.error(f"Error loading IP history: {e}")
             service_health.record_failure(
                 "storage", f"Error loading IP history: {e}", "read_file"
             )
             return []
+        with self._history_lock:
+            history = list(self._history)
+        return [dict(record) for record in history]
 
     def save_ip_history(self, history: list[dict[str, Any]]) -> bool:
         """
@@ -156,27 +775,36 @@ class SQLiteIPStorage:
             bool: True if successful, False otherwise
         """
         try:
-            with sqlite3.connect(self.db_file) as conn:
+            with self._lock, self.conn as conn:
                 cursor = conn.cursor()
 
                 # Clear existing history
                 cursor.execute("DELETE FROM ip_history")
 
+                records = [
+                    (*pack_ip(record["ip"]), record["timestamp"])
+                    for record in history
+                ]
+
                 # Insert new history records
-                for record in history[-self.history_size :]:
-                    cursor.execute(
-                        """
-                        INSERT INTO ip_history (ip, timestamp) 
-                        VALUES (?, ?)
-                    """,
-                        (record["ip"], record["timestamp"]),
-                    )
+                cursor.executemany(
+                    """
+                    INSERT INTO ip_history (ip, family, timestamp) 
+                    VALUES (?, ?, ?)
+                """,
+                    records[-self.history_size :],
+                )
+
+                # Archive every record, including those beyond the history size
+                for packed, family, timestamp in records:
+                    self._archive_record(cursor, packed, family, timestamp)
 
                 conn.commit()
+                self._state_loaded = False
                 service_health.record_success("storage", "write_file")
                 return True
 
-        except (sqlite3.Error, KeyError) as e:
+        except (sqlite3.Error, KeyError, ValueError) as e:
             logger.error(f"Error saving IP history: {e}")
             service_health.record_failure(
                 "storage", f"Error saving IP history: {e}", "write_file"
@@ -185,113 +813,539 @@ class SQLiteIPStorage:
 
     def load_last_ip(self) -> str | None:
         """
-        Load the last known IP from database.
+        Load the last known IP, from memory once it has been read.
 
         Returns:
             IP address string or None if unsuccessful
         """
         try:
-            with sqlite3.connect(self.db_file) as conn:
+            self._load_state()
+        except sqlite3.Error as e:
+            logger.error(f"Error loading last IP: {e}")
+            service_health.record_failure(
+                "storage", f"Error loading last IP: {e}", "read_file"
+            )
+            return None
+        return self._current_ip
+
+    def save_current_ip(self, ip: str) -> bool:
+        """
+        Save the current IP to database and update history if changed.
+
+        Args:
+            ip: The IP address to save
+
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        try:
+            packed, family = pack_ip(ip)
+        except ValueError:
+            logger.error(f"Invalid IP address: {ip}")
+            return False
+        # Stored addresses are read back in their compressed form
+        ip = unpack_ip(packed)
+
+        timestamp = datetime.now().isoformat()
+        success = True
+
+        try:
+            with self._lock, self.conn as conn:
+                self._load_state()
                 cursor = conn.cursor()
-                cursor.execute("""
-                    SELECT ip FROM current_ip 
-                    ORDER BY created_at DESC 
-                    LIMIT 1
-                """)
+                changed = self._current_ip != ip
 
-                row = cursor.fetchone()
-                if row and self.is_valid_ip(row[0]):
-                    service_health.record_success("storage", "read_file")
-                    return row[0]
+                if not changed:
+                    # Unchanged: only record when the IP was last seen
+                    cursor.execute(
+                        "UPDATE current_ip SET timestamp = ?", (timestamp,)
+                    )
+                else:
+                    # The IP changed from was last seen at its last check
+                    cursor.execute("""
+                        UPDATE seen_ips SET last_seen = (
+                            SELECT max(seen_ips.last_seen, timestamp) FROM current_ip
+                        ) 
+                        WHERE ip IN (SELECT ip FROM current_ip)
+                    """)
+
+                    # Update current IP (replace the single record)
+                    cursor.execute("DELETE FROM current_ip")
+                    cursor.execute(
+                        """
+                        INSERT INTO current_ip (ip, family, timestamp) 
+                        VALUES (?, ?, ?)
+                    """,
+                        (packed, family, timestamp),
+                    )
 
-                if row:
-                    logger.warning("Invalid IP in database")
-                    service_health.record_failure(
-                        "storage", "Invalid IP in database", "read_file"
+                    # Add to history, as the IP has changed
+                    cursor.execute(
+                        """
+                        INSERT INTO ip_history (ip, family, timestamp) 
+                        VALUES (?, ?, ?)
+                    """,
+                        (packed, family, timestamp),
                     )
 
+                    # Maintain history size limit. AUTOINCREMENT ids are
+                    # consecutive, so the rows to drop are those at or below
+                    # the new id minus the limit: a range delete on the
+                    # primary key that costs the same for any history size
+                    cursor.execute(
+                        "DELETE FROM ip_history WHERE id <= ?",
+                        (cursor.lastrowid - self.history_size,),
+                    )
+
+                    self._archive_record(cursor, packed, family, timestamp)
+
+                conn.commit()
+                if changed:
+                    record = {"ip": ip, "timestamp": timestamp}
+                    self._current_ip = ip
+                    with self._history_lock:
+                        self._history.append(record)
+                service_health.record_success("storage", "write_file")
+
         except sqlite3.Error as e:
-            logger.error(f"Error loading last IP: {e}")
+            logger.error(f"Error saving current IP: {e}")
             service_health.record_failure(
-                "storage", f"Error loading last IP: {e}", "read_file"
+                "storage", f"Error saving current IP: {e}", "write_file"
             )
+            success = False
 
-        return None
+        return success
+
+    def load_archive(
+        self, start: str | None = None, end: str | None = None, ip: str | None = None
+    ) -> list[dict[str, Any]]:
+        """
+        Load archived IP changes, including those beyond the history size.
+
+        Only the partitions of the months in range are read.
+
+        Args:
+            start: Earliest timestamp to include, as an ISO date or datetime
+            end: Timestamp to stop before, as an ISO date or datetime
+            ip: Only include changes to this IP address
+
+        Returns:
+            Chronological list of dictionaries containing IP addresses and
+            timestamps
+        """
+        packed: bytes | None = None
+        if ip is not None:
+            try:
+                packed = pack_ip(ip)[0]
+            except ValueError:
+                # No invalid address is ever archived
+                return []
+        conditions = []
+        params: list[str | bytes] = []
+        for condition, value in (
+            ("timestamp >= ?", start),
+            ("timestamp < ?", end),
+            ("ip = ?", packed),
+        ):
+            if value is not None:
+                conditions.append(condition)
+                params.append(value)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
+        records = []
+        try:
+            with self._reading() as conn:
+                cursor = conn.cursor()
+                cursor.execute(
+                    """
+                    SELECT month FROM ip_archive_partitions 
+                    WHERE month >= ? AND month <= ? 
+                    ORDER BY month
+                """,
+                    (start[:7] if start else "", end[:7] if end else "9999-12"),
+                )
+                for (month,) in cursor.fetchall():
+                    cursor.execute(
+                        f"""
+                        SELECT ip, timestamp FROM {self._archive_partition(month)} 
+                        {where} 
+                        ORDER BY timestamp, id
+                    """,
+                        params,
+                    )
+                    records.extend(
+                        {"ip": unpack_ip(address), "timestamp": timestamp}
+                        for address, timestamp in cursor.fetchall()
+                    )
+        except sqlite3.Error as e:
+            logger.error(f"Error loading IP archive: {e}")
+            service_health.record_failure(
+                "storage", f"Error loading IP archive: {e}", "read_file"
+            )
+            return []
+        return records
+
+    def load_history_page(
+        self,
+        limit: int,
+        before: HistoryCursor | None = None,
+        start: str | None = None,
+        end: str | None = None,
+    ) -> tuple[list[dict[str, Any]], HistoryCursor | None]:
+        """
+        Load one page of archived IP changes, newest first.
+
+        Pages continue from a cursor instead of an offset, and each archive
+        partition is read through its timestamp index from the cursor on, so
+        a page costs the same however much history precedes it.
+
+        Args:
+            limit: Maximum number of changes in the page
+            before: Cursor returned with the previous page, to continue after it
+            start: Earliest timestamp to include, as an ISO date or datetime
+            end: Timestamp to stop before, as an ISO date or datetime
+
+        Returns:
+            The page's changes and the cursor of the next page, or None if
+            there are no older changes
+        """
+        conditions = []
+        params: list[Any] = []
+        for condition, value in (
+            ("timestamp >= ?", start),
+            ("timestamp < ?", end),
+            ("(timestamp, id) < (?, ?)", before),
+        ):
+            if value is not None:
+                conditions.append(condition)
+                params.extend(value if isinstance(value, tuple) else (value,))
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        last_month = min(
+            (bound[:7] for bound in (end, before and before[0]) if bound),
+            default="9999-12",
+        )
+
+        # One row past the page tells whether there is a next page
+        rows: list[tuple[int, bytes, str]] = []
+        try:
+            with self._reading() as conn:
+                cursor = conn.cursor()
+                cursor.execute(
+                    """
+                    SELECT month FROM ip_archive_partitions 
+                    WHERE month >= ? AND month <= ? 
+                    ORDER BY month DESC
+                """,
+                    (start[:7] if start else "", last_month),
+                )
+                for (month,) in cursor.fetchall():
+                    cursor.execute(
+                        f"""
+                        SELECT id, ip, timestamp 
+                        FROM {self._archive_partition(month)} 
+                        {where} 
+                        ORDER BY timestamp DESC, id DESC 
+                        LIMIT ?
+                    """,
+                        (*params, limit + 1 - len(rows)),
+                    )
+                    rows.extend(cursor.fetchall())
+                    if len(rows) > limit:
+                        break
+        except sqlite3.Error as e:
+            logger.error(f"Error loading IP history page: {e}")
+            service_health.record_failure(
+                "storage", f"Error loading IP history page: {e}", "read_file"
+            )
+            return [], None
+
+        page = rows[:limit]
+        next_cursor = None
+        if len(rows) > limit:
+            row_id, _, timestamp = page[-1]
+            next_cursor = (timestamp, row_id)
+        return [
+            {"ip": unpack_ip(packed), "timestamp": timestamp}
+            for _, packed, timestamp in page
+        ], next_cursor
+
+    def load_rollups(
+        self, granularity: str = "day", start: str | None = None, end: str | None = None
+    ) -> list[dict[str, Any]]:
+        """
+        Load the precomputed change counts of archived history.
+
+        Args:
+            granularity: "day" or "month"
+            start: First period to include, as an ISO date or month
+            end: Last period to include, as an ISO date or month
+
+        Returns:
+            Chronological list of dictionaries with the period, its number of
+            IP changes and the number of distinct IPs changed to
+
+        Raises:
+            ValueError: If the granularity is unknown
+        """
+        table = self.ROLLUP_TABLES.get(granularity)
+        if table is None:
+            raise ValueError(f"Unknown rollup granularity: {granularity}")
+
+        try:
+            with self._reading() as conn:
+                cursor = conn.cursor()
+                cursor.execute(
+                    f"""
+                    SELECT period, changes, distinct_ips FROM {table} 
+                    WHERE period >= ? AND substr(period, 1, ?) <= ? 
+                    ORDER BY period
+                """,
+                    (start or "", len(end or "9"), end or "9"),
+                )
+                rows = cursor.fetchall()
+        except sqlite3.Error as e:
+            logger.error(f"Error loading IP rollups: {e}")
+            service_health.record_failure(
+                "storage", f"Error loading IP rollups: {e}", "read_file"
+            )
+            return []
+        return [
+            {"period": period, "changes": changes, "distinct_ips": distinct_ips}
+            for period, changes, distinct_ips in rows
+        ]
+
+    def load_seen_ip(self, ip: str) -> dict[str, Any] | None:
+        """
+        Look up whether the IP has been changed to before.
+
+        The last seen time of the current IP is that of its last check.
+
+        Args:
+            ip: The IP address to look up
+
+        Returns:
+            Dictionary with when the IP was first and last seen and the number
+            of times it was changed to, or None if it has never been seen
+        """
+        try:
+            packed, _ = pack_ip(ip)
+        except ValueError:
+            return None
+
+        try:
+            with self._reading() as conn:
+                cursor = conn.cursor()
+                cursor.execute(
+                    """
+                    SELECT first_seen, max(last_seen, coalesce(
+                        (SELECT timestamp FROM current_ip c WHERE c.ip = s.ip), ''
+                    )), occurrences 
+                    FROM seen_ips s WHERE ip = ?
+                """,
+                    (packed,),
+                )
+                row = cursor.fetchone()
+        except sqlite3.Error as e:
+            logger.error(f"Error looking up seen IP: {e}")
+            service_health.record_failure(
+                "storage", f"Error looking up seen IP: {e}", "read_file"
+            )
+            return None
+        if row is None:
+            return None
+        first_seen, last_seen, occurrences = row
+        return {
+            "ip": unpack_ip(packed),
+            "first_seen": first_seen,
+            "last_seen": last_seen,
+            "occurrences": occurrences,
+        }
+
+    @contextmanager
+    def _snapshot(self) -> Iterator[sqlite3.Connection]:
+        """
+        Hold a read transaction on a connection of its own for a long read.
+
+        The read sees one snapshot of the database while writes continue. An
+        in-memory database has no other connection, so there the read holds
+        the write connection.
+        """
+        if self.db_file == ":memory:":
+            with self._lock:
+                yield self.conn
+            return
+        conn = self._connect("PRAGMA query_only=ON")
+        try:
+            conn.execute("BEGIN")
+            yield conn
+        finally:
+            self._close_connection(conn)
+
+    def iter_archive(self) -> Iterator[dict[str, str]]:
+        """
+        Stream every archived IP change in chronological order.
+
+        Rows are read one at a time from a cursor over a snapshot, so memory
+        use does not grow with the size of the archive.
+
+        Yields:
+            Dictionaries containing IP addresses and timestamps
+
+        Raises:
+            sqlite3.Error: If the archive cannot be read
+        """
+        with self._snapshot() as conn:
+            months = conn.execute(
+                "SELECT month FROM ip_archive_partitions ORDER BY month"
+            ).fetchall()
+            for (month,) in months:
+                cursor = conn.execute(f"""
+                    SELECT ip, timestamp FROM {self._archive_partition(month)} 
+                    ORDER BY timestamp, id
+                """)
+                for packed, timestamp in cursor:
+                    yield {"ip": unpack_ip(packed), "timestamp": timestamp}
 
-    def save_current_ip(self, ip: str) -> bool:
+    def import_archive(self, records: Iterable[dict[str, Any]]) -> int:
         """
-        Save the current IP to database and update history if changed.
+        Add IP changes to the archive in one transaction.
+
+        Records are staged with batched executemany calls, then copied into
+        their partitions with the rollups and seen addresses of the affected
+        periods updated set-wise. Changes already archived, records without a
+        valid IP and date, and records older than the retention period are
+        skipped. The history tail is not changed.
 
         Args:
-            ip: The IP address to save
+            records: Dictionaries containing IP addresses and timestamps
 
         Returns:
-            bool: True if successful, False otherwise
+            Number of changes added, or -1 if the import failed
         """
-        if not self.is_valid_ip(ip):
-            logger.error(f"Invalid IP address: {ip}")
-            return False
+        cutoff = self._retention_cutoff()
+        skipped = 0
 
-        timestamp = datetime.now().isoformat()
-        success = True
+        def staged_rows() -> Iterator[tuple[bytes, int, str, str]]:
+            nonlocal skipped
+            for record in records:
+                try:
+                    packed, family = pack_ip(record["ip"])
+                    timestamp = str(record["timestamp"])
+                    month = date.fromisoformat(timestamp[:10]).isoformat()[:7]
+                except (KeyError, TypeError, ValueError):
+                    skipped += 1
+                    continue
+                if cutoff is not None and month < cutoff:
+                    skipped += 1
+                    continue
+                yield packed, family, timestamp, month
 
         try:
-            with sqlite3.connect(self.db_file) as conn:
-                cursor = conn.cursor()
-
-                # Get the last IP to check if it changed (using same connection)
+            with self._lock, self._transaction(self.conn) as cursor:
                 cursor.execute("""
-                    SELECT ip FROM current_ip 
-                    ORDER BY created_at DESC 
-                    LIMIT 1
-                """)
-                row = cursor.fetchone()
-                last_ip = row[0] if row and self.is_valid_ip(row[0]) else None
-
-                # Update current IP (replace the single record)
-                cursor.execute("DELETE FROM current_ip")
-                cursor.execute(
-                    """
-                    INSERT INTO current_ip (ip, timestamp) 
-                    VALUES (?, ?)
-                """,
-                    (ip, timestamp),
-                )
-
-                # Add to history only if IP has changed
-                if last_ip != ip:
-                    cursor.execute(
-                        """
-                        INSERT INTO ip_history (ip, timestamp) 
-                        VALUES (?, ?)
-                    """,
-                        (ip, timestamp),
+                    CREATE TEMP TABLE IF NOT EXISTS archive_import (
+                        ip BLOB NOT NULL,
+                        family INTEGER NOT NULL,
+                        timestamp TEXT NOT NULL,
+                        month TEXT NOT NULL,
+                        UNIQUE (month, ip, timestamp)
                     )
-
-                    # Maintain history size limit
-                    cursor.execute(
+                """)
+                cursor.execute("DELETE FROM archive_import")
+                rows = staged_rows()
+                while batch := list(islice(rows, self.IMPORT_BATCH_SIZE)):
+                    cursor.executemany(
                         """
-                        DELETE FROM ip_history 
-                        WHERE id NOT IN (
-                            SELECT id FROM ip_history 
-                            ORDER BY created_at DESC 
-                            LIMIT ?
-                        )
+                        INSERT OR IGNORE INTO archive_import 
+                        (ip, family, timestamp, month) VALUES (?, ?, ?, ?)
                     """,
-                        (self.history_size,),
+                        batch,
                     )
 
-                conn.commit()
-                service_health.record_success("storage", "write_file")
-
-        except sqlite3.Error as e:
-            logger.error(f"Error saving current IP: {e}")
+                added = 0
+                cursor.execute("SELECT DISTINCT month FROM archive_import")
+                for (month,) in cursor.fetchall():
+                    added += self._import_month(cursor, month)
+                cursor.execute("DELETE FROM archive_import")
+        except (sqlite3.Error, ValueError) as e:
+            logger.error(f"Error importing IP archive: {e}")
             service_health.record_failure(
-                "storage", f"Error saving current IP: {e}", "write_file"
+                "storage", f"Error importing IP archive: {e}", "write_file"
             )
-            success = False
-
-        return success
+            return -1
+
+        if skipped:
+            logger.warning(f"Skipped {skipped} invalid or expired archive records")
+        service_health.record_success("storage", "write_file")
+        return added
+
+    def _import_month(self, cursor: sqlite3.Cursor, month: str) -> int:
+        """Copy a month's staged changes into the archive, returning the count."""
+        partition = self._archive_partition(month)
+        cursor.execute(
+            "INSERT OR IGNORE INTO ip_archive_partitions (month) VALUES (?)",
+            (month,),
+        )
+        if cursor.rowcount:
+            self._create_partition(cursor, partition)
+
+        # Keep only the changes that are new to the archive
+        cursor.execute(
+            f"""
+            DELETE FROM archive_import WHERE month = ? AND EXISTS (
+                SELECT 1 FROM {partition} p 
+                WHERE p.ip = archive_import.ip 
+                AND p.timestamp = archive_import.timestamp
+            )
+        """,
+            (month,),
+        )
+        cursor.execute(
+            f"""
+            INSERT INTO {partition} (ip, family, timestamp) 
+            SELECT ip, family, timestamp FROM archive_import 
+            WHERE month = ? ORDER BY timestamp
+        """,
+            (month,),
+        )
+        added = cursor.rowcount
+        if not added:
+            return 0
+
+        # Recount the changed days and the month from the partition
+        cursor.execute(
+            f"""
+            INSERT OR REPLACE INTO {self.ROLLUP_TABLES["day"]} 
+            (period, changes, distinct_ips) 
+            SELECT substr(timestamp, 1, 10), COUNT(*), COUNT(DISTINCT ip) 
+            FROM {partition} WHERE substr(timestamp, 1, 10) IN (
+                SELECT substr(timestamp, 1, 10) FROM archive_import WHERE month = ?
+            ) 
+            GROUP BY substr(timestamp, 1, 10)
+        """,
+            (month,),
+        )
+        cursor.execute(
+            f"""
+            INSERT OR REPLACE INTO {self.ROLLUP_TABLES["month"]} 
+            (period, changes, distinct_ips) 
+            SELECT ?, COUNT(*), COUNT(DISTINCT ip) FROM {partition}
+        """,
+            (month,),
+        )
+        cursor.execute(
+            """
+            INSERT INTO seen_ips (ip, family, first_seen, last_seen, occurrences) 
+            SELECT ip, family, MIN(timestamp), MAX(timestamp), COUNT(*) 
+            FROM archive_import WHERE month = ? GROUP BY ip 
+            ON CONFLICT (ip) DO UPDATE SET 
+                first_seen = min(first_seen, excluded.first_seen), 
+                last_seen = max(last_seen, excluded.last_seen), 
+                occurrences = occurrences + excluded.occurrences
+        """,
+            (month,),
+        )
+        return added
 
     @staticmethod
     def is_valid_ip(ip: str) -> bool:
@@ -324,7 +1378,7 @@ class SQLiteIPStorage:
             List of result tuples
         """
         try:
-            with sqlite3.connect(self.db_file) as conn:
+            with self._lock, self.conn as conn:
                 cursor = conn.cursor()
                 cursor.execute(query, params)
                 return cursor.fetchall()
@@ -354,6 +1408,9 @@ class SQLiteIPStorage:
         """
         Migrate existing JSON data to SQLite database.
 
+        Once a migration has completed, later calls return without reading the
+        files.
+
         Args:
             ip_file: Path to current IP JSON file
             history_file: Path to history JSON file
@@ -362,6 +1419,14 @@ class SQLiteIPStorage:
             bool: True if migration successful, False otherwise
         """
         try:
+            with self._reading() as conn:
+                migrated = conn.execute(
+                    "SELECT 1 FROM storage_meta WHERE key = 'json_migrated'"
+                ).fetchone()
+            if migrated:
+                logger.debug("JSON data already migrated to SQLite")
+                return True
+
             # Load existing JSON data
             current_ip_data = None
             if os.path.exists(ip_file):
@@ -373,39 +1438,59 @@ class SQLiteIPStorage:
                 with open(history_file) as f:
                     history_data = json.load(f)
 
-            with sqlite3.connect(self.db_file) as conn:
+            with self._lock, self.conn as conn:
                 cursor = conn.cursor()
 
                 # Migrate current IP
-                if current_ip_data and "ip" in current_ip_data:
+                if (
+                    current_ip_data
+                    and "ip" in current_ip_data
+                    and self.is_valid_ip(current_ip_data["ip"])
+                ):
                     cursor.execute("DELETE FROM current_ip")
                     cursor.execute(
                         """
-                        INSERT INTO current_ip (ip, timestamp) 
-                        VALUES (?, ?)
+                        INSERT INTO current_ip (ip, family, timestamp) 
+                        VALUES (?, ?, ?)
                     """,
                         (
-                            current_ip_data["ip"],
+                            *pack_ip(current_ip_data["ip"]),
                             current_ip_data.get(
                                 "timestamp", datetime.now().isoformat()
                             ),
                         ),
                     )
 
-                # Migrate history
+                # Migrate history, skipping records without a valid IP
                 if history_data:
+                    records = [
+                        (*pack_ip(record["ip"]), record["timestamp"])
+                        for record in history_data
+                        if "timestamp" in record
+                        and self.is_valid_ip(record.get("ip"))
+                    ]
                     cursor.execute("DELETE FROM ip_history")
-                    for record in history_data[-self.history_size :]:
-                        if "ip" in record and "timestamp" in record:
-                            cursor.execute(
-                                """
-                                INSERT INTO ip_history (ip, timestamp) 
-                                VALUES (?, ?)
-                            """,
-                                (record["ip"], record["timestamp"]),
-                            )
+                    cursor.executemany(
+                        """
+                        INSERT INTO ip_history (ip, family, timestamp) 
+                        VALUES (?, ?, ?)
+                    """,
+                        records[-self.history_size :],
+                    )
+                    for packed, family, timestamp in records:
+                        self._archive_record(cursor, packed, family, timestamp)
+
+                # Later startups skip the migration
+                cursor.execute(
+                    """
+                    INSERT OR REPLACE INTO storage_meta (key, value) 
+                    VALUES ('json_migrated', ?)
+                """,
+                    (datetime.now().isoformat(),),
+                )
 
                 conn.commit()
+                self._state_loaded = False
                 logger.info("Successfully migrated JSON data to SQLite")
                 return True
 
@@ -511,6 +1596,21 @@ class IPStorage:
                 )
         return []
 
+    def load_history_page(
+        self,
+        limit: int,
+        before: HistoryCursor | None = None,
+        start: str | None = None,
+        end: str | None = None,
+    ) -> tuple[list[dict[str, Any]], HistoryCursor | None]:
+        """
+        Load one page of the IP history, newest first.
+
+        The history file is read whole; cursors use the record's position in
+        it as the row id. See SQLiteIPStorage.load_history_page.
+        """
+        return page_history(self.load_ip_history(), limit, before, start, end)
+
     def save_ip_history(self, history: list[dict[str, Any]]) -> bool:
         """
         Save the IP address history to file.
@@ -606,3 +1706,592 @@ class IPStorage:
             return True
         except ValueError:
             return False
+
+    def close(self) -> None:
+        """Nothing to release: files are only open during each call."""
+
+
+class JSONLIPStorage(IPStorage):
+    """
+    IP storage that appends each IP change to a JSON Lines history file.
+
+    The current IP is the last record of the file, so an unchanged IP costs
+    no write and a change costs one appended line. An index of the byte
+    offsets of the last history-size lines is built once by scanning the
+    file from its end, so the last N records are read with one seek however
+    long the file has grown. Once the file exceeds the compaction threshold
+    it is rewritten atomically with only the indexed tail.
+    """
+
+    # Bytes read per block when scanning the file from its end
+    TAIL_BLOCK_SIZE = 4096
+
+    def __init__(
+        self, history_file: str, history_size: int, compact_bytes: int = 262144
+    ) -> None:
+        """
+        Initialize the storage handler.
+
+        Args:
+            history_file: Path to the JSON Lines file of IP changes, which
+                also holds the current IP
+            history_size: Maximum number of IP records to keep
+            compact_bytes: File size above which the file is compacted
+        """
+        super().__init__(history_file, history_file, history_size)
+        self.compact_bytes = compact_bytes
+        self._lock = Lock()
+        # Byte offsets of the last history-size lines, and the file size
+        self._offsets: deque[int] = deque(maxlen=history_size)
+        self._size = 0
+        self._last: dict[str, Any] | None = None
+        self._index_loaded = False
+
+    def _load_index(self) -> None:
+        """
+        Index the tail of the history file on first use.
+
+        A line cut short by a crash during an append is truncated away.
+        """
+        if self._index_loaded:
+            return
+        self._offsets.clear()
+        self._size = 0
+        self._last = None
+        if os.path.exists(self.history_file):
+            with open(self.history_file, "rb+") as f:
+                size = f.seek(0, os.SEEK_END)
+                newlines = self._scan_tail(f, size)
+                end = newlines[0] + 1 if newlines else 0
+                if end < size:
+                    logger.warning(
+                        f"Truncating {size - end} bytes of an incomplete record "
+                        f"from {self.history_file}"
+                    )
+                    f.truncate(end)
+                self._size = end
+            # Each line starts after the newline that ends the line before
+            # it; fewer newlines than that means the scan reached the start
+            starts = [offset + 1 for offset in newlines[1:]]
+            if len(newlines) <= self.history_size and self._size:
+                starts.append(0)
+            self._offsets.extend(reversed(starts))
+            records = self._read_tail()
+            self._last = records[-1] if records else None
+        self._index_loaded = True
+
+    def _scan_tail(self, f: Any, size: int) -> list[int]:
+        """
+        Find the offsets of the last newlines of a file, newest first.
+
+        Reading stops once one more newline than the history size is found.
+        """
+        newlines: list[int] = []
+        position = size
+        while position > 0 and len(newlines) <= self.history_size:
+            start = max(0, position - self.TAIL_BLOCK_SIZE)
+            f.seek(start)
+            block = f.read(position - start)
+            index = len(block)
+            while len(newlines) <= self.history_size:
+                index = block.rfind(b"\n", 0, index)
+                if index < 0:
+                    break
+                newlines.append(start + index)
+            position = start
+        return newlines
+
+    def _read_tail(self) -> list[dict[str, Any]]:
+        """Read the indexed records from the history file."""
+        if not self._offsets:
+            return []
+        with open(self.history_file, "rb") as f:
+            f.seek(self._offsets[0])
+            data = f.read(self._size - self._offsets[0])
+        records = []
+        for line in data.splitlines():
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                logger.warning(f"Skipping malformed line in {self.history_file}")
+        return records
+
+    def load_ip_history(self) -> list[dict[str, Any]]:
+        """
+        Load the last history-size IP changes.
+
+        Returns:
+            List of dictionaries containing IP addresses and timestamps
+        """
+        try:
+            with self._lock:
+                self._load_index()
+                records = self._read_tail()
+        except OSError as e:
+            logger.error(f"Error loading IP history: {e}")
+            service_health.record_failure(
+                "storage", f"Error loading IP history: {e}", "read_file"
+            )
+            return []
+        service_health.record_success("storage", "read_file")
+        return records
+
+    def load_last_ip(self) -> str | None:
+        """
+        Load the last known IP, the IP of the last record.
+
+        Returns:
+            IP address string or None if there is none
+        """
+        try:
+            with self._lock:
+                self._load_index()
+                last = self._last
+        except OSError as e:
+            logger.error(f"Error loading last IP: {e}")
+            service_health.record_failure(
+                "storage", f"Error loading last IP: {e}", "read_file"
+            )
+            return None
+        ip = last.get("ip") if last else None
+        return ip if ip and self.is_valid_ip(ip) else None
+
+    def save_current_ip(self, ip: str) -> bool:
+        """
+        Append the IP to the history file if it has changed.
+
+        Args:
+            ip: The IP address to save
+
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        if not self.is_valid_ip(ip):
+            logger.error(f"Invalid IP address: {ip}")
+            return False
+        record = {"ip": ip, "timestamp": datetime.now().isoformat()}
+        try:
+            with self._lock:
+                self._load_index()
+                if self._last is not None and self._last.get("ip") == ip:
+                    return True
+                self._append(record)
+                if self._size > self.compact_bytes and self._offsets[0]:
+                    self._compact()
+        except OSError as e:
+            logger.error(f"Error saving current IP: {e}")
+            service_health.record_failure(
+                "storage", f"Error saving current IP: {e}", "write_file"
+            )
+            return False
+        service_health.record_success("storage", "write_file")
+        return True
+
+    def save_ip_history(self, history: list[dict[str, Any]]) -> bool:
+        """
+        Replace the history file with the given history.
+
+        Args:
+            history: List of dictionaries containing IP addresses and timestamps
+
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        records = history[-self.history_size :]
+        lines = b"".join(self._encode(record) for record in records)
+        try:
+            with self._lock:
+                self._replace(lines)
+                self._index_loaded = False
+                self._load_index()
+        except (OSError, TypeError, ValueError) as e:
+            logger.error(f"Error saving IP history: {e}")
+            service_health.record_failure(
+                "storage", f"Error saving IP history: {e}", "write_file"
+            )
+            return False
+        service_health.record_success("storage", "write_file")
+        return True
+
+    @staticmethod
+    def _encode(record: dict[str, Any]) -> bytes:
+        """Encode a record as one line of the history file."""
+        return json.dumps(record, separators=(",", ":")).encode() + b"\n"
+
+    def _append(self, record: dict[str, Any]) -> None:
+        """Append a record to the history file and durably write it."""
+        line = self._encode(record)
+        directory = os.path.dirname(self.history_file)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.history_file, "ab") as f:
+            f.write(line)
+            f.flush()
+            os.fsync(f.fileno())
+        self._offsets.append(self._size)
+        self._size += len(line)
+        self._last = record
+
+    def _compact(self) -> None:
+        """Rewrite the history file with only its indexed tail."""
+        start = self._offsets[0]
+        with open(self.history_file, "rb") as f:
+            f.seek(start)
+            tail = f.read(self._size - start)
+        self._replace(tail)
+        self._offsets = deque(
+            (offset - start for offset in self._offsets), maxlen=self.history_size
+        )
+        self._size -= start
+        logger.info(f"Compacted {self.history_file} to {self._size} bytes")
+
+    def _replace(self, data: bytes) -> None:
+        """Atomically replace the history file's contents."""
+        directory = os.path.dirname(self.history_file) or "."
+        os.makedirs(directory, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=directory)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, self.history_file)
+        except BaseException:
+            with suppress(OSError):
+                os.remove(temp_path)
+            raise
+
+
+class MemoryIPStorage:
+    """
+    IP storage that keeps the current IP and history in memory only.
+
+    Nothing outlives the process, which suits tests and ephemeral containers
+    that rebuild their state on start.
+    """
+
+    def __init__(self, history_size: int) -> None:
+        """
+        Initialize the storage handler.
+
+        Args:
+            history_size: Maximum number of IP records to keep
+        """
+        self.history_size = history_size
+        self._lock = Lock()
+        self._current_ip: str | None = None
+        self._history: deque[dict[str, str]] = deque(maxlen=history_size)
+
+    def load_ip_history(self) -> list[dict[str, Any]]:
+        """
+        Load the IP address history.
+
+        Returns:
+            List of dictionaries containing IP addresses and timestamps
+        """
+        with self._lock:
+            return [dict(record) for record in self._history]
+
+    def load_history_page(
+        self,
+        limit: int,
+        before: HistoryCursor | None = None,
+        start: str | None = None,
+        end: str | None = None,
+    ) -> tuple[list[dict[str, Any]], HistoryCursor | None]:
+        """
+        Load one page of the IP history, newest first.
+
+        See SQLiteIPStorage.load_history_page.
+        """
+        return page_history(self.load_ip_history(), limit, before, start, end)
+
+    def save_ip_history(self, history: list[dict[str, Any]]) -> bool:
+        """
+        Replace the IP address history.
+
+        Args:
+            history: List of dictionaries containing IP addresses and timestamps
+
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        try:
+            records = [
+                {"ip": record["ip"], "timestamp": record["timestamp"]}
+                for record in history
+            ]
+        except (KeyError, TypeError) as e:
+            logger.error(f"Error saving IP history: {e}")
+            return False
+        with self._lock:
+            self._history = deque(records, maxlen=self.history_size)
+        return True
+
+    def load_last_ip(self) -> str | None:
+        """
+        Load the last known IP.
+
+        Returns:
+            IP address string or None if there is none
+        """
+        return self._current_ip
+
+    def save_current_ip(self, ip: str) -> bool:
+        """
+        Save the current IP and add it to the history if it has changed.
+
+        Args:
+            ip: The IP address to save
+
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        if not self.is_valid_ip(ip):
+            logger.error(f"Invalid IP address: {ip}")
+            return False
+        with self._lock:
+            if self._current_ip != ip:
+                self._history.append(
+                    {"ip": ip, "timestamp": datetime.now().isoformat()}
+                )
+                self._current_ip = ip
+        return True
+
+    is_valid_ip = staticmethod(IPStorage.is_valid_ip)
+
+    def close(self) -> None:
+        """Nothing to release."""
+
+
+# Factories building each storage backend from the configuration, by the
+# name selected with the STORAGE_BACKEND setting
+STORAGE_BACKENDS: dict[str, Callable[[AppConfig], IPStorageBackend]] = {
+    "sqlite": lambda config: SQLiteIPStorage(
+        db_file=config.db_file,
+        history_size=config.ip_history_size,
+        archive_retention_months=config.archive_retention_months,
+    ),
+    "jsonl": lambda config: JSONLIPStorage(
+        config.jsonl_history_file,
+        config.ip_history_size,
+        config.jsonl_compact_bytes,
+    ),
+    "memory": lambda config: MemoryIPStorage(config.ip_history_size),
+}
+
+
+def register_storage_backend(
+    name: str, factory: Callable[[AppConfig], IPStorageBackend]
+) -> None:
+    """
+    Register a storage backend, replacing any registered under the name.
+
+    Args:
+        name: Name selecting the backend in the configuration
+        factory: Builds the backend from the configuration
+    """
+    STORAGE_BACKENDS[name.lower()] = factory
+
+
+def create_storage(config: AppConfig) -> IPStorageBackend:
+    """
+    Build the storage backend selected by the configuration.
+
+    Args:
+        config: Application configuration
+
+    Returns:
+        The configured storage backend
+
+    Raises:
+        ValueError: If no backend is registered under the configured name
+    """
+    name = config.storage_backend.lower()
+    factory = STORAGE_BACKENDS.get(name)
+    if factory is None:
+        raise ValueError(
+            f"Unknown storage backend: {config.storage_backend}. "
+            f"Use one of: {', '.join(STORAGE_BACKENDS)}"
+        )
+    return factory(config)
+
+
+class StorageWorker:
+    """
+    Runs storage calls one at a time on a dedicated thread.
+
+    Calls are taken from a request queue in the order they were submitted. The
+    thread is started on first use and after stop(), so a worker can be shared
+    for the lifetime of the process.
+    """
+
+    def __init__(self, name: str) -> None:
+        """
+        Initialize the worker.
+
+        Args:
+            name: Name of the worker thread
+        """
+        self.name = name
+        self._lock = Lock()
+        self._requests: queue.SimpleQueue | None = None
+        self._thread: Thread | None = None
+
+    def submit(self, func: Callable[..., Any], *args: Any) -> Future:
+        """
+        Queue a call to run on the worker thread.
+
+        Args:
+            func: Function to call
+            *args: Positional arguments for the call
+
+        Returns:
+            Future resolved with the call's result or exception
+        """
+        future: Future = Future()
+        with self._lock:
+            if self._requests is None:
+                self._requests = queue.SimpleQueue()
+                self._thread = Thread(
+                    target=self._run,
+                    args=(self._requests,),
+                    name=self.name,
+                    daemon=True,
+                )
+                self._thread.start()
+            self._requests.put((future, func, args))
+        return future
+
+    async def run(self, func: Callable[..., Any], *args: Any) -> Any:
+        """
+        Run a call on the worker thread and wait for it without blocking the loop.
+
+        Args:
+            func: Function to call
+            *args: Positional arguments for the call
+
+        Returns:
+            The call's result; its exception is raised here
+        """
+        return await asyncio.wrap_future(self.submit(func, *args))
+
+    def stop(self, timeout: float | None = None) -> bool:
+        """
+        Stop the worker thread once the calls queued so far have run.
+
+        Args:
+            timeout: Maximum seconds to wait (None waits indefinitely)
+
+        Returns:
+            True if the thread has stopped, False on timeout
+        """
+        with self._lock:
+            requests, thread = self._requests, self._thread
+            self._requests = self._thread = None
+        if requests is None:
+            return True
+        requests.put(None)
+        thread.join(timeout)
+        return not thread.is_alive()
+
+    @staticmethod
+    def _run(requests: queue.SimpleQueue) -> None:
+        """Run queued calls until the stop marker is taken."""
+        while (request := requests.get()) is not None:
+            future, func, args = request
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                result = func(*args)
+            except BaseException as e:
+                future.set_exception(e)
+            else:
+                future.set_result(result)
+
+
+# Shared by every AsyncStorage: one thread owns writes, another serves reads
+storage_writer = StorageWorker("storage-writer")
+storage_reader = StorageWorker("storage-reader")
+
+
+class AsyncStorage:
+    """
+    Awaitable front end for IP storage that keeps disk I/O off the event loop.
+
+    Writes run in submission order on the single writer thread. Reads run on a
+    separate reader thread, so a lookup is not queued behind a slow write;
+    SQLiteIPStorage serves them from its own read connection.
+    """
+
+    def __init__(
+        self,
+        storage: IPStorageBackend,
+        writer: StorageWorker = storage_writer,
+        reader: StorageWorker = storage_reader,
+    ) -> None:
+        """
+        Initialize the facade.
+
+        Args:
+            storage: Storage whose calls are moved off the event loop
+            writer: Worker that runs writes
+            reader: Worker that runs reads
+        """
+        self.storage = storage
+        self.writer = writer
+        self.reader = reader
+
+    async def load_last_ip(self) -> str | None:
+        """Load the last known IP on the reader thread."""
+        return await self.reader.run(self.storage.load_last_ip)
+
+    async def load_ip_history(self) -> list[dict[str, Any]]:
+        """Load the IP history on the reader thread."""
+        return await self.reader.run(self.storage.load_ip_history)
+
+    async def save_current_ip(self, ip: str) -> bool:
+        """Save the current IP on the writer thread."""
+        return await self.writer.run(self.storage.save_current_ip, ip)
+
+    async def save_ip_history(self, history: list[dict[str, Any]]) -> bool:
+        """Replace the IP history on the writer thread."""
+        return await self.writer.run(self.storage.save_ip_history, history)
+
+    async def load_archive(
+        self, start: str | None = None, end: str | None = None, ip: str | None = None
+    ) -> list[dict[str, Any]]:
+        """Load archived IP changes on the reader thread."""
+        return await self.reader.run(self.storage.load_archive, start, end, ip)
+
+    async def load_history_page(
+        self,
+        limit: int,
+        before: HistoryCursor | None = None,
+        start: str | None = None,
+        end: str | None = None,
+    ) -> tuple[list[dict[str, Any]], HistoryCursor | None]:
+        """Load one page of IP history on the reader thread."""
+        return await self.reader.run(
+            self.storage.load_history_page, limit, before, start, end
+        )
+
+    async def load_rollups(
+        self, granularity: str = "day", start: str | None = None, end: str | None = None
+    ) -> list[dict[str, Any]]:
+        """Load the archive's change counts on the reader thread."""
+        return await self.reader.run(self.storage.load_rollups, granularity, start, end)
+
+    async def load_seen_ip(self, ip: str) -> dict[str, Any] | None:
+        """Look up when an IP was seen before on the reader thread."""
+        return await self.reader.run(self.storage.load_seen_ip, ip)
+
+    async def import_archive(self, records: Iterable[dict[str, Any]]) -> int:
+        """Add IP changes to the archive on the writer thread."""
+        return await self.writer.run(self.storage.import_archive, records)
+
+    async def close(self) -> None:
+        """Close the storage once the writes queued before this call have run."""
+        close = getattr(self.storage, "close", None)
+        if close is not None:
+            await self.writer.run(close)
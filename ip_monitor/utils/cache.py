@@ -5,18 +5,73 @@ This module provides a comprehensive caching layer that reduces API calls
 through intelligent TTL management, cache invalidation, and persistence.
 """
 
-import hashlib
+import asyncio
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Mapping
+import contextlib
+from enum import Enum
+import functools
+import heapq
 import json
 import logging
-import time
-from dataclasses import dataclass
-from enum import Enum
+import os
 from pathlib import Path
-from threading import Lock
+import sys
+from threading import Condition, Event, Lock, Thread
+import time
+from types import MappingProxyType
 from typing import Any
 
+from ip_monitor.utils.frequency_sketch import FrequencySketch
+
 logger = logging.getLogger(__name__)
 
+# Cache keys are (namespace, identifier) pairs; tuples hash cheaply and keep
+# the namespace addressable without string parsing
+CacheKey = tuple[str, str]
+
+# Read-only metadata shared by every entry that has none of its own
+EMPTY_METADATA: Mapping[str, Any] = MappingProxyType({})
+
+DEFAULT_STALE_THRESHOLD = 0.8
+
+# Decodes a single JSON value, e.g. just the key at the start of an entry line
+_JSON_DECODER = json.JSONDecoder()
+
+
+def estimate_size(value: Any, _seen: set[int] | None = None) -> int:
+    """
+    Approximate the memory footprint of a value in bytes.
+
+    Containers and object attributes (including slots) are sized recursively;
+    objects reachable more than once are only counted once, and enum members
+    and the empty metadata sentinel are treated as shared singletons.
+
+    Args:
+        value: Value to size
+
+    Returns:
+        Approximate size in bytes
+    """
+    if isinstance(value, Enum) or value is EMPTY_METADATA:
+        return 0
+    if _seen is None:
+        _seen = set()
+    if id(value) in _seen:
+        return 0
+    _seen.add(id(value))
+
+    if isinstance(value, dict):
+        children = (item for pair in value.items() for item in pair)
+    elif isinstance(value, list | tuple | set | frozenset):
+        children = value
+    elif hasattr(value, "__dict__"):
+        children = (vars(value),)
+    else:
+        slots = getattr(type(value), "__slots__", ())
+        children = (getattr(value, name, None) for name in slots)
+    return sys.getsizeof(value) + sum(estimate_size(child, _seen) for child in children)
+
 
 class CacheType(Enum):
     """Cache types for different data categories."""
@@ -26,32 +81,135 @@ class CacheType(Enum):
     DNS_LOOKUP = "dns_lookup"
     PERFORMANCE_DATA = "performance_data"
 
+    @classmethod
+    def coerce(cls, cache_type: "CacheType | str") -> "CacheType":
+        """
+        Resolve a cache type given as a member, its value or its name.
+
+        Raises:
+            ValueError: If cache_type does not name a cache type
+        """
+        if isinstance(cache_type, cls):
+            return cache_type
+        with contextlib.suppress(ValueError):
+            return cls(cache_type)
+        with contextlib.suppress(KeyError, TypeError):
+            return cls[cache_type]
+        valid = ", ".join(member.value for member in cls)
+        raise ValueError(
+            f"Unknown cache type {cache_type!r} (expected one of: {valid})"
+        )
+
+
+class AdmissionPolicy(Enum):
+    """Policies deciding which entries stay when the cache is full."""
+
+    LRU = "lru"
+    TINY_LFU = "tinylfu"
+
+
+@functools.lru_cache(maxsize=256)
+def _entry_policy(cache_type: CacheType, ttl: float) -> tuple[CacheType, float]:
+    """Return the (cache_type, ttl) pair shared by entries with that policy."""
+    return (cache_type, ttl)
+
 
-@dataclass
 class CacheEntry:
-    """Represents a single cache entry with metadata."""
+    """
+    Represents a single cache entry with metadata.
 
-    key: str
-    value: Any
-    created_at: float
-    last_accessed: float
-    access_count: int
-    ttl: float
-    cache_type: CacheType
-    metadata: dict[str, Any] = None
+    Entries are slotted and store only what cannot be derived: the expiry
+    deadline follows from created_at and ttl, and the cache keeps stale
+    deadlines and sizes in its own indexes. The cache type and TTL are held
+    as one pair shared by entries with the same policy, and entries without
+    metadata share the read-only EMPTY_METADATA mapping.
+    """
 
-    def __post_init__(self):
-        if self.metadata is None:
-            self.metadata = {}
+    __slots__ = (
+        "_policy",
+        "access_count",
+        "created_at",
+        "key",
+        "last_accessed",
+        "metadata",
+        "value",
+    )
+
+    def __init__(
+        self,
+        key: str,
+        value: Any,
+        created_at: float,
+        last_accessed: float,
+        access_count: int,
+        ttl: float,
+        cache_type: CacheType,
+        metadata: Mapping[str, Any] | None = None,
+    ) -> None:
+        self.key = key
+        self.value = value
+        self.created_at = created_at
+        self.last_accessed = last_accessed
+        self.access_count = access_count
+        self.metadata = metadata or EMPTY_METADATA
+        self._policy = _entry_policy(cache_type, ttl)
+
+    def __repr__(self) -> str:
+        return (
+            f"CacheEntry(key={self.key!r}, value={self.value!r}, "
+            f"ttl={self.ttl!r}, cache_type={self.cache_type})"
+        )
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, CacheEntry):
+            return NotImplemented
+        return self.to_tuple() == other.to_tuple()
+
+    __hash__ = None
+
+    @property
+    def cache_type(self) -> CacheType:
+        """Type of the cached data."""
+        return self._policy[0]
+
+    @property
+    def ttl(self) -> float:
+        """Time to live in seconds."""
+        return self._policy[1]
+
+    # Field order of the compact tuple layout used for serialization
+    TUPLE_FIELDS = (
+        "key",
+        "value",
+        "created_at",
+        "last_accessed",
+        "access_count",
+        "ttl",
+        "cache_type",
+        "metadata",
+    )
+
+    @property
+    def expires_at(self) -> float:
+        """Absolute time at which the entry expires."""
+        return self.created_at + self.ttl
+
+    def stale_at(self, stale_threshold: float = DEFAULT_STALE_THRESHOLD) -> float:
+        """Absolute time after which the entry is considered stale."""
+        return self.created_at + self.ttl * stale_threshold
 
     def is_expired(self) -> bool:
         """Check if the cache entry has expired."""
-        return time.time() - self.created_at > self.ttl
+        return time.time() > self.expires_at
+
+    def is_stale(self, stale_threshold: float = DEFAULT_STALE_THRESHOLD) -> bool:
+        """
+        Check if the cache entry is approaching expiration.
 
-    def is_stale(self, stale_threshold: float = 0.8) -> bool:
-        """Check if the cache entry is approaching expiration."""
-        age = time.time() - self.created_at
-        return age > (self.ttl * stale_threshold)
+        Args:
+            stale_threshold: Fraction of TTL after which the entry is stale
+        """
+        return time.time() > self.stale_at(stale_threshold)
 
     def touch(self) -> None:
         """Update last accessed time and increment access count."""
@@ -68,7 +226,7 @@ class CacheEntry:
             "access_count": self.access_count,
             "ttl": self.ttl,
             "cache_type": self.cache_type.value,
-            "metadata": self.metadata,
+            "metadata": dict(self.metadata),
         }
 
     @classmethod
@@ -82,9 +240,61 @@ class CacheEntry:
             access_count=data["access_count"],
             ttl=data["ttl"],
             cache_type=CacheType(data["cache_type"]),
-            metadata=data.get("metadata", {}),
+            metadata=data.get("metadata"),
+        )
+
+    def to_tuple(self) -> tuple:
+        """
+        Convert cache entry to a compact tuple for serialization.
+
+        Fields follow TUPLE_FIELDS; empty metadata is written as None.
+        """
+        return (
+            self.key,
+            self.value,
+            self.created_at,
+            self.last_accessed,
+            self.access_count,
+            self.ttl,
+            self.cache_type.value,
+            dict(self.metadata) if self.metadata else None,
         )
 
+    @classmethod
+    def from_tuple(cls, data: tuple | list) -> "CacheEntry":
+        """Create cache entry from the compact tuple layout."""
+        (
+            key,
+            value,
+            created_at,
+            last_accessed,
+            access_count,
+            ttl,
+            cache_type,
+            metadata,
+        ) = data
+        return cls(
+            key=key,
+            value=value,
+            created_at=created_at,
+            last_accessed=last_accessed,
+            access_count=access_count,
+            ttl=ttl,
+            cache_type=CacheType(cache_type),
+            metadata=metadata,
+        )
+
+
+# Bytes every cached entry costs whatever it holds: the slotted instance, its
+# (namespace, identifier) key tuple and its created_at float, which
+# last_accessed shares until the entry is first read. Policy pairs are shared
+# and not counted
+ENTRY_OVERHEAD = (
+    sys.getsizeof(object.__new__(CacheEntry))
+    + sys.getsizeof(("", ""))
+    + sys.getsizeof(0.0)
+)
+
 
 class IntelligentCache:
     """
@@ -92,26 +302,145 @@ class IntelligentCache:
 
     Features:
     - Configurable TTL per cache type
-    - Memory and persistent storage
+    - Memory and persistent storage (JSON file or SQLite tier)
     - Cache invalidation strategies
     - Performance metrics
     - Adaptive refresh policies
     - Thread-safe operations
+    - Entry-count and byte budgets, with optional TinyLFU admission
+    - Background persistence and lazy warm-up
+    - Single-flight computation for coroutines
     """
 
-    def __init__(self, cache_file: str = "cache.json", max_memory_size: int = 1000):
+    # Rebuild the deadline heaps once lazily-deleted items outnumber live ones
+    HEAP_COMPACTION_FACTOR = 2
+    HEAP_COMPACTION_MIN_SIZE = 64
+
+    # Cache files with these suffixes use the SQLite persistent tier, which
+    # only upserts changed entries on save and reads entries back on a miss
+    SQLITE_SUFFIXES = frozenset({".db", ".sqlite", ".sqlite3"})
+
+    # Version of the JSON cache file layout (3: a header line followed by
+    # one "<expires_at>\t<entry tuple>" line per entry)
+    CACHE_FILE_FORMAT = 3
+
+    # Entries decoded per lock acquisition while warming up
+    WARMUP_BATCH_SIZE = 500
+
+    # Share of max_memory_size given to the TinyLFU admission window
+    ADMISSION_WINDOW_RATIO = 0.01
+
+    # Seconds a maintenance run may spend sweeping expired entries, and the
+    # heap items examined per lock acquisition while sweeping
+    MAINTENANCE_TIME_BUDGET = 0.05
+    MAINTENANCE_SWEEP_SLICE = 256
+
+    def __init__(
+        self,
+        cache_file: str = "cache.json",
+        max_memory_size: int = 1000,
+        background_persistence: bool = False,
+        max_memory_bytes: int | None = None,
+        lazy_load: bool = False,
+        admission_policy: AdmissionPolicy = AdmissionPolicy.LRU,
+        memory_budgets: Mapping[CacheType | str, int] | None = None,
+    ):
         """
         Initialize the intelligent cache.
 
         Args:
-            cache_file: Path to persistent cache file
+            cache_file: Path to persistent cache file (JSON, or SQLite for
+                .db/.sqlite/.sqlite3 suffixes)
             max_memory_size: Maximum number of entries in memory cache
+            background_persistence: Write saves on a worker thread instead of
+                the calling thread
+            max_memory_bytes: Optional total byte budget for cached entries
+            lazy_load: Load persisted entries on a background thread instead
+                of in the constructor
+            admission_policy: Policy deciding which entries stay when full
+            memory_budgets: Optional byte budgets per cache type
         """
         self.cache_file = Path(cache_file)
         self.max_memory_size = max_memory_size
-        self.memory_cache: dict[str, CacheEntry] = {}
+        # Ordered by recency of use: least recently used entries come first
+        self.memory_cache: OrderedDict[CacheKey, CacheEntry] = OrderedDict()
         self.lock = Lock()
 
+        # Secondary index: namespace -> identifiers currently cached
+        self._namespaces: dict[str, set[str]] = {}
+        self._namespace_stats: dict[str, dict[str, int]] = {}
+
+        # Deadline indexes: (absolute deadline, key). Items are never removed
+        # eagerly; items of overwritten, refreshed or invalidated entries are
+        # skipped once they surface, so sweeps only touch due entries
+        self.stale_threshold = DEFAULT_STALE_THRESHOLD
+        self._expiry_heap: list[tuple[float, CacheKey]] = []
+        self._stale_heap: list[tuple[float, CacheKey]] = []
+        self._stale_keys: set[CacheKey] = set()
+
+        # Memory accounting. Each type keeps its keys in recency order for
+        # type budgets, mapped to the entry's accounted size in bytes
+        self.max_memory_bytes = max_memory_bytes
+        self.memory_budgets: dict[CacheType, int] = {
+            CacheType.coerce(cache_type): budget
+            for cache_type, budget in (memory_budgets or {}).items()
+        }
+        self.memory_bytes = 0
+        self._type_bytes: dict[CacheType, int] = dict.fromkeys(CacheType, 0)
+        self._type_order: dict[CacheType, OrderedDict[CacheKey, int]] = {
+            cache_type: OrderedDict() for cache_type in CacheType
+        }
+
+        # Optional SQLite tier. Changes not yet written are tagged with a
+        # change sequence number so a save only retires what it wrote:
+        # - _dirty: entries to upsert, kept even if evicted from memory
+        # - _pending_deletes: keys, namespaces, or None for a full clear
+        self.persistent_store = None
+        if self.cache_file.suffix in self.SQLITE_SUFFIXES:
+            from ip_monitor.utils.cache_store import SQLiteCacheStore
+
+            self.persistent_store = SQLiteCacheStore(self.cache_file)
+        self._change_seq = 0
+        self._dirty: dict[CacheKey, tuple[int, CacheEntry]] = {}
+        self._pending_deletes: dict[CacheKey | str | None, int] = {}
+
+        # TinyLFU admission: recent access frequencies and the window of new
+        # keys, least recently used first; the main region is everything else
+        self.admission_policy = AdmissionPolicy(admission_policy)
+        self._sketch: FrequencySketch | None = None
+        self._window: OrderedDict[CacheKey, None] = OrderedDict()
+        self._window_size = max(1, int(max_memory_size * self.ADMISSION_WINDOW_RATIO))
+        if self.admission_policy is AdmissionPolicy.TINY_LFU:
+            self._sketch = FrequencySketch(max_memory_size)
+
+        # Async single-flight: key -> task computing it, and remembered
+        # failures: key -> (deadline, exception or None for a None result)
+        self._inflight: dict[CacheKey, asyncio.Task] = {}
+        self._negative: dict[CacheKey, tuple[float, Exception | None]] = {}
+
+        # Lines of the JSON cache file not decoded yet, keyed by cache key.
+        # Lookups made while the file is still being indexed miss instead of
+        # waiting; keys, namespaces or a full clear (None) written meanwhile
+        # are recorded so the indexed lines cannot overwrite them.
+        self.lazy_load = lazy_load
+        self._unloaded: dict[CacheKey, str] = {}
+        self._index_ready = Event()
+        self._indexing_writes: set[CacheKey | str | None] | None = set()
+        self._warmup_thread: Thread | None = None
+
+        # Background persistence: saves snapshot under the lock and a worker
+        # thread writes them; a single slot holds the latest pending snapshot
+        self.background_persistence = background_persistence
+        self._persist_cond = Condition()
+        self._pending_snapshot: dict[str, Any] | None = None
+        self._persist_busy = False
+        self._persist_thread: Thread | None = None
+
+        # Counters at the end of the previous maintenance run, and the
+        # rollup of what changed between the two most recent runs
+        self._rollup_base: dict[str, int] = {}
+        self.last_maintenance: dict[str, Any] = {}
+
         # Default TTL values (in seconds)
         self.default_ttl = {
             CacheType.IP_RESULT: 300,  # 5 minutes
@@ -129,48 +458,341 @@ class IntelligentCache:
             "refreshes": 0,
             "saves": 0,
             "loads": 0,
+            "persistent_hits": 0,
+            "snapshots_coalesced": 0,
+            "computations": 0,
+            "coalesced": 0,
+            "negative_hits": 0,
+            "admission_rejections": 0,
+            "maintenance_runs": 0,
         }
 
         # Load existing cache
-        self._load_cache()
+        if lazy_load:
+            self._warmup_thread = Thread(
+                target=self._load_cache, name="cache-warmup", daemon=True
+            )
+            self._warmup_thread.start()
+        else:
+            self._load_cache()
 
-    def _generate_key(self, namespace: str, identifier: str) -> str:
+    def _generate_key(self, namespace: str, identifier: str) -> CacheKey:
         """Generate a unique cache key."""
-        combined = f"{namespace}:{identifier}"
-        return hashlib.sha256(combined.encode()).hexdigest()
+        return (namespace, identifier)
 
     def _get_original_key(self, namespace: str, identifier: str) -> str:
         """Get the original namespace:identifier key."""
         return f"{namespace}:{identifier}"
 
-    def _evict_expired(self) -> None:
-        """Remove expired entries from memory cache."""
-        expired_keys = []
+    def _insert_entry(self, key: CacheKey, entry: CacheEntry) -> None:
+        """Store an entry and index it by namespace, deadline and size."""
+        previous = self.memory_cache.get(key)
+        if previous is not None:
+            self._release(key, previous)
+        self.memory_cache[key] = entry
+        self._account(key, entry, self._entry_size(key, entry))
+        namespace, identifier = key
+        self._namespaces.setdefault(namespace, set()).add(identifier)
+        self._schedule(key, entry)
+
+    @staticmethod
+    def _entry_size(key: CacheKey, entry: CacheEntry) -> int:
+        """
+        Approximate an entry's footprint in bytes.
 
-        for key, entry in self.memory_cache.items():
-            if entry.is_expired():
-                expired_keys.append(key)
+        Only the value and metadata are sized recursively; the rest of the
+        entry has a fixed layout counted by ENTRY_OVERHEAD. Namespaces are
+        shared by many entries and are not counted.
+        """
+        size = (
+            ENTRY_OVERHEAD
+            + sys.getsizeof(key[1])
+            + sys.getsizeof(entry.key)
+            + estimate_size(entry.value)
+        )
+        if entry.metadata:
+            size += estimate_size(entry.metadata)
+        return size
+
+    def _account(self, key: CacheKey, entry: CacheEntry, size: int) -> None:
+        """Add an entry's size to the memory totals."""
+        self.memory_bytes += size
+        self._type_bytes[entry.cache_type] += size
+        self._type_order[entry.cache_type][key] = size
+
+    def _release(self, key: CacheKey, entry: CacheEntry) -> None:
+        """Remove an entry's size from the memory totals."""
+        size = self._type_order[entry.cache_type].pop(key, 0)
+        self.memory_bytes -= size
+        self._type_bytes[entry.cache_type] -= size
+
+    def _enforce_memory_budgets(self, cache_type: CacheType | None = None) -> None:
+        """
+        Evict least recently used entries until byte budgets are met.
+
+        The most recently used entry is never evicted, so a single entry
+        larger than its budget is still cached.
+
+        Args:
+            cache_type: Only enforce this type's budget (and the total budget)
+        """
+        cache_types = self.memory_budgets if cache_type is None else (cache_type,)
+        for budget_type in cache_types:
+            budget = self.memory_budgets.get(budget_type)
+            order = self._type_order[budget_type]
+            while (
+                budget is not None
+                and self._type_bytes[budget_type] > budget
+                and len(order) > 1
+            ):
+                # Like LRU eviction, unsaved entries stay queued for the store
+                key = next(iter(order))
+                self._unindex(key, self.memory_cache.pop(key))
+                self.stats["evictions"] += 1
+
+        if self.max_memory_bytes is None:
+            return
+        while self.memory_bytes > self.max_memory_bytes and len(self.memory_cache) > 1:
+            key, entry = self.memory_cache.popitem(last=False)
+            self._unindex(key, entry)
+            self.stats["evictions"] += 1
+
+    def _record_lookup(self, namespace: str, outcome: str) -> None:
+        """Count a hit or miss globally and for the namespace."""
+        self.stats[outcome] += 1
+        namespace_stats = self._namespace_stats.get(namespace)
+        if namespace_stats is None:
+            namespace_stats = self._namespace_stats[namespace] = {
+                "hits": 0,
+                "misses": 0,
+            }
+        namespace_stats[outcome] += 1
+
+    def _schedule(self, key: CacheKey, entry: CacheEntry) -> None:
+        """Index an entry's expiry and staleness deadlines."""
+        heapq.heappush(self._expiry_heap, (entry.expires_at, key))
+        heapq.heappush(self._stale_heap, (entry.stale_at(self.stale_threshold), key))
+        self._compact_heaps()
+
+    def _compact_heaps(self) -> None:
+        """Drop lazily-deleted heap items once they dominate the heaps."""
+        limit = max(
+            self.HEAP_COMPACTION_MIN_SIZE,
+            len(self.memory_cache) * self.HEAP_COMPACTION_FACTOR,
+        )
+        if len(self._expiry_heap) <= limit and len(self._stale_heap) <= limit:
+            return
+
+        self._expiry_heap = [
+            (entry.expires_at, key) for key, entry in self.memory_cache.items()
+        ]
+        self._stale_heap = [
+            (entry.stale_at(self.stale_threshold), key)
+            for key, entry in self.memory_cache.items()
+            if key not in self._stale_keys
+        ]
+        heapq.heapify(self._expiry_heap)
+        heapq.heapify(self._stale_heap)
+
+    def _remove_entry(self, key: CacheKey) -> None:
+        """Remove an entry from memory; its heap items are deleted lazily."""
+        entry = self.memory_cache.pop(key)
+        self._dirty.pop(key, None)
+        self._unindex(key, entry)
+
+    def _next_change(self) -> int:
+        """Get the next change sequence number."""
+        self._change_seq += 1
+        return self._change_seq
+
+    def _mark_dirty(self, key: CacheKey, entry: CacheEntry) -> None:
+        """Queue an entry for the next incremental save to the SQLite tier."""
+        if self.persistent_store is not None:
+            self._dirty[key] = (self._next_change(), entry)
+
+    def _mark_deleted(self, token: CacheKey | str | None) -> None:
+        """Queue a key, namespace or full clear for deletion from the SQLite tier."""
+        if self.persistent_store is not None:
+            self._pending_deletes[token] = self._next_change()
+
+    def _shadow_index(self, token: CacheKey | str | None) -> None:
+        """Keep lines still being indexed from overwriting a key, namespace or clear."""
+        if self._indexing_writes is not None:
+            self._indexing_writes.add(token)
+
+    def _is_pending_delete(self, key: CacheKey) -> bool:
+        """Check whether a persisted entry is shadowed by an unsaved deletion."""
+        deletes = self._pending_deletes
+        return bool(deletes) and (
+            None in deletes or key[0] in deletes or key in deletes
+        )
+
+    def _read_through(self, key: CacheKey) -> CacheEntry | None:
+        """
+        Load a persisted entry after a memory miss.
+
+        The entry is decoded from the cache file lines not loaded yet, or read
+        from the SQLite tier.
+
+        Args:
+            key: (namespace, identifier) cache key
+
+        Returns:
+            The entry, now also held in memory, or None if not persisted
+        """
+        line = self._unloaded.pop(key, None)
+        if line is not None:
+            try:
+                entry = self._decode_line(line)
+            except (ValueError, TypeError) as e:
+                logger.warning(f"Skipping unreadable cache entry {key}: {e}")
+                return None
+        elif self.persistent_store is None:
+            return None
+        else:
+            entry = self._read_from_store(key)
+
+        if entry is None or entry.is_expired():
+            return None
+
+        self._insert_new_entry(key, entry)
+        self._enforce_memory_budgets(entry.cache_type)
+        self.stats["persistent_hits"] += 1
+        return entry
+
+    def _read_from_store(self, key: CacheKey) -> CacheEntry | None:
+        """Read an entry from the SQLite tier, honoring unsaved changes."""
+        # An unsaved entry evicted from memory is newer than its stored row
+        pending = self._dirty.get(key)
+        if pending is not None:
+            return pending[1]
+        if self._is_pending_delete(key):
+            return None
+        try:
+            return self.persistent_store.get(*key)
+        except Exception as e:
+            logger.error(f"Failed to read cache entry from store: {e}")
+            return None
+
+    def _unindex(self, key: CacheKey, entry: CacheEntry) -> None:
+        """Drop a removed entry from the indexes and memory totals."""
+        self._release(key, entry)
+        self._stale_keys.discard(key)
+        self._window.pop(key, None)
+        namespace, identifier = key
+        identifiers = self._namespaces.get(namespace)
+        if identifiers is not None:
+            identifiers.discard(identifier)
+            if not identifiers:
+                del self._namespaces[namespace]
+
+    def _evict_expired(self, now: float | None = None, limit: int | None = None) -> int:
+        """
+        Remove expired entries from memory cache.
+
+        Only heap items whose deadline has passed are examined, so the cost is
+        proportional to the number of due entries rather than the cache size.
+
+        Args:
+            now: Current time (defaults to time.time())
+            limit: Maximum number of heap items to examine (None for no limit)
 
-        for key in expired_keys:
-            del self.memory_cache[key]
+        Returns:
+            Number of entries evicted
+        """
+        if now is None:
+            now = time.time()
+
+        heap = self._expiry_heap
+        evicted = 0
+        examined = 0
+        while heap and heap[0][0] < now:
+            if limit is not None and examined >= limit:
+                break
+            examined += 1
+            deadline, key = heapq.heappop(heap)
+            entry = self.memory_cache.get(key)
+            # Skip items superseded by an overwrite, refresh or invalidation
+            if entry is None or entry.expires_at != deadline:
+                continue
+
+            self._remove_entry(key)
             self.stats["evictions"] += 1
+            evicted += 1
+
+        return evicted
+
+    def _collect_stale(self, now: float) -> None:
+        """Move entries whose stale deadline has passed into the stale set."""
+        heap = self._stale_heap
+        while heap and heap[0][0] < now:
+            deadline, key = heapq.heappop(heap)
+            entry = self.memory_cache.get(key)
+            if entry is None or entry.stale_at(self.stale_threshold) != deadline:
+                continue
+            self._stale_keys.add(key)
 
     def _evict_lru(self) -> None:
         """Evict least recently used entries when cache is full."""
         if len(self.memory_cache) >= self.max_memory_size:
-            # Sort by last accessed time and remove oldest
-            sorted_items = sorted(
-                self.memory_cache.items(), key=lambda x: x[1].last_accessed
-            )
+            # Remove 10% of cache or at least 1 entry, oldest first
+            evict_count = max(1, len(self.memory_cache) // 10)
 
-            # Remove 10% of cache or at least 1 entry
-            evict_count = max(1, len(sorted_items) // 10)
-
-            for i in range(evict_count):
-                key, _ = sorted_items[i]
-                del self.memory_cache[key]
+            for _ in range(evict_count):
+                key, entry = self.memory_cache.popitem(last=False)
+                self._unindex(key, entry)
                 self.stats["evictions"] += 1
 
+    def _insert_new_entry(self, key: CacheKey, entry: CacheEntry) -> None:
+        """Insert an entry for a key not in memory, making room per policy."""
+        if self._sketch is None:
+            self._evict_lru()
+            self._insert_entry(key, entry)
+            return
+
+        self._insert_entry(key, entry)
+        self._window[key] = None
+        self._admit_from_window()
+
+    def _admit_from_window(self) -> None:
+        """
+        Move entries out of the admission window, evicting per TinyLFU.
+
+        New entries enter a small window LRU. When the cache is full, the
+        entry leaving the window is only admitted to the main region if it
+        has been accessed more often recently than the main region's least
+        recently used entry, which is evicted instead. Frequencies come from
+        an aging count-min sketch, so a burst of one-off keys cannot flush out
+        frequently used entries.
+        """
+        while len(self._window) > self._window_size:
+            candidate = next(iter(self._window))
+            if len(self.memory_cache) <= self.max_memory_size:
+                del self._window[candidate]
+                continue
+
+            # Compete with the main region's least recently used entry
+            victim = next(
+                (key for key in self.memory_cache if key not in self._window),
+                None,
+            )
+            del self._window[candidate]
+            if victim is None or (
+                self._sketch.estimate(candidate) <= self._sketch.estimate(victim)
+            ):
+                self.stats["admission_rejections"] += 1
+                victim = candidate
+            self._evict_key(victim)
+
+        # The window can only be under its size if entries left it early
+        while len(self.memory_cache) > self.max_memory_size:
+            self._evict_key(next(iter(self.memory_cache)))
+
+    def _evict_key(self, key: CacheKey) -> None:
+        """Evict one entry from memory, keeping any unsaved change."""
+        self._unindex(key, self.memory_cache.pop(key))
+        self.stats["evictions"] += 1
+
     def get(
         self,
         namespace: str,
@@ -191,20 +813,29 @@ class IntelligentCache:
         key = self._generate_key(namespace, identifier)
 
         with self.lock:
+            if self._sketch is not None:
+                self._sketch.increment(key)
+
             entry = self.memory_cache.get(key)
+            if entry is None:
+                entry = self._read_through(key)
 
             if entry is None:
-                self.stats["misses"] += 1
+                self._record_lookup(namespace, "misses")
                 return None
 
             if entry.is_expired():
-                del self.memory_cache[key]
-                self.stats["misses"] += 1
+                self._remove_entry(key)
+                self._record_lookup(namespace, "misses")
                 self.stats["evictions"] += 1
                 return None
 
             entry.touch()
-            self.stats["hits"] += 1
+            self.memory_cache.move_to_end(key)
+            self._type_order[entry.cache_type].move_to_end(key)
+            if key in self._window:
+                self._window.move_to_end(key)
+            self._record_lookup(namespace, "hits")
             logger.debug(f"Cache hit for {namespace}:{identifier}")
             return entry.value
 
@@ -213,7 +844,7 @@ class IntelligentCache:
         namespace: str,
         identifier: str,
         value: Any,
-        cache_type: CacheType = CacheType.IP_RESULT,
+        cache_type: CacheType | str = CacheType.IP_RESULT,
         ttl: float | None = None,
         metadata: dict[str, Any] | None = None,
     ) -> None:
@@ -224,10 +855,19 @@ class IntelligentCache:
             namespace: Cache namespace
             identifier: Unique identifier within namespace
             value: Value to cache
-            cache_type: Type of cache entry
+            cache_type: Type of cache entry, as a member or its value or name
             ttl: Time to live in seconds (uses default if None)
             metadata: Additional metadata to store
+
+        Raises:
+            ValueError: If the namespace contains ':' or the cache type is
+                unknown
         """
+        # The cache file splits "namespace:identifier" on the first colon
+        if ":" in namespace:
+            raise ValueError(f"Cache namespace must not contain ':': {namespace!r}")
+        cache_type = CacheType.coerce(cache_type)
+
         key = self._generate_key(namespace, identifier)
         original_key = self._get_original_key(namespace, identifier)
 
@@ -243,19 +883,163 @@ class IntelligentCache:
             access_count=1,
             ttl=ttl,
             cache_type=cache_type,
-            metadata=metadata or {},
+            metadata=metadata,
         )
 
         with self.lock:
-            # Clean up expired entries
-            self._evict_expired()
+            # Clean up entries whose deadline has passed
+            self._evict_expired(current_time)
+
+            if self._sketch is not None:
+                self._sketch.increment(key)
+
+            if key in self.memory_cache:
+                # Overwrite in place; stale heap items for the old entry are skipped
+                self._stale_keys.discard(key)
+                self.memory_cache.move_to_end(key)
+                if key in self._window:
+                    self._window.move_to_end(key)
+                self._insert_entry(key, entry)
+            else:
+                # Makes room first if the cache is full
+                self._insert_new_entry(key, entry)
+            self._enforce_memory_budgets(cache_type)
+            self._mark_dirty(key, entry)
+            self._unloaded.pop(key, None)
+            self._shadow_index(key)
+            self._negative.pop(key, None)
+            logger.debug(f"Cache set for {namespace}:{identifier}, TTL: {ttl}s")
 
-            # Evict LRU if cache is full
-            if len(self.memory_cache) >= self.max_memory_size:
-                self._evict_lru()
+    async def get_or_compute(
+        self,
+        namespace: str,
+        identifier: str,
+        factory: Callable[[], Awaitable[Any]],
+        cache_type: CacheType = CacheType.IP_RESULT,
+        ttl: float | None = None,
+        metadata: dict[str, Any] | None = None,
+        negative_ttl: float | None = None,
+        refresh: bool = False,
+    ) -> Any | None:
+        """
+        Get a value from the cache, computing and caching it on a miss.
 
-            self.memory_cache[key] = entry
-            logger.debug(f"Cache set for {namespace}:{identifier}, TTL: {ttl}s")
+        Concurrent callers for the same key share one call to factory: the
+        first starts it and the others await its result. A failed computation
+        (factory raising or returning None) is remembered for negative_ttl
+        seconds, during which callers get the same outcome without calling
+        factory again.
+
+        Args:
+            namespace: Cache namespace
+            identifier: Unique identifier within namespace
+            factory: Coroutine function producing the value
+            cache_type: Type of cache entry
+            ttl: Time to live in seconds (uses default if None)
+            metadata: Additional metadata to store
+            negative_ttl: Seconds to remember a failure (None disables)
+            refresh: Recompute even if a cached value exists
+
+        Returns:
+            Cached or computed value, or None if the computation failed
+
+        Raises:
+            Exception: Whatever factory raised, also for remembered failures
+        """
+        key = self._generate_key(namespace, identifier)
+
+        if not refresh:
+            value = self.get(namespace, identifier, cache_type)
+            if value is not None:
+                return value
+
+        with self.lock:
+            failure = self._negative.get(key)
+            if failure is not None and failure[0] < time.time():
+                del self._negative[key]
+                failure = None
+            if failure is not None:
+                self.stats["negative_hits"] += 1
+
+        if failure is not None:
+            if failure[1] is not None:
+                raise failure[1]
+            return None
+
+        loop = asyncio.get_running_loop()
+        task = self._inflight.get(key)
+        if task is not None and task.get_loop() is loop:
+            with self.lock:
+                self.stats["coalesced"] += 1
+        else:
+            task = loop.create_task(
+                self._compute(
+                    namespace,
+                    identifier,
+                    factory,
+                    cache_type,
+                    ttl,
+                    metadata,
+                    negative_ttl,
+                )
+            )
+            self._inflight[key] = task
+            task.add_done_callback(functools.partial(self._computation_done, key))
+
+        # A cancelled caller must not cancel the computation others await
+        return await asyncio.shield(task)
+
+    async def _compute(
+        self,
+        namespace: str,
+        identifier: str,
+        factory: Callable[[], Awaitable[Any]],
+        cache_type: CacheType,
+        ttl: float | None,
+        metadata: dict[str, Any] | None,
+        negative_ttl: float | None,
+    ) -> Any | None:
+        """Run a single-flight computation and cache its outcome."""
+        with self.lock:
+            self.stats["computations"] += 1
+
+        try:
+            value = await factory()
+        except Exception as e:
+            self._remember_failure(namespace, identifier, negative_ttl, e)
+            raise
+
+        if value is None:
+            self._remember_failure(namespace, identifier, negative_ttl, None)
+            return None
+
+        self.set(namespace, identifier, value, cache_type, ttl, metadata)
+        return value
+
+    def _remember_failure(
+        self,
+        namespace: str,
+        identifier: str,
+        negative_ttl: float | None,
+        error: Exception | None,
+    ) -> None:
+        """Remember a failed computation for negative_ttl seconds."""
+        if not negative_ttl:
+            return
+        key = self._generate_key(namespace, identifier)
+        with self.lock:
+            self._negative[key] = (time.time() + negative_ttl, error)
+        logger.debug(
+            f"Caching failure for {namespace}:{identifier} for {negative_ttl}s"
+        )
+
+    def _computation_done(self, key: CacheKey, task: asyncio.Task) -> None:
+        """Forget a finished single-flight computation."""
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # Mark the outcome as retrieved even if every caller was cancelled
+        if not task.cancelled():
+            task.exception()
 
     def invalidate(self, namespace: str, identifier: str | None = None) -> int:
         """
@@ -271,22 +1055,51 @@ class IntelligentCache:
         with self.lock:
             if identifier is not None:
                 key = self._generate_key(namespace, identifier)
+                removed = 0
                 if key in self.memory_cache:
-                    del self.memory_cache[key]
-                    self.stats["invalidations"] += 1
-                    return 1
-                return 0
-            # Invalidate entire namespace
-            keys_to_remove = []
-            for key, entry in self.memory_cache.items():
-                if entry.key.startswith(namespace + ":"):
-                    keys_to_remove.append(key)
-
-            for key in keys_to_remove:
-                del self.memory_cache[key]
-                self.stats["invalidations"] += 1
-
-            return len(keys_to_remove)
+                    self._remove_entry(key)
+                    removed = 1
+                elif (
+                    self._dirty.pop(key, None) is not None
+                    or self._unloaded.pop(key, None) is not None
+                ):
+                    removed = 1
+                self._negative.pop(key, None)
+                self._mark_deleted(key)
+                self._shadow_index(key)
+                self.stats["invalidations"] += removed
+                return removed
+            # Invalidate entire namespace via the index: O(entries in namespace)
+            identifiers = self._namespaces.pop(namespace, set())
+            for identifier in identifiers:
+                key = (namespace, identifier)
+                self._release(key, self.memory_cache.pop(key))
+                self._stale_keys.discard(key)
+                self._window.pop(key, None)
+
+            if self._dirty:
+                self._dirty = {
+                    key: pending
+                    for key, pending in self._dirty.items()
+                    if key[0] != namespace
+                }
+            if self._negative:
+                self._negative = {
+                    key: failure
+                    for key, failure in self._negative.items()
+                    if key[0] != namespace
+                }
+            if self._unloaded:
+                self._unloaded = {
+                    key: line
+                    for key, line in self._unloaded.items()
+                    if key[0] != namespace
+                }
+            self._mark_deleted(namespace)
+            self._shadow_index(namespace)
+
+            self.stats["invalidations"] += len(identifiers)
+            return len(identifiers)
 
     def get_stale_entries(self, namespace: str | None = None) -> list[CacheEntry]:
         """
@@ -299,11 +1112,20 @@ class IntelligentCache:
             List of stale cache entries
         """
         with self.lock:
+            now = time.time()
+            self._collect_stale(now)
+
             stale_entries = []
-            for entry in self.memory_cache.values():
-                if entry.is_stale() and not entry.is_expired():
-                    if namespace is None or entry.key.startswith(namespace + ":"):
-                        stale_entries.append(entry)
+            for key in list(self._stale_keys):
+                entry = self.memory_cache.get(key)
+                # Refreshed entries are rescheduled and leave the stale set
+                if entry is None or entry.stale_at(self.stale_threshold) >= now:
+                    self._stale_keys.discard(key)
+                    continue
+                if entry.expires_at < now:
+                    continue
+                if namespace is None or key[0] == namespace:
+                    stale_entries.append(entry)
             return stale_entries
 
     def refresh_entry(
@@ -328,11 +1150,26 @@ class IntelligentCache:
             if entry is None:
                 return False
 
-            entry.value = new_value
-            entry.touch()
-
+            # Replace rather than update the entry: pending snapshots hold
+            # references to entries and serialize them outside the lock
+            now = time.time()
+            refreshed = CacheEntry(
+                key=entry.key,
+                value=new_value,
+                created_at=now if extend_ttl else entry.created_at,
+                last_accessed=now,
+                access_count=entry.access_count + 1,
+                ttl=entry.ttl,
+                cache_type=entry.cache_type,
+                metadata=entry.metadata,
+            )
             if extend_ttl:
-                entry.created_at = time.time()
+                self._stale_keys.discard(key)
+            self._insert_entry(key, refreshed)
+            self.memory_cache.move_to_end(key)
+
+            self._mark_dirty(key, refreshed)
+            self._enforce_memory_budgets(refreshed.cache_type)
 
             self.stats["refreshes"] += 1
             logger.debug(f"Cache refreshed for {namespace}:{identifier}")
@@ -349,21 +1186,67 @@ class IntelligentCache:
                 "memory_entries": len(self.memory_cache),
                 "hit_rate": hit_rate,
                 "memory_usage_mb": self._estimate_memory_usage(),
+                "memory_bytes": self.memory_bytes,
+                "max_memory_bytes": self.max_memory_bytes,
+                "admission_policy": self.admission_policy.value,
+                "memory_by_type": {
+                    cache_type.value: {
+                        "entries": len(self._type_order[cache_type]),
+                        "bytes": self._type_bytes[cache_type],
+                        "budget": self.memory_budgets.get(cache_type),
+                    }
+                    for cache_type in CacheType
+                },
+                "namespaces": self._get_namespace_stats(),
+                "last_maintenance": dict(self.last_maintenance),
             }
 
+    def get_namespace_stats(self) -> dict[str, dict[str, Any]]:
+        """
+        Get per-namespace entry counts and hit rates.
+
+        Returns:
+            Dictionary mapping namespace to entries, hits, misses and hit_rate
+        """
+        with self.lock:
+            return self._get_namespace_stats()
+
+    def _get_namespace_stats(self) -> dict[str, dict[str, Any]]:
+        """Build per-namespace statistics; caller must hold the lock."""
+        namespace_stats = {}
+        for namespace in self._namespaces.keys() | self._namespace_stats.keys():
+            counters = self._namespace_stats.get(namespace, {"hits": 0, "misses": 0})
+            total_requests = counters["hits"] + counters["misses"]
+            namespace_stats[namespace] = {
+                "entries": len(self._namespaces.get(namespace, ())),
+                "hits": counters["hits"],
+                "misses": counters["misses"],
+                "hit_rate": counters["hits"] / total_requests
+                if total_requests > 0
+                else 0,
+            }
+        return namespace_stats
+
     def _estimate_memory_usage(self) -> float:
-        """Estimate memory usage in MB."""
-        # Rough estimation based on average entry size
-        avg_entry_size = 1024  # 1KB per entry estimate
-        return (len(self.memory_cache) * avg_entry_size) / (1024 * 1024)
+        """Get the accounted memory usage of cached entries in MB."""
+        return self.memory_bytes / (1024 * 1024)
 
     def cleanup(self) -> dict[str, int]:
         """Clean up expired entries and optimize cache."""
+        self._wait_for_index()
         with self.lock:
             initial_count = len(self.memory_cache)
-            self._evict_expired()
+            now = time.time()
+            self._evict_expired(now)
             final_count = len(self.memory_cache)
 
+            # Drop remembered failures that have run out
+            self._negative = {
+                key: failure
+                for key, failure in self._negative.items()
+                if failure[0] >= now
+            }
+
             cleaned = initial_count - final_count
 
             # Save to disk after cleanup
@@ -371,54 +1254,401 @@ class IntelligentCache:
 
             return {"entries_cleaned": cleaned, "entries_remaining": final_count}
 
-    def _save_cache(self) -> None:
-        """Save cache to persistent storage."""
-        try:
-            cache_data = {
-                "entries": [entry.to_dict() for entry in self.memory_cache.values()],
-                "stats": self.stats,
-                "saved_at": time.time(),
+    def run_maintenance(self, time_budget: float | None = None) -> dict[str, Any]:
+        """
+        Run one incremental maintenance pass.
+
+        Expired entries are swept in slices, releasing the lock between
+        slices, until none are due or the time budget runs out; a backlog
+        left over is picked up by the next run. The cache is then snapshotted
+        and the counters accumulated since the previous run are rolled up
+        into last_maintenance.
+
+        Args:
+            time_budget: Seconds the sweep may take (defaults to
+                MAINTENANCE_TIME_BUDGET)
+
+        Returns:
+            The rollup of this run, as stored in last_maintenance
+        """
+        if time_budget is None:
+            time_budget = self.MAINTENANCE_TIME_BUDGET
+        self._wait_for_index()
+
+        started = time.monotonic()
+        deadline = started + time_budget
+        cleaned = 0
+        while True:
+            with self.lock:
+                now = time.time()
+                cleaned += self._evict_expired(now, self.MAINTENANCE_SWEEP_SLICE)
+                heap = self._expiry_heap
+                sweep_complete = not (heap and heap[0][0] < now)
+            if sweep_complete or time.monotonic() >= deadline:
+                break
+
+        with self.lock:
+            now = time.time()
+            self._negative = {
+                key: failure
+                for key, failure in self._negative.items()
+                if failure[0] >= now
             }
+            self._compact_heaps()
 
-            with open(self.cache_file, "w") as f:
-                json.dump(cache_data, f, indent=2)
+            self.stats["maintenance_runs"] += 1
+            counters = ("hits", "misses", "evictions", "saves")
+            deltas = {
+                name: self.stats[name] - self._rollup_base.get(name, 0)
+                for name in counters
+            }
+            self._rollup_base = {name: self.stats[name] for name in counters}
+            lookups = deltas["hits"] + deltas["misses"]
+            self.last_maintenance = {
+                "ran_at": now,
+                "duration": time.monotonic() - started,
+                "entries_cleaned": cleaned,
+                "entries_remaining": len(self.memory_cache),
+                "sweep_complete": sweep_complete,
+                "interval_hits": deltas["hits"],
+                "interval_misses": deltas["misses"],
+                "interval_evictions": deltas["evictions"],
+                "interval_saves": deltas["saves"],
+                "interval_hit_rate": deltas["hits"] / lookups if lookups else 0,
+            }
+
+            self._save_cache()
+            return dict(self.last_maintenance)
+
+    def _save_cache(self) -> None:
+        """Save cache to persistent storage; caller must hold the lock."""
+        try:
+            snapshot = self._take_snapshot()
+            if self.background_persistence:
+                self._submit_snapshot(snapshot)
+                return
 
-            self.stats["saves"] += 1
-            logger.debug(f"Cache saved to {self.cache_file}")
+            self._write_snapshot(snapshot)
+            self._mark_persisted(snapshot)
         except Exception as e:
             logger.error(f"Failed to save cache: {e}")
 
+    def _take_snapshot(self) -> dict[str, Any]:
+        """
+        Capture the state to persist; caller must hold the lock.
+
+        Only entry references are taken here. Serializing them is left to
+        _write_snapshot, which may run on the persistence worker.
+        """
+        snapshot = {"stats": dict(self.stats), "saved_at": time.time()}
+        if self.persistent_store is not None:
+            snapshot["upserts"] = [
+                (key, seq, entry) for key, (seq, entry) in self._dirty.items()
+            ]
+            snapshot["deletes"] = dict(self._pending_deletes)
+        else:
+            # Lines not decoded yet are written back as they were read
+            snapshot["unloaded"] = list(self._unloaded.values())
+            snapshot["entries"] = list(self.memory_cache.values())
+        return snapshot
+
+    def _write_snapshot(self, snapshot: dict[str, Any]) -> None:
+        """Write a snapshot to disk; does not need the cache lock."""
+        if self.persistent_store is not None:
+            deletes = snapshot["deletes"]
+            written = self.persistent_store.apply_changes(
+                upserts=[(key, entry) for key, _, entry in snapshot["upserts"]],
+                deleted_keys=[token for token in deletes if isinstance(token, tuple)],
+                deleted_namespaces=[
+                    token for token in deletes if isinstance(token, str)
+                ],
+                clear=None in deletes,
+            )
+            purged = self.persistent_store.purge_expired()
+            self.persistent_store.save_stats(snapshot["stats"])
+            logger.debug(
+                f"Cache store {self.cache_file} updated: "
+                f"{written} entries written, {purged} expired entries purged"
+            )
+            return
+
+        # Entries use the compact tuple layout described by "fields"
+        header = {
+            "format": self.CACHE_FILE_FORMAT,
+            "fields": CacheEntry.TUPLE_FIELDS,
+            "stats": snapshot["stats"],
+            "saved_at": snapshot["saved_at"],
+        }
+
+        # Write to a temporary file and rename it over the cache file so a
+        # crash mid-write never leaves a truncated cache behind
+        temp_file = self.cache_file.with_name(f"{self.cache_file.name}.tmp")
+        with open(temp_file, "w") as f:
+            f.write(json.dumps(header, separators=(",", ":")) + "\n")
+            f.writelines(snapshot["unloaded"])
+            f.writelines(
+                self._encode_line(entry.expires_at, entry.to_tuple())
+                for entry in snapshot["entries"]
+            )
+            f.flush()
+            os.fsync(f.fileno())
+        temp_file.replace(self.cache_file)
+        logger.debug(f"Cache saved to {self.cache_file}")
+
+    def _mark_persisted(self, snapshot: dict[str, Any]) -> None:
+        """Retire changes written by a snapshot; caller must hold the lock."""
+        for key, seq, _ in snapshot.get("upserts", ()):
+            pending = self._dirty.get(key)
+            if pending is not None and pending[0] == seq:
+                del self._dirty[key]
+        for token, seq in snapshot.get("deletes", {}).items():
+            if self._pending_deletes.get(token) == seq:
+                del self._pending_deletes[token]
+        self.stats["saves"] += 1
+
+    def _submit_snapshot(self, snapshot: dict[str, Any]) -> None:
+        """Hand a snapshot to the persistence worker, replacing any pending one."""
+        with self._persist_cond:
+            if self._pending_snapshot is not None:
+                # Superseded snapshots are dropped; the newer one covers them
+                self.stats["snapshots_coalesced"] += 1
+            self._pending_snapshot = snapshot
+
+            if self._persist_thread is None or not self._persist_thread.is_alive():
+                self._persist_thread = Thread(
+                    target=self._persistence_worker,
+                    name="cache-persistence",
+                    daemon=True,
+                )
+                self._persist_thread.start()
+            self._persist_cond.notify_all()
+
+    def _persistence_worker(self) -> None:
+        """Write submitted snapshots until the process exits."""
+        while True:
+            with self._persist_cond:
+                while self._pending_snapshot is None:
+                    self._persist_cond.wait()
+                snapshot = self._pending_snapshot
+                self._pending_snapshot = None
+                self._persist_busy = True
+
+            try:
+                self._write_snapshot(snapshot)
+                with self.lock:
+                    self._mark_persisted(snapshot)
+            except Exception as e:
+                logger.error(f"Failed to save cache: {e}")
+            finally:
+                with self._persist_cond:
+                    self._persist_busy = False
+                    self._persist_cond.notify_all()
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """
+        Wait for background saves to reach disk.
+
+        Args:
+            timeout: Maximum seconds to wait (None waits indefinitely)
+
+        Returns:
+            True if no save is pending or in progress, False on timeout
+        """
+        with self._persist_cond:
+            return self._persist_cond.wait_for(
+                lambda: self._pending_snapshot is None and not self._persist_busy,
+                timeout,
+            )
+
+    @staticmethod
+    def _encode_line(expires_at: float, data: tuple) -> str:
+        """Encode an entry tuple as a cache file line prefixed by its deadline."""
+        return f"{expires_at!r}\t{json.dumps(data, separators=(',', ':'))}\n"
+
+    @staticmethod
+    def _decode_line(line: str) -> CacheEntry:
+        """Decode a cache file line back into an entry."""
+        return CacheEntry.from_tuple(json.loads(line.partition("\t")[2]))
+
+    def _install_index(self, lines: dict[CacheKey, str]) -> None:
+        """Publish indexed lines, minus any written or deleted while indexing."""
+        with self.lock:
+            writes = self._indexing_writes
+            self._indexing_writes = None
+            if writes:
+                lines = {
+                    key: line
+                    for key, line in lines.items()
+                    if None not in writes and key[0] not in writes and key not in writes
+                }
+            self._unloaded = lines
+            self._index_ready.set()
+
+    def _wait_for_index(self) -> None:
+        """Block until a lazily loaded cache file has been indexed."""
+        if not self._index_ready.is_set():
+            self._index_ready.wait()
+
+    def wait_for_warm_up(self, timeout: float | None = None) -> bool:
+        """
+        Wait for a lazy load to finish decoding persisted entries.
+
+        Args:
+            timeout: Maximum seconds to wait (None waits indefinitely)
+
+        Returns:
+            True if loading has finished, False on timeout
+        """
+        if self._warmup_thread is not None:
+            self._warmup_thread.join(timeout)
+            return not self._warmup_thread.is_alive()
+        return True
+
     def _load_cache(self) -> None:
         """Load cache from persistent storage."""
+        if self.persistent_store is not None:
+            # Entries are read through lazily; only stats are restored here
+            self._install_index({})
+            try:
+                purged = self.persistent_store.purge_expired()
+                self._restore_stats(self.persistent_store.load_stats())
+                logger.info(
+                    f"Cache store opened at {self.cache_file}: "
+                    f"{purged} expired entries purged"
+                )
+            except Exception as e:
+                logger.error(f"Failed to load cache: {e}")
+            return
+
         try:
             if not self.cache_file.exists():
                 return
 
-            with open(self.cache_file) as f:
-                cache_data = json.load(f)
+            stats, lines = self._index_cache_file()
+            self._install_index(lines)
+            self._restore_stats(stats)
+
+            loaded_count = self._decode_unloaded()
+            logger.info(f"Cache loaded from {self.cache_file}: {loaded_count} entries")
+        except Exception as e:
+            logger.error(f"Failed to load cache: {e}")
+        finally:
+            if not self._index_ready.is_set():
+                self._install_index({})
 
-            # Load entries, filtering out expired ones
-            loaded_count = 0
+    def _index_cache_file(self) -> tuple[dict[str, Any], dict[CacheKey, str]]:
+        """
+        Read the cache file into undecoded entry lines keyed by cache key.
 
-            for entry_data in cache_data.get("entries", []):
-                entry = CacheEntry.from_dict(entry_data)
-                if not entry.is_expired():
-                    # Generate hash key for storage from original key
-                    hash_key = hashlib.sha256(entry.key.encode()).hexdigest()
-                    self.memory_cache[hash_key] = entry
-                    loaded_count += 1
+        Expired entries are skipped by their deadline prefix, and only the key
+        of the remaining entries is decoded. Files written in the earlier
+        single-document layouts are decoded in full and converted.
 
-            # Load stats
-            if "stats" in cache_data:
-                self.stats.update(cache_data["stats"])
+        Returns:
+            The persisted statistics and the unexpired entry lines, least
+            recently used first
+        """
+        now = time.time()
+        lines: dict[CacheKey, str] = {}
+
+        with open(self.cache_file) as f:
+            try:
+                header = json.loads(f.readline())
+            except json.JSONDecodeError:
+                # A multi-line legacy document
+                f.seek(0)
+                header = json.load(f)
+            if header.get("format") != self.CACHE_FILE_FORMAT:
+                return self._convert_legacy_cache_data(header, now)
+
+            for line in f:
+                deadline, _, payload = line.partition("\t")
+                if float(deadline) < now:
+                    continue
+                # The entry key is the first element of the tuple
+                original_key = _JSON_DECODER.raw_decode(payload, 1)[0]
+                namespace, _, identifier = original_key.partition(":")
+                lines[(namespace, identifier)] = (
+                    line if line.endswith("\n") else line + "\n"
+                )
+
+        return header.get("stats", {}), lines
+
+    def _convert_legacy_cache_data(
+        self, cache_data: dict[str, Any], now: float
+    ) -> tuple[dict[str, Any], dict[CacheKey, str]]:
+        """Convert a single-document cache file into entry lines."""
+        # Entries are dictionaries before the tuple layout, tuples after it
+        entries = [
+            CacheEntry.from_dict(entry_data)
+            if isinstance(entry_data, dict)
+            else CacheEntry.from_tuple(entry_data)
+            for entry_data in cache_data.get("entries", [])
+        ]
+        entries = [entry for entry in entries if entry.expires_at >= now]
+        entries.sort(key=lambda entry: entry.last_accessed)
+
+        lines: dict[CacheKey, str] = {}
+        for entry in entries:
+            # Recover (namespace, identifier) from the original key
+            namespace, _, identifier = entry.key.partition(":")
+            lines[(namespace, identifier)] = self._encode_line(
+                entry.expires_at, entry.to_tuple()
+            )
+        return cache_data.get("stats", {}), lines
 
+    def _restore_stats(self, stats: dict[str, Any]) -> None:
+        """Add persisted statistics to those counted since startup."""
+        with self.lock:
+            for name, value in stats.items():
+                self.stats[name] = self.stats.get(name, 0) + value
+                # Restored history is not part of the first maintenance rollup
+                self._rollup_base[name] = self._rollup_base.get(name, 0) + value
             self.stats["loads"] += 1
-            logger.info(f"Cache loaded from {self.cache_file}: {loaded_count} entries")
-        except Exception as e:
-            logger.error(f"Failed to load cache: {e}")
+
+    def _decode_unloaded(self) -> int:
+        """
+        Decode indexed cache file lines into memory.
+
+        Lines are decoded in batches, most recently used first, releasing the
+        lock between batches so lookups are not held up by a large file.
+        Entries cached in the meantime are newer and are kept. Decoding stops
+        once the cache is full; the remaining lines are decoded on demand.
+
+        Returns:
+            Number of entries decoded
+        """
+        with self.lock:
+            keys = list(reversed(self._unloaded))
+
+        loaded = 0
+        for start in range(0, len(keys), self.WARMUP_BATCH_SIZE):
+            with self.lock:
+                for key in keys[start : start + self.WARMUP_BATCH_SIZE]:
+                    if len(self.memory_cache) >= self.max_memory_size:
+                        return loaded
+                    line = self._unloaded.pop(key, None)
+                    if line is None:
+                        continue
+                    try:
+                        entry = self._decode_line(line)
+                    except (ValueError, TypeError) as e:
+                        logger.warning(f"Skipping unreadable cache entry: {e}")
+                        continue
+                    if entry.is_expired():
+                        continue
+
+                    # Older than anything already cached: insert at the LRU end
+                    self._insert_entry(key, entry)
+                    self.memory_cache.move_to_end(key, last=False)
+                    self._type_order[entry.cache_type].move_to_end(key, last=False)
+                    loaded += 1
+                self._enforce_memory_budgets()
+        return loaded
 
     def save(self) -> None:
         """Explicitly save cache to disk."""
+        self._wait_for_index()
         with self.lock:
             self._save_cache()
 
@@ -427,9 +1657,61 @@ class IntelligentCache:
         with self.lock:
             count = len(self.memory_cache)
             self.memory_cache.clear()
+            self._namespaces.clear()
+            self._expiry_heap.clear()
+            self._stale_heap.clear()
+            self._stale_keys.clear()
+            self.memory_bytes = 0
+            self._type_bytes = dict.fromkeys(CacheType, 0)
+            for order in self._type_order.values():
+                order.clear()
+            self._dirty.clear()
+            self._pending_deletes.clear()
+            self._negative.clear()
+            self._unloaded.clear()
+            self._window.clear()
+            self._mark_deleted(None)
+            self._shadow_index(None)
             self.stats["invalidations"] += count
             return count
 
+    def set_stale_threshold(self, stale_threshold: float) -> None:
+        """Set the fraction of TTL after which entries are considered stale."""
+        with self.lock:
+            self.stale_threshold = stale_threshold
+            self._stale_keys.clear()
+            self._stale_heap = [
+                (entry.stale_at(stale_threshold), key)
+                for key, entry in self.memory_cache.items()
+            ]
+            heapq.heapify(self._stale_heap)
+        logger.debug(f"Stale threshold set to {stale_threshold}")
+
+    def set_memory_budget(
+        self, max_bytes: int | None, cache_type: CacheType | str | None = None
+    ) -> None:
+        """
+        Set the byte budget for the whole cache or for one cache type.
+
+        Args:
+            max_bytes: Budget in bytes (None removes the budget)
+            cache_type: Cache type to budget (None sets the total budget)
+        """
+        if cache_type is not None:
+            cache_type = CacheType.coerce(cache_type)
+        with self.lock:
+            if cache_type is None:
+                self.max_memory_bytes = max_bytes
+            elif max_bytes is None:
+                self.memory_budgets.pop(cache_type, None)
+            else:
+                self.memory_budgets[cache_type] = max_bytes
+            self._enforce_memory_budgets()
+        logger.debug(
+            f"Memory budget for {cache_type.value if cache_type else 'cache'} "
+            f"set to {max_bytes} bytes"
+        )
+
     def set_ttl(self, cache_type: CacheType, ttl: float) -> None:
         """Set default TTL for a cache type."""
         self.default_ttl[cache_type] = ttl
@@ -444,14 +1726,28 @@ def get_cache() -> IntelligentCache:
     """Get the global cache instance."""
     global _cache_instance
     if _cache_instance is None:
-        _cache_instance = IntelligentCache()
+        _cache_instance = IntelligentCache(background_persistence=True, lazy_load=True)
     return _cache_instance
 
 
 def initialize_cache(
-    cache_file: str = "cache.json", max_memory_size: int = 1000
+    cache_file: str = "cache.json",
+    max_memory_size: int = 1000,
+    background_persistence: bool = True,
+    max_memory_bytes: int | None = None,
+    lazy_load: bool = True,
+    admission_policy: AdmissionPolicy = AdmissionPolicy.LRU,
+    memory_budgets: Mapping[CacheType | str, int] | None = None,
 ) -> IntelligentCache:
     """Initialize the global cache instance with custom settings."""
     global _cache_instance
-    _cache_instance = IntelligentCache(cache_file, max_memory_size)
+    _cache_instance = IntelligentCache(
+        cache_file,
+        max_memory_size,
+        background_persistence=background_persistence,
+        max_memory_bytes=max_memory_bytes,
+        lazy_load=lazy_load,
+        admission_policy=admission_policy,
+        memory_budgets=memory_budgets,
+    )
     return _cache_instance
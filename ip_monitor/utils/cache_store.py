@@ -0,0 +1,233 @@
+"""
+SQLite-backed persistent tier for the intelligent cache.
+
+The store keeps one row per cache entry so that saves only write the entries
+that changed since the last save, expired rows are purged through an index on
+their deadline, and entries are read back lazily when the in-memory tier
+misses instead of being loaded wholesale at startup.
+"""
+
+from collections.abc import Iterable
+import json
+import logging
+from pathlib import Path
+import sqlite3
+from threading import Lock
+import time
+from typing import Any
+
+from ip_monitor.utils.cache import CacheEntry, CacheType
+
+logger = logging.getLogger(__name__)
+
+
+class SQLiteCacheStore:
+    """
+    Persistent (L2) cache tier stored in an SQLite table.
+
+    The connection is shared between the cache and its persistence worker
+    thread, so every operation is serialized by the store's own lock.
+    """
+
+    def __init__(self, db_file: str | Path) -> None:
+        """
+        Initialize the persistent cache store.
+
+        Args:
+            db_file: Path to the SQLite database file
+        """
+        self.db_file = Path(db_file)
+        self.conn = sqlite3.connect(str(self.db_file), check_same_thread=False)
+        self.lock = Lock()
+        self._init_database()
+
+    def _init_database(self) -> None:
+        """Create the cache tables and the expiry index if needed."""
+        with self.conn:
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS cache_entries (
+                    namespace TEXT NOT NULL,
+                    identifier TEXT NOT NULL,
+                    value TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_accessed REAL NOT NULL,
+                    access_count INTEGER NOT NULL,
+                    ttl REAL NOT NULL,
+                    cache_type TEXT NOT NULL,
+                    metadata TEXT NOT NULL,
+                    expires_at REAL NOT NULL,
+                    PRIMARY KEY (namespace, identifier)
+                )
+            """)
+            self.conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_cache_entries_expires_at
+                ON cache_entries(expires_at)
+            """)
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS cache_meta (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL
+                )
+            """)
+
+    def get(
+        self, namespace: str, identifier: str, now: float | None = None
+    ) -> CacheEntry | None:
+        """
+        Read a single unexpired entry.
+
+        Args:
+            namespace: Cache namespace
+            identifier: Unique identifier within namespace
+            now: Current time (defaults to time.time())
+
+        Returns:
+            The stored entry, or None if missing or expired
+        """
+        if now is None:
+            now = time.time()
+
+        with self.lock:
+            row = self.conn.execute(
+                """
+                SELECT value, created_at, last_accessed, access_count, ttl,
+                       cache_type, metadata
+                FROM cache_entries
+                WHERE namespace = ? AND identifier = ? AND expires_at >= ?
+                """,
+                (namespace, identifier, now),
+            ).fetchone()
+        if row is None:
+            return None
+
+        value, created_at, last_accessed, access_count, ttl, cache_type, metadata = row
+        return CacheEntry(
+            key=f"{namespace}:{identifier}",
+            value=json.loads(value),
+            created_at=created_at,
+            last_accessed=last_accessed,
+            access_count=access_count,
+            ttl=ttl,
+            cache_type=CacheType(cache_type),
+            metadata=json.loads(metadata),
+        )
+
+    def apply_changes(
+        self,
+        upserts: Iterable[tuple[tuple[str, str], CacheEntry]] = (),
+        deleted_keys: Iterable[tuple[str, str]] = (),
+        deleted_namespaces: Iterable[str] = (),
+        clear: bool = False,
+    ) -> int:
+        """
+        Apply deletions and then upserts in a single transaction.
+
+        Deletions are applied first, so an entry that was set again after
+        being invalidated survives.
+
+        Args:
+            upserts: (namespace, identifier) keys paired with their entries
+            deleted_keys: (namespace, identifier) keys to delete
+            deleted_namespaces: Namespaces to delete entirely
+            clear: Whether to delete every entry first
+
+        Returns:
+            Number of entries upserted
+        """
+        rows = [
+            (
+                namespace,
+                identifier,
+                json.dumps(entry.value),
+                entry.created_at,
+                entry.last_accessed,
+                entry.access_count,
+                entry.ttl,
+                entry.cache_type.value,
+                json.dumps(dict(entry.metadata)),
+                entry.expires_at,
+            )
+            for (namespace, identifier), entry in upserts
+        ]
+
+        with self.lock, self.conn:
+            if clear:
+                self.conn.execute("DELETE FROM cache_entries")
+            self.conn.executemany(
+                "DELETE FROM cache_entries WHERE namespace = ?",
+                [(namespace,) for namespace in deleted_namespaces],
+            )
+            self.conn.executemany(
+                "DELETE FROM cache_entries WHERE namespace = ? AND identifier = ?",
+                list(deleted_keys),
+            )
+            self.conn.executemany(
+                """
+                INSERT OR REPLACE INTO cache_entries (
+                    namespace, identifier, value, created_at, last_accessed,
+                    access_count, ttl, cache_type, metadata, expires_at
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                rows,
+            )
+        return len(rows)
+
+    def upsert_many(self, entries: Iterable[tuple[tuple[str, str], CacheEntry]]) -> int:
+        """
+        Insert or replace entries in a single transaction.
+
+        Args:
+            entries: (namespace, identifier) keys paired with their entries
+
+        Returns:
+            Number of entries written
+        """
+        return self.apply_changes(upserts=entries)
+
+    def purge_expired(self, now: float | None = None) -> int:
+        """
+        Delete expired entries using the expiry index.
+
+        Args:
+            now: Current time (defaults to time.time())
+
+        Returns:
+            Number of rows purged
+        """
+        if now is None:
+            now = time.time()
+        with self.lock, self.conn:
+            cursor = self.conn.execute(
+                "DELETE FROM cache_entries WHERE expires_at < ?", (now,)
+            )
+        return cursor.rowcount
+
+    def count(self) -> int:
+        """Get the number of stored entries, including not-yet-purged ones."""
+        with self.lock:
+            row = self.conn.execute("SELECT COUNT(*) FROM cache_entries").fetchone()
+        return row[0]
+
+    def save_stats(self, stats: dict[str, Any]) -> None:
+        """Persist cache statistics alongside the entries."""
+        with self.lock, self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO cache_meta (key, value) VALUES ('stats', ?)",
+                (json.dumps(stats),),
+            )
+
+    def load_stats(self) -> dict[str, Any]:
+        """Load persisted cache statistics, or an empty dict if none."""
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT value FROM cache_meta WHERE key = 'stats'"
+            ).fetchone()
+        return json.loads(row[0]) if row else {}
+
+    def close(self) -> None:
+        """Close the database connection."""
+        try:
+            with self.lock:
+                self.conn.close()
+        except sqlite3.Error as e:
+            logger.error(f"Failed to close cache store: {e}")
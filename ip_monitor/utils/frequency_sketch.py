@@ -0,0 +1,107 @@
+"""
+Approximate access-frequency tracking for cache admission decisions.
+
+This module provides the count-min sketch used by the TinyLFU admission
+policy of the intelligent cache. It estimates how often each key has been
+accessed recently in constant memory, regardless of how many distinct keys
+are seen.
+"""
+
+from collections.abc import Hashable
+import logging
+
+logger = logging.getLogger(__name__)
+
+_MASK64 = (1 << 64) - 1
+
+# Odd 64-bit constants mixed into the key hash, one per sketch row
+_ROW_SEEDS = (
+    0x9E3779B97F4A7C15,
+    0xC2B2AE3D27D4EB4F,
+    0x165667B19E3779F9,
+    0xD6E8FEB86659FD93,
+)
+
+# Translation table halving every counter in a row at once
+_HALVE = bytes(count >> 1 for count in range(256))
+
+
+class FrequencySketch:
+    """
+    Count-min sketch of recent access frequencies with periodic aging.
+
+    Each key increments one small counter in every row; its frequency is
+    estimated as the minimum of those counters, which can overestimate on
+    collisions but never underestimates. Counters saturate at MAX_COUNT.
+    After sample_size increments every counter is halved, so keys that
+    were popular long ago lose their advantage over recently popular ones.
+    """
+
+    MAX_COUNT = 15
+
+    # Counters per row per expected key, and the smallest row; keys outside
+    # the cache (e.g. one-off scans) are tracked too, so rows are kept wide
+    WIDTH_FACTOR = 4
+    MIN_WIDTH = 256
+
+    # Aging period as a multiple of the expected number of tracked keys
+    SAMPLE_FACTOR = 10
+
+    def __init__(self, capacity: int) -> None:
+        """
+        Initialize a frequency sketch.
+
+        Args:
+            capacity: Expected number of keys whose frequency matters,
+                usually the cache's maximum entry count
+        """
+        capacity = max(capacity, 1)
+        width = max(capacity * self.WIDTH_FACTOR, self.MIN_WIDTH)
+        self.width_bits = (width - 1).bit_length()
+        self.rows = [bytearray(1 << self.width_bits) for _ in _ROW_SEEDS]
+        self.sample_size = capacity * self.SAMPLE_FACTOR
+        self.additions = 0
+        self.resets = 0
+
+        logger.debug(
+            f"FrequencySketch initialized: {len(self.rows)} rows of "
+            f"{1 << self.width_bits} counters, aging every {self.sample_size}"
+        )
+
+    def _indexes(self, key: Hashable) -> list[int]:
+        """Get the counter index of a key in each row."""
+        h = hash(key) & _MASK64
+        shift = 64 - self.width_bits
+        return [((h ^ seed) * seed & _MASK64) >> shift for seed in _ROW_SEEDS]
+
+    def increment(self, key: Hashable) -> None:
+        """Record one access to a key."""
+        added = False
+        for row, index in zip(self.rows, self._indexes(key), strict=True):
+            if row[index] < self.MAX_COUNT:
+                row[index] += 1
+                added = True
+
+        if added:
+            self.additions += 1
+            if self.additions >= self.sample_size:
+                self._age()
+
+    def estimate(self, key: Hashable) -> int:
+        """Estimate how often a key has been accessed recently."""
+        return min(
+            row[index] for row, index in zip(self.rows, self._indexes(key), strict=True)
+        )
+
+    def _age(self) -> None:
+        """Halve every counter so old popularity fades."""
+        for i, row in enumerate(self.rows):
+            self.rows[i] = bytearray(row.translate(_HALVE))
+        self.additions //= 2
+        self.resets += 1
+
+    def clear(self) -> None:
+        """Forget all recorded accesses."""
+        for row in self.rows:
+            row[:] = bytes(len(row))
+        self.additions = 0
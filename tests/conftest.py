@@ -13,7 +13,7 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 
 @pytest.fixture
-def mock_config():
+def mock_config(tmp_path):
     """Create a mock configuration object."""
     config = Mock()
     config.check_interval = 300
@@ -30,9 +30,22 @@ def mock_config():
     config.cache_enabled = True
     config.cache_ttl = 300
     config.cache_max_memory_size = 1000
+    config.cache_stale_threshold = 0.8
+    config.cache_file = str(tmp_path / "cache.json")
+    config.cache_max_memory_bytes = 0
+    config.cache_type_memory_budgets = {}
+    config.cache_cleanup_interval = 300
     config.rate_limit_period = 300
     config.max_checks_per_period = 10
     config.ip_history_size = 10
+    config.storage_backend = "sqlite"
+    config.jsonl_history_file = str(tmp_path / "ip_history.jsonl")
+    config.jsonl_compact_bytes = 262144
+    config.archive_retention_months = 0
+    config.observation_log_enabled = False
+    config.backup_dir = str(tmp_path / "backups")
+    config.backup_interval_hours = 0
+    config.backup_keep = 7
     config.startup_message_enabled = True
     config.custom_apis_enabled = True
     config.connection_pool_size = 10
@@ -366,6 +379,8 @@ def sqlite_storage(temp_db_path):
 @pytest.fixture(scope="function")
 def sqlite_storage_with_data(sqlite_storage):
     """Create a SQLiteIPStorage instance with test data."""
+    from ip_monitor.storage import pack_ip
+
     # Insert test data
     test_ips = [
         ("192.168.1.1", "2023-01-01T12:00:00Z"),
@@ -377,14 +392,17 @@ def sqlite_storage_with_data(sqlite_storage):
         cursor = conn.cursor()
 
         # Add current IP
+        ip, timestamp = test_ips[-1]
         cursor.execute(
-            "INSERT INTO current_ip (ip, timestamp) VALUES (?, ?)", test_ips[-1]
+            "INSERT INTO current_ip (ip, family, timestamp) VALUES (?, ?, ?)",
+            (*pack_ip(ip), timestamp),
         )
 
         # Add history in reverse order so chronological order is correct
         for ip, timestamp in reversed(test_ips):
             cursor.execute(
-                "INSERT INTO ip_history (ip, timestamp) VALUES (?, ?)", (ip, timestamp)
+                "INSERT INTO ip_history (ip, family, timestamp) VALUES (?, ?, ?)",
+                (*pack_ip(ip), timestamp),
             )
 
         conn.commit()
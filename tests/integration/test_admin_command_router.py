@@ -33,13 +33,16 @@ class TestAdminCommandRouterIntegration:
 
     def test_initialization(self, admin_router):
         """Test that AdminCommandRouter initializes correctly."""
-        assert len(admin_router.handlers) == 5
-        assert len(admin_router.command_map) == 5
+        assert len(admin_router.handlers) == 6
+        assert len(admin_router.command_map) == 8
         assert "stop" in admin_router.command_map
         assert "config" in admin_router.command_map
         assert "queue" in admin_router.command_map
         assert "api" in admin_router.command_map
         assert "cache" in admin_router.command_map
+        assert "export" in admin_router.command_map
+        assert "import" in admin_router.command_map
+        assert "backup" in admin_router.command_map
 
     def test_check_admin_permissions(
         self, admin_router, mock_admin_message, mock_non_admin_message
@@ -259,7 +262,10 @@ class TestAdminCommandRouterIntegration:
         assert "queue" in commands
         assert "api" in commands
         assert "cache" in commands
-        assert len(commands) == 5
+        assert "export" in commands
+        assert "import" in commands
+        assert "backup" in commands
+        assert len(commands) == 8
 
     def test_get_handler_for_command(self, admin_router):
         """Test getting handler for specific command."""
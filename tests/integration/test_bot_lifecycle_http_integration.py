@@ -37,7 +37,7 @@ class TestBotLifecycleHTTPIntegration:
         Path(temp_path).unlink(missing_ok=True)
 
     @pytest.fixture
-    def mock_config(self, temp_db_path):
+    def mock_config(self, temp_db_path, tmp_path):
         """Create mock configuration."""
         config = Mock(spec=AppConfig)
         config.bot_token = "test_token"
@@ -54,11 +54,19 @@ class TestBotLifecycleHTTPIntegration:
         config.message_queue_max_size = 100
         config.cache_enabled = True
         config.cache_ttl = 60
+        config.cache_max_memory_size = 1000
+        config.cache_stale_threshold = 0.8
+        config.cache_file = str(tmp_path / "cache.json")
+        config.cache_max_memory_bytes = 0
+        config.cache_type_memory_budgets = {}
+        config.cache_cleanup_interval = 300
         config.startup_message_enabled = True
         config.custom_apis_enabled = True
         config.connection_timeout = 5.0
         config.read_timeout = 10.0
         config.ip_history_size = 10
+        config.archive_retention_months = 0
+        config.observation_log_enabled = False
         config.connection_pool_size = 10
         config.connection_pool_max_keepalive = 5
         config.rate_limit_period = 300
@@ -105,7 +113,7 @@ class TestBotLifecycleHTTPIntegration:
     async def bot_instance(self, mock_config, mock_discord_client, storage):
         """Create bot instance with mocked dependencies."""
         with patch("ip_monitor.bot.commands.Bot", return_value=mock_discord_client):
-            with patch("ip_monitor.bot.SQLiteIPStorage", return_value=storage):
+            with patch("ip_monitor.bot.create_storage", return_value=storage):
                 bot = IPMonitorBot(mock_config)
                 # Don't actually start the bot loop
                 bot.start_monitoring = AsyncMock()
@@ -7,16 +7,26 @@ and database performance.
 """
 
 import asyncio
+from dataclasses import dataclass
+import random
+import sqlite3
 import time
+import tracemalloc
+from typing import Any
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
 from ip_monitor.bot import IPMonitorBot
 from ip_monitor.ip_service import IPService
-from ip_monitor.storage import SQLiteIPStorage
+from ip_monitor.storage import AsyncStorage, SQLiteIPStorage, StorageWorker, pack_ip
 from ip_monitor.utils.async_rate_limiter import AsyncRateLimiter
-from ip_monitor.utils.cache import CacheType, IntelligentCache
+from ip_monitor.utils.cache import (
+    AdmissionPolicy,
+    CacheEntry,
+    CacheType,
+    IntelligentCache,
+)
 
 
 class TestPerformanceLoadTesting:
@@ -61,7 +71,9 @@ class TestPerformanceLoadTesting:
     @pytest.fixture
     def performance_storage(self):
         """Create storage for performance testing."""
-        storage = SQLiteIPStorage(":memory:", history_size=10)  # In-memory for performance
+        storage = SQLiteIPStorage(
+            ":memory:", history_size=10
+        )  # In-memory for performance
         yield storage
         storage.close()
 
@@ -418,6 +430,215 @@ class TestPerformanceCacheEfficiency:
             f"Too many entries remaining after cleanup: {remaining_entries}"
         )
 
+    @pytest.mark.asyncio
+    async def test_background_save_loop_lag(self, tmp_path):
+        """Test that background saves do not stall the event loop."""
+
+        async def max_loop_lag(cache: IntelligentCache) -> float:
+            """Save while a ticker measures the longest gap between ticks."""
+            lags = []
+            stop = asyncio.Event()
+
+            async def ticker():
+                while not stop.is_set():
+                    before = time.perf_counter()
+                    await asyncio.sleep(0)
+                    lags.append(time.perf_counter() - before)
+
+            task = asyncio.create_task(ticker())
+            await asyncio.sleep(0)
+            for _ in range(5):
+                cache.save()
+                await asyncio.sleep(0.001)
+            await asyncio.to_thread(cache.flush)
+            stop.set()
+            await task
+            return max(lags)
+
+        lags = {}
+        for background in (False, True):
+            cache = IntelligentCache(
+                cache_file=str(tmp_path / f"cache_{background}.json"),
+                max_memory_size=20000,
+                background_persistence=background,
+            )
+            for i in range(20000):
+                cache.set("lag_test", f"key_{i}", {"ip": f"10.0.{i % 256}.1"})
+            lags[background] = await max_loop_lag(cache)
+
+        print(
+            f"Max loop lag during saves: sync={lags[False] * 1000:.1f}ms, "
+            f"background={lags[True] * 1000:.1f}ms"
+        )
+        assert lags[True] < lags[False]
+        # Saving only takes entry references on the loop; the worker encodes
+        assert lags[True] < 0.05, (
+            f"Background save stalled the loop for {lags[True] * 1000:.1f}ms"
+        )
+
+    def test_cache_entry_memory_footprint(self):
+        """Test that slotted cache entries are smaller than dict-backed ones."""
+
+        @dataclass
+        class DictBackedEntry:
+            """The previous entry layout: instance __dict__ and own metadata."""
+
+            key: str
+            value: Any
+            created_at: float
+            last_accessed: float
+            access_count: int
+            ttl: float
+            cache_type: CacheType
+            metadata: dict = None
+            size: int = 0
+
+            def __post_init__(self):
+                if self.metadata is None:
+                    self.metadata = {}
+
+        def bytes_per_entry(entry_class, count=100_000):
+            keys = [f"ip_check:api_{i}" for i in range(count)]
+            tracemalloc.start()
+            baseline, _ = tracemalloc.get_traced_memory()
+            entries = []
+            for key in keys:
+                now = time.time()
+                entries.append(
+                    entry_class(
+                        key=key,
+                        value=None,
+                        created_at=now,
+                        last_accessed=now,
+                        access_count=1,
+                        ttl=300,
+                        cache_type=CacheType.IP_RESULT,
+                    )
+                )
+            current, _ = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            return (current - baseline) / count
+
+        dict_backed = bytes_per_entry(DictBackedEntry)
+        slotted = bytes_per_entry(CacheEntry)
+
+        print(
+            f"Bytes per entry at 100k entries: dict-backed={dict_backed:.0f}, "
+            f"slotted={slotted:.0f}"
+        )
+        assert slotted < dict_backed * 0.5
+
+    def test_cache_entry_expiry_check_speed(self):
+        """Test that expiry and staleness checks are fast."""
+        now = time.time()
+        entries = [
+            CacheEntry(
+                key=f"ip_check:api_{i}",
+                value=None,
+                created_at=now,
+                last_accessed=now,
+                access_count=1,
+                ttl=300,
+                cache_type=CacheType.IP_RESULT,
+            )
+            for i in range(100_000)
+        ]
+
+        start_time = time.perf_counter()
+        expired = sum(entry.is_expired() for entry in entries)
+        stale = sum(entry.is_stale() for entry in entries)
+        elapsed = time.perf_counter() - start_time
+
+        assert expired == 0
+        assert stale == 0
+        assert elapsed < 1.0, f"200k deadline checks took {elapsed:.3f}s"
+
+    def test_cache_startup_time(self, tmp_path):
+        """Test that a lazily loaded cache starts without parsing its file."""
+        cache_file = str(tmp_path / "cache.json")
+        cache = IntelligentCache(cache_file=cache_file, max_memory_size=50_000)
+        for i in range(20_000):
+            cache.set(
+                "ip_check",
+                f"api_{i}",
+                {"ip": f"10.0.{i % 256}.{i // 256}", "latency": [0.1, 0.2]},
+                metadata={"api_url": f"https://api{i}.example.com/ip"},
+            )
+        cache.save()
+
+        start_time = time.perf_counter()
+        IntelligentCache(cache_file=cache_file, max_memory_size=50_000)
+        eager_time = time.perf_counter() - start_time
+
+        start_time = time.perf_counter()
+        lazy = IntelligentCache(
+            cache_file=cache_file, max_memory_size=50_000, lazy_load=True
+        )
+        lazy_time = time.perf_counter() - start_time
+        # Lookups do not wait for the file to be indexed; until then they miss
+        lazy.get("ip_check", "api_0")
+        first_get_time = time.perf_counter() - start_time
+        assert lazy.wait_for_warm_up(timeout=30)
+        warm_time = time.perf_counter() - start_time
+        value = lazy.get("ip_check", "api_0")
+
+        print(
+            f"Cache startup with 20k entries: eager={eager_time * 1000:.1f}ms, "
+            f"lazy={lazy_time * 1000:.1f}ms, first get={first_get_time * 1000:.1f}ms, "
+            f"fully warm={warm_time * 1000:.1f}ms"
+        )
+        assert value == {"ip": "10.0.0.0", "latency": [0.1, 0.2]}
+        assert len(lazy.memory_cache) == 20_000
+        assert lazy_time < eager_time / 10
+
+    @staticmethod
+    def _bot_access_trace(seed: int = 7, length: int = 50_000) -> list:
+        """
+        Build an access trace shaped like the bot's cache traffic.
+
+        A fifth of lookups are for the current IP and the rest follow a
+        Zipf-like popularity over 400 keys, interrupted every 2000 lookups by
+        an `!api test all` style sweep of 150 keys that are never used again.
+        """
+        rng = random.Random(seed)
+        popular = [("stats", f"key_{i}") for i in range(400)]
+        weights = [1 / (rank + 1) for rank in range(len(popular))]
+
+        trace = []
+        for step in range(length):
+            if step % 2000 == 0:
+                sweep = step // 2000
+                trace.extend(("api_test", f"endpoint_{j}_{sweep}") for j in range(150))
+            if rng.random() < 0.2:
+                trace.append(("global", "current_ip"))
+            else:
+                trace.append(rng.choices(popular, weights)[0])
+        return trace
+
+    def test_admission_policy_hit_rates(self, tmp_path):
+        """Test that TinyLFU admission beats plain LRU on a scan-heavy trace."""
+        trace = self._bot_access_trace()
+        hit_rates = {}
+        for policy in AdmissionPolicy:
+            cache = IntelligentCache(
+                cache_file=str(tmp_path / f"{policy.value}.json"),
+                max_memory_size=100,
+                admission_policy=policy,
+            )
+            start_time = time.perf_counter()
+            for namespace, identifier in trace:
+                if cache.get(namespace, identifier) is None:
+                    cache.set(namespace, identifier, identifier, ttl=3600)
+            elapsed = time.perf_counter() - start_time
+
+            hit_rates[policy] = cache.stats["hits"] / len(trace)
+            print(
+                f"{policy.value}: hit rate {hit_rates[policy]:.1%}, "
+                f"{len(trace) / elapsed:,.0f} lookups/s"
+            )
+
+        assert hit_rates[AdmissionPolicy.TINY_LFU] > hit_rates[AdmissionPolicy.LRU]
+
 
 class TestPerformanceRateLimiting:
     """Test rate limiting performance under high frequency requests."""
@@ -728,6 +949,230 @@ class TestPerformanceDatabaseOperations:
             f"Average time per operation: {avg_time_per_op:.4f}s (should be < 0.075s)"
         )
 
+    def test_persistent_connection_throughput(self, tmp_path):
+        """Test that the persistent WAL connection beats connecting per call."""
+        operations = 500
+
+        # Previous behaviour: a fresh connection per call, rollback journal
+        baseline_db = str(tmp_path / "per_call.db")
+        SQLiteIPStorage(baseline_db, history_size=10).close()
+        with sqlite3.connect(baseline_db) as conn:
+            conn.execute("PRAGMA journal_mode=DELETE")
+
+        def per_call_check(ip: str) -> None:
+            conn = sqlite3.connect(baseline_db)
+            try:
+                with conn:
+                    conn.execute(
+                        "SELECT ip FROM current_ip ORDER BY created_at DESC LIMIT 1"
+                    ).fetchone()
+                    conn.execute("DELETE FROM current_ip")
+                    conn.execute(
+                        "INSERT INTO current_ip (ip, family, timestamp) VALUES (?, ?, ?)",
+                        (*pack_ip(ip), "2024-01-01T00:00:00"),
+                    )
+            finally:
+                conn.close()
+            conn = sqlite3.connect(baseline_db)
+            try:
+                conn.execute(
+                    "SELECT ip FROM current_ip ORDER BY created_at DESC LIMIT 1"
+                ).fetchone()
+            finally:
+                conn.close()
+
+        start_time = time.perf_counter()
+        for _ in range(operations):
+            per_call_check("192.168.1.1")
+        per_call_rate = operations / (time.perf_counter() - start_time)
+
+        storage = SQLiteIPStorage(str(tmp_path / "persistent.db"), history_size=10)
+        start_time = time.perf_counter()
+        for _ in range(operations):
+            storage.save_current_ip("192.168.1.1")
+            storage.load_last_ip()
+        persistent_rate = operations / (time.perf_counter() - start_time)
+        storage.close()
+
+        print(
+            f"Save+load checks/s: per-call connection={per_call_rate:,.0f}, "
+            f"persistent WAL connection={persistent_rate:,.0f} "
+            f"({persistent_rate / per_call_rate:.1f}x)"
+        )
+        assert persistent_rate > per_call_rate * 3
+
+    def test_history_trim_cost_independent_of_size(self, tmp_path):
+        """Test that saving a changed IP costs the same for any history size."""
+        saves = 200
+        timings = {}
+        for history_size in (10, 200_000):
+            storage = SQLiteIPStorage(
+                str(tmp_path / f"history_{history_size}.db"), history_size
+            )
+            with storage.conn as conn:
+                conn.executemany(
+                    "INSERT INTO ip_history (ip, family, timestamp) VALUES (?, ?, ?)",
+                    (
+                        ((10 << 24 | i).to_bytes(4, "big"), 4, f"{i}")
+                        for i in range(history_size)
+                    ),
+                )
+            storage.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            # Read the history into memory once, outside the timed saves
+            storage.load_last_ip()
+
+            start_time = time.perf_counter()
+            for i in range(saves):
+                storage.save_current_ip(f"192.168.{i // 256}.{i % 256}")
+            timings[history_size] = (time.perf_counter() - start_time) / saves
+            count = storage.conn.execute("SELECT COUNT(*) FROM ip_history")
+            assert count.fetchone()[0] == history_size
+            storage.close()
+
+        print(
+            f"Save with history trim: 10 rows={timings[10] * 1e6:.0f}us, "
+            f"200k rows={timings[200_000] * 1e6:.0f}us"
+        )
+        assert timings[200_000] < timings[10] * 5
+
+    def test_history_page_cost_independent_of_archive_size(self, tmp_path):
+        """Test that a page deep into the archive costs the same for any size."""
+        pages = 5
+        rounds = 20
+        timings = {}
+        for archive_size in (20_000, 200_000):
+            storage = SQLiteIPStorage(
+                str(tmp_path / f"archive_{archive_size}.db"), history_size=10
+            )
+            storage.save_current_ip("10.0.0.1")
+            month = storage.load_ip_history()[0]["timestamp"][:7]
+            with storage.conn as conn:
+                conn.executemany(
+                    f"INSERT INTO ip_archive_{month.replace('-', '_')} "
+                    "(ip, family, timestamp) VALUES (?, ?, ?)",
+                    (
+                        ((10 << 24 | i).to_bytes(4, "big"), 4, f"{month}-01T{i:09d}")
+                        for i in range(archive_size)
+                    ),
+                )
+
+            # Start halfway through the archive and page towards older entries
+            _, middle = storage.load_history_page(archive_size // 2)
+            start_time = time.perf_counter()
+            for _ in range(rounds):
+                cursor = middle
+                for _ in range(pages):
+                    page, cursor = storage.load_history_page(10, before=cursor)
+                    assert len(page) == 10
+            timings[archive_size] = (time.perf_counter() - start_time) / (
+                rounds * pages
+            )
+            storage.close()
+
+        print(
+            f"History page: 20k rows={timings[20_000] * 1e6:.0f}us, "
+            f"200k rows={timings[200_000] * 1e6:.0f}us"
+        )
+        assert timings[200_000] < timings[20_000] * 5
+
+    def test_seen_ip_lookup_cost_independent_of_archive_size(self, tmp_path):
+        """Test that checking whether an IP was seen before is an index lookup."""
+        lookups = 2000
+        timings = {}
+        for archive_size in (1_000, 100_000):
+            storage = SQLiteIPStorage(
+                str(tmp_path / f"seen_{archive_size}.db"), history_size=10
+            )
+            storage.save_ip_history(
+                [
+                    {
+                        "ip": f"2001:db8::{i >> 16:x}:{i & 0xFFFF:x}",
+                        "timestamp": f"2024-01-01T{i // 3600 % 24:02d}:"
+                        f"{i // 60 % 60:02d}:{i % 60:02d}.{i:06d}",
+                    }
+                    for i in range(archive_size)
+                ]
+            )
+
+            start_time = time.perf_counter()
+            for i in range(lookups):
+                address = i * 7 % archive_size
+                seen = storage.load_seen_ip(
+                    f"2001:db8::{address >> 16:x}:{address & 0xFFFF:x}"
+                )
+                assert seen["occurrences"] == 1
+            timings[archive_size] = (time.perf_counter() - start_time) / lookups
+            storage.close()
+
+        print(
+            f"Seen IP lookup: 1k changes={timings[1_000] * 1e6:.1f}us, "
+            f"100k changes={timings[100_000] * 1e6:.1f}us"
+        )
+        assert timings[100_000] < timings[1_000] * 5
+
+    @pytest.mark.asyncio
+    async def test_storage_loop_lag_under_lock_contention(self, tmp_path):
+        """Test that awaiting storage keeps the loop running during a slow write."""
+        storage = SQLiteIPStorage(str(tmp_path / "lag.db"), history_size=10)
+        writer = StorageWorker("lag-writer")
+        reader = StorageWorker("lag-reader")
+        async_storage = AsyncStorage(storage, writer=writer, reader=reader)
+        hold = 0.2
+
+        async def max_loop_lag(check) -> float:
+            """Run a check while another thread holds the write lock."""
+            lags = []
+            stop = asyncio.Event()
+            locked = asyncio.Event()
+            loop = asyncio.get_running_loop()
+
+            def hold_write_lock():
+                with storage._lock:
+                    loop.call_soon_threadsafe(locked.set)
+                    time.sleep(hold)
+
+            async def ticker():
+                while not stop.is_set():
+                    before = time.perf_counter()
+                    await asyncio.sleep(0)
+                    lags.append(time.perf_counter() - before)
+
+            contention = asyncio.create_task(asyncio.to_thread(hold_write_lock))
+            await locked.wait()
+            task = asyncio.create_task(ticker())
+            await asyncio.sleep(0)
+            await check()
+            stop.set()
+            await task
+            await contention
+            return max(lags)
+
+        async def sync_check():
+            storage.load_last_ip()
+            storage.save_current_ip("192.168.1.1")
+
+        async def async_check():
+            await async_storage.load_last_ip()
+            await async_storage.save_current_ip("192.168.1.2")
+
+        try:
+            sync_lag = await max_loop_lag(sync_check)
+            async_lag = await max_loop_lag(async_check)
+        finally:
+            await async_storage.close()
+            writer.stop(timeout=5)
+            reader.stop(timeout=5)
+
+        print(
+            f"Max loop lag during a check with the write lock held for "
+            f"{hold * 1000:.0f}ms: sync={sync_lag * 1000:.1f}ms, "
+            f"async={async_lag * 1000:.1f}ms"
+        )
+        assert sync_lag >= hold * 0.5
+        assert async_lag < 0.05, (
+            f"Awaited storage stalled the loop for {async_lag * 1000:.1f}ms"
+        )
+
     @pytest.mark.asyncio
     async def test_database_transaction_performance(self, performance_storage):
         """Test database transaction performance."""
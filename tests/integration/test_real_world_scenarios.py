@@ -73,6 +73,8 @@ class TestRealWorldScenarios:
         config.connection_timeout = 10.0
         config.read_timeout = 30.0
         config.ip_history_size = 10
+        config.archive_retention_months = 0
+        config.observation_log_enabled = False
         config.connection_pool_size = 10
         config.rate_limit_period = 300
         config.max_checks_per_period = 20
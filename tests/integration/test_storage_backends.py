@@ -0,0 +1,202 @@
+"""
+Conformance and benchmark suite shared by every registered storage backend.
+
+Each backend is built through create_storage from the same configuration,
+checked against the IPStorageBackend contract and then timed under one
+identical workload, so their results can be compared side by side.
+"""
+
+import statistics
+import time
+
+import pytest
+
+from ip_monitor.storage import (
+    STORAGE_BACKENDS,
+    IPStorageBackend,
+    create_storage,
+)
+
+HISTORY_SIZE = 10
+
+# Check cycles timed per backend, and how often the IP changes during them
+BENCHMARK_CYCLES = 300
+CHANGE_EVERY = 10
+
+
+@pytest.fixture(params=sorted(STORAGE_BACKENDS))
+def storage(request, mock_config, tmp_path):
+    """Each registered backend, built from the same configuration."""
+    mock_config.storage_backend = request.param
+    mock_config.db_file = str(tmp_path / "ip_monitor.db")
+    mock_config.jsonl_history_file = str(tmp_path / "ip_history.jsonl")
+    mock_config.ip_history_size = HISTORY_SIZE
+    storage = create_storage(mock_config)
+    yield storage
+    storage.close()
+
+
+def reopen(storage, mock_config):
+    """Build the backend again on the same files, if it keeps any."""
+    storage.close()
+    return create_storage(mock_config)
+
+
+class TestStorageBackendConformance:
+    """Every backend behaves the same through the storage protocol."""
+
+    def test_implements_protocol(self, storage):
+        """The backend provides every protocol operation."""
+        assert isinstance(storage, IPStorageBackend)
+        assert storage.history_size == HISTORY_SIZE
+
+    def test_empty_storage(self, storage):
+        """A new backend has no IP and no history."""
+        assert storage.load_last_ip() is None
+        assert storage.load_ip_history() == []
+        assert storage.load_history_page(5) == ([], None)
+
+    def test_changes_are_recorded_once(self, storage):
+        """Only changes of IP are added to the history."""
+        for ip in ("192.168.1.1", "192.168.1.1", "10.0.0.1", "2001:db8::1"):
+            assert storage.save_current_ip(ip) is True
+
+        assert storage.load_last_ip() == "2001:db8::1"
+        history = storage.load_ip_history()
+        assert [record["ip"] for record in history] == [
+            "192.168.1.1",
+            "10.0.0.1",
+            "2001:db8::1",
+        ]
+        assert all(record["timestamp"] for record in history)
+
+    def test_invalid_ip_is_rejected(self, storage):
+        """Saving something that is not an IP fails and changes nothing."""
+        storage.save_current_ip("192.168.1.1")
+
+        assert storage.save_current_ip("not-an-ip") is False
+        assert storage.is_valid_ip("not-an-ip") is False
+        assert storage.load_last_ip() == "192.168.1.1"
+        assert len(storage.load_ip_history()) == 1
+
+    def test_history_is_bounded(self, storage):
+        """Only the last history-size changes are kept, oldest first."""
+        for i in range(HISTORY_SIZE + 5):
+            storage.save_current_ip(f"10.0.0.{i}")
+
+        history = storage.load_ip_history()
+        assert [record["ip"] for record in history] == [
+            f"10.0.0.{i}" for i in range(5, HISTORY_SIZE + 5)
+        ]
+
+    def test_save_ip_history_replaces_history(self, storage):
+        """A saved history replaces the old one, trimmed to the history size."""
+        storage.save_current_ip("192.168.1.1")
+        history = [
+            {"ip": f"10.0.0.{i}", "timestamp": f"2024-01-{i + 1:02d}T08:00:00"}
+            for i in range(HISTORY_SIZE + 2)
+        ]
+
+        assert storage.save_ip_history(history) is True
+        assert storage.load_ip_history() == history[-HISTORY_SIZE:]
+
+    def test_history_pages(self, storage):
+        """Pages walk the history newest first and stop at the oldest change."""
+        history = [
+            {"ip": f"10.0.0.{i}", "timestamp": f"2024-01-{i + 1:02d}T08:00:00"}
+            for i in range(5)
+        ]
+        storage.save_ip_history(history)
+
+        first, cursor = storage.load_history_page(3)
+        assert [record["ip"] for record in first] == [
+            "10.0.0.4",
+            "10.0.0.3",
+            "10.0.0.2",
+        ]
+        second, cursor = storage.load_history_page(3, before=cursor)
+        assert [record["ip"] for record in second] == ["10.0.0.1", "10.0.0.0"]
+        assert cursor is None
+
+        window, _ = storage.load_history_page(10, start="2024-01-02", end="2024-01-04")
+        assert [record["ip"] for record in window] == ["10.0.0.2", "10.0.0.1"]
+
+    def test_durable_backends_survive_reopening(self, storage, mock_config):
+        """Backends on disk read back what they saved; memory starts over."""
+        storage.save_current_ip("192.168.1.1")
+        storage.save_current_ip("192.168.1.2")
+
+        reopened = reopen(storage, mock_config)
+        try:
+            if mock_config.storage_backend == "memory":
+                assert reopened.load_last_ip() is None
+            else:
+                assert reopened.load_last_ip() == "192.168.1.2"
+                assert len(reopened.load_ip_history()) == 2
+        finally:
+            reopened.close()
+
+
+def percentile(samples: list[float], percent: int) -> float:
+    """The given percentile of latency samples."""
+    return statistics.quantiles(samples, n=100, method="inclusive")[percent - 1]
+
+
+def run_workload(storage) -> dict[str, list[float]]:
+    """
+    Time one bot-like workload, returning each operation's latencies.
+
+    Each cycle is a check: save the current IP, then read it back. Every
+    CHANGE_EVERY cycles the IP changes and the history is read and paged,
+    as the notification and !history paths do.
+    """
+    latencies: dict[str, list[float]] = {
+        "save_current_ip": [],
+        "load_last_ip": [],
+        "load_ip_history": [],
+        "load_history_page": [],
+    }
+
+    def timed(name, func, *args):
+        start = time.perf_counter()
+        result = func(*args)
+        latencies[name].append(time.perf_counter() - start)
+        return result
+
+    for cycle in range(BENCHMARK_CYCLES):
+        change = cycle // CHANGE_EVERY
+        ip = f"10.{change // 65536}.{change // 256 % 256}.{change % 256}"
+        assert timed("save_current_ip", storage.save_current_ip, ip)
+        assert timed("load_last_ip", storage.load_last_ip) == ip
+        if cycle % CHANGE_EVERY == 0:
+            timed("load_ip_history", storage.load_ip_history)
+            timed("load_history_page", storage.load_history_page, 5)
+    return latencies
+
+
+class TestStorageBackendBenchmark:
+    """The same workload timed on each backend."""
+
+    def test_workload_throughput_and_latency(self, storage, mock_config):
+        """Report ops/sec and latency percentiles for every operation."""
+        start = time.perf_counter()
+        latencies = run_workload(storage)
+        elapsed = time.perf_counter() - start
+
+        operations = sum(len(samples) for samples in latencies.values())
+        print(
+            f"\n{mock_config.storage_backend}: {operations / elapsed:,.0f} ops/s "
+            f"over {operations} operations"
+        )
+        for name, samples in latencies.items():
+            p50, p95, p99 = (percentile(samples, p) for p in (50, 95, 99))
+            print(
+                f"  {name:<18} {len(samples) / sum(samples):>12,.0f} ops/s  "
+                f"p50={p50 * 1e6:,.0f}us p95={p95 * 1e6:,.0f}us "
+                f"p99={p99 * 1e6:,.0f}us"
+            )
+            assert p50 <= p95 <= p99
+
+        # Every backend answers the last IP from memory
+        assert percentile(latencies["load_last_ip"], 50) < 0.001
+        assert len(storage.load_ip_history()) == HISTORY_SIZE
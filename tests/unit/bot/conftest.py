@@ -12,7 +12,7 @@ from ip_monitor.config import AppConfig
 
 
 @pytest.fixture
-def mock_bot_config():
+def mock_bot_config(tmp_path):
     """Enhanced bot configuration mock with comprehensive settings."""
     config = Mock(spec=AppConfig)
 
@@ -38,6 +38,14 @@ def mock_bot_config():
     # Storage settings
     config.db_file = "test.db"
     config.ip_history_size = 10
+    config.storage_backend = "sqlite"
+    config.jsonl_history_file = str(tmp_path / "ip_history.jsonl")
+    config.jsonl_compact_bytes = 262144
+    config.archive_retention_months = 0
+    config.observation_log_enabled = False
+    config.backup_dir = str(tmp_path / "backups")
+    config.backup_interval_hours = 0
+    config.backup_keep = 7
     config.ip_file = "test_ip.json"
     config.ip_history_file = "test_history.json"
 
@@ -59,6 +67,9 @@ def mock_bot_config():
     config.cache_ttl = 300
     config.cache_max_memory_size = 1000
     config.cache_stale_threshold = 0.8
+    config.cache_file = str(tmp_path / "cache.json")
+    config.cache_max_memory_bytes = 0
+    config.cache_type_memory_budgets = {}
     config.cache_cleanup_interval = 300
 
     # API settings
@@ -494,7 +505,7 @@ def mock_bot_instance(
         ):
             with patch("ip_monitor.bot.IPService", return_value=mock_bot_ip_service):
                 with patch(
-                    "ip_monitor.bot.SQLiteIPStorage", return_value=mock_bot_storage
+                    "ip_monitor.bot.create_storage", return_value=mock_bot_storage
                 ):
                     with patch(
                         "ip_monitor.bot.AsyncRateLimiter",
@@ -15,7 +15,7 @@ class TestBotInitialization:
     @patch("ip_monitor.bot.commands.Bot")
     @patch("ip_monitor.bot.discord.Intents")
     @patch("ip_monitor.bot.IPService")
-    @patch("ip_monitor.bot.SQLiteIPStorage")
+    @patch("ip_monitor.bot.create_storage")
     @patch("ip_monitor.bot.AsyncRateLimiter")
     @patch("ip_monitor.bot.DiscordRateLimiter")
     @patch("ip_monitor.bot.IPCommands")
@@ -60,7 +60,7 @@ class TestBotInitialization:
     @patch("ip_monitor.bot.commands.Bot")
     @patch("ip_monitor.bot.discord.Intents")
     @patch("ip_monitor.bot.IPService")
-    @patch("ip_monitor.bot.SQLiteIPStorage")
+    @patch("ip_monitor.bot.create_storage")
     @patch("ip_monitor.bot.AsyncRateLimiter")
     @patch("ip_monitor.bot.DiscordRateLimiter")
     @patch("ip_monitor.bot.IPCommands")
@@ -109,12 +109,56 @@ class TestBotInitialization:
             connection_pool_max_keepalive=mock_bot_config.connection_pool_max_keepalive,
             connection_timeout=mock_bot_config.connection_timeout,
             read_timeout=mock_bot_config.read_timeout,
+            observation_log=bot.observation_log,
         )
 
+    @pytest.mark.parametrize("cache_enabled", [True, False])
     @patch("ip_monitor.bot.commands.Bot")
     @patch("ip_monitor.bot.discord.Intents")
+    @patch("ip_monitor.bot.initialize_cache")
     @patch("ip_monitor.bot.IPService")
-    @patch("ip_monitor.bot.SQLiteIPStorage")
+    @patch("ip_monitor.bot.create_storage")
+    @patch("ip_monitor.bot.AsyncRateLimiter")
+    @patch("ip_monitor.bot.DiscordRateLimiter")
+    @patch("ip_monitor.bot.IPCommands")
+    @patch("ip_monitor.bot.AdminCommandRouter")
+    def test_bot_initialization_builds_configured_cache(
+        self,
+        mock_admin_router,
+        mock_ip_commands,
+        mock_discord_rate_limiter,
+        mock_async_rate_limiter,
+        mock_storage,
+        mock_ip_service,
+        mock_initialize_cache,
+        mock_intents,
+        mock_bot_class,
+        mock_bot_config,
+        cache_enabled,
+    ):
+        """Test that the shared cache is built from the configured file and size."""
+        mock_bot_config.cache_enabled = cache_enabled
+        mock_bot_config.cache_file = "ip_cache.db"
+        mock_bot_config.cache_max_memory_size = 250
+        mock_intents.default.return_value = mock_intents
+        mock_bot_class.return_value = Mock()
+
+        IPMonitorBot(mock_bot_config)
+
+        if cache_enabled:
+            mock_initialize_cache.assert_called_once_with(
+                cache_file="ip_cache.db",
+                max_memory_size=250,
+                max_memory_bytes=None,
+                memory_budgets={},
+            )
+        else:
+            mock_initialize_cache.assert_not_called()
+
+    @patch("ip_monitor.bot.commands.Bot")
+    @patch("ip_monitor.bot.discord.Intents")
+    @patch("ip_monitor.bot.IPService")
+    @patch("ip_monitor.bot.create_storage")
     @patch("ip_monitor.bot.AsyncRateLimiter")
     @patch("ip_monitor.bot.DiscordRateLimiter")
     @patch("ip_monitor.bot.IPCommands")
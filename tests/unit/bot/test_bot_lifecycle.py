@@ -16,7 +16,7 @@ class TestBotLifecycle:
     @patch("ip_monitor.bot.commands.Bot")
     @patch("ip_monitor.bot.discord.Intents")
     @patch("ip_monitor.bot.IPService")
-    @patch("ip_monitor.bot.SQLiteIPStorage")
+    @patch("ip_monitor.bot.create_storage")
     @patch("ip_monitor.bot.AsyncRateLimiter")
     @patch("ip_monitor.bot.DiscordRateLimiter")
     @patch("ip_monitor.bot.IPCommands")
@@ -58,7 +58,7 @@ class TestBotLifecycle:
     @patch("ip_monitor.bot.commands.Bot")
     @patch("ip_monitor.bot.discord.Intents")
     @patch("ip_monitor.bot.IPService")
-    @patch("ip_monitor.bot.SQLiteIPStorage")
+    @patch("ip_monitor.bot.create_storage")
     @patch("ip_monitor.bot.AsyncRateLimiter")
     @patch("ip_monitor.bot.DiscordRateLimiter")
     @patch("ip_monitor.bot.IPCommands")
@@ -103,7 +103,7 @@ class TestBotLifecycle:
     @patch("ip_monitor.bot.commands.Bot")
     @patch("ip_monitor.bot.discord.Intents")
     @patch("ip_monitor.bot.IPService")
-    @patch("ip_monitor.bot.SQLiteIPStorage")
+    @patch("ip_monitor.bot.create_storage")
     @patch("ip_monitor.bot.AsyncRateLimiter")
     @patch("ip_monitor.bot.DiscordRateLimiter")
     @patch("ip_monitor.bot.IPCommands")
@@ -148,7 +148,7 @@ class TestBotLifecycle:
     @patch("ip_monitor.bot.commands.Bot")
     @patch("ip_monitor.bot.discord.Intents")
     @patch("ip_monitor.bot.IPService")
-    @patch("ip_monitor.bot.SQLiteIPStorage")
+    @patch("ip_monitor.bot.create_storage")
     @patch("ip_monitor.bot.AsyncRateLimiter")
     @patch("ip_monitor.bot.DiscordRateLimiter")
     @patch("ip_monitor.bot.IPCommands")
@@ -190,7 +190,7 @@ class TestBotLifecycle:
     @patch("ip_monitor.bot.commands.Bot")
     @patch("ip_monitor.bot.discord.Intents")
     @patch("ip_monitor.bot.IPService")
-    @patch("ip_monitor.bot.SQLiteIPStorage")
+    @patch("ip_monitor.bot.create_storage")
     @patch("ip_monitor.bot.AsyncRateLimiter")
     @patch("ip_monitor.bot.DiscordRateLimiter")
     @patch("ip_monitor.bot.IPCommands")
@@ -248,7 +248,7 @@ class TestBotLifecycle:
     @patch("ip_monitor.bot.commands.Bot")
     @patch("ip_monitor.bot.discord.Intents")
     @patch("ip_monitor.bot.IPService")
-    @patch("ip_monitor.bot.SQLiteIPStorage")
+    @patch("ip_monitor.bot.create_storage")
     @patch("ip_monitor.bot.AsyncRateLimiter")
     @patch("ip_monitor.bot.DiscordRateLimiter")
     @patch("ip_monitor.bot.IPCommands")
@@ -303,7 +303,7 @@ class TestBotLifecycle:
     @patch("ip_monitor.bot.commands.Bot")
     @patch("ip_monitor.bot.discord.Intents")
     @patch("ip_monitor.bot.IPService")
-    @patch("ip_monitor.bot.SQLiteIPStorage")
+    @patch("ip_monitor.bot.create_storage")
     @patch("ip_monitor.bot.AsyncRateLimiter")
     @patch("ip_monitor.bot.DiscordRateLimiter")
     @patch("ip_monitor.bot.IPCommands")
@@ -348,7 +348,7 @@ class TestBotLifecycle:
     @patch("ip_monitor.bot.commands.Bot")
     @patch("ip_monitor.bot.discord.Intents")
     @patch("ip_monitor.bot.IPService")
-    @patch("ip_monitor.bot.SQLiteIPStorage")
+    @patch("ip_monitor.bot.create_storage")
     @patch("ip_monitor.bot.AsyncRateLimiter")
     @patch("ip_monitor.bot.DiscordRateLimiter")
     @patch("ip_monitor.bot.IPCommands")
@@ -386,7 +386,7 @@ class TestBotLifecycle:
     @patch("ip_monitor.bot.commands.Bot")
     @patch("ip_monitor.bot.discord.Intents")
     @patch("ip_monitor.bot.IPService")
-    @patch("ip_monitor.bot.SQLiteIPStorage")
+    @patch("ip_monitor.bot.create_storage")
     @patch("ip_monitor.bot.AsyncRateLimiter")
     @patch("ip_monitor.bot.DiscordRateLimiter")
     @patch("ip_monitor.bot.IPCommands")
@@ -448,7 +448,7 @@ class TestBotLifecycle:
     @patch("ip_monitor.bot.commands.Bot")
     @patch("ip_monitor.bot.discord.Intents")
     @patch("ip_monitor.bot.IPService")
-    @patch("ip_monitor.bot.SQLiteIPStorage")
+    @patch("ip_monitor.bot.create_storage")
     @patch("ip_monitor.bot.AsyncRateLimiter")
     @patch("ip_monitor.bot.DiscordRateLimiter")
     @patch("ip_monitor.bot.IPCommands")
@@ -511,7 +511,7 @@ class TestBotLifecycle:
     @patch("ip_monitor.bot.commands.Bot")
     @patch("ip_monitor.bot.discord.Intents")
     @patch("ip_monitor.bot.IPService")
-    @patch("ip_monitor.bot.SQLiteIPStorage")
+    @patch("ip_monitor.bot.create_storage")
     @patch("ip_monitor.bot.AsyncRateLimiter")
     @patch("ip_monitor.bot.DiscordRateLimiter")
     @patch("ip_monitor.bot.IPCommands")
@@ -568,7 +568,7 @@ class TestBotLifecycle:
     @patch("ip_monitor.bot.commands.Bot")
     @patch("ip_monitor.bot.discord.Intents")
     @patch("ip_monitor.bot.IPService")
-    @patch("ip_monitor.bot.SQLiteIPStorage")
+    @patch("ip_monitor.bot.create_storage")
     @patch("ip_monitor.bot.AsyncRateLimiter")
     @patch("ip_monitor.bot.DiscordRateLimiter")
     @patch("ip_monitor.bot.IPCommands")
@@ -623,7 +623,7 @@ class TestBotLifecycle:
     @patch("ip_monitor.bot.commands.Bot")
     @patch("ip_monitor.bot.discord.Intents")
     @patch("ip_monitor.bot.IPService")
-    @patch("ip_monitor.bot.SQLiteIPStorage")
+    @patch("ip_monitor.bot.create_storage")
     @patch("ip_monitor.bot.AsyncRateLimiter")
     @patch("ip_monitor.bot.DiscordRateLimiter")
     @patch("ip_monitor.bot.IPCommands")
@@ -667,7 +667,7 @@ class TestBotLifecycle:
     @patch("ip_monitor.bot.commands.Bot")
     @patch("ip_monitor.bot.discord.Intents")
     @patch("ip_monitor.bot.IPService")
-    @patch("ip_monitor.bot.SQLiteIPStorage")
+    @patch("ip_monitor.bot.create_storage")
     @patch("ip_monitor.bot.AsyncRateLimiter")
     @patch("ip_monitor.bot.DiscordRateLimiter")
     @patch("ip_monitor.bot.IPCommands")
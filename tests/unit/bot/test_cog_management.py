@@ -17,7 +17,7 @@ class TestCogManagement:
     @patch("ip_monitor.bot.commands.Bot")
     @patch("ip_monitor.bot.discord.Intents")
     @patch("ip_monitor.bot.IPService")
-    @patch("ip_monitor.bot.SQLiteIPStorage")
+    @patch("ip_monitor.bot.create_storage")
     @patch("ip_monitor.bot.AsyncRateLimiter")
     @patch("ip_monitor.bot.DiscordRateLimiter")
     @patch("ip_monitor.bot.IPCommands")
@@ -16,7 +16,7 @@ class TestOnReadyEventHandler:
     @patch("ip_monitor.bot.commands.Bot")
     @patch("ip_monitor.bot.discord.Intents")
     @patch("ip_monitor.bot.IPService")
-    @patch("ip_monitor.bot.SQLiteIPStorage")
+    @patch("ip_monitor.bot.create_storage")
     @patch("ip_monitor.bot.AsyncRateLimiter")
     @patch("ip_monitor.bot.DiscordRateLimiter")
     @patch("ip_monitor.bot.IPCommands")
@@ -70,6 +70,8 @@ class TestOnReadyEventHandler:
         mock_task = AsyncMock()
         mock_task.start = Mock()  # start() is synchronous for tasks.Loop
         bot._create_check_ip_task.return_value = mock_task
+        mock_cache_task = Mock()
+        bot._create_cache_cleanup_task = Mock(return_value=mock_cache_task)
 
         # Run on_ready
         await bot.on_ready()
@@ -85,10 +87,23 @@ class TestOnReadyEventHandler:
         mock_client.tree.sync.assert_called_once()
         mock_task.start.assert_called_once()
 
+        # Cache maintenance is started and handed to the config handler so
+        # interval changes apply to the running task
+        mock_cache_task.start.assert_called_once()
+        assert bot.cache_cleanup_task is mock_cache_task
+        config_handler = mock_admin_router.return_value.get_handler_for_command.return_value
+        assert config_handler.cache_cleanup_task is mock_cache_task
+
+        # A reconnect fires on_ready again; the running loop is kept
+        mock_cache_task.is_running.return_value = True
+        await bot.on_ready()
+        bot._create_cache_cleanup_task.assert_called_once()
+        mock_cache_task.start.assert_called_once()
+
     @patch("ip_monitor.bot.commands.Bot")
     @patch("ip_monitor.bot.discord.Intents")
     @patch("ip_monitor.bot.IPService")
-    @patch("ip_monitor.bot.SQLiteIPStorage")
+    @patch("ip_monitor.bot.create_storage")
     @patch("ip_monitor.bot.AsyncRateLimiter")
     @patch("ip_monitor.bot.DiscordRateLimiter")
     @patch("ip_monitor.bot.IPCommands")
@@ -130,7 +145,7 @@ class TestOnReadyEventHandler:
     @patch("ip_monitor.bot.commands.Bot")
     @patch("ip_monitor.bot.discord.Intents")
     @patch("ip_monitor.bot.IPService")
-    @patch("ip_monitor.bot.SQLiteIPStorage")
+    @patch("ip_monitor.bot.create_storage")
     @patch("ip_monitor.bot.AsyncRateLimiter")
     @patch("ip_monitor.bot.DiscordRateLimiter")
     @patch("ip_monitor.bot.IPCommands")
@@ -172,7 +187,7 @@ class TestOnReadyEventHandler:
     @patch("ip_monitor.bot.commands.Bot")
     @patch("ip_monitor.bot.discord.Intents")
     @patch("ip_monitor.bot.IPService")
-    @patch("ip_monitor.bot.SQLiteIPStorage")
+    @patch("ip_monitor.bot.create_storage")
     @patch("ip_monitor.bot.AsyncRateLimiter")
     @patch("ip_monitor.bot.DiscordRateLimiter")
     @patch("ip_monitor.bot.IPCommands")
@@ -236,7 +251,7 @@ class TestOnReadyEventHandler:
     @patch("ip_monitor.bot.commands.Bot")
     @patch("ip_monitor.bot.discord.Intents")
     @patch("ip_monitor.bot.IPService")
-    @patch("ip_monitor.bot.SQLiteIPStorage")
+    @patch("ip_monitor.bot.create_storage")
     @patch("ip_monitor.bot.AsyncRateLimiter")
     @patch("ip_monitor.bot.DiscordRateLimiter")
     @patch("ip_monitor.bot.IPCommands")
@@ -15,7 +15,7 @@ class TestComponentIntegration:
     @patch("ip_monitor.bot.commands.Bot")
     @patch("ip_monitor.bot.discord.Intents")
     @patch("ip_monitor.bot.IPService")
-    @patch("ip_monitor.bot.SQLiteIPStorage")
+    @patch("ip_monitor.bot.create_storage")
     @patch("ip_monitor.bot.AsyncRateLimiter")
     @patch("ip_monitor.bot.DiscordRateLimiter")
     @patch("ip_monitor.bot.IPCommands")
@@ -55,7 +55,7 @@ class TestComponentIntegration:
     @patch("ip_monitor.bot.commands.Bot")
     @patch("ip_monitor.bot.discord.Intents")
     @patch("ip_monitor.bot.IPService")
-    @patch("ip_monitor.bot.SQLiteIPStorage")
+    @patch("ip_monitor.bot.create_storage")
     @patch("ip_monitor.bot.AsyncRateLimiter")
     @patch("ip_monitor.bot.DiscordRateLimiter")
     @patch("ip_monitor.bot.IPCommands")
@@ -95,12 +95,10 @@ class TestComponentIntegration:
             connection_pool_max_keepalive=mock_bot_config.connection_pool_max_keepalive,
             connection_timeout=mock_bot_config.connection_timeout,
             read_timeout=mock_bot_config.read_timeout,
+            observation_log=bot.observation_log,
         )
 
-        mock_storage.assert_called_once_with(
-            db_file=mock_bot_config.db_file,
-            history_size=mock_bot_config.ip_history_size,
-        )
+        mock_storage.assert_called_once_with(mock_bot_config)
 
         mock_async_rate_limiter.assert_called_once_with(
             period=mock_bot_config.rate_limit_period,
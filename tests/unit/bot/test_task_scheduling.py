@@ -18,7 +18,7 @@ class TestTaskScheduling:
     @patch("ip_monitor.bot.commands.Bot")
     @patch("ip_monitor.bot.discord.Intents")
     @patch("ip_monitor.bot.IPService")
-    @patch("ip_monitor.bot.SQLiteIPStorage")
+    @patch("ip_monitor.bot.create_storage")
     @patch("ip_monitor.bot.AsyncRateLimiter")
     @patch("ip_monitor.bot.DiscordRateLimiter")
     @patch("ip_monitor.bot.IPCommands")
@@ -67,7 +67,7 @@ class TestTaskScheduling:
     @patch("ip_monitor.bot.commands.Bot")
     @patch("ip_monitor.bot.discord.Intents")
     @patch("ip_monitor.bot.IPService")
-    @patch("ip_monitor.bot.SQLiteIPStorage")
+    @patch("ip_monitor.bot.create_storage")
     @patch("ip_monitor.bot.AsyncRateLimiter")
     @patch("ip_monitor.bot.DiscordRateLimiter")
     @patch("ip_monitor.bot.IPCommands")
@@ -115,7 +115,7 @@ class TestTaskScheduling:
     @patch("ip_monitor.bot.commands.Bot")
     @patch("ip_monitor.bot.discord.Intents")
     @patch("ip_monitor.bot.IPService")
-    @patch("ip_monitor.bot.SQLiteIPStorage")
+    @patch("ip_monitor.bot.create_storage")
     @patch("ip_monitor.bot.AsyncRateLimiter")
     @patch("ip_monitor.bot.DiscordRateLimiter")
     @patch("ip_monitor.bot.IPCommands")
@@ -159,7 +159,7 @@ class TestTaskScheduling:
     @patch("ip_monitor.bot.commands.Bot")
     @patch("ip_monitor.bot.discord.Intents")
     @patch("ip_monitor.bot.IPService")
-    @patch("ip_monitor.bot.SQLiteIPStorage")
+    @patch("ip_monitor.bot.create_storage")
     @patch("ip_monitor.bot.AsyncRateLimiter")
     @patch("ip_monitor.bot.DiscordRateLimiter")
     @patch("ip_monitor.bot.IPCommands")
@@ -199,7 +199,7 @@ class TestTaskScheduling:
     @patch("ip_monitor.bot.commands.Bot")
     @patch("ip_monitor.bot.discord.Intents")
     @patch("ip_monitor.bot.IPService")
-    @patch("ip_monitor.bot.SQLiteIPStorage")
+    @patch("ip_monitor.bot.create_storage")
     @patch("ip_monitor.bot.AsyncRateLimiter")
     @patch("ip_monitor.bot.DiscordRateLimiter")
     @patch("ip_monitor.bot.IPCommands")
@@ -241,7 +241,7 @@ class TestTaskScheduling:
     @patch("ip_monitor.bot.commands.Bot")
     @patch("ip_monitor.bot.discord.Intents")
     @patch("ip_monitor.bot.IPService")
-    @patch("ip_monitor.bot.SQLiteIPStorage")
+    @patch("ip_monitor.bot.create_storage")
     @patch("ip_monitor.bot.AsyncRateLimiter")
     @patch("ip_monitor.bot.DiscordRateLimiter")
     @patch("ip_monitor.bot.IPCommands")
@@ -280,7 +280,7 @@ class TestTaskScheduling:
     @patch("ip_monitor.bot.commands.Bot")
     @patch("ip_monitor.bot.discord.Intents")
     @patch("ip_monitor.bot.IPService")
-    @patch("ip_monitor.bot.SQLiteIPStorage")
+    @patch("ip_monitor.bot.create_storage")
     @patch("ip_monitor.bot.AsyncRateLimiter")
     @patch("ip_monitor.bot.DiscordRateLimiter")
     @patch("ip_monitor.bot.IPCommands")
@@ -319,7 +319,7 @@ class TestTaskScheduling:
     @patch("ip_monitor.bot.commands.Bot")
     @patch("ip_monitor.bot.discord.Intents")
     @patch("ip_monitor.bot.IPService")
-    @patch("ip_monitor.bot.SQLiteIPStorage")
+    @patch("ip_monitor.bot.create_storage")
     @patch("ip_monitor.bot.AsyncRateLimiter")
     @patch("ip_monitor.bot.DiscordRateLimiter")
     @patch("ip_monitor.bot.IPCommands")
@@ -359,7 +359,7 @@ class TestTaskScheduling:
     @patch("ip_monitor.bot.commands.Bot")
     @patch("ip_monitor.bot.discord.Intents")
     @patch("ip_monitor.bot.IPService")
-    @patch("ip_monitor.bot.SQLiteIPStorage")
+    @patch("ip_monitor.bot.create_storage")
     @patch("ip_monitor.bot.AsyncRateLimiter")
     @patch("ip_monitor.bot.DiscordRateLimiter")
     @patch("ip_monitor.bot.IPCommands")
@@ -402,7 +402,7 @@ class TestTaskScheduling:
     @patch("ip_monitor.bot.commands.Bot")
     @patch("ip_monitor.bot.discord.Intents")
     @patch("ip_monitor.bot.IPService")
-    @patch("ip_monitor.bot.SQLiteIPStorage")
+    @patch("ip_monitor.bot.create_storage")
     @patch("ip_monitor.bot.AsyncRateLimiter")
     @patch("ip_monitor.bot.DiscordRateLimiter")
     @patch("ip_monitor.bot.IPCommands")
@@ -449,7 +449,7 @@ class TestTaskScheduling:
     @patch("ip_monitor.bot.commands.Bot")
     @patch("ip_monitor.bot.discord.Intents")
     @patch("ip_monitor.bot.IPService")
-    @patch("ip_monitor.bot.SQLiteIPStorage")
+    @patch("ip_monitor.bot.create_storage")
     @patch("ip_monitor.bot.AsyncRateLimiter")
     @patch("ip_monitor.bot.DiscordRateLimiter")
     @patch("ip_monitor.bot.IPCommands")
@@ -534,7 +534,125 @@ class TestTaskErrorHandling:
         mock_bot_instance.cache_cleanup_task = mock_cache_task
 
         # Execute
-        await mock_bot_instance.cleanup()
+        with patch("ip_monitor.bot.get_cache"):
+            await mock_bot_instance.cleanup()
 
         # Verify both tasks are cancelled
         mock_check_task.cancel.assert_called_once()
+        mock_cache_task.cancel.assert_called_once()
+
+    async def test_cache_snapshot_saved_once_during_cleanup(self, mock_bot_instance):
+        """Test that shutdown leaves the final cache snapshot to the IP service."""
+        mock_cache_task = Mock()
+        mock_cache_task.is_running.return_value = True
+        mock_bot_instance.cache_cleanup_task = mock_cache_task
+        mock_cache = Mock()
+
+        with patch("ip_monitor.bot.get_cache", return_value=mock_cache):
+            await mock_bot_instance.cleanup()
+
+        mock_cache_task.cancel.assert_called_once()
+        mock_cache.save.assert_not_called()
+        mock_bot_instance.ip_service.close.assert_awaited_once()
+
+
+class TestCacheMaintenanceTask:
+    """Test suite for the scheduled cache maintenance task."""
+
+    async def test_cache_cleanup_task_uses_configured_interval(
+        self, mock_bot_instance
+    ):
+        """Test that the maintenance task runs every cache_cleanup_interval."""
+        mock_bot_instance.config.cache_cleanup_interval = 120
+
+        task = mock_bot_instance._create_cache_cleanup_task()
+
+        assert task.seconds == 120
+
+    async def test_cache_cleanup_task_runs_maintenance(self, mock_bot_instance):
+        """Test that each iteration runs one cache maintenance pass."""
+        mock_cache = Mock()
+        mock_cache.run_maintenance.return_value = {
+            "entries_cleaned": 3,
+            "duration": 0.001,
+            "interval_hit_rate": 0.5,
+            "sweep_complete": False,
+        }
+        task = mock_bot_instance._create_cache_cleanup_task()
+
+        with patch("ip_monitor.bot.get_cache", return_value=mock_cache):
+            await task()
+
+        mock_cache.run_maintenance.assert_called_once_with()
+
+    async def test_cache_cleanup_task_survives_maintenance_errors(
+        self, mock_bot_instance
+    ):
+        """Test that a failed maintenance pass does not stop the task."""
+        mock_cache = Mock()
+        mock_cache.run_maintenance.side_effect = OSError("disk full")
+        task = mock_bot_instance._create_cache_cleanup_task()
+
+        with patch("ip_monitor.bot.get_cache", return_value=mock_cache):
+            await task()
+
+        mock_cache.run_maintenance.assert_called_once()
+
+
+class TestDatabaseBackupTask:
+    """Test suite for the scheduled database backup task."""
+
+    @pytest.fixture
+    def mock_backup(self, mock_bot_instance):
+        """Backup shared with the !backup command handler."""
+        backup = Mock()
+        backup.run = AsyncMock(return_value=Mock(verified=True))
+        mock_bot_instance.admin_commands = Mock()
+        handler = mock_bot_instance.admin_commands.get_handler_for_command.return_value
+        handler.backup = backup
+        return backup
+
+    async def test_backup_task_uses_configured_interval(self, mock_bot_instance):
+        """Test that the backup task runs every backup_interval_hours."""
+        mock_bot_instance.config.backup_interval_hours = 6
+
+        task = mock_bot_instance._create_backup_task()
+
+        assert task.hours == 6
+
+    async def test_backup_task_runs_shared_backup(self, mock_bot_instance, mock_backup):
+        """Test that each iteration runs the command handler's backup."""
+        task = mock_bot_instance._create_backup_task()
+
+        await task()
+
+        mock_backup.run.assert_awaited_once_with()
+        mock_bot_instance.admin_commands.get_handler_for_command.assert_called_with(
+            "backup"
+        )
+
+    async def test_backup_task_survives_errors(self, mock_bot_instance, mock_backup):
+        """Test that a failed backup does not stop the task."""
+        mock_backup.run.side_effect = OSError("disk full")
+        task = mock_bot_instance._create_backup_task()
+
+        await task()
+
+        mock_backup.run.assert_awaited_once()
+
+    async def test_backup_schedule_disabled(self, mock_bot_instance):
+        """Test that no backup task starts when the interval is 0."""
+        mock_bot_instance.config.backup_interval_hours = 0
+
+        mock_bot_instance._start_backup_schedule()
+
+        assert mock_bot_instance.backup_task is None
+
+    async def test_backup_schedule_requires_sqlite(self, mock_bot_instance):
+        """Test that no backup task starts for backends without a database."""
+        mock_bot_instance.config.backup_interval_hours = 6
+        mock_bot_instance.config.storage_backend = "jsonl"
+
+        mock_bot_instance._start_backup_schedule()
+
+        assert mock_bot_instance.backup_task is None
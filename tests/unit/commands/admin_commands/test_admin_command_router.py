@@ -15,6 +15,7 @@ from ip_monitor.commands.admin_commands.base_handler import BaseHandler
 from ip_monitor.commands.admin_commands.bot_lifecycle_handler import BotLifecycleHandler
 from ip_monitor.commands.admin_commands.cache_handler import CacheHandler
 from ip_monitor.commands.admin_commands.config_handler import ConfigHandler
+from ip_monitor.commands.admin_commands.data_handler import DataHandler
 from ip_monitor.commands.admin_commands.queue_handler import QueueHandler
 
 
@@ -49,12 +50,21 @@ class TestAdminCommandRouter:
         assert router.stop_callback is not None
         assert router.config is not None
         assert router.discord_rate_limiter is not None
-        assert len(router.handlers) == 5
-        assert len(router.command_map) == 5
+        assert len(router.handlers) == 6
+        assert len(router.command_map) == 8
 
     def test_handler_registration(self, router):
         """Test that all handlers are properly registered."""
-        expected_commands = ["stop", "config", "queue", "api", "cache"]
+        expected_commands = [
+            "stop",
+            "config",
+            "queue",
+            "api",
+            "cache",
+            "export",
+            "import",
+            "backup",
+        ]
         assert list(router.command_map.keys()) == expected_commands
 
         # Verify handler types
@@ -63,16 +73,22 @@ class TestAdminCommandRouter:
         assert isinstance(router.command_map["queue"], QueueHandler)
         assert isinstance(router.command_map["api"], ApiHandler)
         assert isinstance(router.command_map["cache"], CacheHandler)
+        assert isinstance(router.command_map["export"], DataHandler)
+        assert router.command_map["import"] is router.command_map["export"]
+        assert router.command_map["backup"] is router.command_map["export"]
 
     def test_get_available_commands(self, router):
         """Test getting list of available commands."""
         commands = router.get_available_commands()
-        assert len(commands) == 5
+        assert len(commands) == 8
         assert "stop" in commands
         assert "config" in commands
         assert "queue" in commands
         assert "api" in commands
         assert "cache" in commands
+        assert "export" in commands
+        assert "import" in commands
+        assert "backup" in commands
 
     def test_get_handler_for_command(self, router):
         """Test getting handler for specific command."""
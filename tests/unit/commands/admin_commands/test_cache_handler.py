@@ -226,6 +226,100 @@ class TestCacheHandler:
             result = await cache_handler._handle_cache_stats(mock_message, ["stats"])
             assert result is True
 
+    async def test_handle_cache_stats_namespace_breakdown(
+        self, cache_handler, mock_message, mock_cache_info
+    ):
+        """Test cache stats lists per-namespace entries and hit rates."""
+        mock_cache_info["stats"]["namespaces"] = {
+            "ip_check": {"entries": 3, "hits": 9, "misses": 1, "hit_rate": 0.9},
+        }
+        cache_handler.ip_service.get_cache_info.return_value = mock_cache_info
+        cache_handler.discord_rate_limiter.send_message_with_backoff = AsyncMock()
+
+        with patch("ip_monitor.utils.cache.get_cache") as mock_get_cache:
+            mock_get_cache.return_value = MagicMock(max_memory_size=100, memory_cache={})
+
+            result = await cache_handler._handle_cache_stats(mock_message, ["stats"])
+
+        assert result is True
+        send = cache_handler.discord_rate_limiter.send_message_with_backoff
+        response = send.call_args[0][1]
+        assert "ip_check: 3 entries, 90.0% hit rate" in response
+
+    async def test_handle_cache_stats_memory_usage(
+        self, cache_handler, mock_message, mock_cache_info
+    ):
+        """Test cache stats reports accounted bytes and budgets."""
+        mock_cache_info["stats"]["memory_bytes"] = 3 * 1024 * 1024
+        mock_cache_info["stats"]["max_memory_bytes"] = 8 * 1024 * 1024
+        mock_cache_info["stats"]["memory_by_type"] = {
+            "ip_result": {"entries": 1, "bytes": 2048, "budget": 4096},
+        }
+        cache_handler.ip_service.get_cache_info.return_value = mock_cache_info
+        cache_handler.discord_rate_limiter.send_message_with_backoff = AsyncMock()
+
+        with patch("ip_monitor.utils.cache.get_cache") as mock_get_cache:
+            mock_get_cache.return_value = MagicMock(
+                max_memory_size=100,
+                memory_cache={
+                    "entry1": MagicMock(cache_type=MagicMock(value="ip_result")),
+                },
+            )
+
+            result = await cache_handler._handle_cache_stats(mock_message, ["stats"])
+
+        assert result is True
+        send = cache_handler.discord_rate_limiter.send_message_with_backoff
+        response = send.call_args[0][1]
+        assert "Memory Usage:     3.0 MB" in response
+        assert "Memory Budget:    8.0 MB" in response
+        assert "ip_result: 1 (2.0 KB of 4.0 KB)" in response
+
+    async def test_handle_cache_stats_type_breakdown_from_stats(
+        self, cache_handler, mock_message, mock_cache_info
+    ):
+        """Test cache stats counts entries by type from the stats snapshot."""
+        mock_cache_info["stats"]["memory_by_type"] = {
+            "ip_result": {"entries": 2, "bytes": 1024, "budget": None},
+            "api_response": {"entries": 0, "bytes": 0, "budget": None},
+        }
+        cache_handler.ip_service.get_cache_info.return_value = mock_cache_info
+        cache_handler.discord_rate_limiter.send_message_with_backoff = AsyncMock()
+
+        with patch("ip_monitor.utils.cache.get_cache") as mock_get_cache:
+            mock_get_cache.return_value = MagicMock(max_memory_size=100)
+
+            result = await cache_handler._handle_cache_stats(mock_message, ["stats"])
+
+        assert result is True
+        mock_get_cache.return_value.memory_cache.values.assert_not_called()
+        send = cache_handler.discord_rate_limiter.send_message_with_backoff
+        response = send.call_args[0][1]
+        assert "ip_result: 2 (1.0 KB)" in response
+        assert "api_response" not in response
+
+    async def test_handle_cache_stats_single_flight(
+        self, cache_handler, mock_message, mock_cache_info
+    ):
+        """Test cache stats reports coalesced computations."""
+        mock_cache_info["stats"]["computations"] = 4
+        mock_cache_info["stats"]["coalesced"] = 7
+        mock_cache_info["stats"]["negative_hits"] = 2
+        cache_handler.ip_service.get_cache_info.return_value = mock_cache_info
+        cache_handler.discord_rate_limiter.send_message_with_backoff = AsyncMock()
+
+        with patch("ip_monitor.utils.cache.get_cache") as mock_get_cache:
+            mock_get_cache.return_value = MagicMock(max_memory_size=100, memory_cache={})
+
+            result = await cache_handler._handle_cache_stats(mock_message, ["stats"])
+
+        assert result is True
+        send = cache_handler.discord_rate_limiter.send_message_with_backoff
+        response = send.call_args[0][1]
+        assert "Computations:     4" in response
+        assert "Coalesced Waits:  7" in response
+        assert "Failures Reused:  2" in response
+
     async def test_handle_cache_stats_disabled(self, cache_handler, mock_message):
         """Test cache stats when cache is disabled."""
         cache_handler.ip_service.get_cache_info.return_value = {
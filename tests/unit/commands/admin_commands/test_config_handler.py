@@ -43,6 +43,8 @@ class TestConfigHandler:
         config.rate_limit_period = 300
         config.max_checks_per_period = 10
         config.ip_history_size = 10
+        config.archive_retention_months = 0
+        config.observation_log_enabled = False
         config.startup_message_enabled = True
         config.message_queue_enabled = True
         config.message_queue_max_size = 1000
@@ -488,6 +490,18 @@ class TestConfigHandler:
             await handler._apply_config_change("message_queue_max_size", 2000)
             assert mock_queue.max_size == 2000
 
+    @pytest.mark.asyncio
+    async def test_apply_config_change_cache_cleanup_interval(self, handler):
+        """Test that cache_cleanup_interval reschedules the maintenance task."""
+        # No task yet: the change only updates the configuration
+        await handler._apply_config_change("cache_cleanup_interval", 600)
+
+        handler.cache_cleanup_task = Mock()
+        await handler._apply_config_change("cache_cleanup_interval", 120)
+        handler.cache_cleanup_task.change_interval.assert_called_once_with(
+            seconds=120
+        )
+
     def test_format_all_configuration(self, handler, mock_dependencies):
         """Test _format_all_configuration method."""
         result = handler._format_all_configuration()
@@ -0,0 +1,191 @@
+"""
+Unit tests for DataHandler.
+"""
+
+import gzip
+import json
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from ip_monitor.commands.admin_commands.data_handler import DataHandler
+from ip_monitor.storage import SQLiteIPStorage
+
+HISTORY = [
+    {"ip": "192.168.1.1", "timestamp": "2024-01-01T08:00:00"},
+    {"ip": "192.168.1.2", "timestamp": "2024-02-01T08:00:00"},
+]
+
+
+class TestDataHandler:
+    """Test cases for DataHandler."""
+
+    @pytest.fixture
+    def storage(self, tmp_path):
+        """SQLite storage with an archived history."""
+        storage = SQLiteIPStorage(str(tmp_path / "ip.db"), history_size=10)
+        storage.save_ip_history(HISTORY)
+        yield storage
+        storage.close()
+
+    @pytest.fixture
+    def data_handler(
+        self, mock_client, mock_ip_service, storage, mock_stop_callback, mock_config
+    ):
+        """Create a DataHandler instance for testing."""
+        mock_ip_service.observation_log = None
+        return DataHandler(
+            client=mock_client,
+            ip_service=mock_ip_service,
+            storage=storage,
+            stop_callback=mock_stop_callback,
+            config=mock_config,
+        )
+
+    @pytest.fixture
+    def admin_message(self, mock_message):
+        """Admin message sent outside a guild."""
+        mock_message.author.guild_permissions.administrator = True
+        mock_message.guild = None
+        mock_message.attachments = []
+        return mock_message
+
+    async def test_handle_command_unknown(self, data_handler, admin_message):
+        """Test that other commands are not handled."""
+        assert await data_handler.handle_command(admin_message, []) is False
+        assert await data_handler.handle_command(admin_message, ["cache"]) is False
+
+    async def test_export_uploads_compressed_history(self, data_handler, admin_message):
+        """Test that the archive is uploaded as a gzipped NDJSON file."""
+        uploaded = {}
+
+        async def send(content, file):
+            uploaded["content"] = content
+            uploaded["filename"] = file.filename
+            uploaded["data"] = file.fp.read()
+
+        admin_message.channel.send = AsyncMock(side_effect=send)
+
+        result = await data_handler.handle_command(admin_message, ["export"])
+
+        assert result is True
+        assert "2 history rows" in uploaded["content"]
+        assert uploaded["filename"].endswith(".ndjson.gz")
+        lines = gzip.decompress(uploaded["data"]).decode().splitlines()
+        assert [json.loads(line) for line in lines] == HISTORY
+
+    async def test_export_over_upload_limit(self, data_handler, admin_message):
+        """Test that an export larger than the upload limit is not sent."""
+        admin_message.guild = Mock(filesize_limit=10)
+
+        result = await data_handler.handle_command(
+            admin_message, ["export", "history", "csv"]
+        )
+
+        assert result is False
+        assert "upload limit" in admin_message.channel.send.call_args[0][0]
+
+    async def test_export_rejects_unknown_dataset_and_format(
+        self, data_handler, admin_message
+    ):
+        """Test that unknown datasets and formats are rejected."""
+        assert (
+            await data_handler.handle_command(admin_message, ["export", "x"]) is False
+        )
+        assert "Unknown dataset" in admin_message.channel.send.call_args[0][0]
+
+        assert (
+            await data_handler.handle_command(admin_message, ["export", "history", "x"])
+            is False
+        )
+        assert "Unknown format" in admin_message.channel.send.call_args[0][0]
+
+    async def test_export_observations_requires_log(self, data_handler, admin_message):
+        """Test that observations cannot be exported when they are not logged."""
+        result = await data_handler.handle_command(
+            admin_message, ["export", "observations"]
+        )
+
+        assert result is False
+        assert "not enabled" in admin_message.channel.send.call_args[0][0]
+
+    async def test_export_requires_admin(self, data_handler, mock_message):
+        """Test that exporting requires admin permissions."""
+        result = await data_handler.handle_command(mock_message, ["export"])
+
+        assert result is False
+        assert "permission" in mock_message.channel.send.call_args[0][0]
+
+    async def test_import_adds_attachment_to_archive(
+        self, data_handler, admin_message, storage
+    ):
+        """Test that an attached CSV export is imported into the archive."""
+        record = {"ip": "10.0.0.1", "timestamp": "2024-03-01T08:00:00"}
+
+        async def save(path):
+            with gzip.open(path, "wt") as f:
+                f.write(f"ip,timestamp\n{record['ip']},{record['timestamp']}\n")
+
+        admin_message.attachments = [
+            Mock(filename="history.csv.gz", save=AsyncMock(side_effect=save))
+        ]
+
+        result = await data_handler.handle_command(admin_message, ["import"])
+
+        assert result is True
+        assert "Imported 1 new" in admin_message.channel.send.call_args[0][0]
+        assert storage.load_archive() == [*HISTORY, record]
+
+    async def test_import_rejects_missing_or_unsupported_file(
+        self, data_handler, admin_message
+    ):
+        """Test that an import needs an attachment in a supported format."""
+        assert await data_handler.handle_command(admin_message, ["import"]) is False
+        assert "Attach" in admin_message.channel.send.call_args[0][0]
+
+        admin_message.attachments = [Mock(filename="history.xlsx")]
+        assert await data_handler.handle_command(admin_message, ["import"]) is False
+        assert "Unsupported file" in admin_message.channel.send.call_args[0][0]
+
+    def test_get_help_text(self, data_handler):
+        """Test that the help text lists the data commands."""
+        help_text = data_handler.get_help_text()
+
+        assert "!export" in help_text
+        assert "!import" in help_text
+
+    async def test_backup_reports_throughput(
+        self, data_handler, admin_message, storage
+    ):
+        """Test that !backup copies the database and reports the result."""
+        data_handler.backup.db_file = storage.db_file
+
+        result = await data_handler.handle_command(admin_message, ["backup"])
+
+        assert result is True
+        reply = admin_message.channel.send.call_args[0][0]
+        assert "MiB/s" in reply
+        assert "Backups kept: 1." in reply
+        assert len(data_handler.backup.list_backups()) == 1
+
+    async def test_backup_failed_verification(self, data_handler, admin_message):
+        """Test that a backup failing its integrity check is reported."""
+        data_handler.backup.run = AsyncMock(return_value=Mock(verified=False))
+
+        result = await data_handler.handle_command(admin_message, ["backup"])
+
+        assert result is False
+        assert "integrity check" in admin_message.channel.send.call_args[0][0]
+
+    async def test_backup_requires_sqlite(
+        self, data_handler, admin_message, mock_config
+    ):
+        """Test that other storage backends have no database to back up."""
+        mock_config.storage_backend = "memory"
+        data_handler.backup.run = AsyncMock()
+
+        result = await data_handler.handle_command(admin_message, ["backup"])
+
+        assert result is False
+        assert "requires SQLite" in admin_message.channel.send.call_args[0][0]
+        data_handler.backup.run.assert_not_called()
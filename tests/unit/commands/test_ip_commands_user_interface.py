@@ -33,7 +33,9 @@ class TestHistoryRetrieval:
         """Test history command with existing IP history data."""
         # Setup mocks
         mock_message.author.name = "TestUser"
-        ip_commands.storage.load_ip_history = Mock(return_value=sample_ip_history)
+        ip_commands.storage.load_history_page = Mock(
+            return_value=(sample_ip_history[::-1], None)
+        )
 
         with patch.object(
             ip_commands, "send_message_with_retry", new_callable=AsyncMock
@@ -45,7 +47,9 @@ class TestHistoryRetrieval:
 
             # Verify success
             assert result is True
-            ip_commands.storage.load_ip_history.assert_called_once()
+            ip_commands.storage.load_history_page.assert_called_once_with(
+                IPCommands.HISTORY_PAGE_SIZE, None, None, None
+            )
             mock_send.assert_called_once()
 
             # Verify message content includes history
@@ -59,7 +63,7 @@ class TestHistoryRetrieval:
     async def test_handle_history_command_no_data(self, ip_commands, mock_message):
         """Test history command with no IP history available."""
         # Setup mocks
-        ip_commands.storage.load_ip_history = Mock(return_value=[])
+        ip_commands.storage.load_history_page = Mock(return_value=([], None))
 
         with patch.object(
             ip_commands, "send_message_with_retry", new_callable=AsyncMock
@@ -78,15 +82,16 @@ class TestHistoryRetrieval:
     async def test_handle_history_command_large_history(
         self, ip_commands, mock_message
     ):
-        """Test history command with large history that exceeds Discord message limits."""
-        # Create large history list
-        large_history = []
-        for i in range(50):
-            large_history.append(
-                {"ip": f"192.168.1.{i}", "timestamp": f"2023-01-{i + 1:02d}T12:00:00Z"}
-            )
+        """Test history command shows one page and points to older entries."""
+        # One page of a larger history, newest first
+        page = [
+            {"ip": f"192.168.1.{i}", "timestamp": f"2023-01-01T12:{i:02d}:00Z"}
+            for i in range(49, 39, -1)
+        ]
 
-        ip_commands.storage.load_ip_history = Mock(return_value=large_history)
+        ip_commands.storage.load_history_page = Mock(
+            return_value=(page, ("2023-01-01T12:40:00Z", 40))
+        )
 
         with patch.object(
             ip_commands, "send_message_with_retry", new_callable=AsyncMock
@@ -96,12 +101,14 @@ class TestHistoryRetrieval:
             # Execute command
             result = await ip_commands.handle_history_command(mock_message)
 
-            # Verify truncation occurs
+            # Verify only the page is sent
             assert result is True
             mock_send.assert_called_once()
             call_args = mock_send.call_args
             message_content = call_args[0][1]
-            assert "more entries" in message_content
+            assert message_content.count("IP: `") == 10
+            assert "1. IP: `192.168.1.49`" in message_content
+            assert "/history" in message_content
             assert len(message_content) < 2000  # Discord limit
 
     async def test_handle_history_command_invalid_timestamp(
@@ -113,7 +120,9 @@ class TestHistoryRetrieval:
             {"ip": "192.168.1.2", "timestamp": "2023-01-01T12:00:00Z"},
         ]
 
-        ip_commands.storage.load_ip_history = Mock(return_value=invalid_history)
+        ip_commands.storage.load_history_page = Mock(
+            return_value=(invalid_history, None)
+        )
 
         with patch.object(
             ip_commands, "send_message_with_retry", new_callable=AsyncMock
@@ -143,7 +152,9 @@ class TestHistoryRetrieval:
             },  # Complete entry
         ]
 
-        ip_commands.storage.load_ip_history = Mock(return_value=incomplete_history)
+        ip_commands.storage.load_history_page = Mock(
+            return_value=(incomplete_history, None)
+        )
 
         with patch.object(
             ip_commands, "send_message_with_retry", new_callable=AsyncMock
@@ -553,7 +564,7 @@ class TestUserInterfaceErrorHandling:
     async def test_history_command_storage_exception(self, ip_commands, mock_message):
         """Test history command when storage raises exception."""
         # Setup storage to raise exception
-        ip_commands.storage.load_ip_history = Mock(
+        ip_commands.storage.load_history_page = Mock(
             side_effect=Exception("Storage error")
         )
 
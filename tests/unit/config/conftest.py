@@ -49,6 +49,17 @@ def env_cleanup():
         "CACHE_STALE_THRESHOLD",
         "CACHE_FILE",
         "CACHE_CLEANUP_INTERVAL",
+        "CACHE_MAX_MEMORY_BYTES",
+        "CACHE_TYPE_MEMORY_BUDGETS",
+        "STORAGE_BACKEND",
+        "JSONL_HISTORY_FILE",
+        "JSONL_COMPACT_BYTES",
+        "ARCHIVE_RETENTION_MONTHS",
+        "OBSERVATION_LOG_ENABLED",
+        "OBSERVATION_RAW_RETENTION_HOURS",
+        "BACKUP_DIR",
+        "BACKUP_INTERVAL_HOURS",
+        "BACKUP_KEEP",
     ]
 
     # Store original values
@@ -345,3 +345,100 @@ class TestAppConfigEnvironmentVariableLoading:
         assert config.cache_stale_threshold == 0.9
         assert config.cache_file == "comprehensive_cache.json"
         assert config.cache_cleanup_interval == 600
+
+    @patch("ip_monitor.config.load_dotenv")
+    def test_load_from_env_cache_memory_budgets(
+        self, mock_load_dotenv, minimal_env_config
+    ):
+        """Test that cache byte budgets are read from the environment."""
+        os.environ["CACHE_MAX_MEMORY_BYTES"] = "1048576"
+        os.environ["CACHE_TYPE_MEMORY_BUDGETS"] = (
+            "api_response=262144, PERFORMANCE_DATA=65536"
+        )
+
+        config = AppConfig.load_from_env()
+
+        assert config.cache_max_memory_bytes == 1048576
+        assert config.cache_type_memory_budgets == {
+            "api_response": 262144,
+            "performance_data": 65536,
+        }
+
+    @patch("ip_monitor.config.load_dotenv")
+    def test_load_from_env_cache_memory_budgets_default_to_none(
+        self, mock_load_dotenv, minimal_env_config
+    ):
+        """Test that no byte budgets are set unless configured."""
+        config = AppConfig.load_from_env()
+
+        assert config.cache_max_memory_bytes == 0
+        assert config.cache_type_memory_budgets == {}
+
+    @patch("ip_monitor.config.load_dotenv")
+    def test_load_from_env_archive_retention(
+        self, mock_load_dotenv, minimal_env_config
+    ):
+        """Test that the archive keeps everything unless a retention is set."""
+        assert AppConfig.load_from_env().archive_retention_months == 0
+
+        os.environ["ARCHIVE_RETENTION_MONTHS"] = "24"
+
+        assert AppConfig.load_from_env().archive_retention_months == 24
+
+    @patch("ip_monitor.config.load_dotenv")
+    def test_load_from_env_observation_log(self, mock_load_dotenv, minimal_env_config):
+        """Test that the observation log is on by default with a week of raw rows."""
+        config = AppConfig.load_from_env()
+        assert config.observation_log_enabled is True
+        assert config.observation_raw_retention_hours == 168
+
+        os.environ["OBSERVATION_LOG_ENABLED"] = "false"
+        os.environ["OBSERVATION_RAW_RETENTION_HOURS"] = "24"
+
+        config = AppConfig.load_from_env()
+        assert config.observation_log_enabled is False
+        assert config.observation_raw_retention_hours == 24
+
+    @patch("ip_monitor.config.load_dotenv")
+    def test_load_from_env_backup(self, mock_load_dotenv, minimal_env_config):
+        """Test that a week of daily backups is kept by default."""
+        config = AppConfig.load_from_env()
+        assert config.backup_dir == "backups"
+        assert config.backup_interval_hours == 24.0
+        assert config.backup_keep == 7
+
+        os.environ["BACKUP_DIR"] = "/var/backups/ip_monitor"
+        os.environ["BACKUP_INTERVAL_HOURS"] = "0.5"
+        os.environ["BACKUP_KEEP"] = "0"
+
+        config = AppConfig.load_from_env()
+        assert config.backup_dir == "/var/backups/ip_monitor"
+        assert config.backup_interval_hours == 0.5
+        assert config.backup_keep == 0
+
+    @patch("ip_monitor.config.load_dotenv")
+    def test_load_from_env_storage_backend(self, mock_load_dotenv, minimal_env_config):
+        """Test that SQLite storage is used unless another backend is chosen."""
+        config = AppConfig.load_from_env()
+        assert config.storage_backend == "sqlite"
+        assert config.jsonl_history_file == "ip_history.jsonl"
+        assert config.jsonl_compact_bytes == 262144
+
+        os.environ["STORAGE_BACKEND"] = "JSONL"
+        os.environ["JSONL_HISTORY_FILE"] = "/data/history.jsonl"
+        os.environ["JSONL_COMPACT_BYTES"] = "1024"
+
+        config = AppConfig.load_from_env()
+        assert config.storage_backend == "jsonl"
+        assert config.jsonl_history_file == "/data/history.jsonl"
+        assert config.jsonl_compact_bytes == 1024
+
+    @patch("ip_monitor.config.load_dotenv")
+    def test_load_from_env_invalid_cache_memory_budget(
+        self, mock_load_dotenv, minimal_env_config
+    ):
+        """Test that a malformed budget pair is rejected."""
+        os.environ["CACHE_TYPE_MEMORY_BUDGETS"] = "api_response"
+
+        with pytest.raises(ValueError, match="Invalid cache memory budget"):
+            AppConfig.load_from_env()
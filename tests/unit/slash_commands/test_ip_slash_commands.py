@@ -9,7 +9,8 @@ import discord
 import pytest
 from discord.ext import commands
 
-from ip_monitor.slash_commands.ip_slash_commands import IPSlashCommands
+from ip_monitor.commands.ip_commands import IPCommands
+from ip_monitor.slash_commands.ip_slash_commands import HistoryView, IPSlashCommands
 
 
 class TestIPSlashCommands:
@@ -352,11 +353,14 @@ class TestHistorySlashCommand:
     def mock_storage(self):
         """Create a mock storage."""
         storage = MagicMock()
-        storage.load_ip_history = MagicMock(
-            return_value=[
-                {"ip": "203.0.113.0", "timestamp": "2024-01-01T12:00:00"},
-                {"ip": "203.0.113.1", "timestamp": "2024-01-01T13:00:00"},
-            ]
+        storage.load_history_page = MagicMock(
+            return_value=(
+                [
+                    {"ip": "203.0.113.1", "timestamp": "2024-01-01T13:00:00"},
+                    {"ip": "203.0.113.0", "timestamp": "2024-01-01T12:00:00"},
+                ],
+                None,
+            )
         )
         return storage
 
@@ -389,17 +393,21 @@ class TestHistorySlashCommand:
         )
 
         mock_interaction.response.defer.assert_called_once()
-        ip_slash_commands.storage.load_ip_history.assert_called_once()
+        ip_slash_commands.storage.load_history_page.assert_called_once_with(
+            IPCommands.HISTORY_PAGE_SIZE, None, None, None
+        )
 
         mock_interaction.followup.send.assert_called_once()
         call_args = mock_interaction.followup.send.call_args[0][0]
         assert "📜 **IP Address History**" in call_args
-        assert "203.0.113.0" in call_args
-        assert "203.0.113.1" in call_args
+        assert "1. IP: `203.0.113.1`" in call_args
+        assert "2. IP: `203.0.113.0`" in call_args
+        # A single page needs no buttons
+        assert "view" not in mock_interaction.followup.send.call_args.kwargs
 
     async def test_history_slash_no_history(self, ip_slash_commands, mock_interaction):
         """Test history slash command with no history."""
-        ip_slash_commands.storage.load_ip_history.return_value = []
+        ip_slash_commands.storage.load_history_page.return_value = ([], None)
 
         await ip_slash_commands.history_slash.callback(
             ip_slash_commands, mock_interaction
@@ -409,35 +417,90 @@ class TestHistorySlashCommand:
         call_args = mock_interaction.followup.send.call_args[0][0]
         assert "No IP history available" in call_args
 
-    async def test_history_slash_large_history(
+    async def test_history_slash_pages_with_buttons(
         self, ip_slash_commands, mock_interaction
     ):
-        """Test history slash command with large history (truncation)."""
-        # Create a large history that will exceed message length
-        large_history = []
-        for i in range(50):
-            large_history.append(
-                {"ip": f"203.0.113.{i}", "timestamp": f"2024-01-{i + 1:02d}T12:00:00"}
-            )
-
-        ip_slash_commands.storage.load_ip_history.return_value = large_history
+        """Test that a longer history is paged with buttons, one page per click."""
+        storage = ip_slash_commands.storage
+        pages = [
+            [
+                {"ip": f"203.0.113.{i}", "timestamp": f"2024-01-{i:02d}T12:00:00"}
+                for i in range(last, last - 10, -1)
+            ]
+            for last in (25, 15, 5)
+        ]
+        storage.load_history_page.return_value = (pages[0], ("2024-01-16", 16))
+        sent_message = MagicMock()
+        mock_interaction.followup.send.return_value = sent_message
 
         await ip_slash_commands.history_slash.callback(
             ip_slash_commands, mock_interaction
         )
 
-        mock_interaction.followup.send.assert_called_once()
-        call_args = mock_interaction.followup.send.call_args[0][0]
-        assert "📜 **IP Address History**" in call_args
-        assert "... and" in call_args and "more entries" in call_args
+        call = mock_interaction.followup.send.call_args
+        assert "1. IP: `203.0.113.25`" in call.args[0]
+        assert call.kwargs["wait"] is True
+        view = call.kwargs["view"]
+        assert isinstance(view, HistoryView)
+        assert view.message is sent_message
+        assert view.newer_button.disabled
+        assert not view.older_button.disabled
+
+        click = MagicMock()
+        click.response.edit_message = AsyncMock()
+        storage.load_history_page.return_value = (pages[1], ("2024-01-06", 6))
+        await view.older_button.callback(click)
+
+        storage.load_history_page.assert_called_with(
+            IPCommands.HISTORY_PAGE_SIZE, ("2024-01-16", 16), None, None
+        )
+        content = click.response.edit_message.call_args.kwargs["content"]
+        assert "11. IP: `203.0.113.15`" in content
+        assert not view.newer_button.disabled
+
+        storage.load_history_page.return_value = (pages[0], ("2024-01-16", 16))
+        await view.newer_button.callback(click)
+
+        storage.load_history_page.assert_called_with(
+            IPCommands.HISTORY_PAGE_SIZE, None, None, None
+        )
+        content = click.response.edit_message.call_args.kwargs["content"]
+        assert "1. IP: `203.0.113.25`" in content
+        assert view.newer_button.disabled
+
+    async def test_history_slash_filters_by_date(
+        self, ip_slash_commands, mock_interaction
+    ):
+        """Test that the date options are passed to storage as a time range."""
+        await ip_slash_commands.history_slash.callback(
+            ip_slash_commands, mock_interaction, since="2024-01-01", before="2024-02-01"
+        )
+
+        ip_slash_commands.storage.load_history_page.assert_called_once_with(
+            IPCommands.HISTORY_PAGE_SIZE, None, "2024-01-01", "2024-02-01"
+        )
+
+    async def test_history_slash_invalid_date(
+        self, ip_slash_commands, mock_interaction
+    ):
+        """Test that an invalid date is rejected without reading history."""
+        await ip_slash_commands.history_slash.callback(
+            ip_slash_commands, mock_interaction, since="last week"
+        )
+
+        ip_slash_commands.storage.load_history_page.assert_not_called()
+        call = mock_interaction.followup.send.call_args
+        assert "Invalid date" in call.args[0]
+        assert call.kwargs["ephemeral"] is True
 
     async def test_history_slash_invalid_timestamp(
         self, ip_slash_commands, mock_interaction
     ):
         """Test history slash command with invalid timestamp."""
-        ip_slash_commands.storage.load_ip_history.return_value = [
-            {"ip": "203.0.113.0", "timestamp": "invalid-timestamp"}
-        ]
+        ip_slash_commands.storage.load_history_page.return_value = (
+            [{"ip": "203.0.113.0", "timestamp": "invalid-timestamp"}],
+            None,
+        )
 
         await ip_slash_commands.history_slash.callback(
             ip_slash_commands, mock_interaction
@@ -452,10 +515,13 @@ class TestHistorySlashCommand:
         self, ip_slash_commands, mock_interaction
     ):
         """Test history slash command with missing fields."""
-        ip_slash_commands.storage.load_ip_history.return_value = [
-            {"ip": "203.0.113.0"},  # Missing timestamp
-            {"timestamp": "2024-01-01T12:00:00"},  # Missing IP
-        ]
+        ip_slash_commands.storage.load_history_page.return_value = (
+            [
+                {"ip": "203.0.113.0"},  # Missing timestamp
+                {"timestamp": "2024-01-01T12:00:00"},  # Missing IP
+            ],
+            None,
+        )
 
         await ip_slash_commands.history_slash.callback(
             ip_slash_commands, mock_interaction
@@ -469,7 +535,9 @@ class TestHistorySlashCommand:
         self, ip_slash_commands, mock_interaction
     ):
         """Test history slash command exception handling."""
-        ip_slash_commands.storage.load_ip_history.side_effect = Exception("Test error")
+        ip_slash_commands.storage.load_history_page.side_effect = Exception(
+            "Test error"
+        )
 
         await ip_slash_commands.history_slash.callback(
             ip_slash_commands, mock_interaction
@@ -483,7 +551,9 @@ class TestHistorySlashCommand:
         self, ip_slash_commands, mock_interaction
     ):
         """Test history slash command when interaction expires."""
-        ip_slash_commands.storage.load_ip_history.side_effect = Exception("Test error")
+        ip_slash_commands.storage.load_history_page.side_effect = Exception(
+            "Test error"
+        )
         mock_interaction.followup.send.side_effect = discord.NotFound(
             MagicMock(), "Interaction not found"
         )
@@ -0,0 +1,114 @@
+"""
+Unit tests for online database backups.
+"""
+
+import os
+import sqlite3
+from unittest.mock import patch
+
+import pytest
+
+from ip_monitor.backup import DatabaseBackup
+
+# Rows of 1000 bytes, enough for several backup steps
+ROWS = 2000
+
+
+@pytest.fixture
+def db_file(tmp_path):
+    """Database in write-ahead log mode spanning several backup steps."""
+    path = str(tmp_path / "ip_monitor.db")
+    with sqlite3.connect(path) as conn:
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("CREATE TABLE blobs (data BLOB)")
+        conn.executemany(
+            "INSERT INTO blobs VALUES (?)", [(os.urandom(1000),) for _ in range(ROWS)]
+        )
+    conn.close()
+    return path
+
+
+@pytest.fixture
+def backup(db_file, tmp_path):
+    """Backup of the database into a temporary directory."""
+    return DatabaseBackup(db_file, str(tmp_path / "backups"), keep=2)
+
+
+def row_count(path: str) -> int:
+    """Count the rows of a copy of the test database."""
+    conn = sqlite3.connect(path)
+    try:
+        return conn.execute("SELECT COUNT(*) FROM blobs").fetchone()[0]
+    finally:
+        conn.close()
+
+
+class TestDatabaseBackup:
+    """Test suite for DatabaseBackup."""
+
+    async def test_backup_is_verified_and_self_contained(self, backup):
+        """A backup is a complete, checked, single-file copy."""
+        result = await backup.run()
+
+        assert result.verified is True
+        assert backup.list_backups() == [result.path]
+        assert os.path.basename(result.path).startswith("ip_monitor-")
+        assert os.listdir(backup.backup_dir) == [os.path.basename(result.path)]
+        assert result.bytes == os.path.getsize(result.path)
+        assert result.pages > DatabaseBackup.PAGES_PER_STEP
+        assert result.bytes_per_second > 0
+        assert row_count(result.path) == ROWS
+        assert backup.last_result is result
+
+    async def test_backup_copies_one_snapshot_while_writes_continue(
+        self, backup, db_file
+    ):
+        """Writes made between steps land, and the copy stays consistent."""
+        writer = sqlite3.connect(db_file, check_same_thread=False)
+        steps = []
+
+        def write_between_steps(status, remaining, total):
+            steps.append(remaining)
+            writer.execute("INSERT INTO blobs VALUES (x'00')")
+            writer.commit()
+
+        try:
+            with patch.object(
+                DatabaseBackup, "_progress", staticmethod(write_between_steps)
+            ):
+                result = await backup.run()
+        finally:
+            writer.close()
+
+        # Several bounded steps, none of them restarting the copy
+        assert len(steps) > 1
+        assert steps == sorted(steps, reverse=True)
+        assert result.verified is True
+        assert row_count(result.path) == ROWS
+        assert row_count(db_file) == ROWS + len(steps)
+
+    async def test_rotation_keeps_newest_backups(self, backup):
+        """Only the configured number of backups is kept."""
+        paths = [(await backup.run()).path for _ in range(3)]
+
+        assert backup.list_backups() == paths[1:]
+
+    async def test_failed_verification_discards_copy(self, backup):
+        """A copy that fails its integrity check is not kept."""
+        with patch.object(DatabaseBackup, "_verify", return_value=False):
+            result = await backup.run()
+
+        assert result.verified is False
+        assert backup.list_backups() == []
+        assert os.listdir(backup.backup_dir) == []
+
+    async def test_copy_error_removes_partial_file(self, backup):
+        """A failed copy leaves no partial file behind."""
+        error = sqlite3.OperationalError("locked")
+        with (
+            patch.object(DatabaseBackup, "_copy", side_effect=error),
+            pytest.raises(sqlite3.OperationalError),
+        ):
+            await backup.run()
+
+        assert os.listdir(backup.backup_dir) == []
@@ -0,0 +1,90 @@
+"""
+Unit tests for streaming data export and import.
+"""
+
+import gzip
+
+import pytest
+
+from ip_monitor.data_export import (
+    export_filename,
+    export_format_for,
+    read_import,
+    write_export,
+)
+
+ROWS = [
+    {"ip": "192.168.1.1", "timestamp": "2024-01-01T08:00:00"},
+    {"ip": "2001:db8::1", "timestamp": "2024-01-02T08:00:00"},
+]
+
+
+class TestDataExport:
+    """Test suite for export and import files."""
+
+    @pytest.mark.parametrize("fmt", ["ndjson", "csv"])
+    def test_round_trip(self, tmp_path, fmt):
+        """Exported rows read back unchanged."""
+        path = str(tmp_path / export_filename("history", fmt, "test"))
+
+        assert write_export(iter(ROWS), ("ip", "timestamp"), fmt, path) == 2
+
+        with open(path, "rb") as f:
+            assert f.read(2) == b"\x1f\x8b"
+        assert list(read_import(path, fmt)) == ROWS
+
+    def test_rows_are_consumed_lazily(self, tmp_path):
+        """Rows are pulled from the iterable as they are written."""
+        path = str(tmp_path / "history.ndjson.gz")
+        pulled = []
+
+        def rows():
+            for row in ROWS:
+                pulled.append(row)
+                yield row
+
+        write_export(rows(), ("ip", "timestamp"), "ndjson", path)
+        assert pulled == ROWS
+
+        imported = read_import(path, "ndjson")
+        assert next(imported) == ROWS[0]
+
+    def test_reads_uncompressed_files(self, tmp_path):
+        """Plain files are read too, skipping blank lines."""
+        ndjson = tmp_path / "history.jsonl"
+        ndjson.write_text('{"ip": "192.168.1.1", "timestamp": "2024-01-01"}\n\n')
+        csv_file = tmp_path / "history.csv"
+        csv_file.write_text("ip,timestamp\n192.168.1.1,2024-01-01\n")
+
+        expected = [{"ip": "192.168.1.1", "timestamp": "2024-01-01"}]
+        assert list(read_import(str(ndjson), "ndjson")) == expected
+        assert list(read_import(str(csv_file), "csv")) == expected
+
+    def test_csv_header_only_holds_requested_columns(self, tmp_path):
+        """Columns not asked for are left out."""
+        path = str(tmp_path / "history.csv.gz")
+        write_export([{**ROWS[0], "extra": 1}], ("ip",), "csv", path)
+
+        with gzip.open(path, "rt") as f:
+            assert f.read().splitlines() == ["ip", "192.168.1.1"]
+
+    def test_unsupported_format(self, tmp_path):
+        """Unknown formats are rejected."""
+        with pytest.raises(ValueError, match="Unsupported"):
+            write_export(ROWS, ("ip",), "xml", str(tmp_path / "out"))
+        with pytest.raises(ValueError, match="Unsupported"):
+            list(read_import(str(tmp_path / "out"), "xml"))
+
+    @pytest.mark.parametrize(
+        ("filename", "fmt"),
+        [
+            ("history.ndjson.gz", "ndjson"),
+            ("HISTORY.JSONL", "ndjson"),
+            ("history.csv.gz", "csv"),
+            ("history.json", None),
+            ("history.gz", None),
+        ],
+    )
+    def test_export_format_for(self, filename, fmt):
+        """Formats are recognized by extension."""
+        assert export_format_for(filename) == fmt
@@ -16,6 +16,17 @@ import pytest
 
 from ip_monitor.ip_api_config import ResponseFormat
 from ip_monitor.ip_service import IPService
+from ip_monitor.observation_log import ObservationLog
+from ip_monitor.storage import StorageWorker
+from ip_monitor.utils.cache import IntelligentCache
+
+
+@pytest.fixture(autouse=True)
+def isolated_cache(tmp_path):
+    """Give each test its own cache so lookup results do not leak between tests."""
+    cache = IntelligentCache(cache_file=str(tmp_path / "cache.json"))
+    with patch("ip_monitor.ip_service.get_cache", return_value=cache):
+        yield cache
 
 
 class TestIPServiceInitialization:
@@ -799,10 +810,6 @@ class TestConcurrentAPIChecking:
         self, service_with_legacy_apis
     ):
         """Test concurrent checking with cache enabled."""
-        # Enable cache
-        service_with_legacy_apis.cache_enabled = True
-        service_with_legacy_apis.cache = Mock()
-
         # Mock API responses - first API returns IP, others return None
         async def mock_fetch_api_with_cache(api_url):
             if "api.ipify.org?format=json" in api_url:
@@ -817,8 +824,49 @@ class TestConcurrentAPIChecking:
             result = await service_with_legacy_apis._get_ip_without_circuit_breaker()
 
         assert result == "203.0.113.1"
-        # Verify cache was called
-        service_with_legacy_apis.cache.set.assert_called_once()
+        # Verify the result was cached as the current IP
+        assert service_with_legacy_apis.cache.get("global", "current_ip") == result
+
+    async def test_get_ip_without_circuit_breaker_coalesces_lookups(
+        self, service_with_legacy_apis
+    ):
+        """Test that concurrent lookups share one round of API requests."""
+        calls = 0
+
+        async def mock_fetch_api(api_url):
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return "203.0.113.1"
+
+        with patch.object(
+            service_with_legacy_apis, "fetch_ip_from_api", side_effect=mock_fetch_api
+        ):
+            results = await asyncio.gather(
+                *(
+                    service_with_legacy_apis._get_ip_without_circuit_breaker()
+                    for _ in range(5)
+                )
+            )
+
+        assert results == ["203.0.113.1"] * 5
+        assert calls == len(service_with_legacy_apis.get_apis_to_use())
+
+    async def test_get_ip_without_circuit_breaker_retries_after_failure(
+        self, service_with_legacy_apis
+    ):
+        """Test that a failed lookup is not cached, so the next check retries."""
+        service_with_legacy_apis.max_retries = 1
+        lookup = service_with_legacy_apis._get_ip_without_circuit_breaker
+
+        with patch.object(
+            service_with_legacy_apis, "fetch_ip_from_api", return_value=None
+        ) as mock_fetch:
+            assert await lookup() is None
+            first_calls = mock_fetch.call_count
+            assert await lookup() is None
+
+        assert mock_fetch.call_count == 2 * first_calls
 
     @patch("ip_monitor.ip_service.ip_api_manager")
     async def test_get_ip_without_circuit_breaker_concurrent_api_save(
@@ -908,6 +956,36 @@ class TestSequentialAPIChecking:
 
         assert result == "203.0.113.1"
 
+    async def test_get_public_ip_records_check_and_attempts(self, tmp_path):
+        """Test that each check and its API attempts go to the observation log."""
+        writer = StorageWorker("test-observation-writer")
+        observation_log = ObservationLog(str(tmp_path / "obs.db"), writer=writer)
+        service = IPService(
+            use_concurrent_checks=False,
+            use_custom_apis=False,
+            circuit_breaker_enabled=False,
+            observation_log=observation_log,
+        )
+        service.client = AsyncMock()
+        service._client_initialized = True
+
+        try:
+            with patch.object(
+                service, "fetch_ip_from_api", side_effect=[None, "203.0.113.1"]
+            ):
+                result = await service.get_public_ip()
+            await observation_log.close()
+        finally:
+            writer.stop(timeout=5)
+
+        assert result == "203.0.113.1"
+        apis = service.get_apis_to_use()
+        now_us = ObservationLog.now_us()
+        summary = observation_log.load_summary(now_us - 60_000_000, now_us + 1)
+        assert [
+            (row["endpoint"], row["attempts"], row["failures"]) for row in summary
+        ] == [("check", 1, 0), (apis[0], 1, 1), (apis[1], 1, 0)]
+
     @patch("ip_monitor.ip_service.ip_api_manager")
     async def test_get_ip_without_circuit_breaker_sequential_all_fail_with_retries(
         self, mock_api_manager, service_with_mock_client
@@ -1417,6 +1495,7 @@ class TestHTTPClientManagement:
         await service.close()
 
         service.cache.save.assert_called_once()
+        service.cache.flush.assert_called_once_with(service.CACHE_FLUSH_TIMEOUT)
 
     async def test_close_with_cache_save_error(self, service):
         """Test closing service when cache save raises exception."""
@@ -0,0 +1,206 @@
+"""
+Unit tests for the check observation log.
+"""
+
+import sqlite3
+import threading
+
+import pytest
+
+from ip_monitor.observation_log import CHECK_ENDPOINT_ID, HOUR_US, ObservationLog
+from ip_monitor.storage import StorageWorker
+
+
+@pytest.fixture
+def writer():
+    """Dedicated writer worker, stopped after the test."""
+    worker = StorageWorker("test-observation-writer")
+    yield worker
+    worker.stop(timeout=5)
+
+
+@pytest.fixture
+def observation_log(tmp_path, writer):
+    """Observation log in a temporary database."""
+    return ObservationLog(str(tmp_path / "observations.db"), writer=writer)
+
+
+def raw_rows(log: ObservationLog) -> list[tuple]:
+    """Read the raw observation rows in insertion order."""
+    with sqlite3.connect(log.db_file) as conn:
+        return conn.execute(
+            "SELECT ts_us, check_us, endpoint_id, latency_us, ok FROM observations "
+            "ORDER BY rowid"
+        ).fetchall()
+
+
+class TestObservationLog:
+    """Test suite for ObservationLog."""
+
+    async def test_check_and_attempts_committed_together(self, observation_log):
+        """A check's attempts are written with it when the check ends."""
+        with observation_log.check() as check:
+            observation_log.record_attempt("api-a", 1500, False)
+            observation_log.record_attempt("api-b", 800, True)
+            check.ok = True
+            assert observation_log._buffer
+
+        await observation_log.close()
+
+        rows = raw_rows(observation_log)
+        assert len(rows) == 3
+        attempt_a, attempt_b, check_row = rows
+        assert check_row[2] == CHECK_ENDPOINT_ID
+        assert check_row[1] == check_row[0]
+        assert check_row[4] == 1
+        assert attempt_a[1] == attempt_b[1] == check_row[1]
+        assert attempt_a[2] != attempt_b[2]
+        assert (attempt_a[3], attempt_a[4]) == (1500, 0)
+        assert (attempt_b[3], attempt_b[4]) == (800, 1)
+        assert all(isinstance(value, int) for row in rows for value in row)
+
+    def test_check_flushes_when_it_ends(self, observation_log):
+        """Ending a check hands its rows to the writer."""
+        with observation_log.check():
+            observation_log.record_attempt("api-a", 100, True)
+
+        assert observation_log._buffer == []
+        observation_log.flush().result(timeout=5)
+        assert len(raw_rows(observation_log)) == 2
+
+    def test_attempts_outside_a_check_are_batched(self, observation_log):
+        """Attempts outside a check are written once the buffer is full."""
+        for _ in range(ObservationLog.BATCH_SIZE - 1):
+            observation_log.record_attempt("api-a", 100, True)
+        assert len(observation_log._buffer) == ObservationLog.BATCH_SIZE - 1
+
+        observation_log.record_attempt("api-a", 100, True)
+        assert observation_log._buffer == []
+        observation_log.flush().result(timeout=5)
+
+        rows = raw_rows(observation_log)
+        assert len(rows) == ObservationLog.BATCH_SIZE
+        assert all(row[0] == row[1] for row in rows)
+
+    def test_recording_does_not_wait_for_the_writer(self, observation_log, writer):
+        """A blocked writer does not hold up checks."""
+        release = threading.Event()
+        writer.submit(release.wait, 5)
+        try:
+            for _ in range(10):
+                with observation_log.check():
+                    observation_log.record_attempt("api-a", 100, True)
+        finally:
+            release.set()
+
+        observation_log.flush().result(timeout=5)
+        assert len(raw_rows(observation_log)) == 20
+
+    def test_old_rows_rolled_up_hourly(self, observation_log):
+        """Raw rows past retention become hourly aggregates."""
+        now_hour = ObservationLog.now_us() // HOUR_US
+        old_hour = now_hour - observation_log.raw_retention_hours - 2
+        old_us = old_hour * HOUR_US
+        observation_log._write(
+            [
+                (old_us + 10, old_us + 10, "api-a", 100, True),
+                (old_us + 20, old_us + 10, "api-a", 300, False),
+                (old_us + 30, old_us + 10, None, 450, True),
+            ]
+        )
+        recent_us = ObservationLog.now_us()
+        observation_log._write([(recent_us, recent_us, "api-a", 500, True)])
+
+        with sqlite3.connect(observation_log.db_file) as conn:
+            hourly = conn.execute(
+                "SELECT hour, endpoint_id, attempts, failures, latency_us_total, "
+                "latency_us_max FROM observation_hourly ORDER BY endpoint_id"
+            ).fetchall()
+        api_id = observation_log._endpoint_ids["api-a"]
+        assert hourly == [
+            (old_hour, CHECK_ENDPOINT_ID, 1, 0, 450, 450),
+            (old_hour, api_id, 2, 1, 400, 300),
+        ]
+        assert [row[0] for row in raw_rows(observation_log)] == [recent_us]
+
+        summary = observation_log.load_summary(old_us, recent_us + 1)
+        assert summary == [
+            {
+                "endpoint": "check",
+                "attempts": 1,
+                "failures": 0,
+                "mean_latency_us": 450,
+                "max_latency_us": 450,
+            },
+            {
+                "endpoint": "api-a",
+                "attempts": 3,
+                "failures": 1,
+                "mean_latency_us": 300,
+                "max_latency_us": 500,
+            },
+        ]
+
+    def test_rollups_merge_with_earlier_rollups(self, observation_log):
+        """Rolling up the same hour twice adds to the existing aggregate."""
+        old_us = (ObservationLog.now_us() // HOUR_US - 500) * HOUR_US
+        observation_log._write([(old_us, old_us, "api-a", 100, True)])
+        observation_log._downsampled_hour = 0
+        observation_log._write([(old_us + 1, old_us + 1, "api-a", 700, False)])
+
+        summary = observation_log.load_summary(old_us, old_us + HOUR_US)
+        assert summary == [
+            {
+                "endpoint": "api-a",
+                "attempts": 2,
+                "failures": 1,
+                "mean_latency_us": 400,
+                "max_latency_us": 700,
+            }
+        ]
+
+    async def test_close_writes_remaining_rows(self, observation_log):
+        """Closing writes rows still in the buffer."""
+        observation_log.record_attempt("api-a", 100, True)
+        await observation_log.close()
+
+        assert len(raw_rows(observation_log)) == 1
+        assert observation_log._conn is None
+
+    def test_write_error_is_logged(self, tmp_path, writer, caplog):
+        """A database that cannot be opened does not raise into the caller."""
+        log = ObservationLog(str(tmp_path / "missing" / "obs.db"), writer=writer)
+        with log.check():
+            log.record_attempt("api-a", 100, True)
+        log.flush().result(timeout=5)
+
+        assert "Error writing" in caplog.text
+
+    def test_iter_observations_streams_raw_rows(self, observation_log):
+        """Raw rows are streamed with their endpoint names, oldest first."""
+        assert list(observation_log.iter_observations()) == []
+
+        now_us = ObservationLog.now_us()
+        observation_log._write(
+            [
+                (now_us, now_us, "api-a", 1500, False),
+                (now_us + 10, now_us, None, 2000, True),
+            ]
+        )
+
+        assert list(observation_log.iter_observations()) == [
+            {
+                "ts_us": now_us,
+                "check_us": now_us,
+                "endpoint": "api-a",
+                "latency_us": 1500,
+                "ok": False,
+            },
+            {
+                "ts_us": now_us + 10,
+                "check_us": now_us,
+                "endpoint": "check",
+                "latency_us": 2000,
+                "ok": True,
+            },
+        ]
@@ -4,20 +4,36 @@ Comprehensive test suite for ip_monitor.storage module.
 This test suite covers:
 - SQLiteIPStorage: Database operations, data integrity, transactions
 - IPStorage: JSON file operations, atomic writes, legacy support
+- AsyncStorage: Storage calls on the writer and reader threads
 - Migration: JSON to SQLite conversion
 - Error handling: Database errors, file system errors, validation
 - Performance: Concurrent access, large datasets, memory usage
 """
 
+import asyncio
 import json
 import os
 import sqlite3
 import threading
 import time
 from datetime import datetime
-from unittest.mock import patch
+from unittest.mock import Mock, patch
 
-from ip_monitor.storage import IPStorage, SQLiteIPStorage
+import pytest
+
+from ip_monitor.storage import (
+    AsyncStorage,
+    IPStorage,
+    STORAGE_BACKENDS,
+    JSONLIPStorage,
+    MemoryIPStorage,
+    SQLiteIPStorage,
+    StorageWorker,
+    create_storage,
+    pack_ip,
+    register_storage_backend,
+    unpack_ip,
+)
 
 
 class TestSQLiteIPStorage:
@@ -89,10 +105,11 @@ class TestSQLiteIPStorage:
         # Verify IP was saved
         with sqlite3.connect(sqlite_storage.db_file) as conn:
             cursor = conn.cursor()
-            cursor.execute("SELECT ip FROM current_ip")
+            cursor.execute("SELECT ip, family FROM current_ip")
             row = cursor.fetchone()
             assert row is not None
-            assert row[0] == test_ip
+            assert row == pack_ip(test_ip)
+            assert len(row[0]) == 4
 
     def test_save_current_ip_updates_history_on_change(self, sqlite_storage):
         """Test that IP history is updated when IP changes."""
@@ -111,8 +128,8 @@ class TestSQLiteIPStorage:
             cursor.execute("SELECT ip FROM ip_history ORDER BY created_at")
             rows = cursor.fetchall()
             assert len(rows) == 2
-            assert rows[0][0] == first_ip
-            assert rows[1][0] == second_ip
+            assert unpack_ip(rows[0][0]) == first_ip
+            assert unpack_ip(rows[1][0]) == second_ip
 
     def test_save_current_ip_no_history_on_same_ip(self, sqlite_storage):
         """Test that IP history is not updated when same IP is saved again."""
@@ -129,6 +146,26 @@ class TestSQLiteIPStorage:
             count = cursor.fetchone()[0]
             assert count == 1
 
+    def test_save_current_ip_trims_history_to_size(self, temp_db_path):
+        """Test that saving keeps only the newest entries, in insertion order."""
+        storage = SQLiteIPStorage(temp_db_path, history_size=3)
+
+        # Saved within the same second, so created_at cannot order them
+        for i in range(5):
+            assert storage.save_current_ip(f"192.168.1.{i}") is True
+
+        history = storage.load_ip_history()
+        storage.close()
+
+        assert [record["ip"] for record in history] == [
+            "192.168.1.2",
+            "192.168.1.3",
+            "192.168.1.4",
+        ]
+        with sqlite3.connect(temp_db_path) as conn:
+            count = conn.execute("SELECT COUNT(*) FROM ip_history").fetchone()[0]
+        assert count == 3
+
     def test_save_current_ip_invalid_ip_rejected(self, sqlite_storage):
         """Test that invalid IP addresses are rejected."""
         invalid_ips = ["not.an.ip", "999.999.999.999", "", "192.168.1", "192.168.1.1.1"]
@@ -139,6 +176,8 @@ class TestSQLiteIPStorage:
 
     def test_save_current_ip_handles_database_error(self, sqlite_storage):
         """Test graceful handling of database errors during save."""
+        # The connection is persistent: drop it so reopening fails
+        sqlite_storage.close()
         with patch("sqlite3.connect", side_effect=sqlite3.Error("Database locked")):
             result = sqlite_storage.save_current_ip("192.168.1.1")
             assert result is False
@@ -162,12 +201,12 @@ class TestSQLiteIPStorage:
 
     def test_load_last_ip_validates_ip_format(self, sqlite_storage):
         """Test that invalid IPs in database are rejected."""
-        # Insert invalid IP directly into database
+        # Insert an address of the wrong length directly into database
         with sqlite3.connect(sqlite_storage.db_file) as conn:
             cursor = conn.cursor()
             cursor.execute(
-                "INSERT INTO current_ip (ip, timestamp) VALUES (?, ?)",
-                ("invalid.ip", datetime.now().isoformat()),
+                "INSERT INTO current_ip (ip, family, timestamp) VALUES (?, ?, ?)",
+                (b"\x7f\x00\x00", 4, datetime.now().isoformat()),
             )
             conn.commit()
 
@@ -176,6 +215,8 @@ class TestSQLiteIPStorage:
 
     def test_load_last_ip_handles_database_error(self, sqlite_storage):
         """Test graceful handling of database errors during load."""
+        # The connection is persistent: drop it so reopening fails
+        sqlite_storage.close()
         with patch("sqlite3.connect", side_effect=sqlite3.Error("Database locked")):
             loaded_ip = sqlite_storage.load_last_ip()
             assert loaded_ip is None
@@ -188,13 +229,13 @@ class TestSQLiteIPStorage:
             ("192.168.1.3", "2023-01-01T14:00:00Z"),
         ]
 
-        # Insert IPs in reverse order
+        # Insert IPs within the same second, so created_at cannot order them
         with sqlite3.connect(sqlite_storage.db_file) as conn:
             cursor = conn.cursor()
-            for ip, timestamp in reversed(test_ips):
+            for ip, timestamp in test_ips:
                 cursor.execute(
-                    "INSERT INTO ip_history (ip, timestamp) VALUES (?, ?)",
-                    (ip, timestamp),
+                    "INSERT INTO ip_history (ip, family, timestamp) VALUES (?, ?, ?)",
+                    (*pack_ip(ip), timestamp),
                 )
             conn.commit()
 
@@ -218,10 +259,10 @@ class TestSQLiteIPStorage:
                 # Use microsecond precision to ensure different created_at values
                 cursor.execute(
                     f"""
-                    INSERT INTO ip_history (ip, timestamp, created_at) 
-                    VALUES (?, ?, datetime('2023-01-01 12:00:00', '+{i} seconds'))
+                    INSERT INTO ip_history (ip, family, timestamp, created_at) 
+                    VALUES (?, ?, ?, datetime('2023-01-01 12:00:00', '+{i} seconds'))
                 """,
-                    (f"192.168.1.{i}", f"2023-01-01T{i:02d}:00:00Z"),
+                    (*pack_ip(f"192.168.1.{i}"), f"2023-01-01T{i:02d}:00:00Z"),
                 )
             conn.commit()
 
@@ -229,14 +270,51 @@ class TestSQLiteIPStorage:
         history = storage.load_ip_history()
 
         # Should return only the most recent 3 entries in reverse chronological order
-        # Due to ORDER BY created_at DESC LIMIT 3, we get entries 4,3,2 then reverse to 2,3,4
+        # ORDER BY id DESC LIMIT 3 gets entries 4,3,2, reversed to 2,3,4
         assert len(history) == 3
         assert history[0]["ip"] == "192.168.1.2"  # Oldest of the 3 most recent
         assert history[1]["ip"] == "192.168.1.3"  # Middle
         assert history[2]["ip"] == "192.168.1.4"  # Most recent
 
+    def test_unchanged_ip_check_only_updates_timestamp(self, sqlite_storage):
+        """Test that checking an unchanged IP reads nothing and writes once."""
+        sqlite_storage.save_current_ip("192.168.1.1")
+        sqlite_storage.load_ip_history()
+        statements = []
+        sqlite_storage.conn.set_trace_callback(statements.append)
+        sqlite_storage.read_conn.set_trace_callback(statements.append)
+
+        assert sqlite_storage.load_last_ip() == "192.168.1.1"
+        assert sqlite_storage.save_current_ip("192.168.1.1") is True
+        assert sqlite_storage.load_ip_history()[-1]["ip"] == "192.168.1.1"
+
+        assert not [sql for sql in statements if "SELECT" in sql]
+        updates = [sql for sql in statements if sql.startswith("UPDATE")]
+        assert len(updates) == 1
+        assert not [sql for sql in statements if sql.startswith(("INSERT", "DELETE"))]
+
+    def test_close_reloads_state_from_database(self, sqlite_storage):
+        """Test that the in-memory state is read again after close."""
+        sqlite_storage.save_current_ip("192.168.1.1")
+        sqlite_storage.close()
+
+        with sqlite3.connect(sqlite_storage.db_file) as conn:
+            conn.execute("UPDATE current_ip SET ip = ?", (pack_ip("192.168.1.9")[0],))
+
+        assert sqlite_storage.load_last_ip() == "192.168.1.9"
+
+    def test_load_ip_history_returns_copies(self, sqlite_storage):
+        """Test that changing returned history does not change the stored tail."""
+        sqlite_storage.save_current_ip("192.168.1.1")
+
+        sqlite_storage.load_ip_history()[0]["ip"] = "10.0.0.1"
+
+        assert sqlite_storage.load_ip_history()[0]["ip"] == "192.168.1.1"
+
     def test_load_ip_history_handles_database_error(self, sqlite_storage):
         """Test graceful handling of database errors during history load."""
+        # The connection is persistent: drop it so reopening fails
+        sqlite_storage.close()
         with patch("sqlite3.connect", side_effect=sqlite3.Error("Database locked")):
             history = sqlite_storage.load_ip_history()
             assert history == []
@@ -253,10 +331,10 @@ class TestSQLiteIPStorage:
 
         assert result is True
 
-        # Verify history was saved - load_ip_history returns in reverse chronological order
+        # Verify history was saved in chronological order
         loaded_history = sqlite_storage.load_ip_history()
         assert len(loaded_history) == 3
-        for i, expected in enumerate(reversed(test_history)):
+        for i, expected in enumerate(test_history):
             assert loaded_history[i]["ip"] == expected["ip"]
             assert loaded_history[i]["timestamp"] == expected["timestamp"]
 
@@ -277,11 +355,13 @@ class TestSQLiteIPStorage:
         # Verify only the most recent entries were saved
         loaded_history = storage.load_ip_history()
         assert len(loaded_history) == 3
-        assert loaded_history[0]["ip"] == "192.168.1.4"  # Most recent entry
-        assert loaded_history[2]["ip"] == "192.168.1.2"  # Oldest of last 3
+        assert loaded_history[0]["ip"] == "192.168.1.2"  # Oldest of last 3
+        assert loaded_history[2]["ip"] == "192.168.1.4"  # Most recent entry
 
     def test_save_ip_history_handles_database_error(self, sqlite_storage):
         """Test graceful handling of database errors during history save."""
+        # The connection is persistent: drop it so reopening fails
+        sqlite_storage.close()
         with patch("sqlite3.connect", side_effect=sqlite3.Error("Database locked")):
             result = sqlite_storage.save_ip_history([])
             assert result is False
@@ -387,8 +467,8 @@ class TestSQLiteIPStorage:
 
         loaded_history = sqlite_storage.load_ip_history()
         assert len(loaded_history) == 3
-        assert loaded_history[0]["ip"] == "192.168.1.3"  # Most recent
-        assert loaded_history[2]["ip"] == "192.168.1.1"  # Oldest
+        assert loaded_history[0]["ip"] == "192.168.1.1"  # Oldest
+        assert loaded_history[2]["ip"] == "192.168.1.3"  # Most recent
 
     def test_migrate_from_json_nonexistent_files(self, sqlite_storage):
         """Test migration when JSON files don't exist."""
@@ -432,13 +512,15 @@ class TestSQLiteIPStorage:
         # Verify only the most recent entries were migrated
         loaded_history = storage.load_ip_history()
         assert len(loaded_history) == 3
-        assert loaded_history[0]["ip"] == "192.168.1.4"  # Most recent entry
+        assert loaded_history[2]["ip"] == "192.168.1.4"  # Most recent entry
 
     def test_migrate_from_json_handles_database_error(self, sqlite_storage, tmp_path):
         """Test migration handles database errors gracefully."""
         ip_file = tmp_path / "ip.json"
         ip_file.write_text(json.dumps({"ip": "192.168.1.1"}))
 
+        # The connection is persistent: drop it so reopening fails
+        sqlite_storage.close()
         with patch("sqlite3.connect", side_effect=sqlite3.Error("Database locked")):
             result = sqlite_storage.migrate_from_json(str(ip_file), "nonexistent.json")
             assert result is False
@@ -495,6 +577,8 @@ class TestSQLiteIPStorage:
         sqlite_storage.save_current_ip("192.168.1.1")
 
         # Simulate database error during save operation
+        # The connection is persistent: drop it so reopening fails
+        sqlite_storage.close()
         with patch("sqlite3.connect", side_effect=sqlite3.Error("Database locked")):
             result = sqlite_storage.save_current_ip("192.168.1.2")
             assert result is False
@@ -504,6 +588,515 @@ class TestSQLiteIPStorage:
         assert loaded_ip == "192.168.1.1"
 
 
+def months_ago(months):
+    """Get the "YYYY-MM" month the given number of months before this one."""
+    now = datetime.now()
+    index = now.year * 12 + now.month - 1 - months
+    return f"{index // 12:04d}-{index % 12 + 1:02d}"
+
+
+class TestSQLiteIPStorageArchive:
+    """Test suite for the SQLiteIPStorage long-term archive."""
+
+    def test_archive_keeps_changes_beyond_history_size(self, temp_db_path):
+        """Test that changes trimmed from the history stay in the archive."""
+        storage = SQLiteIPStorage(temp_db_path, history_size=3)
+
+        for i in range(5):
+            assert storage.save_current_ip(f"192.168.1.{i}") is True
+        assert storage.save_current_ip("192.168.1.4") is True
+
+        assert len(storage.load_ip_history()) == 3
+        archive = storage.load_archive()
+        storage.close()
+
+        assert [record["ip"] for record in archive] == [
+            f"192.168.1.{i}" for i in range(5)
+        ]
+        partition = f"ip_archive_{months_ago(0).replace('-', '_')}"
+        with sqlite3.connect(temp_db_path) as conn:
+            count = conn.execute(f"SELECT COUNT(*) FROM {partition}").fetchone()[0]
+        assert count == 5
+
+    def test_archive_is_partitioned_by_month(self, sqlite_storage):
+        """Test that archive queries read the months and IPs asked for."""
+        history = [
+            {"ip": "192.168.1.1", "timestamp": f"{months_ago(2)}-10T08:00:00"},
+            {"ip": "192.168.1.2", "timestamp": f"{months_ago(1)}-10T08:00:00"},
+            {"ip": "192.168.1.1", "timestamp": f"{months_ago(1)}-20T08:00:00"},
+            {"ip": "192.168.1.3", "timestamp": f"{months_ago(0)}-01T08:00:00"},
+        ]
+        assert sqlite_storage.save_ip_history(history) is True
+
+        with sqlite3.connect(sqlite_storage.db_file) as conn:
+            partitions = [
+                row[0]
+                for row in conn.execute(
+                    "SELECT month FROM ip_archive_partitions ORDER BY month"
+                )
+            ]
+        assert partitions == [months_ago(2), months_ago(1), months_ago(0)]
+
+        assert sqlite_storage.load_archive() == history
+        assert (
+            sqlite_storage.load_archive(
+                start=f"{months_ago(1)}-01", end=f"{months_ago(0)}-01"
+            )
+            == history[1:3]
+        )
+        assert sqlite_storage.load_archive(ip="192.168.1.1") == [
+            history[0],
+            history[2],
+        ]
+
+    def test_rollups_count_changes_and_distinct_ips(self, sqlite_storage):
+        """Test that daily and monthly rollups are kept as changes are archived."""
+        month = months_ago(0)
+        history = [
+            {"ip": "192.168.1.1", "timestamp": f"{month}-01T08:00:00"},
+            {"ip": "192.168.1.2", "timestamp": f"{month}-01T09:00:00"},
+            {"ip": "192.168.1.1", "timestamp": f"{month}-01T10:00:00"},
+            {"ip": "192.168.1.1", "timestamp": f"{month}-02T08:00:00"},
+        ]
+        assert sqlite_storage.save_ip_history(history) is True
+        # Replaying archived changes does not count them again
+        assert sqlite_storage.save_ip_history(history) is True
+
+        assert sqlite_storage.load_rollups("day") == [
+            {"period": f"{month}-01", "changes": 3, "distinct_ips": 2},
+            {"period": f"{month}-02", "changes": 1, "distinct_ips": 1},
+        ]
+        assert sqlite_storage.load_rollups("month") == [
+            {"period": month, "changes": 4, "distinct_ips": 2},
+        ]
+        assert sqlite_storage.load_rollups("day", start=f"{month}-02", end=month) == [
+            {"period": f"{month}-02", "changes": 1, "distinct_ips": 1}
+        ]
+
+        with pytest.raises(ValueError, match="granularity"):
+            sqlite_storage.load_rollups("week")
+
+    def test_retention_drops_old_partitions_and_keeps_rollups(self, temp_db_path):
+        """Test that partitions past the retention period are dropped on open."""
+        storage = SQLiteIPStorage(temp_db_path, history_size=10)
+        storage.save_ip_history(
+            [
+                {"ip": "192.168.1.1", "timestamp": f"{months_ago(3)}-15T08:00:00"},
+                {"ip": "192.168.1.2", "timestamp": f"{months_ago(1)}-15T08:00:00"},
+            ]
+        )
+        storage.close()
+
+        storage = SQLiteIPStorage(
+            temp_db_path, history_size=10, archive_retention_months=2
+        )
+        # Changes older than the retention period are not archived at all
+        storage.save_ip_history(
+            [{"ip": "192.168.1.3", "timestamp": f"{months_ago(4)}-15T08:00:00"}]
+        )
+        archive = storage.load_archive()
+        monthly = storage.load_rollups("month")
+        storage.close()
+
+        assert [record["ip"] for record in archive] == ["192.168.1.2"]
+        assert [rollup["period"] for rollup in monthly] == [
+            months_ago(3),
+            months_ago(1),
+        ]
+        with sqlite3.connect(temp_db_path) as conn:
+            tables = {
+                row[0]
+                for row in conn.execute(
+                    "SELECT name FROM sqlite_master WHERE type = 'table'"
+                )
+            }
+        assert f"ip_archive_{months_ago(3).replace('-', '_')}" not in tables
+
+    def test_archive_is_seeded_from_existing_history(self, temp_db_path):
+        """Test that a database from before the archive has its history archived."""
+        with sqlite3.connect(temp_db_path) as conn:
+            conn.execute(
+                """
+                CREATE TABLE ip_history (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    ip TEXT NOT NULL,
+                    timestamp TEXT NOT NULL,
+                    created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+                )
+            """
+            )
+            conn.execute(
+                "INSERT INTO ip_history (ip, timestamp) VALUES (?, ?)",
+                ("192.168.1.1", "2023-01-01T12:00:00"),
+            )
+
+        storage = SQLiteIPStorage(temp_db_path, history_size=10)
+        archive = storage.load_archive()
+        storage.close()
+
+        assert archive == [{"ip": "192.168.1.1", "timestamp": "2023-01-01T12:00:00"}]
+
+    def test_history_pages_cover_archive_newest_first(self, temp_db_path):
+        """Test that paging by cursor walks every archived change once."""
+        storage = SQLiteIPStorage(temp_db_path, history_size=3)
+        history = [
+            {"ip": f"192.168.1.{i}", "timestamp": f"{month}-{day:02d}T08:00:00"}
+            for i, (month, day) in enumerate(
+                (months_ago(offset), day) for offset in (2, 1, 0) for day in (1, 2, 3)
+            )
+        ]
+        storage.save_ip_history(history)
+
+        pages = []
+        cursor = None
+        while True:
+            page, cursor = storage.load_history_page(4, before=cursor)
+            pages.append(page)
+            if cursor is None:
+                break
+        storage.close()
+
+        assert [len(page) for page in pages] == [4, 4, 1]
+        assert [record for page in pages for record in page] == history[::-1]
+
+    def test_history_page_time_range(self, sqlite_storage):
+        """Test that a page only holds changes within the time range."""
+        month = months_ago(0)
+        history = [
+            {"ip": f"192.168.1.{day}", "timestamp": f"{month}-{day:02d}T08:00:00"}
+            for day in range(1, 8)
+        ]
+        sqlite_storage.save_ip_history(history)
+
+        page, cursor = sqlite_storage.load_history_page(
+            2, start=f"{month}-03", end=f"{month}-06"
+        )
+        assert page == [history[4], history[3]]
+        page, cursor = sqlite_storage.load_history_page(
+            2, before=cursor, start=f"{month}-03", end=f"{month}-06"
+        )
+        assert page == [history[2]]
+        assert cursor is None
+
+    def test_invalid_timestamp_is_not_archived(self, sqlite_storage):
+        """Test that a record whose timestamp has no date is kept out of the archive."""
+        history = [{"ip": "192.168.1.1", "timestamp": "yesterday"}]
+
+        assert sqlite_storage.save_ip_history(history) is True
+
+        assert sqlite_storage.load_ip_history() == history
+        assert sqlite_storage.load_archive() == []
+
+    def test_iter_archive_streams_every_month(self, sqlite_storage):
+        """Test that the archive is streamed in order from a snapshot."""
+        history = [
+            {"ip": "192.168.1.1", "timestamp": f"{months_ago(1)}-10T08:00:00"},
+            {"ip": "2001:db8::1", "timestamp": f"{months_ago(0)}-01T08:00:00"},
+        ]
+        sqlite_storage.save_ip_history(history)
+
+        records = sqlite_storage.iter_archive()
+        assert next(records) == history[0]
+        # Writes made while streaming are not part of the snapshot
+        sqlite_storage.save_current_ip("192.168.1.9")
+        assert list(records) == history[1:]
+
+    def test_import_archive_adds_new_changes_once(self, sqlite_storage):
+        """Test that an import adds new changes, rollups and seen IPs once."""
+        month = months_ago(0)
+        existing = {"ip": "192.168.1.1", "timestamp": f"{month}-01T08:00:00"}
+        sqlite_storage.save_ip_history([existing])
+        records = [
+            existing,
+            {"ip": "192.168.1.2", "timestamp": f"{month}-01T09:00:00"},
+            {"ip": "192.168.1.1", "timestamp": f"{month}-02T08:00:00"},
+            {"ip": "192.168.1.1", "timestamp": f"{months_ago(1)}-05T08:00:00"},
+            {"ip": "192.168.1.2", "timestamp": f"{month}-01T09:00:00"},
+            {"ip": "not-an-ip", "timestamp": f"{month}-03T08:00:00"},
+            {"ip": "192.168.1.3", "timestamp": "yesterday"},
+        ]
+
+        with patch.object(SQLiteIPStorage, "IMPORT_BATCH_SIZE", 2):
+            assert sqlite_storage.import_archive(iter(records)) == 3
+            assert sqlite_storage.import_archive(iter(records)) == 0
+
+        assert sqlite_storage.load_archive() == sorted(
+            records[:4], key=lambda record: record["timestamp"]
+        )
+        assert sqlite_storage.load_ip_history() == [existing]
+        assert sqlite_storage.load_rollups("day") == [
+            {"period": f"{months_ago(1)}-05", "changes": 1, "distinct_ips": 1},
+            {"period": f"{month}-01", "changes": 2, "distinct_ips": 2},
+            {"period": f"{month}-02", "changes": 1, "distinct_ips": 1},
+        ]
+        assert sqlite_storage.load_rollups("month") == [
+            {"period": months_ago(1), "changes": 1, "distinct_ips": 1},
+            {"period": month, "changes": 3, "distinct_ips": 2},
+        ]
+        seen = sqlite_storage.load_seen_ip("192.168.1.1")
+        assert seen["occurrences"] == 3
+        assert seen["first_seen"] == records[3]["timestamp"]
+
+    def test_import_archive_skips_expired_months(self, temp_db_path):
+        """Test that an import leaves out changes past the retention period."""
+        storage = SQLiteIPStorage(
+            temp_db_path, history_size=10, archive_retention_months=2
+        )
+        records = [
+            {"ip": "192.168.1.1", "timestamp": f"{months_ago(4)}-15T08:00:00"},
+            {"ip": "192.168.1.2", "timestamp": f"{months_ago(1)}-15T08:00:00"},
+        ]
+
+        assert storage.import_archive(records) == 1
+        assert storage.load_archive() == records[1:]
+        storage.close()
+
+    def test_import_archive_rolls_back_on_error(self, sqlite_storage):
+        """Test that an import that fails part way adds nothing."""
+        month = months_ago(0)
+
+        def records():
+            yield {"ip": "192.168.1.1", "timestamp": f"{month}-01T08:00:00"}
+            raise ValueError("Malformed line")
+
+        assert sqlite_storage.import_archive(records()) == -1
+        assert sqlite_storage.load_archive() == []
+        assert sqlite_storage.load_rollups("month") == []
+
+
+class TestSQLiteIPStoragePackedAddresses:
+    """Test suite for packed address storage and the seen IP index."""
+
+    def test_ipv6_addresses_are_stored_in_16_bytes(self, sqlite_storage):
+        """Test that IPv6 addresses round trip through their packed form."""
+        assert sqlite_storage.save_current_ip("2001:DB8::1") is True
+
+        with sqlite3.connect(sqlite_storage.db_file) as conn:
+            packed, family = conn.execute(
+                "SELECT ip, family FROM ip_history"
+            ).fetchone()
+        assert (len(packed), family) == (16, 6)
+        assert sqlite_storage.load_last_ip() == "2001:db8::1"
+        assert sqlite_storage.load_archive(ip="2001:db8::1")[0]["ip"] == "2001:db8::1"
+
+    def test_invalid_history_record_rejected(self, sqlite_storage):
+        """Test that history with an address that cannot be packed is not saved."""
+        history = [{"ip": "not.an.ip", "timestamp": "2023-01-01T12:00:00"}]
+
+        assert sqlite_storage.save_ip_history(history) is False
+        assert sqlite_storage.load_archive(ip="not.an.ip") == []
+
+    def test_seen_ip_tracks_returns_to_earlier_ips(self, sqlite_storage):
+        """Test that returning to an earlier IP is found in seen_ips."""
+        assert sqlite_storage.load_seen_ip("192.168.1.1") is None
+
+        sqlite_storage.save_current_ip("192.168.1.1")
+        first = sqlite_storage.load_seen_ip("192.168.1.1")
+        sqlite_storage.save_current_ip("192.168.1.2")
+        sqlite_storage.save_current_ip("192.168.1.1")
+        sqlite_storage.save_current_ip("192.168.1.1")
+
+        seen = sqlite_storage.load_seen_ip("192.168.1.1")
+        last_check = sqlite_storage.load_history_page(1)[0][0]["timestamp"]
+        assert seen["occurrences"] == 2
+        assert seen["first_seen"] == first["first_seen"]
+        assert seen["last_seen"] > last_check
+        assert sqlite_storage.load_seen_ip("192.168.1.2")["occurrences"] == 1
+        assert sqlite_storage.load_seen_ip("10.0.0.1") is None
+        assert sqlite_storage.load_seen_ip("not.an.ip") is None
+
+    def test_seen_ip_last_seen_kept_after_change(self, sqlite_storage):
+        """Test that an IP changed from keeps the time of its last check."""
+        sqlite_storage.save_current_ip("192.168.1.1")
+        sqlite_storage.save_current_ip("192.168.1.1")
+        with sqlite3.connect(sqlite_storage.db_file) as conn:
+            (last_check,) = conn.execute("SELECT timestamp FROM current_ip").fetchone()
+
+        sqlite_storage.save_current_ip("192.168.1.2")
+
+        assert sqlite_storage.load_seen_ip("192.168.1.1")["last_seen"] == last_check
+
+    def test_replayed_history_not_counted_twice(self, sqlite_storage):
+        """Test that saving the same history again leaves seen_ips unchanged."""
+        history = [
+            {"ip": "192.168.1.1", "timestamp": "2023-01-01T12:00:00"},
+            {"ip": "192.168.1.2", "timestamp": "2023-01-02T12:00:00"},
+            {"ip": "192.168.1.1", "timestamp": "2023-01-03T12:00:00"},
+        ]
+        sqlite_storage.save_ip_history(history)
+        sqlite_storage.save_ip_history(history)
+
+        assert sqlite_storage.load_seen_ip("192.168.1.1") == {
+            "ip": "192.168.1.1",
+            "first_seen": "2023-01-01T12:00:00",
+            "last_seen": "2023-01-03T12:00:00",
+            "occurrences": 2,
+        }
+
+    def test_text_address_database_is_converted(self, temp_db_path):
+        """Test that a database storing addresses as text is packed once."""
+        month = months_ago(0)
+        partition = f"ip_archive_{month.replace('-', '_')}"
+        with sqlite3.connect(temp_db_path) as conn:
+            conn.executescript(
+                f"""
+                CREATE TABLE current_ip (
+                    id INTEGER PRIMARY KEY, ip TEXT NOT NULL,
+                    timestamp TEXT NOT NULL,
+                    created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+                );
+                CREATE TABLE ip_history (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT, ip TEXT NOT NULL,
+                    timestamp TEXT NOT NULL,
+                    created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+                );
+                CREATE INDEX idx_ip_history_timestamp ON ip_history(timestamp);
+                CREATE TABLE ip_archive_partitions (month TEXT PRIMARY KEY);
+                CREATE TABLE {partition} (
+                    id INTEGER PRIMARY KEY, ip TEXT NOT NULL,
+                    timestamp TEXT NOT NULL, UNIQUE (ip, timestamp)
+                );
+                CREATE INDEX idx_{partition}_timestamp ON {partition}(timestamp);
+                INSERT INTO ip_archive_partitions VALUES ('{month}');
+                INSERT INTO current_ip (ip, timestamp)
+                VALUES ('192.168.1.2', '{month}-02T08:00:00');
+                INSERT INTO ip_history (ip, timestamp) VALUES
+                    ('192.168.1.1', '{month}-01T08:00:00'),
+                    ('bogus', '{month}-01T09:00:00'),
+                    ('192.168.1.2', '{month}-02T08:00:00');
+                INSERT INTO {partition} (ip, timestamp) VALUES
+                    ('192.168.1.1', '{month}-01T08:00:00'),
+                    ('bogus', '{month}-01T09:00:00'),
+                    ('192.168.1.2', '{month}-02T08:00:00');
+                """
+            )
+
+        storage = SQLiteIPStorage(temp_db_path, history_size=10)
+
+        assert storage.load_last_ip() == "192.168.1.2"
+        assert [record["ip"] for record in storage.load_ip_history()] == [
+            "192.168.1.1",
+            "192.168.1.2",
+        ]
+        assert [record["ip"] for record in storage.load_archive()] == [
+            "192.168.1.1",
+            "192.168.1.2",
+        ]
+        assert storage.load_seen_ip("192.168.1.1")["occurrences"] == 1
+        assert storage.save_current_ip("192.168.1.3") is True
+        storage.close()
+
+        with sqlite3.connect(temp_db_path) as conn:
+            assert conn.execute("PRAGMA user_version").fetchone() == (
+                SQLiteIPStorage.SCHEMA_VERSION,
+            )
+            tables = {
+                name
+                for (name,) in conn.execute(
+                    "SELECT name FROM sqlite_master WHERE type = 'table'"
+                )
+            }
+            indexes = {
+                name
+                for (name,) in conn.execute(
+                    "SELECT name FROM sqlite_master WHERE type = 'index'"
+                )
+            }
+        assert not [table for table in tables if table.endswith("_text")]
+        assert {"idx_ip_history_timestamp", f"idx_{partition}_timestamp"} <= indexes
+
+    def test_up_to_date_database_only_checks_version(self, sqlite_storage):
+        """Test that opening a current database runs no migration."""
+        sqlite_storage.save_current_ip("192.168.1.1")
+        statements = []
+        sqlite_storage.conn.set_trace_callback(statements.append)
+
+        sqlite_storage._init_database()
+
+        assert statements == ["PRAGMA user_version"]
+        assert sqlite_storage.load_seen_ip("192.168.1.1")["occurrences"] == 1
+
+    def test_migrations_match_schema_version(self, sqlite_storage):
+        """Test that there is one migration per schema version."""
+        assert len(sqlite_storage._migrations()) == SQLiteIPStorage.SCHEMA_VERSION
+
+    def test_later_migrations_run_from_recorded_version(self, temp_db_path):
+        """Test that a database at an older version runs only newer migrations."""
+        storage = SQLiteIPStorage(temp_db_path, history_size=10)
+        storage.save_current_ip("192.168.1.1")
+        storage.close()
+        with sqlite3.connect(temp_db_path) as conn:
+            conn.execute("DROP TABLE storage_meta")
+            conn.execute("PRAGMA user_version = 1")
+
+        storage = SQLiteIPStorage(temp_db_path, history_size=10)
+        storage.close()
+
+        with sqlite3.connect(temp_db_path) as conn:
+            assert conn.execute("PRAGMA user_version").fetchone() == (
+                SQLiteIPStorage.SCHEMA_VERSION,
+            )
+            assert conn.execute("SELECT COUNT(*) FROM storage_meta").fetchone() == (0,)
+        assert storage.load_last_ip() == "192.168.1.1"
+
+    def test_interrupted_backfill_resumes(self, temp_db_path):
+        """Test that a conversion stopped between chunks completes on next open."""
+        with sqlite3.connect(temp_db_path) as conn:
+            conn.execute(
+                """
+                CREATE TABLE ip_history (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT, ip TEXT NOT NULL,
+                    timestamp TEXT NOT NULL,
+                    created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+                )
+            """
+            )
+            conn.executemany(
+                "INSERT INTO ip_history (ip, timestamp) VALUES (?, ?)",
+                [(f"10.0.0.{i}", f"2023-01-01T12:00:{i:02d}") for i in range(7)],
+            )
+
+        packed = []
+
+        def pack_until_third_chunk(ip):
+            if len(packed) == 4:
+                raise sqlite3.OperationalError("disk I/O error")
+            packed.append(ip)
+            return pack_ip(ip)
+
+        with (
+            patch.object(SQLiteIPStorage, "BACKFILL_CHUNK_SIZE", 2),
+            patch("ip_monitor.storage.pack_ip", side_effect=pack_until_third_chunk),
+        ):
+            SQLiteIPStorage(temp_db_path, history_size=10).close()
+        with sqlite3.connect(temp_db_path) as conn:
+            assert conn.execute("PRAGMA user_version").fetchone() == (0,)
+            assert conn.execute("SELECT COUNT(*) FROM ip_history").fetchone() == (4,)
+
+        with patch.object(SQLiteIPStorage, "BACKFILL_CHUNK_SIZE", 2):
+            storage = SQLiteIPStorage(temp_db_path, history_size=10)
+
+        assert [record["ip"] for record in storage.load_ip_history()] == [
+            f"10.0.0.{i}" for i in range(7)
+        ]
+        assert len(storage.load_archive()) == 7
+        storage.close()
+
+    def test_json_migration_runs_once(self, sqlite_storage, tmp_path):
+        """Test that JSON files are not read again after a completed migration."""
+        ip_file = tmp_path / "last_ip.json"
+        history_file = tmp_path / "ip_history.json"
+        ip_file.write_text(json.dumps({"ip": "192.168.1.1"}))
+        history_file.write_text(json.dumps([]))
+
+        assert sqlite_storage.migrate_from_json(str(ip_file), str(history_file))
+        sqlite_storage.save_current_ip("192.168.1.2")
+        with patch("builtins.open", side_effect=AssertionError("read again")):
+            assert sqlite_storage.migrate_from_json(str(ip_file), str(history_file))
+
+        assert sqlite_storage.load_last_ip() == "192.168.1.2"
+
+
 class TestIPStorage:
     """Test suite for IPStorage class (legacy JSON storage)."""
 
@@ -629,6 +1222,23 @@ class TestIPStorage:
 
         assert loaded_history == []
 
+    def test_load_history_page(self, tmp_path):
+        """Test that history pages are read newest first from the history file."""
+        history = [
+            {"ip": f"192.168.1.{i}", "timestamp": f"2023-01-01T1{i}:00:00Z"}
+            for i in range(5)
+        ]
+        storage = IPStorage(
+            str(tmp_path / "ip.json"), str(tmp_path / "history.json"), 10
+        )
+        storage.save_ip_history(history)
+
+        page, cursor = storage.load_history_page(3)
+        assert page == history[:1:-1]
+        page, cursor = storage.load_history_page(3, before=cursor)
+        assert page == history[1::-1]
+        assert cursor is None
+
     def test_save_ip_history_successful(self, tmp_path):
         """Test saving IP history successfully."""
         history_file = tmp_path / "history.json"
@@ -882,6 +1492,284 @@ class TestIPStorage:
             assert IPStorage.is_valid_ip(ip) is False
 
 
+class TestJSONLIPStorage:
+    """Test suite for the append-only JSONLIPStorage."""
+
+    def test_changes_are_appended(self, tmp_path):
+        """Test that each change appends a line and an unchanged IP writes nothing."""
+        history_file = tmp_path / "history.jsonl"
+        storage = JSONLIPStorage(str(history_file), history_size=10)
+
+        assert storage.save_current_ip("192.168.1.1") is True
+        assert storage.save_current_ip("192.168.1.2") is True
+        size = history_file.stat().st_size
+        with patch("ip_monitor.storage.os.fsync") as fsync:
+            assert storage.save_current_ip("192.168.1.2") is True
+        fsync.assert_not_called()
+
+        assert history_file.stat().st_size == size
+        lines = history_file.read_text().splitlines()
+        assert [json.loads(line)["ip"] for line in lines] == [
+            "192.168.1.1",
+            "192.168.1.2",
+        ]
+        assert storage.load_last_ip() == "192.168.1.2"
+        assert [record["ip"] for record in storage.load_ip_history()] == [
+            "192.168.1.1",
+            "192.168.1.2",
+        ]
+
+    def test_tail_index_reads_last_records(self, tmp_path):
+        """Test that reopening indexes only the tail of a long file."""
+        history_file = tmp_path / "history.jsonl"
+        records = [
+            {"ip": f"10.0.{i // 256}.{i % 256}", "timestamp": f"2024-01-01T00:{i}"}
+            for i in range(1000)
+        ]
+        history_file.write_text("".join(json.dumps(r) + "\n" for r in records))
+
+        with patch.object(JSONLIPStorage, "TAIL_BLOCK_SIZE", 64):
+            storage = JSONLIPStorage(
+                str(history_file), history_size=5, compact_bytes=10**9
+            )
+            assert storage.load_ip_history() == records[-5:]
+        assert storage.load_last_ip() == records[-1]["ip"]
+
+        assert storage.save_current_ip("192.168.1.1") is True
+        history = storage.load_ip_history()
+        assert history[:4] == records[-4:]
+        assert history[-1]["ip"] == "192.168.1.1"
+
+    def test_compaction_runs_past_threshold(self, tmp_path):
+        """Test that the file is rewritten with its tail once it is too large."""
+        history_file = tmp_path / "history.jsonl"
+        storage = JSONLIPStorage(str(history_file), history_size=3, compact_bytes=400)
+
+        with patch.object(storage, "_compact", wraps=storage._compact) as compact:
+            for i in range(6):
+                storage.save_current_ip(f"192.168.1.{i}")
+            assert compact.call_count == 0
+            for i in range(6, 12):
+                storage.save_current_ip(f"192.168.1.{i}")
+            assert compact.call_count >= 1
+
+        assert history_file.stat().st_size <= 400
+        expected = [f"192.168.1.{i}" for i in range(9, 12)]
+        assert [record["ip"] for record in storage.load_ip_history()] == expected
+        reopened = JSONLIPStorage(str(history_file), history_size=3)
+        assert [record["ip"] for record in reopened.load_ip_history()] == expected
+
+    def test_incomplete_last_line_is_truncated(self, tmp_path):
+        """Test that a line cut short by a crash is dropped on open."""
+        history_file = tmp_path / "history.jsonl"
+        history_file.write_text(
+            '{"ip": "192.168.1.1", "timestamp": "2024-01-01T00:00:00"}\n{"ip": "19'
+        )
+
+        storage = JSONLIPStorage(str(history_file), history_size=10)
+
+        assert storage.load_last_ip() == "192.168.1.1"
+        assert storage.save_current_ip("192.168.1.2") is True
+        lines = history_file.read_text().splitlines()
+        assert [json.loads(line)["ip"] for line in lines] == [
+            "192.168.1.1",
+            "192.168.1.2",
+        ]
+
+    def test_save_ip_history_replaces_file(self, tmp_path):
+        """Test that saving a history replaces the file with its last records."""
+        history_file = tmp_path / "history.jsonl"
+        storage = JSONLIPStorage(str(history_file), history_size=2)
+        storage.save_current_ip("192.168.1.1")
+        history = [
+            {"ip": f"10.0.0.{i}", "timestamp": f"2024-01-0{i}T00:00:00"}
+            for i in range(1, 4)
+        ]
+
+        assert storage.save_ip_history(history) is True
+
+        assert storage.load_ip_history() == history[-2:]
+        assert storage.load_last_ip() == "10.0.0.3"
+        assert len(history_file.read_text().splitlines()) == 2
+
+    def test_load_history_page(self, tmp_path):
+        """Test that history pages are served from the indexed tail."""
+        storage = JSONLIPStorage(str(tmp_path / "history.jsonl"), history_size=10)
+        history = [
+            {"ip": f"10.0.0.{i}", "timestamp": f"2024-01-0{i}T00:00:00"}
+            for i in range(1, 6)
+        ]
+        storage.save_ip_history(history)
+
+        page, cursor = storage.load_history_page(3)
+        assert page == history[:1:-1]
+        page, cursor = storage.load_history_page(3, before=cursor)
+        assert page == history[1::-1]
+        assert cursor is None
+
+    def test_missing_file_is_empty(self, tmp_path):
+        """Test that a storage without a file has no IP or history."""
+        storage = JSONLIPStorage(str(tmp_path / "new" / "history.jsonl"), 10)
+
+        assert storage.load_last_ip() is None
+        assert storage.load_ip_history() == []
+        assert storage.save_current_ip("192.168.1.1") is True
+        assert storage.load_last_ip() == "192.168.1.1"
+
+
+class TestStorageBackendRegistry:
+    """Test suite for choosing a storage backend by name."""
+
+    @pytest.mark.parametrize(
+        ("name", "storage_class"),
+        [
+            ("sqlite", SQLiteIPStorage),
+            ("JSONL", JSONLIPStorage),
+            ("memory", MemoryIPStorage),
+        ],
+    )
+    def test_create_storage(self, mock_config, tmp_path, name, storage_class):
+        """Test that the configured backend is built."""
+        mock_config.storage_backend = name
+        mock_config.db_file = str(tmp_path / "ip_monitor.db")
+
+        storage = create_storage(mock_config)
+        try:
+            assert isinstance(storage, storage_class)
+            assert storage.history_size == mock_config.ip_history_size
+        finally:
+            storage.close()
+
+    def test_unknown_backend(self, mock_config):
+        """Test that an unknown backend name is rejected with the known ones."""
+        mock_config.storage_backend = "redis"
+
+        with pytest.raises(ValueError, match="sqlite, jsonl, memory"):
+            create_storage(mock_config)
+
+    def test_register_storage_backend(self, mock_config):
+        """Test that a registered backend can be selected."""
+        storage = MemoryIPStorage(history_size=3)
+        mock_config.storage_backend = "custom"
+
+        with patch.dict(STORAGE_BACKENDS):
+            register_storage_backend("Custom", lambda config: storage)
+            assert create_storage(mock_config) is storage
+        assert "custom" not in STORAGE_BACKENDS
+
+
+class TestAsyncStorage:
+    """Test suite for AsyncStorage and its worker threads."""
+
+    @pytest.fixture
+    def workers(self):
+        """Dedicated writer and reader workers, stopped after the test."""
+        writer = StorageWorker("test-writer")
+        reader = StorageWorker("test-reader")
+        yield writer, reader
+        writer.stop(timeout=5)
+        reader.stop(timeout=5)
+
+    def test_worker_runs_calls_in_order_on_one_thread(self, workers):
+        """Test that queued calls run in submission order on the worker thread."""
+        writer, _ = workers
+        calls = []
+
+        futures = [
+            writer.submit(lambda i=i: calls.append((i, threading.current_thread())))
+            for i in range(20)
+        ]
+        for future in futures:
+            future.result(timeout=5)
+
+        assert [i for i, _ in calls] == list(range(20))
+        assert {thread.name for _, thread in calls} == {"test-writer"}
+
+    def test_worker_restarts_after_stop(self, workers):
+        """Test that a stopped worker runs pending calls and starts again on use."""
+        writer, _ = workers
+        future = writer.submit(time.sleep, 0.05)
+
+        assert writer.stop(timeout=5)
+        assert future.done()
+        assert writer.submit(lambda: "again").result(timeout=5) == "again"
+
+    async def test_storage_calls_run_on_workers(self, sqlite_storage, workers):
+        """Test that the facade runs writes and reads on their own threads."""
+        writer, reader = workers
+        async_storage = AsyncStorage(sqlite_storage, writer=writer, reader=reader)
+
+        assert await async_storage.save_current_ip("192.168.1.1") is True
+        assert await async_storage.load_last_ip() == "192.168.1.1"
+        history = await async_storage.load_ip_history()
+        assert [record["ip"] for record in history] == ["192.168.1.1"]
+        archive = await async_storage.load_archive()
+        assert [record["ip"] for record in archive] == ["192.168.1.1"]
+
+    async def test_errors_are_raised_to_the_caller(self, workers):
+        """Test that an exception in a storage call is raised where it is awaited."""
+        writer, reader = workers
+        storage = Mock()
+        storage.save_current_ip.side_effect = RuntimeError("disk gone")
+        async_storage = AsyncStorage(storage, writer=writer, reader=reader)
+
+        with pytest.raises(RuntimeError, match="disk gone"):
+            await async_storage.save_current_ip("192.168.1.1")
+
+    async def test_read_not_queued_behind_slow_write(self, workers):
+        """Test that a read completes while a write is still running."""
+        writer, reader = workers
+        release = threading.Event()
+        storage = Mock()
+        storage.save_current_ip.side_effect = lambda ip: release.wait(5)
+        storage.load_last_ip.return_value = "192.168.1.1"
+        async_storage = AsyncStorage(storage, writer=writer, reader=reader)
+
+        write = asyncio.create_task(async_storage.save_current_ip("192.168.1.2"))
+        try:
+            last_ip = await asyncio.wait_for(async_storage.load_last_ip(), 1)
+            assert last_ip == "192.168.1.1"
+            assert not write.done()
+        finally:
+            release.set()
+        assert await write is True
+
+    async def test_close_waits_for_queued_writes(self, workers):
+        """Test that close runs after the writes submitted before it."""
+        writer, reader = workers
+        calls = []
+        storage = Mock()
+        storage.save_current_ip.side_effect = lambda ip: calls.append(ip)
+        storage.close.side_effect = lambda: calls.append("close")
+        async_storage = AsyncStorage(storage, writer=writer, reader=reader)
+
+        writes = [
+            asyncio.create_task(async_storage.save_current_ip(f"10.0.0.{i}"))
+            for i in range(3)
+        ]
+        await asyncio.sleep(0)
+        await async_storage.close()
+
+        assert calls == ["10.0.0.0", "10.0.0.1", "10.0.0.2", "close"]
+        await asyncio.gather(*writes)
+
+    def test_read_sees_committed_state_during_write(self, sqlite_storage):
+        """Test that reads use their own connection while a write is open."""
+        sqlite_storage.save_current_ip("192.168.1.1")
+        results = []
+
+        with sqlite_storage._lock:
+            sqlite_storage.conn.execute("DELETE FROM current_ip")
+            reader = threading.Thread(
+                target=lambda: results.append(sqlite_storage.load_last_ip())
+            )
+            reader.start()
+            reader.join(timeout=5)
+            sqlite_storage.conn.rollback()
+
+        assert results == ["192.168.1.1"]
+
+
 class TestStorageIntegration:
     """Integration tests for storage components."""
 
@@ -922,10 +1810,9 @@ class TestStorageIntegration:
         json_history = json_storage.load_ip_history()
         sqlite_history = sqlite_storage.load_ip_history()
         assert len(json_history) == len(sqlite_history)
-        # SQLite returns in reverse order compared to JSON
+        # Both return history in chronological order
         for i in range(len(json_history)):
-            sqlite_index = len(json_history) - 1 - i  # Reverse index
-            assert json_history[i]["ip"] == sqlite_history[sqlite_index]["ip"]
+            assert json_history[i]["ip"] == sqlite_history[i]["ip"]
 
     def test_large_dataset_performance(self, tmp_path):
         """Test storage performance with large datasets."""
@@ -1016,9 +1903,9 @@ class TestStorageIntegration:
 
         assert loaded_ip == "192.168.1.201"
         assert len(loaded_history) == 2
-        # SQLite returns in reverse chronological order
-        assert loaded_history[0]["ip"] == "192.168.1.201"  # Most recent
-        assert loaded_history[1]["ip"] == test_ip  # Oldest
+        # History is returned in chronological order
+        assert loaded_history[0]["ip"] == test_ip  # Oldest
+        assert loaded_history[1]["ip"] == "192.168.1.201"  # Most recent
 
     def test_error_recovery_and_consistency(self, tmp_path):
         """Test error recovery and data consistency."""
@@ -1028,7 +1915,9 @@ class TestStorageIntegration:
         # Save initial data
         storage.save_current_ip("192.168.1.1")
 
-        # Simulate database corruption/error
+        # Simulate database corruption/error; the connection is persistent,
+        # so drop it to make reopening fail
+        storage.close()
         with patch("sqlite3.connect") as mock_connect:
             mock_connect.side_effect = sqlite3.Error("Database is locked")
 
@@ -1044,6 +1933,6 @@ class TestStorageIntegration:
         # Original data should still be intact
         history = storage.load_ip_history()
         assert len(history) == 2
-        # SQLite returns in reverse chronological order
-        assert history[0]["ip"] == "192.168.1.3"  # Most recent
-        assert history[1]["ip"] == "192.168.1.1"  # Original
+        # History is returned in chronological order
+        assert history[0]["ip"] == "192.168.1.1"  # Original
+        assert history[1]["ip"] == "192.168.1.3"  # Most recent
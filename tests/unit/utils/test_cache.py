@@ -12,25 +12,39 @@ This module tests all aspects of the cache system including:
 """
 
 import asyncio
+from collections import OrderedDict
 import concurrent.futures
 import json
+from pathlib import Path
+import sys
 import tempfile
 import threading
 import time
-from pathlib import Path
+import tracemalloc
 from unittest.mock import Mock, mock_open, patch
 
 import pytest
 
 from ip_monitor.utils.cache import (
+    ENTRY_OVERHEAD,
+    AdmissionPolicy,
     CacheEntry,
     CacheType,
     IntelligentCache,
+    estimate_size,
     get_cache,
     initialize_cache,
 )
 
 
+def read_cache_file(path):
+    """Read a cache file into its header and the entry tuples it holds."""
+    with open(path) as f:
+        header = json.loads(f.readline())
+        entries = [json.loads(line.partition("\t")[2]) for line in f]
+    return header, entries
+
+
 class TestCacheEntry:
     """Test the CacheEntry dataclass functionality."""
 
@@ -238,6 +252,91 @@ class TestCacheEntry:
         entry = CacheEntry.from_dict(data)
         assert entry.metadata == {}
 
+    def test_cache_entry_is_slotted(self):
+        """Test that cache entries carry no per-instance __dict__."""
+        entry = CacheEntry(
+            key="test_key",
+            value="test_value",
+            created_at=1000.0,
+            last_accessed=1000.0,
+            access_count=1,
+            ttl=300.0,
+            cache_type=CacheType.IP_RESULT,
+        )
+
+        assert not hasattr(entry, "__dict__")
+
+    def test_empty_metadata_is_shared(self):
+        """Test that entries without metadata share one read-only mapping."""
+        entries = [
+            CacheEntry(
+                key=f"key{i}",
+                value=i,
+                created_at=1000.0,
+                last_accessed=1000.0,
+                access_count=1,
+                ttl=300.0,
+                cache_type=CacheType.IP_RESULT,
+            )
+            for i in range(2)
+        ]
+
+        assert entries[0].metadata is entries[1].metadata
+        with pytest.raises(TypeError):
+            entries[0].metadata["source"] = "test"
+
+    def test_deadlines_are_derived(self):
+        """Test that expiry and stale deadlines follow created_at and ttl."""
+        entry = CacheEntry(
+            key="test_key",
+            value="test_value",
+            created_at=1000.0,
+            last_accessed=1000.0,
+            access_count=1,
+            ttl=300.0,
+            cache_type=CacheType.IP_RESULT,
+        )
+        assert entry.expires_at == 1300.0
+        assert entry.stale_at() == 1240.0
+        assert entry.stale_at(0.5) == 1150.0
+        assert not hasattr(entry, "__dict__")
+
+    def test_tuple_round_trip(self):
+        """Test compact tuple serialization preserves the entry."""
+        entry = CacheEntry(
+            key="test_key",
+            value={"ip": "1.2.3.4"},
+            created_at=1000.0,
+            last_accessed=1100.0,
+            access_count=3,
+            ttl=300.0,
+            cache_type=CacheType.API_RESPONSE,
+            metadata={"source": "test"},
+        )
+
+        data = entry.to_tuple()
+        restored = CacheEntry.from_tuple(data)
+
+        assert len(data) == len(CacheEntry.TUPLE_FIELDS)
+        assert restored == entry
+
+    def test_tuple_omits_empty_metadata(self):
+        """Test that empty metadata is stored as null and restored as shared."""
+        entry = CacheEntry(
+            key="test_key",
+            value="test_value",
+            created_at=1000.0,
+            last_accessed=1000.0,
+            access_count=1,
+            ttl=300.0,
+            cache_type=CacheType.IP_RESULT,
+        )
+
+        data = entry.to_tuple()
+
+        assert data[-1] is None
+        assert CacheEntry.from_tuple(data).metadata is entry.metadata
+
 
 class TestIntelligentCacheOperations:
     """Test basic cache operations (get, set, delete)."""
@@ -656,13 +755,11 @@ class TestCachePersistence:
         # Verify file was created and contains data
         assert Path(temp_cache_file).exists()
 
-        with open(temp_cache_file) as f:
-            data = json.load(f)
+        header, entries = read_cache_file(temp_cache_file)
 
-        assert "entries" in data
-        assert "stats" in data
-        assert "saved_at" in data
-        assert len(data["entries"]) == 2
+        assert "stats" in header
+        assert "saved_at" in header
+        assert len(entries) == 2
 
     def test_load_cache_from_disk(self, temp_cache_file):
         """Test loading cache from disk."""
@@ -758,25 +855,45 @@ class TestCachePersistence:
         cache.save()
 
         # Load and verify format
-        with open(temp_cache_file) as f:
-            data = json.load(f)
-
-        assert "entries" in data
-        assert "stats" in data
-        assert "saved_at" in data
-
-        entry_data = data["entries"][0]
-        assert "key" in entry_data
-        assert "value" in entry_data
-        assert "created_at" in entry_data
-        assert "last_accessed" in entry_data
-        assert "access_count" in entry_data
-        assert "ttl" in entry_data
-        assert "cache_type" in entry_data
-        assert "metadata" in entry_data
-
+        header, entries = read_cache_file(temp_cache_file)
+
+        assert "stats" in header
+        assert "saved_at" in header
+        assert header["format"] == IntelligentCache.CACHE_FILE_FORMAT
+
+        # Entries are compact tuples laid out as described by "fields"
+        assert header["fields"] == list(CacheEntry.TUPLE_FIELDS)
+        entry_data = dict(zip(header["fields"], entries[0], strict=True))
+        assert entry_data["key"] == "test:key"
+        assert entry_data["value"] == "value"
+        assert entry_data["cache_type"] == "ip_result"
         assert entry_data["metadata"] == metadata
 
+    def test_load_legacy_dict_entries(self, temp_cache_file):
+        """Test that cache files written with dict entries still load."""
+        now = time.time()
+        legacy = {
+            "entries": [
+                {
+                    "key": "test:key",
+                    "value": "value",
+                    "created_at": now,
+                    "last_accessed": now,
+                    "access_count": 1,
+                    "ttl": 300,
+                    "cache_type": "ip_result",
+                    "metadata": {"source": "test"},
+                }
+            ],
+            "stats": {},
+            "saved_at": now,
+        }
+        Path(temp_cache_file).write_text(json.dumps(legacy))
+
+        cache = IntelligentCache(cache_file=temp_cache_file)
+
+        assert cache.get("test", "key") == "value"
+
     def test_save_preserves_statistics(self, temp_cache_file):
         """Test that save operation preserves statistics."""
         cache1 = IntelligentCache(cache_file=temp_cache_file)
@@ -1105,8 +1222,8 @@ class TestCacheRefresh:
         time.sleep(0.01)
         cache.refresh_entry("test", "key", "new_value", extend_ttl=True)
 
-        # Created time should be updated
-        assert entry.created_at > original_created_at
+        # Created time should be updated on the replacement entry
+        assert cache.memory_cache[key].created_at > original_created_at
 
     def test_refresh_without_extending_ttl(self, cache):
         """Test that refresh doesn't extend TTL when extend_ttl=False."""
@@ -1121,7 +1238,18 @@ class TestCacheRefresh:
         cache.refresh_entry("test", "key", "new_value", extend_ttl=False)
 
         # Created time should NOT be updated
-        assert entry.created_at == original_created_at
+        assert cache.memory_cache[key].created_at == original_created_at
+
+    def test_refresh_does_not_change_pending_snapshot(self, cache):
+        """Test that refresh replaces the entry a pending snapshot refers to."""
+        cache.set("test", "key", "original_value")
+        with cache.lock:
+            snapshot = cache._take_snapshot()
+
+        cache.refresh_entry("test", "key", "new_value")
+
+        assert [entry.value for entry in snapshot["entries"]] == ["original_value"]
+        assert cache.get("test", "key") == "new_value"
 
     def test_refresh_updates_access_info(self, cache):
         """Test that refresh updates access information."""
@@ -1136,9 +1264,10 @@ class TestCacheRefresh:
         time.sleep(0.01)
         cache.refresh_entry("test", "key", "new_value")
 
-        # Access info should be updated
-        assert entry.access_count == original_access_count + 1
-        assert entry.last_accessed > original_last_accessed
+        # Access info should carry over to the replacement entry
+        refreshed = cache.memory_cache[key]
+        assert refreshed.access_count == original_access_count + 1
+        assert refreshed.last_accessed > original_last_accessed
 
     def test_refresh_updates_statistics(self, cache):
         """Test that refresh updates statistics."""
@@ -1212,6 +1341,80 @@ class TestCacheCleanup:
         # Should have saved after cleanup
         assert cache.stats["saves"] == initial_saves + 1
 
+    def test_run_maintenance_sweeps_expired_entries(self, cache):
+        """Test that a maintenance run removes expired entries and saves."""
+        cache.set("test", "expired", "value1", ttl=0.001)
+        cache.set("test", "valid", "value2", ttl=3600)
+        time.sleep(0.002)
+
+        result = cache.run_maintenance()
+
+        assert result["entries_cleaned"] == 1
+        assert result["entries_remaining"] == 1
+        assert result["sweep_complete"] is True
+        assert cache.stats["maintenance_runs"] == 1
+        assert cache.stats["saves"] == 1
+        assert read_cache_file(cache.cache_file)[1] == [
+            list(cache.memory_cache[("test", "valid")].to_tuple())
+        ]
+
+    def test_run_maintenance_resumes_sweep_after_budget(self, cache):
+        """Test that a sweep cut short by the time budget resumes next run."""
+        cache.max_memory_size = 1000
+        slice_size = IntelligentCache.MAINTENANCE_SWEEP_SLICE
+        for i in range(slice_size + 10):
+            cache.set("test", f"key{i}", i, ttl=0.2)
+        time.sleep(0.25)
+
+        first = cache.run_maintenance(time_budget=0)
+        assert first["entries_cleaned"] == slice_size
+        assert first["sweep_complete"] is False
+        assert len(cache.memory_cache) == 10
+
+        second = cache.run_maintenance(time_budget=0)
+        assert second["entries_cleaned"] == 10
+        assert second["sweep_complete"] is True
+        assert len(cache.memory_cache) == 0
+
+    def test_run_maintenance_drops_expired_failures(self, cache):
+        """Test that remembered failures past their deadline are dropped."""
+        cache._negative[("test", "old")] = (time.time() - 1, None)
+        cache._negative[("test", "new")] = (time.time() + 60, None)
+
+        cache.run_maintenance()
+
+        assert list(cache._negative) == [("test", "new")]
+
+    def test_run_maintenance_rolls_up_interval_stats(self, cache):
+        """Test that each run reports only the activity since the last run."""
+        cache.set("test", "key", "value")
+        cache.get("test", "key")
+        cache.get("test", "missing")
+
+        first = cache.run_maintenance()
+        assert first["interval_hits"] == 1
+        assert first["interval_misses"] == 1
+        assert first["interval_hit_rate"] == 0.5
+
+        cache.get("test", "key")
+        second = cache.run_maintenance()
+        assert second["interval_hits"] == 1
+        assert second["interval_misses"] == 0
+        assert second["interval_hit_rate"] == 1.0
+        assert second["interval_saves"] == 1
+        assert cache.get_stats()["last_maintenance"] == second
+
+    def test_run_maintenance_excludes_restored_stats(self, cache):
+        """Test that statistics restored from disk are not counted as activity."""
+        cache.get("test", "missing")
+        cache.save()
+
+        restored = IntelligentCache(cache_file=str(cache.cache_file))
+        result = restored.run_maintenance()
+
+        assert restored.stats["misses"] == 1
+        assert result["interval_misses"] == 0
+
     def test_cleanup_thread_safety(self, cache):
         """Test that cleanup is thread-safe."""
 
@@ -1453,3 +1656,894 @@ class TestCacheGlobalInstance:
             assert cache1 is not cache2
         finally:
             Path(cache_file).unlink(missing_ok=True)
+
+
+class TestCacheExpiryIndex:
+    """Test the deadline heaps used for expiry and staleness tracking."""
+
+    @pytest.fixture
+    def cache(self):
+        """Create a temporary cache instance for testing."""
+        with tempfile.NamedTemporaryFile(delete=False) as tmp_file:
+            cache_file = tmp_file.name
+
+        cache = IntelligentCache(cache_file=cache_file, max_memory_size=1000)
+        yield cache
+
+        # Cleanup
+        Path(cache_file).unlink(missing_ok=True)
+
+    @pytest.fixture
+    def clock(self):
+        """Replace the wall clock with one advanced explicitly by the test."""
+        now = [1_000_000.0]
+        with patch("ip_monitor.utils.cache.time.time", side_effect=lambda: now[0]):
+            yield now
+
+    def test_set_does_not_scan_unexpired_entries(self, cache):
+        """Test that set only examines entries whose deadline has passed."""
+        for i in range(200):
+            cache.set("test", f"key{i}", f"value{i}", ttl=3600)
+
+        with patch.object(CacheEntry, "is_expired") as mock_is_expired:
+            cache.set("test", "new_key", "new_value", ttl=3600)
+
+        mock_is_expired.assert_not_called()
+
+    def test_evict_expired_returns_evicted_count(self, cache, clock):
+        """Test that _evict_expired pops only due entries and counts them."""
+        cache.set("test", "short1", "value", ttl=1)
+        cache.set("test", "short2", "value", ttl=1)
+        cache.set("test", "long", "value", ttl=3600)
+        clock[0] += 2
+
+        assert cache._evict_expired() == 2
+        assert len(cache._expiry_heap) == 1
+        assert cache.get("test", "long") == "value"
+
+    def test_overwrite_skips_superseded_heap_items(self, cache, clock):
+        """Test that an overwritten entry is not evicted by its old deadline."""
+        cache.set("test", "key", "old", ttl=1)
+        cache.set("test", "key", "new", ttl=3600)
+        clock[0] += 2
+
+        assert cache._evict_expired() == 0
+        assert cache.get("test", "key") == "new"
+
+    def test_refresh_reschedules_deadlines(self, cache, clock):
+        """Test that extending TTL on refresh moves the entry's deadlines."""
+        cache.set("test", "key", "value", ttl=10)
+        clock[0] += 9
+        assert len(cache.get_stale_entries()) == 1
+
+        cache.refresh_entry("test", "key", "fresh", extend_ttl=True)
+
+        assert cache.get_stale_entries() == []
+        clock[0] += 2
+        assert cache._evict_expired() == 0
+        assert cache.get("test", "key") == "fresh"
+
+    def test_heaps_compact_after_repeated_overwrites(self, cache):
+        """Test that lazily-deleted heap items do not grow without bound."""
+        for _ in range(1000):
+            cache.set("test", "key", "value", ttl=3600)
+
+        limit = max(
+            cache.HEAP_COMPACTION_MIN_SIZE,
+            len(cache.memory_cache) * cache.HEAP_COMPACTION_FACTOR,
+        )
+        assert len(cache._expiry_heap) <= limit
+        assert len(cache._stale_heap) <= limit
+
+    def test_set_stale_threshold_rebuilds_stale_index(self, cache, clock):
+        """Test that changing the stale threshold applies to existing entries."""
+        cache.set("test", "key", "value", ttl=10)
+        clock[0] += 3
+
+        assert cache.get_stale_entries() == []
+
+        cache.set_stale_threshold(0.2)
+
+        assert len(cache.get_stale_entries()) == 1
+
+    def test_load_restores_recency_order(self, cache, clock):
+        """Test that persisted entries are reloaded least recently used first."""
+        cache.set("test", "key1", "value1")
+        cache.set("test", "key2", "value2")
+        clock[0] += 1
+        cache.get("test", "key1")
+        cache.save()
+
+        reloaded = IntelligentCache(cache_file=str(cache.cache_file))
+
+        assert [entry.key for entry in reloaded.memory_cache.values()] == [
+            "test:key2",
+            "test:key1",
+        ]
+
+
+class TestCacheNamespaceIndex:
+    """Test tuple keys and the per-namespace secondary index."""
+
+    @pytest.fixture
+    def cache(self):
+        """Create a temporary cache instance for testing."""
+        with tempfile.NamedTemporaryFile(delete=False) as tmp_file:
+            cache_file = tmp_file.name
+
+        cache = IntelligentCache(cache_file=cache_file, max_memory_size=100)
+        yield cache
+
+        # Cleanup
+        Path(cache_file).unlink(missing_ok=True)
+
+    def test_keys_are_not_hashed(self, cache):
+        """Test that keys are plain (namespace, identifier) tuples."""
+        cache.set("ns", "id", "value")
+
+        assert ("ns", "id") in cache.memory_cache
+        assert cache.memory_cache[("ns", "id")].key == "ns:id"
+
+    def test_identifier_with_colon_round_trips(self, cache):
+        """Test that identifiers containing ':' survive a save and load."""
+        cache.set("ns", "https://api.example.com:8443/ip", "value")
+        cache.save()
+
+        reloaded = IntelligentCache(cache_file=cache.cache_file, max_memory_size=100)
+
+        assert reloaded.get("ns", "https://api.example.com:8443/ip") == "value"
+
+    @pytest.mark.parametrize(
+        "cache_type", [CacheType.API_RESPONSE, "api_response", "API_RESPONSE"]
+    )
+    def test_set_accepts_cache_type_member_value_or_name(self, cache, cache_type):
+        """Test that set() resolves cache types given as strings."""
+        cache.set("ns", "id", "value", cache_type)
+
+        assert cache.memory_cache[("ns", "id")].cache_type is CacheType.API_RESPONSE
+        assert cache.get("ns", "id") == "value"
+
+    def test_set_rejects_unknown_cache_type(self, cache):
+        """Test that an unknown cache type fails with the valid choices."""
+        with pytest.raises(ValueError, match="Unknown cache type 'bogus'"):
+            cache.set("ns", "id", "value", "bogus")
+
+        assert len(cache.memory_cache) == 0
+
+    def test_namespace_with_colon_is_rejected(self, cache):
+        """Test that a namespace that cannot be split back apart is refused."""
+        with pytest.raises(ValueError, match="must not contain ':'"):
+            cache.set("ns:sub", "id", "value")
+
+        assert len(cache.memory_cache) == 0
+
+    def test_namespace_invalidation_touches_only_namespace(self, cache):
+        """Test that namespace invalidation does not iterate other entries."""
+        for i in range(50):
+            cache.set("other", f"key{i}", i)
+        cache.set("target", "a", 1)
+        cache.set("target", "b", 2)
+
+        class NoScanDict(OrderedDict):
+            def __iter__(self):
+                raise AssertionError("namespace invalidation scanned the cache")
+
+            def items(self):
+                raise AssertionError("namespace invalidation scanned the cache")
+
+        cache.memory_cache = NoScanDict(cache.memory_cache)
+
+        assert cache.invalidate("target") == 2
+
+        assert "target" not in cache._namespaces
+        assert len(cache._namespaces["other"]) == 50
+
+    def test_namespace_index_follows_lru_eviction(self):
+        """Test that LRU eviction also removes keys from the namespace index."""
+        cache = IntelligentCache(cache_file="/nonexistent/cache.json", max_memory_size=2)
+        cache.set("ns", "a", 1)
+        cache.set("ns", "b", 2)
+        cache.set("ns", "c", 3)
+
+        assert cache._namespaces["ns"] == {"b", "c"}
+
+    def test_identifiers_containing_colons(self, cache):
+        """Test that identifiers such as URLs survive a save/load round trip."""
+        cache.set("ip_check", "https://api.ipify.org", "1.2.3.4")
+        cache.save()
+
+        reloaded = IntelligentCache(cache_file=str(cache.cache_file))
+
+        assert reloaded.get("ip_check", "https://api.ipify.org") == "1.2.3.4"
+        assert reloaded.invalidate("ip_check") == 1
+
+    def test_namespace_stats(self, cache):
+        """Test per-namespace entry counts and hit rates."""
+        cache.set("global", "current_ip", "1.2.3.4")
+        cache.set("ip_check", "api1", "1.2.3.4")
+        cache.get("global", "current_ip")
+        cache.get("global", "missing")
+        cache.get("ip_check", "api1")
+
+        namespace_stats = cache.get_namespace_stats()
+
+        assert namespace_stats["global"]["entries"] == 1
+        assert namespace_stats["global"]["hits"] == 1
+        assert namespace_stats["global"]["misses"] == 1
+        assert namespace_stats["global"]["hit_rate"] == 0.5
+        assert namespace_stats["ip_check"]["hit_rate"] == 1.0
+        assert cache.get_stats()["namespaces"] == namespace_stats
+
+    def test_namespace_stats_after_clear(self, cache):
+        """Test that clearing keeps counters but drops entry counts."""
+        cache.set("ns", "id", "value")
+        cache.get("ns", "id")
+        cache.clear()
+
+        assert cache.get_namespace_stats()["ns"]["entries"] == 0
+        assert cache.get_namespace_stats()["ns"]["hits"] == 1
+
+
+class TestCacheBackgroundPersistence:
+    """Test off-thread snapshot persistence."""
+
+    @pytest.fixture
+    def cache(self, tmp_path):
+        """Create a cache that persists on a worker thread."""
+        cache = IntelligentCache(
+            cache_file=str(tmp_path / "cache.json"), background_persistence=True
+        )
+        yield cache
+        cache.flush(timeout=5)
+
+    @pytest.fixture
+    def blocked_writes(self, cache):
+        """Hold the worker inside its first write until released."""
+        release = threading.Event()
+        writing = threading.Event()
+        written = []
+        original_write = cache._write_snapshot
+
+        def blocking_write(snapshot):
+            writing.set()
+            release.wait(timeout=5)
+            written.append(snapshot)
+            original_write(snapshot)
+
+        cache._write_snapshot = blocking_write
+        yield writing, release, written
+        release.set()
+
+    def test_save_returns_before_write(self, cache, blocked_writes):
+        """Test that save only snapshots and leaves the write to the worker."""
+        writing, release, written = blocked_writes
+        cache.set("ns", "id", "value")
+
+        cache.save()
+        assert writing.wait(timeout=5)
+        assert not cache.flush(timeout=0.05)
+        assert not cache.cache_file.exists()
+
+        release.set()
+        assert cache.flush(timeout=5)
+        assert len(written) == 1
+        assert cache.stats["saves"] == 1
+        assert read_cache_file(cache.cache_file)[1][0][1] == "value"
+
+    def test_pending_snapshots_coalesce(self, cache, blocked_writes):
+        """Test that only the latest pending snapshot is written."""
+        writing, release, written = blocked_writes
+        cache.save()
+        assert writing.wait(timeout=5)
+
+        for i in range(3):
+            cache.set("ns", f"id{i}", i)
+            cache.save()
+
+        release.set()
+        assert cache.flush(timeout=5)
+        assert len(written) == 2
+        assert cache.stats["snapshots_coalesced"] == 2
+        assert len(written[-1]["entries"]) == 3
+
+    def test_cleanup_does_not_block_on_write(self, cache, blocked_writes):
+        """Test that cleanup evicts expired entries without waiting for disk."""
+        writing, release, _ = blocked_writes
+        cache.set("ns", "short", 1, ttl=0.01)
+        time.sleep(0.02)
+
+        result = cache.cleanup()
+
+        assert result == {"entries_cleaned": 1, "entries_remaining": 0}
+        assert writing.wait(timeout=5)
+        release.set()
+
+    def test_atomic_write_leaves_no_temp_file(self, cache):
+        """Test that the snapshot is renamed into place."""
+        cache.set("ns", "id", "value")
+        cache.save()
+        assert cache.flush(timeout=5)
+
+        assert cache.cache_file.exists()
+        assert not list(cache.cache_file.parent.glob("*.tmp"))
+
+    def test_changes_during_write_stay_dirty(self, tmp_path):
+        """Test that a refresh racing a background write is saved next time."""
+        cache = IntelligentCache(
+            cache_file=str(tmp_path / "cache.db"), background_persistence=True
+        )
+        release = threading.Event()
+        original_write = cache._write_snapshot
+
+        def blocking_write(snapshot):
+            release.wait(timeout=5)
+            original_write(snapshot)
+
+        cache._write_snapshot = blocking_write
+        cache.set("ns", "a", 1)
+        cache.set("ns", "b", 2)
+        cache.save()
+
+        cache.refresh_entry("ns", "a", 10)
+        cache.invalidate("ns", "b")
+        release.set()
+        assert cache.flush(timeout=5)
+
+        # The write stored the old "a" and resurrected "b"; both stay pending
+        assert ("ns", "a") in cache._dirty
+        assert ("ns", "b") in cache._pending_deletes
+        assert cache.get("ns", "b") is None
+
+        cache.save()
+        assert cache.flush(timeout=5)
+        assert cache.persistent_store.get("ns", "a").value == 10
+        assert cache.persistent_store.get("ns", "b") is None
+
+
+class TestCacheMemoryAccounting:
+    """Test per-entry size accounting and byte budgets."""
+
+    @pytest.fixture
+    def cache(self, tmp_path):
+        """Create a cache without a persisted file."""
+        return IntelligentCache(cache_file=str(tmp_path / "cache.json"))
+
+    def test_estimate_size_is_recursive(self):
+        """Test that nested containers are included in the size."""
+        value = {"ips": ["192.168.0.1"] * 3, "meta": {"source": "x" * 1000}}
+
+        assert estimate_size(value) > sys.getsizeof(value) + 1000
+
+    def test_estimate_size_counts_shared_objects_once(self):
+        """Test that an object reachable twice is only counted once."""
+        shared = "y" * 1000
+
+        assert estimate_size([shared, shared]) < 2 * sys.getsizeof(shared)
+
+    def test_memory_bytes_follow_entry_lifecycle(self, cache):
+        """Test that totals follow set, overwrite, invalidation and clear."""
+        cache.set("ns", "a", "x" * 1000)
+        large = cache.memory_bytes
+        cache.set("ns", "a", "x")
+        assert cache.memory_bytes < large
+
+        cache.set("ns", "b", "y" * 100, cache_type=CacheType.API_RESPONSE)
+        assert cache.memory_bytes == sum(
+            sum(order.values()) for order in cache._type_order.values()
+        )
+
+        cache.invalidate("ns", "a")
+        assert cache.memory_bytes == cache._type_bytes[CacheType.API_RESPONSE]
+
+        cache.clear()
+        assert cache.memory_bytes == 0
+
+    def test_refresh_updates_size(self, cache):
+        """Test that refreshing with a larger value updates accounting."""
+        cache.set("ns", "a", "x")
+        before = cache.memory_bytes
+
+        cache.refresh_entry("ns", "a", "x" * 1000)
+
+        assert cache.memory_bytes >= before + 999
+        assert cache.memory_bytes == cache._type_order[CacheType.IP_RESULT][("ns", "a")]
+
+    def test_total_budget_evicts_least_recently_used(self, cache):
+        """Test that the total byte budget evicts the oldest entries."""
+        cache.set("ns", "a", "x" * 1000)
+        entry_size = cache.memory_bytes
+        cache.set_memory_budget(int(entry_size * 2.5))
+
+        cache.set("ns", "b", "x" * 1000)
+        cache.get("ns", "a")
+        cache.set("ns", "c", "x" * 1000)
+
+        assert set(cache.memory_cache) == {("ns", "a"), ("ns", "c")}
+        assert cache.memory_bytes <= cache.max_memory_bytes
+
+    def test_type_budget_only_evicts_that_type(self, cache):
+        """Test that a type budget leaves other cache types alone."""
+        cache.set("ip", "keep", "x" * 1000, cache_type=CacheType.IP_RESULT)
+        cache.set("perf", "a", "x" * 1000, cache_type=CacheType.PERFORMANCE_DATA)
+        entry_size = cache._type_bytes[CacheType.PERFORMANCE_DATA]
+        cache.set_memory_budget(int(entry_size * 1.5), CacheType.PERFORMANCE_DATA)
+
+        cache.set("perf", "b", "x" * 1000, cache_type=CacheType.PERFORMANCE_DATA)
+
+        assert ("ip", "keep") in cache.memory_cache
+        assert ("perf", "a") not in cache.memory_cache
+        assert ("perf", "b") in cache.memory_cache
+
+    def test_oversized_entry_is_kept(self, cache):
+        """Test that the newest entry survives even if it exceeds the budget."""
+        cache.set_memory_budget(100)
+
+        cache.set("ns", "a", "x" * 1000)
+        cache.set("ns", "b", "x" * 1000)
+
+        assert list(cache.memory_cache) == [("ns", "b")]
+
+    def test_setting_budget_evicts_immediately(self, cache):
+        """Test that lowering a budget evicts down to it."""
+        for i in range(10):
+            cache.set("ns", f"id{i}", "x" * 1000)
+
+        cache.set_memory_budget(cache.memory_bytes // 2)
+
+        assert len(cache.memory_cache) < 10
+        assert ("ns", "id9") in cache.memory_cache
+
+    def test_stats_report_memory_by_type(self, cache):
+        """Test that statistics report true byte usage per type."""
+        cache.set("ns", "a", "x" * 1000)
+        cache.set_memory_budget(10**6, CacheType.IP_RESULT)
+
+        stats = cache.get_stats()
+        ip_memory = stats["memory_by_type"][CacheType.IP_RESULT.value]
+
+        assert stats["memory_bytes"] == cache.memory_bytes
+        assert stats["memory_usage_mb"] == cache.memory_bytes / (1024 * 1024)
+        assert ip_memory == {"entries": 1, "bytes": cache.memory_bytes, "budget": 10**6}
+
+    def test_accounting_tracks_allocations(self, cache):
+        """Test that accounted bytes are close to what tracemalloc measures."""
+        tracemalloc.start()
+        baseline, _ = tracemalloc.get_traced_memory()
+        for i in range(2000):
+            value = {"ip": f"10.0.{i % 256}.{i // 256}", "latency": [i * 0.5, i]}
+            cache.set("perf", f"sample_{i}", value)
+        current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        measured = current - baseline
+        assert 0.5 * measured < cache.memory_bytes < 2 * measured
+
+    def test_sizing_only_walks_value_and_metadata(self, cache):
+        """Test that the fixed part of an entry is not sized recursively."""
+        value = {"ip": "10.0.0.1"}
+        metadata = {"source": "api"}
+
+        with patch(
+            "ip_monitor.utils.cache.estimate_size", wraps=estimate_size
+        ) as sized:
+            cache.set("ns", "a", value, metadata=metadata)
+
+        sized_objects = [call.args[0] for call in sized.call_args_list]
+        assert value in sized_objects
+        assert metadata in sized_objects
+        assert not any(isinstance(obj, CacheEntry) for obj in sized_objects)
+        assert ("ns", "a") not in sized_objects
+        size = cache._type_order[CacheType.IP_RESULT][("ns", "a")]
+        assert size > ENTRY_OVERHEAD + estimate_size(value)
+
+    def test_constructor_applies_type_budgets(self, tmp_path):
+        """Test that per-type budgets can be given by cache type value."""
+        cache = IntelligentCache(
+            cache_file=str(tmp_path / "cache.json"),
+            max_memory_bytes=10**6,
+            memory_budgets={"api_response": 4096, CacheType.DNS_LOOKUP: 2048},
+        )
+
+        assert cache.max_memory_bytes == 10**6
+        assert cache.memory_budgets == {
+            CacheType.API_RESPONSE: 4096,
+            CacheType.DNS_LOOKUP: 2048,
+        }
+
+
+class TestCacheGetOrCompute:
+    """Test async get_or_compute with single-flight and negative caching."""
+
+    @pytest.fixture
+    def cache(self, tmp_path):
+        """Create a cache without a persisted file."""
+        return IntelligentCache(cache_file=str(tmp_path / "cache.json"))
+
+    async def test_computes_and_caches_on_miss(self, cache):
+        """Test that a miss computes the value and later calls hit the cache."""
+        calls = 0
+
+        async def factory():
+            nonlocal calls
+            calls += 1
+            return "value"
+
+        assert await cache.get_or_compute("ns", "id", factory) == "value"
+        assert await cache.get_or_compute("ns", "id", factory) == "value"
+
+        assert calls == 1
+        assert cache.get("ns", "id") == "value"
+        assert cache.stats["computations"] == 1
+
+    async def test_concurrent_misses_compute_once(self, cache):
+        """Test that concurrent callers for one key share a computation."""
+        calls = 0
+
+        async def factory():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return calls
+
+        results = await asyncio.gather(
+            *(cache.get_or_compute("ns", "id", factory) for _ in range(10))
+        )
+
+        assert results == [1] * 10
+        assert calls == 1
+        assert cache.stats["coalesced"] == 9
+        assert cache._inflight == {}
+
+    async def test_different_keys_compute_independently(self, cache):
+        """Test that single-flight is per key."""
+
+        async def factory():
+            await asyncio.sleep(0.01)
+            return "value"
+
+        await asyncio.gather(
+            cache.get_or_compute("ns", "a", factory),
+            cache.get_or_compute("ns", "b", factory),
+        )
+
+        assert cache.stats["computations"] == 2
+
+    async def test_refresh_recomputes(self, cache):
+        """Test that refresh bypasses a cached value."""
+        cache.set("ns", "id", "old")
+
+        async def factory():
+            return "new"
+
+        assert await cache.get_or_compute("ns", "id", factory, refresh=True) == "new"
+        assert cache.get("ns", "id") == "new"
+
+    async def test_failure_propagates_to_all_waiters(self, cache):
+        """Test that a raised error reaches every concurrent caller."""
+
+        async def factory():
+            await asyncio.sleep(0.01)
+            raise ValueError("boom")
+
+        results = await asyncio.gather(
+            *(cache.get_or_compute("ns", "id", factory) for _ in range(3)),
+            return_exceptions=True,
+        )
+
+        assert all(isinstance(result, ValueError) for result in results)
+        assert cache.stats["computations"] == 1
+        assert cache.get("ns", "id") is None
+
+    async def test_failures_are_not_remembered_by_default(self, cache):
+        """Test that without negative_ttl a failure is retried."""
+        calls = 0
+
+        async def factory():
+            nonlocal calls
+            calls += 1
+
+        await cache.get_or_compute("ns", "id", factory)
+        await cache.get_or_compute("ns", "id", factory)
+
+        assert calls == 2
+
+    async def test_negative_caching_of_errors(self, cache):
+        """Test that a remembered error is re-raised without recomputing."""
+        calls = 0
+
+        async def factory():
+            nonlocal calls
+            calls += 1
+            raise ValueError("boom")
+
+        for _ in range(3):
+            with pytest.raises(ValueError):
+                await cache.get_or_compute("ns", "id", factory, negative_ttl=60)
+
+        assert calls == 1
+        assert cache.stats["negative_hits"] == 2
+
+    async def test_negative_caching_expires(self, cache):
+        """Test that a failure is retried once its negative TTL passes."""
+        results = iter([None, "value"])
+
+        async def factory():
+            return next(results)
+
+        assert await cache.get_or_compute("ns", "id", factory, negative_ttl=0.01) is None
+        await asyncio.sleep(0.02)
+
+        value = await cache.get_or_compute("ns", "id", factory, negative_ttl=0.01)
+        assert value == "value"
+
+    async def test_set_and_invalidate_forget_failures(self, cache):
+        """Test that a remembered failure is dropped by set and invalidate."""
+
+        async def failing():
+            return None
+
+        async def succeeding():
+            return "value"
+
+        await cache.get_or_compute("ns", "a", failing, negative_ttl=60)
+        await cache.get_or_compute("ns", "b", failing, negative_ttl=60)
+
+        cache.set("ns", "a", "set")
+        cache.invalidate("ns", "b")
+
+        assert await cache.get_or_compute("ns", "a", succeeding) == "set"
+        assert await cache.get_or_compute("ns", "b", succeeding) == "value"
+
+    async def test_cancelled_caller_does_not_cancel_computation(self, cache):
+        """Test that other waiters still get the value if one caller is cancelled."""
+
+        async def factory():
+            await asyncio.sleep(0.02)
+            return "value"
+
+        first = asyncio.create_task(cache.get_or_compute("ns", "id", factory))
+        second = asyncio.create_task(cache.get_or_compute("ns", "id", factory))
+        await asyncio.sleep(0)
+        first.cancel()
+
+        assert await second == "value"
+        assert cache.get("ns", "id") == "value"
+
+
+class TestCacheLazyLoad:
+    """Test background warm-up and on-demand loading of the cache file."""
+
+    @pytest.fixture
+    def cache_file(self, tmp_path):
+        """Path to a cache file holding ten saved entries."""
+        path = tmp_path / "cache.json"
+        cache = IntelligentCache(cache_file=str(path))
+        for i in range(10):
+            cache.set("ns", f"id{i}", i)
+        cache.get("ns", "id0")  # Most recently used
+        cache.save()
+        return path
+
+    @pytest.fixture
+    def undecoded(self):
+        """Keep lazily loaded entries indexed but not decoded."""
+        with patch.object(IntelligentCache, "_decode_unloaded", return_value=0):
+            yield
+
+    def test_lazy_load_warms_up_in_background(self, cache_file):
+        """Test that a lazy cache loads every entry on its warm-up thread."""
+        cache = IntelligentCache(cache_file=str(cache_file), lazy_load=True)
+
+        assert cache.wait_for_warm_up(timeout=5)
+        assert len(cache.memory_cache) == 10
+        assert cache._unloaded == {}
+        assert cache.stats["loads"] == 1
+
+    def test_warm_up_preserves_recency_order(self, cache_file):
+        """Test that the most recently used entries are loaded first."""
+        cache = IntelligentCache(
+            cache_file=str(cache_file), max_memory_size=3, lazy_load=True
+        )
+        cache.wait_for_warm_up(timeout=5)
+
+        assert list(cache.memory_cache) == [
+            ("ns", "id8"),
+            ("ns", "id9"),
+            ("ns", "id0"),
+        ]
+        assert len(cache._unloaded) == 7
+
+    def test_miss_loads_entry_on_demand(self, cache_file, undecoded):
+        """Test that a lookup decodes an entry that has not been loaded yet."""
+        cache = IntelligentCache(cache_file=str(cache_file), lazy_load=True)
+        cache.wait_for_warm_up(timeout=5)
+        assert len(cache.memory_cache) == 0
+
+        assert cache.get("ns", "id3") == 3
+        assert ("ns", "id3") in cache.memory_cache
+        assert ("ns", "id3") not in cache._unloaded
+        assert cache.stats["persistent_hits"] == 1
+
+    def test_set_replaces_undecoded_entry(self, cache_file, undecoded):
+        """Test that a value set during warm-up wins over the persisted one."""
+        cache = IntelligentCache(cache_file=str(cache_file), lazy_load=True)
+        cache.set("ns", "id1", "new")
+        cache.invalidate("ns", "id2")
+
+        assert cache.get("ns", "id1") == "new"
+        assert cache.get("ns", "id2") is None
+
+    def test_save_keeps_undecoded_entries(self, cache_file, undecoded):
+        """Test that saving before warm-up finishes does not drop entries."""
+        cache = IntelligentCache(cache_file=str(cache_file), lazy_load=True)
+        cache.set("ns", "extra", "value")
+        cache.save()
+
+        _, entries = read_cache_file(cache_file)
+        assert len(entries) == 11
+
+    def test_expired_lines_are_not_decoded(self, tmp_path):
+        """Test that expired entries are skipped by their deadline alone."""
+        path = tmp_path / "cache.json"
+        cache = IntelligentCache(cache_file=str(path))
+        cache.set("ns", "live", "value")
+        cache.save()
+        with open(path, "a") as f:
+            f.write(f"{time.time() - 1!r}\tnot json\n")
+
+        with patch("logging.Logger.error") as mock_error:
+            loaded = IntelligentCache(cache_file=str(path))
+
+        mock_error.assert_not_called()
+        assert loaded.get("ns", "live") == "value"
+
+    def test_load_single_document_layout(self, tmp_path):
+        """Test that cache files saved as one JSON document still load."""
+        path = tmp_path / "cache.json"
+        now = time.time()
+        entry = ["test:key", "value", now, now, 1, 300, "ip_result", None]
+        data = {"format": 2, "entries": [entry], "stats": {}, "saved_at": now}
+        path.write_text(json.dumps(data, indent=2))
+
+        cache = IntelligentCache(cache_file=str(path))
+
+        assert cache.get("test", "key") == "value"
+
+    def test_lazy_stats_add_to_startup_counts(self, cache_file, undecoded):
+        """Test that persisted stats are added to counts made during warm-up."""
+        saved_hits = IntelligentCache(cache_file=str(cache_file)).stats["hits"]
+
+        cache = IntelligentCache(cache_file=str(cache_file), lazy_load=True)
+        assert cache._index_ready.wait(timeout=5)
+        cache.get("ns", "id1")
+        cache.wait_for_warm_up(timeout=5)
+
+        assert cache.stats["hits"] == saved_hits + 1
+
+    @pytest.fixture
+    def slow_index(self):
+        """Hold indexing of the cache file until the returned event is set."""
+        release = threading.Event()
+        index_cache_file = IntelligentCache._index_cache_file
+
+        def blocked(cache):
+            release.wait(timeout=5)
+            return index_cache_file(cache)
+
+        with patch.object(IntelligentCache, "_index_cache_file", blocked):
+            yield release
+        release.set()
+
+    def test_lookups_do_not_wait_for_indexing(self, cache_file, slow_index):
+        """Test that get and set run while the cache file is still indexed."""
+        cache = IntelligentCache(cache_file=str(cache_file), lazy_load=True)
+
+        assert cache.get("ns", "id1") is None
+        cache.set("ns", "id2", "new")
+        cache.invalidate("ns", "id3")
+        assert not cache._index_ready.is_set()
+
+        slow_index.set()
+        assert cache.wait_for_warm_up(timeout=5)
+        assert cache.get("ns", "id1") == 1
+        assert cache.get("ns", "id2") == "new"
+        assert cache.get("ns", "id3") is None
+
+    def test_clear_during_indexing_drops_indexed_entries(
+        self, cache_file, slow_index
+    ):
+        """Test that entries indexed after a clear are not restored."""
+        cache = IntelligentCache(cache_file=str(cache_file), lazy_load=True)
+        cache.clear()
+
+        slow_index.set()
+        assert cache.wait_for_warm_up(timeout=5)
+        assert len(cache.memory_cache) == 0
+        assert cache._unloaded == {}
+
+    def test_unreadable_line_is_a_miss(self, cache_file, undecoded):
+        """Test that a line that fails to decode is dropped on read-through."""
+        cache = IntelligentCache(cache_file=str(cache_file), lazy_load=True)
+        cache.wait_for_warm_up(timeout=5)
+        cache._unloaded[("ns", "id3")] = f"{time.time() + 60!r}\tnot json"
+
+        assert cache.get("ns", "id3") is None
+        assert ("ns", "id3") not in cache._unloaded
+        assert cache.get("ns", "id4") == 4
+
+
+class TestCacheTinyLFUAdmission:
+    """Test the TinyLFU admission policy."""
+
+    @pytest.fixture
+    def cache(self, tmp_path):
+        """Create a small TinyLFU cache without a persisted file."""
+        return IntelligentCache(
+            cache_file=str(tmp_path / "cache.json"),
+            max_memory_size=10,
+            admission_policy=AdmissionPolicy.TINY_LFU,
+        )
+
+    def test_policy_is_selectable(self, cache, tmp_path):
+        """Test that the policy is chosen per instance."""
+        plain = IntelligentCache(cache_file=str(tmp_path / "plain.json"))
+
+        assert cache.get_stats()["admission_policy"] == "tinylfu"
+        assert plain.get_stats()["admission_policy"] == "lru"
+        named = IntelligentCache(
+            cache_file=str(tmp_path / "named.json"), admission_policy="tinylfu"
+        )
+        assert named.admission_policy is AdmissionPolicy.TINY_LFU
+
+    def test_unknown_policy_rejected(self, tmp_path):
+        """Test that an unknown policy name raises."""
+        with pytest.raises(ValueError):
+            IntelligentCache(
+                cache_file=str(tmp_path / "cache.json"), admission_policy="fifo"
+            )
+
+    def test_never_exceeds_capacity(self, cache):
+        """Test that admission keeps the cache at its entry limit."""
+        for i in range(100):
+            cache.set("ns", f"id{i}", i)
+
+        assert len(cache.memory_cache) == 10
+        assert len(cache._window) <= cache._window_size
+        assert set(cache._window) <= set(cache.memory_cache)
+
+    def test_scan_does_not_flush_frequent_entries(self, cache):
+        """Test that one-off keys cannot push out frequently used entries."""
+        for i in range(9):
+            cache.set("hot", f"id{i}", i)
+        for _ in range(3):
+            for i in range(9):
+                cache.get("hot", f"id{i}")
+
+        for i in range(50):
+            cache.set("scan", f"id{i}", i)
+
+        assert all(cache.get("hot", f"id{i}") == i for i in range(9))
+        assert cache.stats["admission_rejections"] > 0
+
+    def test_frequent_newcomer_is_admitted(self, cache):
+        """Test that a key used more often than the LRU victim gets in."""
+        for i in range(10):
+            cache.set("old", f"id{i}", i)
+        for _ in range(5):
+            cache.get("new", "key")
+
+        cache.set("new", "key", "value")
+        cache.set("other", "key", "value")  # Pushes "new" out of the window
+
+        assert cache.get("new", "key") == "value"
+        assert len(cache.memory_cache) == 10
+
+    def test_invalidate_and_clear_update_window(self, cache):
+        """Test that removed entries leave the admission window."""
+        cache.set("ns", "a", 1)
+        cache.invalidate("ns")
+        assert cache._window == OrderedDict()
+
+        cache.set("ns", "b", 2)
+        cache.clear()
+        assert cache._window == OrderedDict()
@@ -0,0 +1,201 @@
+"""
+Tests for the SQLite-backed persistent cache tier.
+"""
+
+import time
+
+import pytest
+
+from ip_monitor.utils.cache import CacheEntry, CacheType, IntelligentCache
+from ip_monitor.utils.cache_store import SQLiteCacheStore
+
+
+@pytest.fixture
+def cache_db(tmp_path):
+    """Path to a temporary SQLite cache file."""
+    return tmp_path / "cache.db"
+
+
+def make_entry(key: str, value, ttl: float = 300, age: float = 0) -> CacheEntry:
+    """Build a cache entry created `age` seconds ago."""
+    created_at = time.time() - age
+    return CacheEntry(
+        key=key,
+        value=value,
+        created_at=created_at,
+        last_accessed=created_at,
+        access_count=1,
+        ttl=ttl,
+        cache_type=CacheType.IP_RESULT,
+        metadata={"source": "test"},
+    )
+
+
+class TestSQLiteCacheStore:
+    """Test cases for SQLiteCacheStore."""
+
+    def test_upsert_and_get_round_trip(self, cache_db):
+        """Test that stored entries are read back intact."""
+        store = SQLiteCacheStore(cache_db)
+        entry = make_entry("ns:id", {"ip": "1.2.3.4"})
+
+        assert store.upsert_many([(("ns", "id"), entry)]) == 1
+        loaded = store.get("ns", "id")
+
+        assert loaded.key == "ns:id"
+        assert loaded.value == {"ip": "1.2.3.4"}
+        assert loaded.cache_type == CacheType.IP_RESULT
+        assert loaded.metadata == {"source": "test"}
+        assert loaded.created_at == entry.created_at
+        store.close()
+
+    def test_get_ignores_expired_rows(self, cache_db):
+        """Test that expired rows are never returned."""
+        store = SQLiteCacheStore(cache_db)
+        store.upsert_many([(("ns", "old"), make_entry("ns:old", "x", ttl=1, age=10))])
+
+        assert store.get("ns", "old") is None
+        store.close()
+
+    def test_purge_expired(self, cache_db):
+        """Test that purging removes only expired rows."""
+        store = SQLiteCacheStore(cache_db)
+        store.upsert_many(
+            [
+                (("ns", "old"), make_entry("ns:old", "x", ttl=1, age=10)),
+                (("ns", "new"), make_entry("ns:new", "y")),
+            ]
+        )
+
+        assert store.purge_expired() == 1
+        assert store.count() == 1
+        store.close()
+
+    def test_apply_changes_deletes_namespace(self, cache_db):
+        """Test that deleting a namespace leaves other namespaces alone."""
+        store = SQLiteCacheStore(cache_db)
+        store.upsert_many(
+            [
+                (("a", "1"), make_entry("a:1", 1)),
+                (("a", "2"), make_entry("a:2", 2)),
+                (("b", "1"), make_entry("b:1", 3)),
+            ]
+        )
+
+        store.apply_changes(deleted_namespaces=["a"])
+
+        assert store.get("a", "1") is None
+        assert store.get("a", "2") is None
+        assert store.get("b", "1").value == 3
+        store.close()
+
+
+class TestCachePersistentTier:
+    """Test cases for IntelligentCache backed by SQLiteCacheStore."""
+
+    def test_sqlite_suffix_selects_store(self, cache_db, tmp_path):
+        """Test that only SQLite cache files enable the persistent tier."""
+        cache = IntelligentCache(cache_file=str(cache_db))
+        json_cache = IntelligentCache(cache_file=str(tmp_path / "cache.json"))
+
+        assert isinstance(cache.persistent_store, SQLiteCacheStore)
+        assert json_cache.persistent_store is None
+
+    def test_save_is_incremental(self, cache_db):
+        """Test that a save only writes entries changed since the last save."""
+        cache = IntelligentCache(cache_file=str(cache_db))
+        for i in range(5):
+            cache.set("ns", f"id{i}", i)
+        cache.save()
+        assert cache.persistent_store.count() == 5
+        assert cache._dirty == {}
+
+        cache.set("ns", "id0", "changed")
+        assert list(cache._dirty) == [("ns", "id0")]
+        cache.save()
+
+        assert cache.persistent_store.get("ns", "id0").value == "changed"
+
+    def test_restart_reads_through_lazily(self, cache_db):
+        """Test that a restarted cache loads entries on demand."""
+        cache = IntelligentCache(cache_file=str(cache_db))
+        cache.set("ns", "id", "value")
+        cache.save()
+
+        restarted = IntelligentCache(cache_file=str(cache_db))
+        assert len(restarted.memory_cache) == 0
+        assert restarted.stats["loads"] == cache.stats["loads"] + 1
+
+        assert restarted.get("ns", "id") == "value"
+        assert ("ns", "id") in restarted.memory_cache
+        assert restarted.stats["persistent_hits"] == 1
+
+    def test_evicted_unsaved_entry_is_not_lost(self, cache_db):
+        """Test that entries evicted from memory before a save still persist."""
+        cache = IntelligentCache(cache_file=str(cache_db), max_memory_size=2)
+        cache.set("ns", "a", 1)
+        cache.set("ns", "b", 2)
+        cache.set("ns", "c", 3)  # Evicts "a" before it was ever saved
+
+        assert ("ns", "a") not in cache.memory_cache
+        assert cache.get("ns", "a") == 1
+
+        cache.save()
+        assert cache.persistent_store.count() == 3
+
+    def test_invalidate_removes_persisted_entries(self, cache_db):
+        """Test that invalidated entries are not read back from the store."""
+        cache = IntelligentCache(cache_file=str(cache_db))
+        cache.set("ns", "a", 1)
+        cache.set("ns", "b", 2)
+        cache.set("other", "a", 3)
+        cache.save()
+
+        restarted = IntelligentCache(cache_file=str(cache_db))
+        restarted.invalidate("ns", "a")
+        assert restarted.get("ns", "a") is None
+
+        restarted.invalidate("ns")
+        assert restarted.get("ns", "b") is None
+        assert restarted.get("other", "a") == 3
+
+        restarted.save()
+        assert restarted._pending_deletes == {}
+        assert restarted.persistent_store.count() == 1
+
+    def test_clear_empties_store(self, cache_db):
+        """Test that clearing the cache also clears the persistent tier."""
+        cache = IntelligentCache(cache_file=str(cache_db))
+        cache.set("ns", "a", 1)
+        cache.save()
+
+        cache.clear()
+        assert cache.get("ns", "a") is None
+
+        cache.save()
+        assert cache.persistent_store.count() == 0
+
+    def test_cleanup_purges_expired_rows(self, cache_db):
+        """Test that cleanup purges expired rows from the store."""
+        cache = IntelligentCache(cache_file=str(cache_db))
+        cache.set("ns", "short", 1, ttl=0.01)
+        cache.set("ns", "long", 2)
+        cache.save()
+
+        time.sleep(0.02)
+        cache.cleanup()
+
+        assert cache.persistent_store.count() == 1
+        assert cache.persistent_store.get("ns", "long").value == 2
+
+    def test_set_after_invalidate_survives_save(self, cache_db):
+        """Test that deletions are applied before newer upserts."""
+        cache = IntelligentCache(cache_file=str(cache_db))
+        cache.set("ns", "a", 1)
+        cache.save()
+
+        cache.invalidate("ns")
+        cache.set("ns", "a", 2)
+        cache.save()
+
+        assert cache.persistent_store.get("ns", "a").value == 2
@@ -0,0 +1,72 @@
+"""
+Tests for the count-min frequency sketch used by TinyLFU admission.
+"""
+
+from ip_monitor.utils.frequency_sketch import FrequencySketch
+
+
+class TestFrequencySketch:
+    """Test cases for FrequencySketch."""
+
+    def test_unseen_key_estimates_zero(self):
+        """Test that keys never recorded have no frequency."""
+        sketch = FrequencySketch(100)
+
+        assert sketch.estimate(("ns", "id")) == 0
+
+    def test_estimate_counts_increments(self):
+        """Test that estimates follow recorded accesses."""
+        sketch = FrequencySketch(100)
+        for _ in range(5):
+            sketch.increment(("ns", "hot"))
+        sketch.increment(("ns", "cold"))
+
+        assert sketch.estimate(("ns", "hot")) >= 5
+        assert sketch.estimate(("ns", "hot")) > sketch.estimate(("ns", "cold"))
+
+    def test_counters_saturate(self):
+        """Test that counters stop at MAX_COUNT."""
+        sketch = FrequencySketch(1000)
+        for _ in range(100):
+            sketch.increment("key")
+
+        assert sketch.estimate("key") == FrequencySketch.MAX_COUNT
+
+    def test_aging_halves_counters(self):
+        """Test that aging halves every counter."""
+        sketch = FrequencySketch(10)
+        for _ in range(8):
+            sketch.increment("hot")
+
+        sketch._age()
+
+        assert sketch.estimate("hot") == 4
+        assert sketch.resets == 1
+
+    def test_aging_runs_after_sample_size(self):
+        """Test that counters are aged once sample_size increments are seen."""
+        sketch = FrequencySketch(10)
+        for i in range(sketch.sample_size):
+            sketch.increment(f"key{i}")
+
+        assert sketch.resets == 1
+        assert sketch.additions == sketch.sample_size // 2
+
+    def test_estimates_stay_accurate_with_many_keys(self):
+        """Test that collisions rarely inflate estimates at capacity."""
+        sketch = FrequencySketch(1000)
+        for i in range(1000):
+            sketch.increment(f"key{i}")
+
+        overestimated = sum(sketch.estimate(f"key{i}") > 1 for i in range(1000))
+        assert overestimated < 20
+
+    def test_clear(self):
+        """Test that clearing forgets all frequencies."""
+        sketch = FrequencySketch(100)
+        sketch.increment("key")
+
+        sketch.clear()
+
+        assert sketch.estimate("key") == 0
+        assert sketch.additions == 0